@@ -0,0 +1,18 @@
+"""Headless benchmark suite for the game's hot paths.
+
+This package times the code that runs every frame (or every time a screen is
+built) without opening a real window or audio device: SDL is pointed at its
+dummy video and audio drivers before pygame is imported. Results are written
+as JSON and compared against a stored baseline so that regressions show up as
+numbers instead of as "the game feels slower".
+
+Usage (from the project root, so that asset paths resolve):
+    python -m benchmarks                      # run and compare to baseline
+    python -m benchmarks --output out.json    # also save the results
+    python -m benchmarks --save-baseline      # overwrite stored baseline
+    python -m benchmarks --quick              # skip the 10^6 row files
+
+Modules:
+    run_benchmarks: Timing harness, JSON output, and baseline comparison.
+    hot_path_benchmarks: The individual microbenchmarks.
+"""
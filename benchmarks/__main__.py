@@ -0,0 +1,7 @@
+"""Run benchmark suite via "python -m benchmarks"."""
+
+from benchmarks.run_benchmarks import main
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,355 @@
+"""Define the individual hot path microbenchmarks.
+
+Each benchmark is a "make" function that builds whatever game objects it
+needs (untimed) and returns a (call, before_each) pair: call is the code
+being timed and before_each is an optional untimed callable that resets state
+between calls. get_benchmarks() returns the full list of benchmarks along with
+any timing options specific to them.
+
+Functions:
+    setup_headless_window: Initializes pygame and returns a dummy window.
+    get_benchmarks: Returns list of (name, make function, options) tuples.
+"""
+
+import atexit
+import os
+import random
+import shutil
+import tempfile
+from collections import deque
+from functools import partial
+import pygame
+from misc.constants import *
+from misc.saved_data_io_functions import get_page_of_user_row, get_score_name_list, update_settings_real_time
+from game_objects.game_board import GameBoard
+from game_objects.game_border_ui import GameBorderUI
+from game_objects.game_grid import GameGrid
+from game_objects.game_simulation import GameSimulation
+from game_objects.ghost_replay import GhostReplay, GhostSnake
+from game_objects.hamiltonian_autopilot import HamiltonianAutopilot
+from game_objects.snake_autopilot import SnakeAutopilot
+from game_objects.snack_items import Item, draw_items, spawn_apple_snacks
+from game_objects.snake_player import PlayerSnake, make_snake_player_list
+from game_screens.snake_game_screen import SnakeGame
+from menu_screens.high_scores_screen import HighScoresScreen
+from training.snake_environment import SnakeEnvironment, VectorSnakeEnvironment
+
+SNAKE_LENGTHS = [10, 1_000, 10_000]
+COLLISION_SNAKE_LENGTHS = [10, 1_000]
+BOARD_FILL_FRACTIONS = [0.5, 0.9, 0.99]
+APPLE_COUNTS = [NUMBER_OF_APPLE_SNACKS, 500]
+PLAYER_COUNTS = [1, MAX_LOCAL_PLAYERS]
+ENVIRONMENT_COUNTS = [1, 64]
+AUTOPILOT_BOARD_SIZES = [BOARD_DEFAULT_SIZE, (370, 210)]
+SCORE_FILE_ROW_COUNTS = [10**3, 10**4, 10**5, 10**6]
+QUICK_SCORE_FILE_ROW_COUNTS = [10**3, 10**4, 10**5]
+GHOST_REPLAY_TICKS = 2_000
+
+_window = None
+
+
+def setup_headless_window() -> pygame.Surface:
+    """Initialize pygame once and return a (dummy driver) game window."""
+    global _window
+    if _window is None:
+        pygame.init()
+        _window = pygame.display.set_mode((GAME_WINDOW_WIDTH, GAME_WINDOW_HEIGHT))
+    return _window
+
+
+def _make_board(board_size: tuple[int, int] = BOARD_DEFAULT_SIZE) -> GameBoard:
+    """Return empty game board of entered (columns, rows) size in the default play area."""
+    play_area_rect = pygame.Rect(GAME_BORDER_LEFT, GAME_BORDER_UPPER,
+                                 GAME_WINDOW_WIDTH - GAME_BORDER_LEFT - GAME_BORDER_RIGHT,
+                                 GAME_WINDOW_HEIGHT - GAME_BORDER_UPPER - GAME_BORDER_LOWER)
+    return GameBoard(*board_size, BOARD_DEFAULT_CELL_SIZE, play_area_rect)
+
+
+def _board_cell_list(board: GameBoard) -> list[tuple[int, int]]:
+    """Return every board cell, in row-major order."""
+    return [(column, row) for row in range(board.rows) for column in range(board.columns)]
+
+
+def _make_snake(window: pygame.Surface, board: GameBoard, length: int) -> PlayerSnake:
+    """Return snake of entered length laid out over the board.
+
+    Body cubes are laid out over every board cell (except the head's cell)
+    and wrap around once all cells are used, so that the head never collides
+    with its own body regardless of length.
+    """
+    snake = PlayerSnake(window, board, SNAKE_PLAYER_START_DIRECTION)
+    snake.vacate_board_cells()
+    free_centers = [board.cell_to_center(cell) for cell in _board_cell_list(board) if cell != snake.head_cell]
+    snake.snake_cube_rect_list = deque([snake.head_cube_rect] + [
+        snake.body_cube.get_rect(center=free_centers[index % len(free_centers)]) for index in range(length - 1)])
+    snake.occupy_board_cells()
+    return snake
+
+
+def _make_snake_game(window: pygame.Surface, length: int, apple_count: int = NUMBER_OF_APPLE_SNACKS) -> SnakeGame:
+    """Return SnakeGame instance (with sound and music turned off) holding a snake of entered length."""
+    board = _make_board()
+    border_ui = GameBorderUI(window, GAME_WINDOW_WIDTH, GAME_WINDOW_HEIGHT, board, game_ready_ui=True)
+    background = pygame.Surface(board.rect.size)
+    # (Apples are spawned before the snake is laid out, since a long snake covers every board cell).
+    spawn_apple_snacks(window, board, apple_count)
+    snake = _make_snake(window, board, length)
+    return SnakeGame(window, GAME_WINDOW_WIDTH, GAME_WINDOW_HEIGHT, 'False', 'False', 'False', pygame.time.Clock(),
+                     board, border_ui, background, board.rect.topleft, GameGrid(window, board), [snake])
+
+
+def make_snake_move(length: int):
+    """Benchmark PlayerSnake.move for a snake of entered length."""
+    snake = _make_snake(setup_headless_window(), _make_board(), length)
+    return snake.move, None
+
+
+def make_end_game_event_handling(length: int):
+    """Benchmark SnakeGame.end_game_event_handling on a normal (no crash) tick."""
+    game = _make_snake_game(setup_headless_window(), length)
+    return game.end_game_event_handling, None
+
+
+def make_snack_collision_handling(length: int, apple_count: int = NUMBER_OF_APPLE_SNACKS):
+    """Benchmark SnakeGame.snack_collision_handling on a tick where a snack is eaten."""
+    game = _make_snake_game(setup_headless_window(), length, apple_count)
+    snake, board = game.snake_player_list[0], game.board
+    apple = next(iter(board.item_cell_dict.values()))
+
+    def before_each() -> None:
+        # Undo growth from previous call, and move an apple into the snake's head cell (replacing any spawned one).
+        while len(snake.snake_cube_rect_list) > length:
+            board.vacate_snake_cell(board.pos_to_cell(snake.snake_cube_rect_list.pop().center))
+        while len(board.item_cell_dict) >= apple_count:
+            board.remove_item(next(reversed(board.item_cell_dict)))
+        apple.cell = snake.head_cell
+        board.add_item(apple)
+
+    return game.snack_collision_handling, before_each
+
+
+def _record_autopilot_replay(board_size: tuple[int, int], tick_count: int) -> GhostReplay:
+    """Return replay of up to entered number of ticks of an apple autopilot game on a seeded board."""
+    window = setup_headless_window()
+    board = _make_board(board_size)
+    snake = PlayerSnake(window, board, SNAKE_PLAYER_START_DIRECTION)
+    simulation = GameSimulation(window, board, [snake], SnakeAutopilot(snake, board))
+    replay = GhostReplay(board.columns, board.rows, NUMBER_OF_APPLE_SNACKS, 0)
+    board.seed(replay.seed)
+    simulation.reset(replay.apple_count)
+    while len(replay.direction_array) < tick_count and not simulation.is_over():
+        simulation.update()
+        replay.record(snake.direction)
+    return replay
+
+
+def make_update_simulation(player_count: int, autopilot_class=None,
+                           board_size: tuple[int, int] = BOARD_DEFAULT_SIZE, ghost_bool: bool = False):
+    """Benchmark SnakeGame.update_simulation with entered number of local players' snakes.
+
+    If an autopilot class (SnakeAutopilot or HamiltonianAutopilot) is
+    entered, player 1's snake is driven by it (so the timed ticks include its
+    searches). If ghost_bool is True, a ghost snake replays a recorded
+    autopilot game alongside the game, and player 1's moves are recorded.
+    """
+    window = setup_headless_window()
+    board = _make_board(board_size)
+    border_ui = GameBorderUI(window, GAME_WINDOW_WIDTH, GAME_WINDOW_HEIGHT, board, True, player_count)
+    spawn_apple_snacks(window, board, NUMBER_OF_APPLE_SNACKS)
+    snake_player_list = make_snake_player_list(window, board, player_count)
+    autopilot = autopilot_class(snake_player_list[0], board) if autopilot_class is not None else None
+    game = SnakeGame(window, GAME_WINDOW_WIDTH, GAME_WINDOW_HEIGHT, 'False', 'False', 'False', pygame.time.Clock(),
+                     board, border_ui, pygame.Surface(board.rect.size), board.rect.topleft, GameGrid(window, board),
+                     snake_player_list, autopilot,
+                     ghost_snake=(GhostSnake(window, board, _record_autopilot_replay(board_size, GHOST_REPLAY_TICKS))
+                                  if ghost_bool else None),
+                     replay=GhostReplay(board.columns, board.rows, NUMBER_OF_APPLE_SNACKS, 0) if ghost_bool else None)
+
+    def before_each() -> None:
+        # Restart the ghost's replay once it is finished.
+        if game.ghost_snake is not None and game.ghost_snake.finished:
+            game.ghost_snake.reset()
+        # Start a new game once every snake has crashed.
+        if all(snake_player.dead for snake_player in snake_player_list):
+            board.clear()
+            for snake_player in snake_player_list:
+                snake_player.reset()
+            if autopilot is not None:
+                autopilot.reset()
+            spawn_apple_snacks(window, board, NUMBER_OF_APPLE_SNACKS)
+            border_ui.reset()
+
+    return game.update_simulation, before_each
+
+
+def make_environment_step(environment_count: int):
+    """Benchmark stepping entered number of training environment boards with random actions.
+
+    A single board is stepped with SnakeEnvironment.step (reset untimed once
+    its episode is done), more than one with VectorSnakeEnvironment.step
+    (which resets finished boards itself, so resets are timed).
+    """
+    setup_headless_window()
+    action_rng = random.Random(0)
+    if environment_count == 1:
+        environment = SnakeEnvironment()
+        environment.reset(0)
+
+        def before_each() -> None:
+            if environment.done:
+                environment.reset()
+
+        return lambda: environment.step(action_rng.randrange(environment.action_count)), before_each
+
+    vector_environment = VectorSnakeEnvironment(environment_count)
+    vector_environment.reset(0)
+    return lambda: vector_environment.step([action_rng.randrange(len(ENVIRONMENT_ACTION_LIST))
+                                            for _ in range(environment_count)]), None
+
+
+def make_item_random_pos(fill_fraction: float):
+    """Benchmark Item.random_pos on a board with entered fraction of cells occupied."""
+    board = _make_board()
+    item = Item(setup_headless_window(), board)
+    item.remove()
+    cell_list = _board_cell_list(board)
+    for cell in random.Random(0).sample(cell_list, int(len(cell_list) * fill_fraction)):
+        board.occupy_snake_cell(cell)
+    return item.random_pos, None
+
+
+def make_draw_items(apple_count: int):
+    """Benchmark draw_items for entered number of apples on the board."""
+    window = setup_headless_window()
+    board = _make_board()
+    spawn_apple_snacks(window, board, apple_count)
+    return partial(draw_items, window, board.item_cell_dict.values()), None
+
+
+def make_border_ui_update_ui_info():
+    """Benchmark GameBorderUI.update_ui_info."""
+    border_ui = GameBorderUI(setup_headless_window(), GAME_WINDOW_WIDTH, GAME_WINDOW_HEIGHT, _make_board(),
+                             game_ready_ui=True)
+    return border_ui.update_ui_info, None
+
+
+def make_border_ui_draw():
+    """Benchmark GameBorderUI.draw (border images, number backgrounds, and ui text)."""
+    border_ui = GameBorderUI(setup_headless_window(), GAME_WINDOW_WIDTH, GAME_WINDOW_HEIGHT, _make_board(),
+                             game_ready_ui=True)
+    return border_ui.draw, None
+
+
+def make_game_grid_draw():
+    """Benchmark GameGrid.draw."""
+    grid = GameGrid(setup_headless_window(), _make_board())
+    return grid.draw, None
+
+
+def make_high_scores_draw_current_page():
+    """Benchmark HighScoresScreen.draw_current_page on a full page."""
+    window = setup_headless_window()
+    _, _, background = update_settings_real_time(GAME_WINDOW_WIDTH, GAME_WINDOW_HEIGHT, {'MUSIC': 'OFF~False'})
+    screen = HighScoresScreen(window, GAME_WINDOW_WIDTH, GAME_WINDOW_HEIGHT, 'False', background)
+    screen.score_name_list = _make_score_name_rows(10**3)
+    screen.score_name_list.sort(key=lambda x: x[0], reverse=True)
+    return screen.draw_current_page, None
+
+
+def _make_score_name_rows(row_count: int) -> list[list[int, str]]:
+    """Return reproducible list of random [score, name] rows."""
+    rng = random.Random(row_count)
+    return [[rng.randrange(0, 100_000, GAME_UI_SCORE_MULTIPLIER), f'player{rng.randrange(10**6)}']
+            for _ in range(row_count)]
+
+
+def _make_score_file_directory(row_count: int) -> str:
+    """Create temp dir holding a saved_data_snake/high_scores.txt of entered length.
+
+    The file I/O functions read "saved_data_snake/high_scores.txt" relative to
+    the working directory, so benchmarks switch into this temp dir for each
+    call instead of ever touching the real save data. The dir is removed when
+    the benchmark run exits.
+    """
+    temp_directory = tempfile.mkdtemp(prefix='snake_bench_')
+    atexit.register(shutil.rmtree, temp_directory, True)
+    os.makedirs(os.path.join(temp_directory, 'saved_data_snake'))
+    with open(os.path.join(temp_directory, 'saved_data_snake', 'high_scores.txt'), 'w') as score_file:
+        score_file.write('\n'.join(f'{score}, {name}' for score, name in _make_score_name_rows(row_count)))
+    return temp_directory
+
+
+def make_get_score_name_list(row_count: int):
+    """Benchmark get_score_name_list on a high_scores.txt of entered length."""
+    score_directory = _make_score_file_directory(row_count)
+
+    def call() -> None:
+        original_directory = os.getcwd()
+        os.chdir(score_directory)
+        try:
+            get_score_name_list()
+        finally:
+            os.chdir(original_directory)
+
+    return call, None
+
+
+def make_get_page_of_user_row(row_count: int):
+    """Benchmark get_page_of_user_row for the most recently saved (last) row."""
+    score_name_list = _make_score_name_rows(row_count)
+    user_score, user_name = score_name_list[-1]
+    score_name_list.sort(key=lambda x: x[0], reverse=True)
+    return partial(get_page_of_user_row, score_name_list, user_score, user_name), None
+
+
+def get_benchmarks(quick: bool = False) -> list[tuple]:
+    """Return list of (name, make function, timing options) benchmark tuples.
+
+    Args:
+        quick: If True, the 10^6 row score files are left out.
+
+    Returns:
+        benchmarks: List of tuples, each holding a benchmark name, a zero
+            argument make function, and a dict of time_calls() keyword args.
+    """
+    row_counts = QUICK_SCORE_FILE_ROW_COUNTS if quick else SCORE_FILE_ROW_COUNTS
+    benchmarks = [(f'PlayerSnake.move[len={length}]', partial(make_snake_move, length), {})
+                  for length in SNAKE_LENGTHS]
+    benchmarks += [(f'SnakeGame.end_game_event_handling[len={length}]',
+                    partial(make_end_game_event_handling, length), {})
+                   for length in COLLISION_SNAKE_LENGTHS]
+    benchmarks += [(f'SnakeGame.snack_collision_handling[len={length}]',
+                    partial(make_snack_collision_handling, length), {})
+                   for length in COLLISION_SNAKE_LENGTHS]
+    benchmarks += [(f'SnakeGame.snack_collision_handling[apples={apple_count}]',
+                    partial(make_snack_collision_handling, 10, apple_count), {})
+                   for apple_count in APPLE_COUNTS]
+    benchmarks += [(f'SnakeGame.update_simulation[players={player_count}]',
+                    partial(make_update_simulation, player_count), {})
+                   for player_count in PLAYER_COUNTS]
+    benchmarks += [(f'SnakeGame.update_simulation[autopilot,board={columns}x{rows}]',
+                    partial(make_update_simulation, 1, SnakeAutopilot, (columns, rows)), {})
+                   for columns, rows in AUTOPILOT_BOARD_SIZES]
+    benchmarks += [(f'SnakeGame.update_simulation[cycle,board={columns}x{rows}]',
+                    partial(make_update_simulation, 1, HamiltonianAutopilot, (columns, rows)), {})
+                   for columns, rows in AUTOPILOT_BOARD_SIZES]
+    benchmarks += [('SnakeGame.update_simulation[ghost]',
+                    partial(make_update_simulation, 1, SnakeAutopilot, ghost_bool=True), {})]
+    benchmarks += [(f'SnakeEnvironment.step[envs={environment_count}]',
+                    partial(make_environment_step, environment_count), {})
+                   for environment_count in ENVIRONMENT_COUNTS]
+    benchmarks += [(f'draw_items[apples={apple_count}]', partial(make_draw_items, apple_count), {})
+                   for apple_count in APPLE_COUNTS]
+    benchmarks += [(f'Item.random_pos[fill={fraction}]', partial(make_item_random_pos, fraction), {})
+                   for fraction in BOARD_FILL_FRACTIONS]
+    benchmarks += [('GameBorderUI.update_ui_info', make_border_ui_update_ui_info, {}),
+                   ('GameBorderUI.draw', make_border_ui_draw, {}),
+                   ('GameGrid.draw', make_game_grid_draw, {}),
+                   ('HighScoresScreen.draw_current_page', make_high_scores_draw_current_page, {})]
+    benchmarks += [(f'get_score_name_list[rows={row_count}]', partial(make_get_score_name_list, row_count),
+                    {'timeout': 60.0})
+                   for row_count in row_counts]
+    benchmarks += [(f'get_page_of_user_row[rows={row_count}]', partial(make_get_page_of_user_row, row_count),
+                    {'timeout': 60.0})
+                   for row_count in row_counts]
+    return benchmarks
@@ -0,0 +1,194 @@
+"""Time hot path benchmarks headlessly and compare them against a baseline.
+
+This module holds the timing harness used by the benchmark suite. SDL is
+forced onto its dummy video and audio drivers before anything imports pygame,
+every benchmark is timed call by call (with optional untimed setup between
+calls), and the results are written out as JSON. If a baseline JSON file
+exists the results are compared against it and any benchmark that got slower
+than the allowed threshold is reported as a regression.
+
+Functions:
+    time_calls: Times repeated calls of a single benchmark.
+    run_all: Runs every registered benchmark and returns a results dict.
+    compare_to_baseline: Returns list of regressions compared to baseline.
+    main: Command line entry point.
+"""
+
+import os
+
+# Must be set before pygame is imported anywhere.
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+os.environ['SDL_AUDIODRIVER'] = 'dummy'
+
+import argparse
+import json
+import platform
+import signal
+import statistics
+import sys
+import time
+from benchmarks import hot_path_benchmarks
+
+BASELINE_FILE = os.path.join('benchmarks', 'baseline.json')
+DEFAULT_THRESHOLD = 2.0  # Medians of back to back runs on one machine differ by up to ~1.9x.
+DEFAULT_MIN_TIME = 0.2
+DEFAULT_MIN_RUNS = 3
+DEFAULT_MAX_RUNS = 5000
+DEFAULT_TIMEOUT = 5.0
+
+
+class BenchmarkTimeout(Exception):
+    """Raised by the alarm handler when a benchmark exceeds its time budget."""
+
+
+def _raise_timeout(signum, frame) -> None:
+    """Signal handler that aborts a benchmark that is taking too long."""
+    raise BenchmarkTimeout()
+
+
+def time_calls(call, before_each=None, min_time: float = DEFAULT_MIN_TIME, min_runs: int = DEFAULT_MIN_RUNS,
+               max_runs: int = DEFAULT_MAX_RUNS, timeout: float = DEFAULT_TIMEOUT) -> dict:
+    """Time repeated calls of a benchmark and return its statistics.
+
+    Each call is timed on its own so that the (untimed) before_each setup can
+    put the benchmarked object back into the state being measured. Calls are
+    repeated until both min_time and min_runs are reached, or max_runs is hit.
+    If the benchmark runs longer than timeout seconds in total it is aborted
+    and reported as timed out instead (some baseline code paths never finish
+    on certain inputs, e.g. spawning an item on a near-full board).
+
+    Args:
+        call: Zero argument callable being benchmarked.
+        before_each: Optional zero argument callable run (untimed) before
+            every call.
+        min_time: Minimum total seconds spent inside timed calls.
+        min_runs: Minimum number of timed calls.
+        max_runs: Maximum number of timed calls.
+        timeout: Seconds before the benchmark is aborted.
+
+    Returns:
+        stats: Dict of median, min, and mean microseconds per call and the
+            number of runs, or a timeout status.
+    """
+    durations = []
+    use_alarm = hasattr(signal, 'setitimer')
+    if use_alarm:
+        previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        total = 0.0
+        while len(durations) < max_runs and (total < min_time or len(durations) < min_runs):
+            if before_each is not None:
+                before_each()
+            start = time.perf_counter()
+            call()
+            duration = time.perf_counter() - start
+            durations.append(duration)
+            total += duration
+    except BenchmarkTimeout:
+        return {'status': 'timeout', 'timeout_s': timeout, 'runs': len(durations)}
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+
+    return {'status': 'ok',
+            'median_us': round(statistics.median(durations) * 1e6, 3),
+            'min_us': round(min(durations) * 1e6, 3),
+            'mean_us': round(statistics.fmean(durations) * 1e6, 3),
+            'runs': len(durations)}
+
+
+def run_all(quick: bool = False, name_filter: str = '') -> dict:
+    """Run every registered benchmark and return a JSON serializable dict.
+
+    Args:
+        quick: If True, the largest (slowest to build) inputs are skipped.
+        name_filter: Only benchmarks whose name contains this string are run.
+
+    Returns:
+        report: Dict with a "meta" section describing the environment and a
+            "results" section mapping benchmark names to their statistics.
+    """
+    import pygame
+    results = {}
+    for name, make_benchmark, options in hot_path_benchmarks.get_benchmarks(quick):
+        if name_filter not in name:
+            continue
+        call, before_each = make_benchmark()
+        results[name] = time_calls(call, before_each, **options)
+        print(f'{name:<55} {_format_stats(results[name])}', file=sys.stderr)
+
+    return {'meta': {'python': platform.python_version(),
+                     'pygame': pygame.version.ver,
+                     'platform': platform.platform(),
+                     'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                     'quick': quick},
+            'results': results}
+
+
+def compare_to_baseline(report: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD,
+                        ) -> list[tuple[str, str]]:
+    """Return list of (benchmark name, reason) pairs that regressed.
+
+    A benchmark regresses if its median time is more than threshold times the
+    baseline median, or if it timed out when the baseline did not. Benchmarks
+    missing from either side are ignored.
+    """
+    regressions = []
+    for name, current in report['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if previous is None:
+            continue
+        if current['status'] == 'timeout' and previous['status'] == 'ok':
+            regressions.append((name, 'timed out (baseline did not)'))
+        elif current['status'] == previous['status'] == 'ok':
+            ratio = current['median_us'] / previous['median_us'] if previous['median_us'] else 1.0
+            current['baseline_ratio'] = round(ratio, 3)
+            if ratio > threshold:
+                regressions.append((name, f'{ratio:.2f}x slower than baseline'))
+    return regressions
+
+
+def _format_stats(stats: dict) -> str:
+    """Return one line human readable summary of benchmark stats."""
+    if stats['status'] == 'timeout':
+        return f'TIMEOUT after {stats["timeout_s"]}s'
+    return f'median {stats["median_us"]:>12.1f} us   min {stats["min_us"]:>12.1f} us   runs {stats["runs"]}'
+
+
+def main() -> None:
+    """Parse command line args, run benchmarks, and report regressions."""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Run headless hot path benchmarks.')
+    parser.add_argument('--output', help='write JSON results to this file (default: stdout)')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='baseline JSON file to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='overwrite baseline with these results')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='allowed slowdown ratio before a benchmark counts as a regression')
+    parser.add_argument('--quick', action='store_true', help='skip the largest inputs')
+    parser.add_argument('--filter', default='', help='only run benchmarks whose name contains this string')
+    args = parser.parse_args()
+
+    report = run_all(args.quick, args.filter)
+
+    regressions = []
+    if args.save_baseline:
+        with open(args.baseline, 'w') as baseline_file:
+            json.dump(report, baseline_file, indent=2)
+        print(f'baseline saved to {args.baseline}', file=sys.stderr)
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, 'r') as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare_to_baseline(report, baseline, args.threshold)
+        report['regressions'] = [{'name': name, 'reason': reason} for name, reason in regressions]
+        for name, reason in regressions:
+            print(f'REGRESSION: {name}: {reason}', file=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,110 @@
+"""Define board observation class that mirrors the board as a tensor.
+
+This module holds a class that keeps a persistent (channels, rows, columns)
+array of bytes describing every cell of a game board: which cells hold snake
+cubes, which hold snake heads, which hold apples, and which are walls. The
+board writes each change into it as cells are occupied and vacated, so the
+array is always up to date without ever being rebuilt, and it is handed out
+as a memoryview (and as a NumPy array, if NumPy is installed) over the same
+memory, so reading it never copies anything either.
+
+Functions:
+    get_tensor: Returns NumPy array (or memoryview) over entered buffer.
+
+Classes:
+    BoardObservation: Persistent in place tensor of a board's cells.
+"""
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional, the memoryview works without it.
+    numpy = None
+from misc.constants import *
+from game_objects.game_board import GameBoard
+
+
+def get_tensor(buffer, shape: tuple[int, ...]) -> 'numpy.ndarray | memoryview':
+    """Return uint8 tensor of entered shape over entered buffer, without copying it.
+
+    The tensor is a NumPy array if NumPy is installed, otherwise a
+    multidimensional memoryview (which NumPy and most tensor libraries can
+    also wrap without copying, through the buffer protocol).
+    """
+    if numpy is None:
+        return memoryview(buffer).cast('B', shape)
+    return numpy.frombuffer(buffer, numpy.uint8).reshape(shape)
+
+
+class BoardObservation(object):
+    """Persistent channels x rows x columns byte tensor of a game board.
+
+    The tensor has OBSERVATION_CHANNEL_COUNT channels (body, head, apples,
+    and walls, in the order of the OBSERVATION_CHANNEL_ constants), each
+    holding 1 for every cell of that kind and 0 otherwise. The body channel
+    holds every cell with a snake cube in it (heads included). The board is
+    padded with a ring of wall cells on every side (the game border), so each
+    channel is (rows + 2) x (columns + 2) and the cell (column, row) is at
+    [row + 1][column + 1], and a snake head that crashed into the border is
+    still shown (in a wall cell).
+
+    Once attached to a board (see attach), the board and its snakes write
+    every change straight into the tensor: a cell changes only when its
+    first snake cube moves in or its last moves out, when an item is placed
+    or removed, or when a head moves, so each tick costs a few byte writes
+    no matter the size of the board, and clearing the board zeroes the
+    changing channels with one slice assignment (from a zeroed bytes object
+    made once).
+
+    The tensor is stored in a buffer, which can be entered so that several
+    observations share one block of memory (e.g. one per board of a
+    vectorized environment, see VectorSnakeEnvironment). view is a
+    multidimensional memoryview of the buffer and tensor is the same memory
+    as a NumPy uint8 array (or the memoryview again, without NumPy). Both
+    always show the current state of the board, so copy them to keep a past
+    state (see copy).
+    """
+
+    def __init__(self, columns: int, rows: int, buffer: memoryview | None = None) -> None:
+        self.columns = columns + 2
+        self.rows = rows + 2
+        self.channel_size = self.columns * self.rows
+        self.size = OBSERVATION_CHANNEL_COUNT * self.channel_size
+        self.buffer = memoryview(bytearray(self.size) if buffer is None else buffer)
+        self.shape = (OBSERVATION_CHANNEL_COUNT, self.rows, self.columns)
+        self.view = self.buffer.cast('B', self.shape)
+        self.tensor = get_tensor(self.buffer, self.shape)
+        # Every channel before the wall channel is cleared along with the board.
+        self.empty_channels = bytes(OBSERVATION_CHANNEL_WALL * self.channel_size)
+        self.draw_walls()
+
+    def attach(self, board: GameBoard) -> None:
+        """Attach observation to entered board and fill it in from the board's current cells."""
+        board.observation = self
+        self.clear()
+        for cell in board.snake_cell_dict:
+            self.set_cell(OBSERVATION_CHANNEL_BODY, cell, 1)
+        for cell in board.item_cell_dict:
+            self.set_cell(OBSERVATION_CHANNEL_APPLE, cell, 1)
+
+    def set_cell(self, channel: int, cell: tuple[int, int], value: int) -> None:
+        """Set entered cell of entered channel to value (0 or 1)."""
+        self.buffer[channel * self.channel_size + (cell[1] + 1) * self.columns + cell[0] + 1] = value
+
+    def draw_walls(self) -> None:
+        """Fill in wall channel (every padding cell around the board)."""
+        wall_start = OBSERVATION_CHANNEL_WALL * self.channel_size
+        self.buffer[wall_start:wall_start + self.channel_size] = bytes(self.channel_size)
+        for column in range(self.columns):
+            self.buffer[wall_start + column] = 1
+            self.buffer[wall_start + (self.rows - 1) * self.columns + column] = 1
+        for row in range(self.rows):
+            self.buffer[wall_start + row * self.columns] = 1
+            self.buffer[wall_start + row * self.columns + self.columns - 1] = 1
+
+    def copy(self) -> 'numpy.ndarray | memoryview':
+        """Return copy of tensor that won't change as the board does."""
+        return get_tensor(bytearray(self.buffer), self.shape)
+
+    def clear(self) -> None:
+        """Zero every channel except the walls (used when the board is cleared)."""
+        self.buffer[:len(self.empty_channels)] = self.empty_channels
@@ -0,0 +1,216 @@
+"""Define game board class holding the playable grid's geometry and occupancy.
+
+This module holds a class responsible for everything to do with the grid of
+cells the snake moves on: how many columns and rows of cells there are, how
+big each cell is in pixels, where the board sits on the screen, converting
+between cells and pixel positions, and keeping track of which cells are
+currently occupied by snake cubes or snack items (and which are still free).
+Every other game object derives its bounds, spawn ranges, and start position
+from a GameBoard instance instead of hard-coded pixel values.
+
+Functions:
+    get_board_settings: Returns (columns, rows, cell size) from user prefs.
+
+Classes:
+    GameBoard: Holds board geometry and occupancy information.
+"""
+
+import random
+import pygame
+from misc.constants import *
+from misc.saved_data_io_functions import get_file_dict
+
+
+def get_board_settings() -> tuple[int, int, int]:
+    """Return board (columns, rows, cell size) from user_preferences.txt.
+
+    Falls back to the default (classic) board if either setting is missing
+    from the user preferences file (i.e. a preferences file saved before
+    board size settings existed).
+    """
+    user_prefs = get_file_dict('user_preferences')
+    columns, rows = BOARD_DEFAULT_SIZE
+    cell_size = BOARD_DEFAULT_CELL_SIZE
+    if user_prefs.get('BOARD SIZE') is not None:
+        columns, rows = (int(number) for number in user_prefs.get('BOARD SIZE').split('~')[1].split('x'))
+    if user_prefs.get('CELL SIZE') is not None:
+        cell_size = int(user_prefs.get('CELL SIZE').split('~')[1])
+
+    return columns, rows, cell_size
+
+
+class GameBoard(object):
+    """Grid of cells that the snake moves on and snack items are placed on.
+
+    This class holds the board's size in cells, the size of each cell in
+    pixels, and the board's rect on screen (centered in the entered play area
+    rect). The cell size is shrunk if the board wouldn't otherwise fit in the
+    play area. Cells are (column, row) tuples with (0, 0) being the top left
+    cell. The board also keeps count of how many snake cubes are in each cell
+    (a cell holding more than one means the snake ran into itself), which
+    item is in each cell holding a snack item, and a list of every free cell
+    that is updated incrementally as cells are occupied and vacated (swapping
+    the removed cell with the last one in the list), so that collisions,
+    eating an item, and picking a random free cell never need to scan through
+    lists of rects or cells, even with hundreds of items on the board. Random
+    free cells are picked with the board's own random number generator, so a
+    game can be replayed exactly by seeding it (see seed). If a board
+    observation is attached, every change to a cell is also written into it.
+    """
+
+    def __init__(self, columns: int, rows: int, cell_size: int, play_area_rect: pygame.Rect) -> None:
+        self.columns = columns
+        self.rows = rows
+        self.cell_size = max(1, min(cell_size, play_area_rect.width // columns, play_area_rect.height // rows))
+        self.width = self.columns * self.cell_size
+        self.height = self.rows * self.cell_size
+        self.rect = pygame.Rect(0, 0, self.width, self.height)
+        self.rect.center = play_area_rect.center
+        self.left = self.rect.left
+        self.top = self.rect.top
+        self.cell_count = self.columns * self.rows
+        self.start_cell = (self.columns // 2, self.rows - SNAKE_PLAYER_START_ROWS_FROM_BOTTOM)
+        self.snake_cell_dict = {}  # {cell: number of snake cubes in cell}
+        self.item_cell_dict = {}  # {cell: item in cell}
+        self.free_cell_list = []
+        self.free_cell_index_dict = {}  # {free cell: index of cell in free_cell_list}
+        self.rng = random.Random()
+        self.observation = None  # BoardObservation kept up to date in place (None if not attached).
+        self.reset_free_cells()
+
+    def get_start_cell_list(self, player_count: int) -> list[tuple[int, int]]:
+        """Return start cell of each snake, spread evenly along the start row.
+
+        (For a single player this is the same cell as start_cell).
+        """
+        return [(self.columns * (index + 1) // (player_count + 1), self.rows - SNAKE_PLAYER_START_ROWS_FROM_BOTTOM)
+                for index in range(player_count)]
+
+    def cell_to_center(self, cell: tuple[int, int]) -> tuple[int, int]:
+        """Return pixel center of entered cell."""
+        return (self.left + cell[0] * self.cell_size + self.cell_size // 2,
+                self.top + cell[1] * self.cell_size + self.cell_size // 2)
+
+    def pos_to_cell(self, pos: tuple[int, int]) -> tuple[int, int]:
+        """Return cell containing entered pixel position."""
+        return (pos[0] - self.left) // self.cell_size, (pos[1] - self.top) // self.cell_size
+
+    def is_in_bounds(self, cell: tuple[int, int]) -> bool:
+        """Return True if entered cell is on the board (not in a border)."""
+        return 0 <= cell[0] < self.columns and 0 <= cell[1] < self.rows
+
+    def reset_free_cells(self) -> None:
+        """Rebuild free cell list from scratch (every cell not holding snake or item)."""
+        self.free_cell_list = [(column, row) for row in range(self.rows) for column in range(self.columns)
+                               if self.is_free((column, row))]
+        self.free_cell_index_dict = {cell: index for index, cell in enumerate(self.free_cell_list)}
+
+    def set_free_cell_order(self, cell_list: list[tuple[int, int]]) -> None:
+        """Put free cell list in entered order (which must hold exactly the free cells).
+
+        Random free cells are picked by their index in the free cell list, so
+        a saved game only spawns apples where it would have if its free cell
+        list is put back in the same order as well as its random number
+        generator's state (see GameSnapshot.restore).
+
+        Raises:
+            ValueError: If entered cells aren't exactly the board's free cells.
+        """
+        if len(cell_list) != len(self.free_cell_list) or set(cell_list) != self.free_cell_index_dict.keys():
+            raise ValueError('free cell order does not match free cells')
+        self.free_cell_list = list(cell_list)
+        self.free_cell_index_dict = {cell: index for index, cell in enumerate(self.free_cell_list)}
+
+    def take_free_cell(self, cell: tuple[int, int]) -> None:
+        """Remove entered cell from free cell list, if it is in it.
+
+        The cell is swapped with the last cell in the list before being
+        popped off the end, so removal is O(1) regardless of board size.
+        """
+        index = self.free_cell_index_dict.pop(cell, None)
+        if index is None:
+            return
+        last_cell = self.free_cell_list.pop()
+        if last_cell != cell:
+            self.free_cell_list[index] = last_cell
+            self.free_cell_index_dict[last_cell] = index
+
+    def release_free_cell(self, cell: tuple[int, int]) -> None:
+        """Add entered cell to free cell list, if it's on the board and now free."""
+        if cell not in self.free_cell_index_dict and self.is_in_bounds(cell) and self.is_free(cell):
+            self.free_cell_index_dict[cell] = len(self.free_cell_list)
+            self.free_cell_list.append(cell)
+
+    def occupy_snake_cell(self, cell: tuple[int, int]) -> None:
+        """Add one snake cube to entered cell."""
+        count = self.snake_cell_dict.get(cell, 0)
+        self.snake_cell_dict[cell] = count + 1
+        if count == 0:
+            self.take_free_cell(cell)
+            if self.observation is not None:
+                self.observation.set_cell(OBSERVATION_CHANNEL_BODY, cell, 1)
+
+    def vacate_snake_cell(self, cell: tuple[int, int]) -> None:
+        """Remove one snake cube from entered cell."""
+        count = self.snake_cell_dict.get(cell, 0)
+        if count > 1:
+            self.snake_cell_dict[cell] = count - 1
+        else:
+            self.snake_cell_dict.pop(cell, None)
+            self.release_free_cell(cell)
+            if self.observation is not None and count == 1:
+                self.observation.set_cell(OBSERVATION_CHANNEL_BODY, cell, 0)
+
+    def mark_head_cell(self, cell: tuple[int, int], head_bool: bool) -> None:
+        """Mark entered cell as holding (or no longer holding) a snake head in the attached observation."""
+        if self.observation is not None:
+            self.observation.set_cell(OBSERVATION_CHANNEL_HEAD, cell, head_bool)
+
+    def get_snake_cell_count(self, cell: tuple[int, int]) -> int:
+        """Return number of snake cubes in entered cell."""
+        return self.snake_cell_dict.get(cell, 0)
+
+    def add_item(self, item) -> None:
+        """Place entered item (any object with a cell attribute) in its cell."""
+        self.item_cell_dict[item.cell] = item
+        self.take_free_cell(item.cell)
+        if self.observation is not None:
+            self.observation.set_cell(OBSERVATION_CHANNEL_APPLE, item.cell, 1)
+
+    def remove_item(self, cell: tuple[int, int]):
+        """Remove and return item in entered cell (None if cell holds no item)."""
+        item = self.item_cell_dict.pop(cell, None)
+        if item is not None:
+            self.release_free_cell(cell)
+            if self.observation is not None:
+                self.observation.set_cell(OBSERVATION_CHANNEL_APPLE, cell, 0)
+        return item
+
+    def is_free(self, cell: tuple[int, int]) -> bool:
+        """Return True if entered cell holds neither a snake cube nor an item."""
+        return cell not in self.snake_cell_dict and cell not in self.item_cell_dict
+
+    def has_free_cell(self) -> bool:
+        """Return True if at least one cell holds neither snake nor item."""
+        return len(self.free_cell_list) > 0
+
+    def get_random_free_cell(self) -> tuple[int, int] | None:
+        """Return a random free cell, or None if every cell is occupied."""
+        return self.rng.choice(self.free_cell_list) if self.free_cell_list else None
+
+    def seed(self, seed: int | None) -> None:
+        """Seed board's random number generator (None seeds it from the OS).
+
+        The free cell list is rebuilt in row order whenever the board is
+        cleared, so seeding then clearing the board makes every following
+        random free cell repeat exactly, given the same moves.
+        """
+        self.rng.seed(seed)
+
+    def clear(self) -> None:
+        """Remove all snake cubes and items from board (used for a new game)."""
+        self.snake_cell_dict.clear()
+        self.item_cell_dict.clear()
+        self.reset_free_cells()
+        if self.observation is not None:
+            self.observation.clear()
@@ -11,101 +11,141 @@ import os
 import pygame
 from math import trunc
 from misc.constants import *
+from misc.asset_cache import load_image
 from misc.saved_data_io_functions import get_file_dict, get_score_name_list
+from game_objects.game_board import GameBoard
 
 
 class GameBorderUI(object):
     """Game border and ui to hold useful in-game information.
 
-    This class holds a border made of 4 rect objects, which are used to check
-    for collisions between the snake and the borders of the game. This class
-    also acts as a container for all in-game information present on the border
-    ui, blitting it to the screen and/or saving it until it is needed later.
+    This class holds a border made of 4 rect objects that surround the game
+    board (so the snake crashes into the border as soon as it leaves the
+    board). This class also acts as a container for all in-game information
+    present on the border ui, blitting it to the screen and/or saving it until
+    it is needed later. With more than one local player, the border ui shows
+    each player's score (P1 to P4) in place of the user score and apples, and
+    the user score is the highest of the players' scores.
+
+    Everything the border ui draws (the border images, the black rects
+    behind its numbers, and its text) is kept in one list of (surface, rect)
+    pairs that is blit in a single blits call, and a number's surface is only
+    rendered again when the number changes.
     """
 
-    def __init__(self, window: pygame.Surface, width: int, height: int, game_ready_ui: bool = False) -> None:
+    def __init__(self, window: pygame.Surface, width: int, height: int, board: GameBoard,
+                 game_ready_ui: bool = False, player_count: int = 1) -> None:
         self.window = window
         self.width = width
         self.height = height
+        self.board = board
+        self.border_left_width = self.board.rect.left
+        self.border_right_width = self.width - self.board.rect.right
+        self.border_upper_height = self.board.rect.top
+        self.border_lower_height = self.height - self.board.rect.bottom
         self.game_ready_ui = game_ready_ui
         self.selected_border_theme = get_file_dict('user_preferences').get('BORDER THEME').split('~')[1]
-        self.border_left = pygame.transform.scale(pygame.Surface.convert_alpha(pygame.image.load(
+        self.border_left = load_image(
             os.path.join('project_assets',
                          'border_themes',
                          f'{self.selected_border_theme}left.png',
-                         ))), (GAME_BORDER_LEFT, self.height))
-        self.border_right = pygame.transform.scale(pygame.Surface.convert_alpha(pygame.image.load(
+                         ), (self.border_left_width, self.height))
+        self.border_right = load_image(
             os.path.join('project_assets',
                          'border_themes',
                          f'{self.selected_border_theme}right.png',
-                         ))), (GAME_BORDER_RIGHT, self.height))
-        self.border_upper = pygame.transform.scale(pygame.Surface.convert_alpha(pygame.image.load(
+                         ), (self.border_right_width, self.height))
+        self.border_upper = load_image(
             os.path.join('project_assets',
                          'border_themes',
                          f'{self.selected_border_theme}upper.png',
-                         ))), (self.width, GAME_BORDER_UPPER))
-        self.border_lower = pygame.transform.scale(pygame.Surface.convert_alpha(pygame.image.load(
+                         ), (self.width, self.border_upper_height))
+        self.border_lower = load_image(
             os.path.join('project_assets',
                          'border_themes',
                          f'{self.selected_border_theme}lower.png',
-                         ))), (self.width, GAME_BORDER_LOWER))
+                         ), (self.width, self.border_lower_height))
         self.border_image_list = [self.border_left, self.border_right, self.border_upper, self.border_lower]
-        self.border_image_pos_list = [BACKGROUND_BLIT_POS, (self.width-GAME_BORDER_RIGHT, 0),
-                                      BACKGROUND_BLIT_POS, (0, self.height-GAME_BORDER_LOWER)]
+        self.border_image_pos_list = [BACKGROUND_BLIT_POS, (self.board.rect.right, 0),
+                                      BACKGROUND_BLIT_POS, (0, self.board.rect.bottom)]
         self.border_image_rect_list = [border.get_rect(topleft=pos)
                                        for border, pos in zip(self.border_image_list, self.border_image_pos_list)]
         self.high_score = get_score_name_list()[0][0]
         self.user_score = 0
-        self.snacks_eaten = 0
+        self.player_count = player_count
+        self.snacks_eaten_list = [0] * self.player_count  # Snacks eaten by each player.
         self.game_runtime = '00:00'
         self.font_size = GAME_UI_FONT_SIZE
         self.text_font = pygame.font.Font(ARCADE_FONT_FILE, self.font_size)
-        self.text_list = ['HIGH SCORE', f'{self.high_score}',
-                          'YOUR SCORE', f'{self.snacks_eaten * GAME_UI_SCORE_MULTIPLIER}',
-                          'APPLES', f'{self.snacks_eaten}',
-                          'TIME', f'{self.game_runtime}']
-        self.text_color_list = [GAME_TEXT_LIGHT_BLUE, GAME_TEXT_WHITE, GAME_TEXT_LIGHT_BLUE, GAME_TEXT_WHITE,
-                                GAME_TEXT_LIGHT_BLUE, GAME_TEXT_WHITE, GAME_TEXT_LIGHT_BLUE, GAME_TEXT_WHITE]
-        self.text_pos_list = [(120, 18), (255, 18), (120, 42), (255, 42), (400, 33), (485, 33), (595, 33), (680, 33)]
+        if self.player_count == 1:
+            self.text_list = ['HIGH SCORE', f'{self.high_score}',
+                              'YOUR SCORE', f'{self.user_score}',
+                              'APPLES', f'{self.snacks_eaten_list[0]}',
+                              'TIME', f'{self.game_runtime}']
+            self.text_pos_list = [(120, 18), (255, 18), (120, 42), (255, 42), (400, 33), (485, 33), (595, 33),
+                                  (680, 33)]
+            self.text_bg_pos_list = [(255, 18, 105), (255, 42, 105), (485, 33, 60), (680, 33, 90)]  # (x, y, width)
+        else:
+            self.text_list = ['HIGH SCORE', f'{self.high_score}', 'TIME', f'{self.game_runtime}']
+            self.text_pos_list = [(120, 18), (255, 18), (120, 42), (255, 42)]
+            self.text_bg_pos_list = [(255, 18, 105), (255, 42, 105)]  # (x, y, width)
+            # Players 1 and 2 go in the middle column, players 3 and 4 in the right column.
+            for index in range(self.player_count):
+                label_x = 400 + 195 * (index // 2)
+                text_y = 18 + 24 * (index % 2)
+                self.text_list += [f'P{index + 1}', '0']
+                self.text_pos_list += [(label_x, text_y), (label_x + 85, text_y)]
+                self.text_bg_pos_list.append((label_x + 85, text_y, 90))
+        self.text_color_list = [GAME_TEXT_LIGHT_BLUE, GAME_TEXT_WHITE] * (len(self.text_list) // 2)
         self.text_surface_list = [(self.text_font.render(self.text_list[index], True, self.text_color_list[index]))
                                   for index in range(len(self.text_list))]
         self.text_rect_list = [surface.get_rect(center=pos)
                                for surface, pos in zip(self.text_surface_list, self.text_pos_list)]
-        self.text_bg_pos_list = [(255, 18, 105), (255, 42, 105), (485, 33, 60), (680, 33, 90)]  # (x, y, width)
+        self.rendered_text_list = list(self.text_list)  # Text each surface in text_surface_list was rendered from.
+
+        # (surface, rect) pairs blit by draw: border images, black rects behind numbers, then text and numbers.
+        self.border_blit_list = list(zip(self.border_image_list, self.border_image_rect_list))
+        self.ui_blit_list = list(self.border_blit_list)
+        for pos in self.text_bg_pos_list:
+            black_surface = pygame.Surface((pos[2], GAME_UI_TEXT_BG_HEIGHT)).convert()
+            black_surface.fill(GAME_COLOR_BLACK)
+            self.ui_blit_list.append((black_surface, black_surface.get_rect(center=(pos[0], pos[1]))))
+        self.text_blit_start = len(self.ui_blit_list)  # Index of the first text pair in ui_blit_list.
+        self.ui_blit_list += zip(self.text_surface_list, self.text_rect_list)
 
     def draw(self) -> None:
-        """Blit all border images and game ui info to screen."""
-        # Draw border images.
-        for border, rect in zip(self.border_image_list, self.border_image_rect_list):
-            self.window.blit(border, rect)
+        """Blit all border images (and game ui info, if the game is ready) to screen in one blits call."""
         if self.game_ready_ui is True:
-            # Draw black rectangles behind numbers on ui.
-            for pos in self.text_bg_pos_list:
-                black_rect = pygame.Rect(0, 0, pos[2], GAME_UI_TEXT_BG_HEIGHT)
-                black_rect.center = (pos[0], pos[1])
-                pygame.draw.rect(self.window, GAME_COLOR_BLACK, black_rect)
             self.update_ui_info()
-            # Draw all text and number surfaces on top of border ui.
-            for surface, rect in zip(self.text_surface_list, self.text_rect_list):
-                self.window.blit(surface, rect)
+            self.window.blits(self.ui_blit_list, False)
+        else:
+            self.window.blits(self.border_blit_list, False)
 
     def update_ui_info(self) -> None:
         """Update what is displayed on screen with current ui info.
 
         This method rewrites the string text list with current ui info and
-        then remakes the surface and rect lists in order for updated info to
-        show up.
+        then remakes the surfaces and rects of the text that changed in order
+        for updated info to show up.
         """
-        self.user_score = self.snacks_eaten * GAME_UI_SCORE_MULTIPLIER
+        self.user_score = max(self.snacks_eaten_list) * GAME_UI_SCORE_MULTIPLIER
         self.text_list[1] = f'{self.high_score}'
-        self.text_list[3] = f'{self.user_score}'
-        self.text_list[5] = f'{self.snacks_eaten}'
-        self.text_list[7] = f'{self.game_runtime}'
-        # Remake the surface and rect list comprehensions in order for updated info to show up.
-        self.text_surface_list = [(self.text_font.render(self.text_list[index], True, self.text_color_list[index]))
-                                  for index in range(len(self.text_list))]
-        self.text_rect_list = [surface.get_rect(center=pos)
-                               for surface, pos in zip(self.text_surface_list, self.text_pos_list)]
+        if self.player_count == 1:
+            self.text_list[3] = f'{self.user_score}'
+            self.text_list[5] = f'{self.snacks_eaten_list[0]}'
+            self.text_list[7] = f'{self.game_runtime}'
+        else:
+            self.text_list[3] = f'{self.game_runtime}'
+            for index, snacks_eaten in enumerate(self.snacks_eaten_list):
+                self.text_list[5 + 2 * index] = f'{snacks_eaten * GAME_UI_SCORE_MULTIPLIER}'
+        # Remake the surfaces and rects of changed text in order for updated info to show up.
+        for index, text in enumerate(self.text_list):
+            if text != self.rendered_text_list[index]:
+                self.rendered_text_list[index] = text
+                surface = self.text_surface_list[index] = self.text_font.render(text, True,
+                                                                                 self.text_color_list[index])
+                rect = self.text_rect_list[index] = surface.get_rect(center=self.text_pos_list[index])
+                self.ui_blit_list[self.text_blit_start + index] = (surface, rect)
 
     def update_timer(self, current_time: int, start_time: int, paused_time: int) -> None:
         """Update time displayed on border ui timer.
@@ -139,5 +179,5 @@ class GameBorderUI(object):
         self.game_ready_ui = True
         self.high_score = get_score_name_list()[0][0]
         self.user_score = 0
-        self.snacks_eaten = 0
+        self.snacks_eaten_list = [0] * self.player_count
         self.game_runtime = '00:00'
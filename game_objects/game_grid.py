@@ -6,7 +6,7 @@ Classes:
 
 import pygame
 from misc.constants import *
-from game_objects.game_border_ui import GameBorderUI
+from game_objects.game_board import GameBoard
 
 
 class GameGrid(object):
@@ -14,25 +14,38 @@ class GameGrid(object):
 
     This class holds all of the content required to draw a grid of white lines
     that appear in game as a way to show the player where exactly the snake is
-    going and where snack objects are located.
+    going and where snack objects are located. The lines are drawn once onto
+    a transparent (RLE accelerated colorkey) surface the size of the board, so
+    drawing the grid each frame is a single blit that only touches the line
+    pixels, no matter how many cells the board has.
     """
 
-    def __init__(self, window: pygame.Surface, border_ui: GameBorderUI) -> None:
+    def __init__(self, window: pygame.Surface, board: GameBoard) -> None:
         self.window = window
-        self.border_ui = border_ui
-        self.grid_left = self.border_ui.border_image_rect_list[0].right
-        self.grid_right = self.border_ui.border_image_rect_list[1].left
-        self.grid_top = self.border_ui.border_image_rect_list[2].bottom
-        self.grid_bottom = self.border_ui.border_image_rect_list[3].top
-        self.vertical_lines_start = self.grid_left + SNAKE_CUBE_DISPLACEMENT
-        self.vertical_lines_end = self.grid_right - SNAKE_CUBE_DISPLACEMENT + 1
-        self.horizontal_lines_start = self.grid_top + SNAKE_CUBE_DISPLACEMENT
-        self.horizontal_lines_end = self.grid_bottom - SNAKE_CUBE_DISPLACEMENT + 1
+        self.board = board
+        self.grid_left = 0
+        self.grid_right = self.board.width
+        self.grid_top = 0
+        self.grid_bottom = self.board.height
+        self.vertical_lines_start = self.grid_left + self.board.cell_size
+        self.vertical_lines_end = self.grid_right - self.board.cell_size + 1
+        self.horizontal_lines_start = self.grid_top + self.board.cell_size
+        self.horizontal_lines_end = self.grid_bottom - self.board.cell_size + 1
+        self.grid_surface = self.make_grid_surface()
+
+    def make_grid_surface(self) -> pygame.Surface:
+        """Return board sized surface with grid lines drawn on it."""
+        grid_surface = pygame.Surface((self.board.width, self.board.height)).convert()
+        grid_surface.fill(GAME_GRID_COLORKEY)
+        grid_surface.set_colorkey(GAME_GRID_COLORKEY, pygame.RLEACCEL)
+        for x in range(self.vertical_lines_start, self.vertical_lines_end, self.board.cell_size):
+            pygame.draw.line(grid_surface, GAME_COLOR_LIGHT_GREY, (x, self.grid_top), (x, self.grid_bottom))
+
+        for y in range(self.horizontal_lines_start, self.horizontal_lines_end, self.board.cell_size):
+            pygame.draw.line(grid_surface, GAME_COLOR_LIGHT_GREY, (self.grid_left, y), (self.grid_right, y))
+
+        return grid_surface
 
     def draw(self) -> None:
         """Blits grid of white x-axis and y-axis lines to screen."""
-        for x in range(self.vertical_lines_start, self.vertical_lines_end, SNAKE_CUBE_DISPLACEMENT):
-            pygame.draw.line(self.window, GAME_COLOR_LIGHT_GREY, (x, self.grid_top), (x, self.grid_bottom))
-
-        for y in range(self.horizontal_lines_start, self.horizontal_lines_end, SNAKE_CUBE_DISPLACEMENT):
-            pygame.draw.line(self.window, GAME_COLOR_LIGHT_GREY, (self.grid_left, y), (self.grid_right, y))
+        self.window.blit(self.grid_surface, self.board.rect)
@@ -0,0 +1,119 @@
+"""Define game simulation class holding the rules of a game of snake.
+
+This module holds a class responsible for playing one tick of a game of snake
+on a board (moving every snake, crashing snakes, eating apples, and spawning
+new ones) without drawing, playing sounds, or reading input, so that the same
+rules can run in-game (SnakeGame), in headless training environments, and in
+network game rooms, along with a function for getting a window surface to
+build game objects on when there is no real game window.
+
+Functions:
+    get_headless_window: Returns off screen surface that game objects use.
+
+Classes:
+    GameSimulation: Plays ticks of a game of snake on a board.
+"""
+
+import pygame
+from misc.constants import *
+from game_objects.game_board import GameBoard
+from game_objects.hamiltonian_autopilot import HamiltonianAutopilot
+from game_objects.snack_items import spawn_apple_snacks
+from game_objects.snake_autopilot import SnakeAutopilot
+from game_objects.snake_player import PlayerSnake
+
+
+def get_headless_window() -> pygame.Surface:
+    """Return off screen surface the size of the game window.
+
+    Images can only be converted (as every game object does when loading
+    them) once a display mode is set, so a hidden 1x1 display is set first if
+    there isn't one yet. Nothing is ever drawn to that display.
+    """
+    if pygame.display.get_surface() is None:
+        pygame.display.init()
+        pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    return pygame.Surface((GAME_WINDOW_WIDTH, GAME_WINDOW_HEIGHT))
+
+
+class GameSimulation(object):
+    """Rules of snake for every snake sharing a board, one tick at a time.
+
+    This class moves every snake still alive, then checks for crashes (using
+    the board's shared cell occupancy counts, so a snake crashes into a
+    border, its own body, or another snake), then lets each living snake eat
+    the apple in its head cell (growing by one, with a new apple placed on a
+    free cell). Callers find out what happened through the lists returned by
+    each method and handle the rest themselves (sound effects, scores, game
+    over screens, rewards, network messages, etc.), and the cells of apples
+    spawned during the last tick are kept in spawned_cell_list. If an
+    autopilot is entered, it steers its snake at the start of every tick.
+    """
+
+    def __init__(self, window: pygame.Surface, board: GameBoard, snake_player_list: list[PlayerSnake],
+                 autopilot: SnakeAutopilot | HamiltonianAutopilot | None = None) -> None:
+        self.window = window
+        self.board = board
+        self.snake_player_list = snake_player_list
+        self.autopilot = autopilot
+        self.spawned_cell_list = []  # Cells of apples spawned during the last tick.
+
+    def update(self) -> tuple[list[int], list[int]]:
+        """Play one tick and return (crashed player indexes, player indexes that ate an apple)."""
+        self.move_snakes()
+        return self.handle_crashes(), self.handle_snacks()
+
+    def move_snakes(self) -> None:
+        """Steer autopilot's snake (if any) then move every snake still alive one cell.
+
+        Every snake is moved before any collisions are checked, so that the
+        board's snake cell counts hold the new position of every snake when
+        crashes (including head to head crashes) are resolved.
+        """
+        self.spawned_cell_list.clear()
+        if self.autopilot is not None and not self.autopilot.snake_player.dead:
+            self.autopilot.steer()
+        for snake_player in self.snake_player_list:
+            if not snake_player.dead:
+                snake_player.move()
+
+    def handle_crashes(self) -> list[int]:
+        """Kill every living snake that crashed this tick and return their player indexes.
+
+        Every snake is checked before any are killed (so two snakes crashing
+        head to head both die). Crashed snakes stay on the board as obstacles.
+        """
+        crashed_index_list = [index for index, snake_player in enumerate(self.snake_player_list)
+                              if not snake_player.dead and snake_player.has_crashed()]
+        for index in crashed_index_list:
+            self.snake_player_list[index].die()
+        return crashed_index_list
+
+    def handle_snacks(self) -> list[int]:
+        """Let each living snake eat the item in its head cell and return indexes of players that ate.
+
+        Eating removes the item from the board's item dict (a single dict
+        lookup, no matter how many items are on the board), grows the snake,
+        and places a new apple on a free cell if the board still has one.
+        """
+        eaten_index_list = []
+        for index, snake_player in enumerate(self.snake_player_list):
+            if not snake_player.dead and self.board.remove_item(snake_player.head_cell) is not None:
+                snake_player.increase_length()
+                for apple in spawn_apple_snacks(self.window, self.board, 1):
+                    self.spawned_cell_list.append(apple.cell)
+                eaten_index_list.append(index)
+        return eaten_index_list
+
+    def is_over(self) -> bool:
+        """Return True once every snake has crashed."""
+        return all(snake_player.dead for snake_player in self.snake_player_list)
+
+    def reset(self, apple_count: int) -> None:
+        """Clear board, reset every snake, and place entered number of apples (used for a new game)."""
+        self.board.clear()
+        for snake_player in self.snake_player_list:
+            snake_player.reset()
+        if self.autopilot is not None:
+            self.autopilot.reset()
+        spawn_apple_snacks(self.window, self.board, apple_count)
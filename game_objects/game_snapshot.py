@@ -0,0 +1,275 @@
+"""Define game snapshot class used to save a game mid-play and resume it later.
+
+This module holds a class holding everything needed to pick a game back up
+where it was left off (the board's size, every snake's cells, direction, and
+snacks eaten, every apple's cell, the time played so far, whether it was a
+practice game and which autopilot drove player 1's snake, and the state of
+the board's random number generator, so apples keep spawning exactly where
+they would have), along with functions for taking a snapshot of a running
+game and saving it to (and loading it from) a compact binary file. Cells are
+written as packed arrays of (column, row) int16 pairs (so saving or loading a
+snake that fills the largest board is a single array copy) rather than by
+pickling PlayerSnake objects and their pygame rects. Everything is little
+endian.
+
+File format:
+    Header: Magic bytes, format version, board columns, rows, and cell size,
+        player count, apple count, free cell count, milliseconds played,
+        practice flag, and autopilot mode index (see AUTOPILOT_MODE_LIST).
+    RNG state: Mersenne Twister state words, then the cached gauss value
+        (with a flag saying whether there is one).
+    Each snake: Dead flag, direction index, snacks eaten, length, then its
+        cells (head first).
+    Apples: Cell of every apple.
+    Free cells: Every free cell, in the board's free cell list order.
+
+Functions:
+    pack_array: Returns little endian bytes of an array.
+    unpack_array: Returns array read from little endian bytes.
+    take_game_snapshot: Returns snapshot of entered game objects.
+    save_game_snapshot: Writes entered snapshot to snapshot file.
+    load_game_snapshot: Returns snapshot read from snapshot file (or None).
+    has_game_snapshot: Returns True if a saved snapshot exists.
+    delete_game_snapshot: Removes saved snapshot file.
+
+Classes:
+    GameSnapshot: State of a game at the moment it was saved.
+"""
+
+import os
+import struct
+import sys
+from array import array
+from itertools import chain
+import pygame
+from misc.constants import *
+from game_objects.game_board import GameBoard
+from game_objects.snack_items import AppleSnack
+from game_objects.snake_player import PlayerSnake
+
+# (magic, version, columns, rows, cell size, players, apples, free cells, milliseconds played, practice, autopilot)
+SNAPSHOT_HEADER = struct.Struct('<4sBHHHBIIIBB')
+RNG_GAUSS = struct.Struct('<Bd')  # (has gauss value, gauss value)
+SNAKE_HEADER = struct.Struct('<BBII')  # (dead, direction index, snacks eaten, length)
+
+
+def pack_array(values: array) -> bytes:
+    """Return little endian bytes of entered array."""
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def unpack_array(typecode: str, data: bytes, offset: int, count: int) -> array:
+    """Return array of entered type holding count values read from data at offset."""
+    values = array(typecode)
+    values.frombytes(data[offset:offset + count * values.itemsize])
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+class GameSnapshot(object):
+    """State of a game at the moment it was saved.
+
+    This class holds each snake's cells as a flat array of column and row
+    values (head first) rather than a list of tuples, so a snapshot of a very
+    long snake is only ever copied in bulk, and restore moves the game's
+    existing snakes and apples into place (reusing their rects, see
+    PlayerSnake.set_cell_list) instead of making new ones. The order of the
+    board's free cell list is kept too, since random free cells are picked by
+    index, so a restored game spawns the same apples the saved one would have.
+    The game's modes are kept too, so a practice or autopilot game is resumed
+    as one (and its score still stays off the leaderboard).
+    """
+
+    def __init__(self, columns: int, rows: int, cell_size: int, elapsed_time: int, rng_state: tuple,
+                 snake_state_list: list[tuple[bool, str, int, array]], apple_cell_array: array,
+                 free_cell_array: array, practice_bool: bool = False,
+                 autopilot_mode: str = AUTOPILOT_MODE_LIST[0]) -> None:
+        self.columns = columns
+        self.rows = rows
+        self.cell_size = cell_size
+        self.elapsed_time = elapsed_time  # Milliseconds played, not counting time paused.
+        self.rng_state = rng_state  # (As returned by random.Random.getstate).
+        self.snake_state_list = snake_state_list  # [(dead, direction, snacks eaten, cell array)] of each player.
+        self.apple_cell_array = apple_cell_array
+        self.free_cell_array = free_cell_array
+        self.practice_bool = practice_bool
+        self.autopilot_mode = autopilot_mode
+        self.player_count = len(self.snake_state_list)
+        self.snacks_eaten_list = [snacks_eaten for _, _, snacks_eaten, _ in self.snake_state_list]
+
+    def to_bytes(self) -> bytes:
+        """Return snapshot packed in the snapshot file format (see module docstring)."""
+        _, rng_words, gauss_next = self.rng_state
+        part_list = [SNAPSHOT_HEADER.pack(GAME_SNAPSHOT_MAGIC, GAME_SNAPSHOT_VERSION, self.columns, self.rows,
+                                          self.cell_size, self.player_count, len(self.apple_cell_array) // 2,
+                                          len(self.free_cell_array) // 2, self.elapsed_time, self.practice_bool,
+                                          AUTOPILOT_MODE_LIST.index(self.autopilot_mode)),
+                     pack_array(array('I', rng_words)),
+                     RNG_GAUSS.pack(gauss_next is not None, gauss_next or 0.0)]
+        for dead, direction, snacks_eaten, cell_array in self.snake_state_list:
+            part_list.append(SNAKE_HEADER.pack(dead, ENVIRONMENT_ACTION_LIST.index(direction), snacks_eaten,
+                                               len(cell_array) // 2))
+            part_list.append(pack_array(cell_array))
+        part_list.append(pack_array(self.apple_cell_array))
+        part_list.append(pack_array(self.free_cell_array))
+        return b''.join(part_list)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'GameSnapshot':
+        """Return snapshot unpacked from entered bytes (raises ValueError if they aren't a snapshot)."""
+        try:
+            (magic, version, columns, rows, cell_size, player_count, apple_count, free_cell_count, elapsed_time,
+             practice, autopilot_index) = SNAPSHOT_HEADER.unpack_from(data)
+            if magic != GAME_SNAPSHOT_MAGIC or version != GAME_SNAPSHOT_VERSION:
+                raise ValueError('not a game snapshot (or saved by another version)')
+            autopilot_mode = AUTOPILOT_MODE_LIST[autopilot_index]
+            offset = SNAPSHOT_HEADER.size
+            rng_words = unpack_array('I', data, offset, GAME_SNAPSHOT_RNG_WORDS)
+            offset += rng_words.itemsize * GAME_SNAPSHOT_RNG_WORDS
+            has_gauss, gauss_next = RNG_GAUSS.unpack_from(data, offset)
+            offset += RNG_GAUSS.size
+            snake_state_list = []
+            for _ in range(player_count):
+                dead, direction_index, snacks_eaten, length = SNAKE_HEADER.unpack_from(data, offset)
+                offset += SNAKE_HEADER.size
+                cell_array = unpack_array('h', data, offset, length * 2)
+                offset += cell_array.itemsize * length * 2
+                if length < 1 or len(cell_array) != length * 2:
+                    raise ValueError('game snapshot is incomplete')
+                snake_state_list.append((bool(dead), ENVIRONMENT_ACTION_LIST[direction_index], snacks_eaten,
+                                         cell_array))
+            apple_cell_array = unpack_array('h', data, offset, apple_count * 2)
+            offset += apple_cell_array.itemsize * apple_count * 2
+            free_cell_array = unpack_array('h', data, offset, free_cell_count * 2)
+        except (struct.error, IndexError) as error:
+            raise ValueError(f'game snapshot is incomplete ({error})')
+        if len(apple_cell_array) != apple_count * 2 or len(free_cell_array) != free_cell_count * 2 \
+                or len(rng_words) != GAME_SNAPSHOT_RNG_WORDS:
+            raise ValueError('game snapshot is incomplete')
+        rng_state = (3, tuple(rng_words), gauss_next if has_gauss else None)  # (3 is random's state version).
+        snapshot = cls(columns, rows, cell_size, elapsed_time, rng_state, snake_state_list, apple_cell_array,
+                       free_cell_array, bool(practice), autopilot_mode)
+        snapshot.check_board()
+        return snapshot
+
+    def check_board(self) -> None:
+        """Raise ValueError if the snapshot's snakes, apples, and free cells don't fit its board.
+
+        Every cell must be on the board (except a dead snake's head, which
+        may have crashed into the border), apples can't share a cell with
+        each other or a snake, and the free cells must be exactly the cells
+        left over, so that restore can never put the board in a state a game
+        couldn't reach.
+        """
+        if self.columns < 2 or self.rows < 2 or self.cell_size < 1 \
+                or not 1 <= self.player_count <= len(SNAKE_PLAYER_KEY_NAME_LIST):
+            raise ValueError('game snapshot has an impossible board size or player count')
+        snake_cell_set = set()
+        for dead, _, _, cell_array in self.snake_state_list:
+            cell_list = list(zip(cell_array[::2], cell_array[1::2]))
+            if dead and not self.is_in_bounds(cell_list[0]):
+                if not (-1 <= cell_list[0][0] <= self.columns and -1 <= cell_list[0][1] <= self.rows):
+                    raise ValueError('game snapshot has a snake off the board')
+                cell_list = cell_list[1:]
+            if not all(self.is_in_bounds(cell) for cell in cell_list):
+                raise ValueError('game snapshot has a snake off the board')
+            snake_cell_set.update(cell_list)
+        apple_cell_set = set(zip(self.apple_cell_array[::2], self.apple_cell_array[1::2]))
+        if len(apple_cell_set) != len(self.apple_cell_array) // 2 or apple_cell_set & snake_cell_set \
+                or not all(self.is_in_bounds(cell) for cell in apple_cell_set):
+            raise ValueError('game snapshot has an apple off the board or in a taken cell')
+        free_cell_set = set(zip(self.free_cell_array[::2], self.free_cell_array[1::2]))
+        if len(free_cell_set) != len(self.free_cell_array) // 2 or free_cell_set & (snake_cell_set | apple_cell_set) \
+                or not all(self.is_in_bounds(cell) for cell in free_cell_set) \
+                or len(free_cell_set) + len(snake_cell_set) + len(apple_cell_set) != self.columns * self.rows:
+            raise ValueError('game snapshot\'s free cells are not the cells left over')
+
+    def is_in_bounds(self, cell: tuple[int, int]) -> bool:
+        """Return True if entered cell is on the snapshot's board."""
+        return 0 <= cell[0] < self.columns and 0 <= cell[1] < self.rows
+
+    def restore(self, window: pygame.Surface, board: GameBoard, snake_player_list: list[PlayerSnake]) -> None:
+        """Put entered game's snakes, apples, and random number generator back how they were saved.
+
+        The board must be the snapshot's size, with one snake per saved
+        player. Existing apples are moved to the saved apples' cells (new
+        ones are only made if there are more saved apples than existing ones).
+
+        Raises:
+            ValueError: If the saved free cells aren't the restored board's
+                free cells (the board should be reset before it's used again).
+        """
+        apple_list = list(board.item_cell_dict.values())
+        for apple in apple_list:
+            apple.remove()
+        for snake_player, (dead, direction, _, cell_array) in zip(snake_player_list, self.snake_state_list):
+            snake_player.set_cell_list(list(zip(cell_array[::2], cell_array[1::2])), direction)
+            if dead:
+                snake_player.die()
+        for index, cell in enumerate(zip(self.apple_cell_array[::2], self.apple_cell_array[1::2])):
+            if index == len(apple_list):
+                apple_list.append(AppleSnack(window, board, cell))
+            else:
+                apple_list[index].set_cell(cell)
+        board.set_free_cell_order(list(zip(self.free_cell_array[::2], self.free_cell_array[1::2])))
+        board.rng.setstate(self.rng_state)
+
+
+def take_game_snapshot(board: GameBoard, snake_player_list: list[PlayerSnake], snacks_eaten_list: list[int],
+                       elapsed_time: int, practice_bool: bool = False,
+                       autopilot_mode: str = AUTOPILOT_MODE_LIST[0]) -> GameSnapshot:
+    """Return snapshot of entered game.
+
+    Args:
+        board: Board the game is played on.
+        snake_player_list: Every PlayerSnake in the game, in player order.
+        snacks_eaten_list: Snacks eaten by each player.
+        elapsed_time: Milliseconds played so far, not counting time paused.
+        practice_bool: True if the game is a practice game (can be rewound).
+        autopilot_mode: Autopilot mode driving player 1's snake (see AUTOPILOT_MODE_LIST).
+
+    Returns:
+        snapshot: Snapshot holding copies of the game's state.
+    """
+    snake_state_list = [(snake_player.dead, snake_player.direction, snacks_eaten,
+                         array('h', chain.from_iterable(snake_player.get_cell_list())))
+                        for snake_player, snacks_eaten in zip(snake_player_list, snacks_eaten_list)]
+    return GameSnapshot(board.columns, board.rows, board.cell_size, max(0, elapsed_time), board.rng.getstate(),
+                        snake_state_list, array('h', chain.from_iterable(board.item_cell_dict)),
+                        array('h', chain.from_iterable(board.free_cell_list)), practice_bool, autopilot_mode)
+
+
+def save_game_snapshot(snapshot: GameSnapshot, file_path: str = GAME_SNAPSHOT_FILE) -> None:
+    """Write entered snapshot to entered file (replacing any snapshot saved before)."""
+    try:
+        with open(file_path, 'wb') as snapshot_file:
+            snapshot_file.write(snapshot.to_bytes())
+    except OSError:
+        print('could not save game snapshot to disk')
+
+
+def load_game_snapshot(file_path: str = GAME_SNAPSHOT_FILE) -> GameSnapshot | None:
+    """Return snapshot read from entered file (None if there isn't a valid one)."""
+    try:
+        with open(file_path, 'rb') as snapshot_file:
+            return GameSnapshot.from_bytes(snapshot_file.read())
+    except (OSError, ValueError) as error:
+        print(f'could not load game snapshot: {error}')
+        return None
+
+
+def has_game_snapshot(file_path: str = GAME_SNAPSHOT_FILE) -> bool:
+    """Return True if a snapshot has been saved to entered file."""
+    return os.path.isfile(file_path)
+
+
+def delete_game_snapshot(file_path: str = GAME_SNAPSHOT_FILE) -> None:
+    """Remove entered snapshot file (so a saved game can only be resumed once)."""
+    try:
+        os.remove(file_path)
+    except OSError:
+        pass
@@ -0,0 +1,184 @@
+"""Define ghost replay and ghost snake classes used to race a personal best run.
+
+This module holds a class recording every move of a single player game (the
+board's size, the number of apples, the seed of the board's random number
+generator, and the direction the snake moved in each tick), a class replaying
+such a recording as a translucent "ghost" snake alongside a live game, and
+functions for saving the best recording of each board size and apple count to
+(and loading it from) a compact binary file. Since apples are only ever placed
+by the board's seeded random number generator, replaying the recorded
+directions on a board seeded the same way plays the run back exactly, so only
+one byte per tick is stored. Everything is little endian.
+
+File format:
+    Header: Magic bytes, format version, board columns and rows, apple count,
+        seed, snacks eaten, and tick count.
+    Directions: Direction index (in ENVIRONMENT_ACTION_LIST order) the snake
+        moved in, one byte per tick.
+
+Functions:
+    get_ghost_replay_path: Returns file path of entered board's best replay.
+    load_ghost_replay: Returns best replay of entered board (or None).
+    save_ghost_replay: Writes entered replay to its board's replay file.
+    make_ghost_surface: Returns translucent copy of entered image.
+
+Classes:
+    GhostReplay: Recording of every move of a single player game.
+    GhostSnake: Translucent snake replaying a recording in lockstep with a game.
+"""
+
+import os
+import struct
+from array import array
+from itertools import islice
+import pygame
+from misc.constants import *
+from game_objects.game_board import GameBoard
+from game_objects.game_simulation import GameSimulation
+from game_objects.snake_player import PlayerSnake
+
+# (magic, version, columns, rows, apples, seed, snacks eaten, ticks)
+REPLAY_HEADER = struct.Struct('<4sBHHHIII')
+
+
+def get_ghost_replay_path(columns: int, rows: int, apple_count: int) -> str:
+    """Return file path of best replay of entered board size and apple count."""
+    return os.path.join(GHOST_REPLAY_DIRECTORY, f'{columns}x{rows}_{apple_count}.bin')
+
+
+def make_ghost_surface(image: pygame.Surface) -> pygame.Surface:
+    """Return copy of entered image with its per pixel alpha scaled down to GHOST_SNAKE_ALPHA.
+
+    The alpha is baked into the copy's pixels once, so blitting it every
+    frame costs the same as blitting the opaque image. The copy always has
+    per pixel alpha, even if entered image has none (see load_image).
+    """
+    ghost_surface = image.convert_alpha()
+    ghost_surface.fill((255, 255, 255, GHOST_SNAKE_ALPHA), special_flags=pygame.BLEND_RGBA_MULT)
+    return ghost_surface
+
+
+class GhostReplay(object):
+    """Recording of every move of a single player game.
+
+    This class holds the seed the game's board was seeded with and the index
+    of the direction the snake moved in each tick, in an array of bytes that
+    grows by one byte per tick (see record), along with the board's size and
+    number of apples (a replay can only be raced on the same board) and how
+    many snacks were eaten (so the best replay is only replaced by a better
+    one).
+    """
+
+    def __init__(self, columns: int, rows: int, apple_count: int, seed: int, snacks_eaten: int = 0,
+                 direction_array: array | None = None) -> None:
+        self.columns = columns
+        self.rows = rows
+        self.apple_count = apple_count
+        self.seed = seed
+        self.snacks_eaten = snacks_eaten
+        self.direction_array = array('B') if direction_array is None else direction_array
+
+    def record(self, direction: str) -> None:
+        """Add direction the snake moved in this tick to the end of the replay."""
+        self.direction_array.append(ENVIRONMENT_ACTION_LIST.index(direction))
+
+    def is_better_than(self, replay: 'GhostReplay | None') -> bool:
+        """Return True if this replay ate more snacks than entered replay (or there is none, and it ate any)."""
+        return self.snacks_eaten > (0 if replay is None else replay.snacks_eaten)
+
+    def to_bytes(self) -> bytes:
+        """Return replay packed in the replay file format (see module docstring)."""
+        return REPLAY_HEADER.pack(GHOST_REPLAY_MAGIC, GHOST_REPLAY_VERSION, self.columns, self.rows,
+                                  self.apple_count, self.seed, self.snacks_eaten,
+                                  len(self.direction_array)) + self.direction_array.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'GhostReplay':
+        """Return replay unpacked from entered bytes (raises ValueError if they aren't a replay)."""
+        try:
+            magic, version, columns, rows, apple_count, seed, snacks_eaten, tick_count = \
+                REPLAY_HEADER.unpack_from(data)
+        except struct.error as error:
+            raise ValueError(f'ghost replay is incomplete ({error})')
+        if magic != GHOST_REPLAY_MAGIC or version != GHOST_REPLAY_VERSION:
+            raise ValueError('not a ghost replay (or saved by another version)')
+        direction_array = array('B', data[REPLAY_HEADER.size:REPLAY_HEADER.size + tick_count])
+        if len(direction_array) != tick_count or max(direction_array, default=0) >= len(ENVIRONMENT_ACTION_LIST):
+            raise ValueError('ghost replay is incomplete')
+        return cls(columns, rows, apple_count, seed, snacks_eaten, direction_array)
+
+
+def load_ghost_replay(columns: int, rows: int, apple_count: int) -> GhostReplay | None:
+    """Return best replay of entered board size and apple count (None if there isn't a valid one)."""
+    file_path = get_ghost_replay_path(columns, rows, apple_count)
+    if not os.path.isfile(file_path):
+        return None
+    try:
+        with open(file_path, 'rb') as replay_file:
+            return GhostReplay.from_bytes(replay_file.read())
+    except (OSError, ValueError) as error:
+        print(f'could not load ghost replay: {error}')
+        return None
+
+
+def save_ghost_replay(replay: GhostReplay) -> None:
+    """Write entered replay to its board's replay file (replacing the replay saved before)."""
+    try:
+        os.makedirs(GHOST_REPLAY_DIRECTORY, exist_ok=True)
+        with open(get_ghost_replay_path(replay.columns, replay.rows, replay.apple_count), 'wb') as replay_file:
+            replay_file.write(replay.to_bytes())
+    except OSError:
+        print('could not save ghost replay to disk')
+
+
+class GhostSnake(object):
+    """Translucent snake replaying a recorded run in lockstep with a live game.
+
+    This class plays the replay back on its own board (the same size and
+    position on screen as the live game's board, so the ghost lines up with
+    it, but never drawn) with its own GameSimulation, seeded with the
+    replay's seed, so the ghost eats and grows exactly like the recorded run
+    did, no matter what the live snake does. Each update plays one tick (a
+    single snake move, so the ghost fits in the same tick budget as the live
+    game). The ghost is drawn with translucent copies of the snake's head and
+    body images, made once (see make_ghost_surface), and disappears once the
+    replay runs out or the ghost crashes.
+    """
+
+    def __init__(self, window: pygame.Surface, board: GameBoard, replay: GhostReplay,
+                 snake_skin: str | None = None) -> None:
+        self.window = window
+        self.replay = replay
+        self.board = GameBoard(board.columns, board.rows, board.cell_size, board.rect)
+        self.snake_player = PlayerSnake(self.window, self.board, SNAKE_PLAYER_START_DIRECTION, snake_skin=snake_skin)
+        self.simulation = GameSimulation(self.window, self.board, [self.snake_player])
+        self.head_cube_dict = {direction: make_ghost_surface(head_cube)
+                               for direction, head_cube in self.snake_player.head_cube_dict.items()}
+        self.body_cube = make_ghost_surface(self.snake_player.body_cube)
+        self.tick = 0
+        self.finished = False
+        self.reset()
+
+    def update(self) -> None:
+        """Play the replay's next tick (does nothing once the ghost is finished)."""
+        if self.finished:
+            return
+        self.snake_player.set_direction(ENVIRONMENT_ACTION_LIST[self.replay.direction_array[self.tick]])
+        self.simulation.update()
+        self.tick += 1
+        self.finished = self.snake_player.dead or self.tick == len(self.replay.direction_array)
+
+    def draw(self) -> None:
+        """Blit ghost snake's body cubes (in a single blits call) then its head."""
+        if self.finished:
+            return
+        self.window.blits([(self.body_cube, body_cube)
+                           for body_cube in islice(self.snake_player.snake_cube_rect_list, 1, None)], False)
+        self.window.blit(self.head_cube_dict[self.snake_player.direction], self.snake_player.head_cube_rect)
+
+    def reset(self) -> None:
+        """Seed ghost's board with the replay's seed and start the replay from the first tick."""
+        self.board.seed(self.replay.seed)
+        self.simulation.reset(self.replay.apple_count)
+        self.tick = 0
+        self.finished = len(self.replay.direction_array) == 0
@@ -0,0 +1,337 @@
+"""Define Hamiltonian cycle autopilot class and the cycle builder it uses.
+
+This module holds a second autopilot strategy: instead of searching for
+apples, the snake follows a fixed route (a Hamiltonian cycle) that visits
+every cell of the board once before returning to where it started, so it can
+never trap itself and always ends up filling the whole board (all but one
+cell, on boards with an odd number of both columns and rows). While the snake
+is still short, it takes safe shortcuts across the cycle towards the nearest
+apple. The cycle for each board size is built once and saved to disk, so that
+later games on the same board size only load it (a saved cycle that fails to
+load, or isn't a valid cycle of its board, is built again and saved over).
+
+File format (all integers little-endian):
+    Header: Magic bytes, format version, board columns and rows, and cycle
+        length.
+    Cycle order: Flat index (row * columns + column) of each cell along the
+        cycle (4 bytes each).
+
+Functions:
+    build_hamiltonian_cycle: Returns list of board cells in cycle order.
+    is_hamiltonian_cycle: Returns True if cycle order is a valid board cycle.
+    load_hamiltonian_cycle: Returns saved cycle order (None if not valid).
+    save_hamiltonian_cycle: Writes cycle order to its board's cycle file.
+    get_hamiltonian_cycle: Returns cycle order and index arrays (cached).
+
+Classes:
+    HamiltonianAutopilot: Steers a snake along a Hamiltonian cycle.
+"""
+
+import os
+import struct
+from array import array
+from misc.constants import *
+from game_objects.game_board import GameBoard
+from game_objects.snake_player import PlayerSnake
+
+_hamiltonian_cycle_dict = {}  # {(columns, rows): (cycle order array, cycle index array)}
+
+# (magic, version, columns, rows, cycle length)
+CYCLE_HEADER = struct.Struct('<4sBHHI')
+
+
+def build_hamiltonian_cycle(columns: int, rows: int) -> list[tuple[int, int]]:
+    """Return list of every board cell in Hamiltonian cycle order.
+
+    With an even number of rows, the cycle runs right along the top row,
+    snakes back and forth through every other column row by row, and returns
+    up the first column. With an odd number of rows but an even number of
+    columns, the same cycle is built on the board turned on its side. If both
+    are odd no Hamiltonian cycle exists (every move swaps between "black" and
+    "white" cells of a checkerboard, and there is one more of one color), so
+    the cycle is built on every row but the last, then the last row's cells
+    are spliced in two at a time, leaving out only the bottom right cell.
+
+    Args:
+        columns: Number of columns on the board (at least 2).
+        rows: Number of rows on the board (at least 2).
+
+    Returns:
+        cycle_cell_list: Cells in cycle order (each cell is next to the one
+            after it, and the last cell is next to the first one).
+    """
+    if rows % 2 == 0:
+        cycle_cell_list = [(column, 0) for column in range(columns)]
+        for row in range(1, rows):
+            column_range = range(columns - 1, 0, -1) if row % 2 == 1 else range(1, columns)
+            cycle_cell_list += [(column, row) for column in column_range]
+        cycle_cell_list += [(0, row) for row in range(rows - 1, 0, -1)]
+        return cycle_cell_list
+
+    if columns % 2 == 0:
+        return [(column, row) for row, column in build_hamiltonian_cycle(rows, columns)]
+
+    # Both odd: the last row above runs right to left, so each pair of cells below it can be spliced in.
+    cycle_cell_list = build_hamiltonian_cycle(columns, rows - 1)
+    next_cell_dict = {cell: cycle_cell_list[(index + 1) % len(cycle_cell_list)]
+                      for index, cell in enumerate(cycle_cell_list)}
+    for column in range(0, columns - 1, 2):
+        # Replace the step (column + 1, rows - 2) -> (column, rows - 2) with a detour through the last row.
+        right_cell, left_cell = (column + 1, rows - 2), (column, rows - 2)
+        next_cell_dict[right_cell] = (column + 1, rows - 1)
+        next_cell_dict[(column + 1, rows - 1)] = (column, rows - 1)
+        next_cell_dict[(column, rows - 1)] = left_cell
+    cycle_cell_list = [(0, 0)]
+    while next_cell_dict[cycle_cell_list[-1]] != (0, 0):
+        cycle_cell_list.append(next_cell_dict[cycle_cell_list[-1]])
+    return cycle_cell_list
+
+
+def is_hamiltonian_cycle(cycle_order: array, columns: int, rows: int) -> bool:
+    """Return True if entered cycle order visits every board cell once, one step at a time.
+
+    On boards with an odd number of both columns and rows, the cycle must
+    leave out the bottom right cell (as build_hamiltonian_cycle does), since
+    the autopilot expects the left out cell to be there.
+    """
+    cell_count = columns * rows
+    cycle_length = cell_count - (columns % 2) * (rows % 2)
+    # (The bottom right cell has the last flat index, so every index below cycle length leaves only it out).
+    if len(cycle_order) != cycle_length or min(cycle_order) < 0 or max(cycle_order) >= cycle_length \
+            or len(set(cycle_order)) != cycle_length:
+        return False
+    previous_row, previous_column = divmod(cycle_order[-1], columns)
+    for flat_cell in cycle_order:
+        row, column = divmod(flat_cell, columns)
+        if abs(column - previous_column) + abs(row - previous_row) != 1:
+            return False
+        previous_row, previous_column = row, column
+    return True
+
+
+def load_hamiltonian_cycle(columns: int, rows: int) -> array | None:
+    """Return saved cycle order of entered board size (None if there isn't a valid one)."""
+    cycle_file_path = os.path.join(HAMILTONIAN_CYCLE_DIRECTORY, f'{columns}x{rows}.bin')
+    if not os.path.isfile(cycle_file_path):
+        return None
+    try:
+        with open(cycle_file_path, 'rb') as cycle_file:
+            data = cycle_file.read()
+        magic, version, saved_columns, saved_rows, cycle_length = CYCLE_HEADER.unpack_from(data)
+        if magic != HAMILTONIAN_CYCLE_MAGIC or version != HAMILTONIAN_CYCLE_VERSION:
+            raise ValueError('not a hamiltonian cycle (or saved by another version)')
+        cycle_order = array('i')
+        cycle_order.frombytes(data[CYCLE_HEADER.size:])
+        if (saved_columns, saved_rows, cycle_length) != (columns, rows, len(cycle_order)) \
+                or not is_hamiltonian_cycle(cycle_order, columns, rows):
+            raise ValueError('hamiltonian cycle is incomplete or not a cycle of its board')
+    except (OSError, struct.error, ValueError) as error:
+        print(f'could not load hamiltonian cycle: {error}')
+        return None
+    return cycle_order
+
+
+def save_hamiltonian_cycle(columns: int, rows: int, cycle_order: array) -> None:
+    """Write entered cycle order to its board size's cycle file (replacing the one saved before)."""
+    try:
+        os.makedirs(HAMILTONIAN_CYCLE_DIRECTORY, exist_ok=True)
+        with open(os.path.join(HAMILTONIAN_CYCLE_DIRECTORY, f'{columns}x{rows}.bin'), 'wb') as cycle_file:
+            cycle_file.write(CYCLE_HEADER.pack(HAMILTONIAN_CYCLE_MAGIC, HAMILTONIAN_CYCLE_VERSION, columns, rows,
+                                               len(cycle_order)) + cycle_order.tobytes())
+    except OSError:
+        print('could not save hamiltonian cycle to disk')
+
+
+def get_hamiltonian_cycle(columns: int, rows: int) -> tuple[array, array]:
+    """Return (cycle order, cycle index) arrays for entered board size.
+
+    Cells are stored as flat indexes (row * columns + column). Cycle order
+    holds the flat index of the cell at each position along the cycle, and
+    cycle index holds the position along the cycle of each flat index (or -1
+    for the cell left out of the cycle on boards with an odd number of both
+    columns and rows), so looking up either way is O(1). The cycle order is
+    saved to HAMILTONIAN_CYCLE_DIRECTORY the first time a board size is used
+    (or whenever the saved one isn't valid), loaded from there afterwards, and
+    kept in memory once loaded.
+    """
+    if (columns, rows) in _hamiltonian_cycle_dict:
+        return _hamiltonian_cycle_dict[(columns, rows)]
+
+    cycle_order = load_hamiltonian_cycle(columns, rows)
+    if cycle_order is None:
+        cycle_order = array('i', (row * columns + column for column, row in build_hamiltonian_cycle(columns, rows)))
+        save_hamiltonian_cycle(columns, rows, cycle_order)
+
+    cycle_index = array('i', [-1]) * (columns * rows)
+    for index, flat_cell in enumerate(cycle_order):
+        cycle_index[flat_cell] = index
+    _hamiltonian_cycle_dict[(columns, rows)] = (cycle_order, cycle_index)
+    return cycle_order, cycle_index
+
+
+class HamiltonianAutopilot(object):
+    """Autopilot that follows a Hamiltonian cycle, taking safe shortcuts.
+
+    Following the cycle on its own is always safe: the snake's body trails
+    behind its head along the cycle, so the cell ahead is always free (or the
+    tail, which moves out of the way). While the snake and apples (each
+    counting as HAMILTONIAN_SHORTCUT_APPLE_WEIGHT cubes) fill less than
+    HAMILTONIAN_SHORTCUT_MAX_FILL of the board, the autopilot may instead
+    move to a neighboring cell further along the cycle (towards the nearest
+    apple along the cycle, without passing it), as long as that cell is still
+    far enough ahead of the tail along the cycle that the head can't catch up
+    with the body, even if the snake eats every apple on the board on the way
+    (since every move goes forward along the cycle, the body's cells are
+    always in cycle order from tail to head). Every lookup (the cycle position
+    of a cell, or the cell at a cycle position) is O(1), so each tick costs
+    the same on the largest boards as on the classic one.
+
+    On boards with an odd number of both columns and rows, the cell left out
+    of the cycle is next to the 2 cells on either side of one cycle cell, so
+    either of them makes a cycle. The autopilot swaps them (following the
+    other cycle) whenever the snake passes an apple in the left out cell.
+    Since the snake never enters the left out cell otherwise, the last apple
+    usually lands there once the board is nearly full, and the snake crashes
+    with every other cell filled (a snake on a cycle can only fill a whole
+    board whose cells can all be on the cycle).
+    """
+
+    def __init__(self, snake_player: PlayerSnake, board: GameBoard) -> None:
+        self.snake_player = snake_player
+        self.board = board
+        self.columns = self.board.columns
+        self.cycle_order, self.cycle_index = get_hamiltonian_cycle(self.board.columns, self.board.rows)
+        self.cycle_length = len(self.cycle_order)
+        self.skipped_cell = None
+        self.skipped_neighbor_cell_list = []  # Cells next to both the skipped cell and the cycle cell between them.
+        if self.cycle_length < board.cell_count:
+            # (Copied, since eating an apple in the skipped cell swaps it into the cycle, see swap_skipped_cell).
+            self.cycle_order, self.cycle_index = array('i', self.cycle_order), array('i', self.cycle_index)
+            self.skipped_cell = (self.board.columns - 1, self.board.rows - 1)
+            self.skipped_neighbor_cell_list = [(self.board.columns - 2, self.board.rows - 1),
+                                               (self.board.columns - 1, self.board.rows - 2)]
+        self.target_cell = None
+        self.direction_dict = {(0, -1): 'up', (1, 0): 'right', (0, 1): 'down', (-1, 0): 'left'}
+
+    def steer(self) -> None:
+        """Set the snake's direction for its next move."""
+        next_cell = self.get_next_cell()
+        head_cell = self.snake_player.head_cell
+        self.snake_player.set_direction(self.direction_dict[(next_cell[0] - head_cell[0],
+                                                             next_cell[1] - head_cell[1])])
+
+    def reset(self) -> None:
+        """Forget current target apple (used for a new game)."""
+        self.target_cell = None
+
+    def get_position(self, cell: tuple[int, int]) -> int:
+        """Return position of entered cell along the cycle (-1 for the skipped cell)."""
+        return self.cycle_index[cell[1] * self.columns + cell[0]]
+
+    def get_cycle_cell(self, position: int) -> tuple[int, int]:
+        """Return cell at entered position along the cycle."""
+        flat_cell = self.cycle_order[position % self.cycle_length]
+        return flat_cell % self.columns, flat_cell // self.columns
+
+    def get_distance(self, start_position: int, end_position: int) -> int:
+        """Return number of steps along the cycle from start to end position."""
+        return (end_position - start_position) % self.cycle_length
+
+    def get_skipped_cell_neighbor_positions(self) -> list[int]:
+        """Return cycle positions of the skipped cell's 2 neighbors."""
+        return [self.get_position(cell) for cell in self.skipped_neighbor_cell_list]
+
+    def swap_skipped_cell(self, position: int) -> None:
+        """Swap the skipped cell into the cycle at entered position, leaving out the cell that was there.
+
+        The cell at entered position must be the one between the skipped
+        cell's 2 neighbors along the cycle (the 2 cells are both next to both
+        neighbors, so either one makes a cycle).
+        """
+        position %= self.cycle_length
+        cycle_cell = self.get_cycle_cell(position)
+        skipped_flat_cell = self.skipped_cell[1] * self.columns + self.skipped_cell[0]
+        self.cycle_index[cycle_cell[1] * self.columns + cycle_cell[0]] = -1
+        self.cycle_index[skipped_flat_cell] = position
+        self.cycle_order[position] = skipped_flat_cell
+        self.skipped_cell = cycle_cell
+
+    def get_next_cell(self) -> tuple[int, int]:
+        """Return cell the snake should move into next.
+
+        Returns the next cell along the cycle unless a safe shortcut is
+        available (or the skipped cell holds an apple and can be swapped in
+        for the next cell, see swap_skipped_cell).
+        """
+        head_cell = self.snake_player.head_cell
+        neck_cell = self.board.pos_to_cell(self.snake_player.snake_cube_rect_list[1].center)
+        if head_cell == self.skipped_cell:
+            # (Only after a rewind to before the skipped cell was swapped out). The way out is its other neighbor.
+            return [cell for cell in self.skipped_neighbor_cell_list if cell != neck_cell][0]
+
+        head_position = self.get_position(head_cell)
+        next_cell = self.get_cycle_cell(head_position + 1)
+        tail_cell = self.board.pos_to_cell(self.snake_player.snake_cube_rect_list[-1].center)
+        if next_cell == tail_cell:
+            return next_cell
+
+        if self.skipped_cell in self.board.item_cell_dict and head_cell in self.skipped_neighbor_cell_list \
+                and self.get_cycle_cell(head_position + 2) in self.skipped_neighbor_cell_list:
+            # Going through the skipped cell instead of the next cell is just following the other cycle, which
+            # is as safe as following this one (the next cell isn't the tail, so it isn't part of the body).
+            self.swap_skipped_cell(head_position + 1)
+            return self.get_cycle_cell(head_position + 1)
+
+        # Shortcuts leave the cells they skip behind the head, out of reach until the tail has passed them. Once
+        # no free cells are left, every move eats an apple and the tail stops moving, so any apples left behind
+        # the head can never be eaten. Shortcuts are only taken while the snake and apples fill less than
+        # HAMILTONIAN_SHORTCUT_MAX_FILL of the board, which leaves the tail plenty of time to pass them.
+        if len(self.snake_player.snake_cube_rect_list) \
+                + len(self.board.item_cell_dict) * HAMILTONIAN_SHORTCUT_APPLE_WEIGHT \
+                >= self.cycle_length * HAMILTONIAN_SHORTCUT_MAX_FILL:
+            return next_cell
+
+        if tail_cell == self.skipped_cell:
+            # (The cube after the tail is further along the cycle, so the room ahead is underestimated, not over).
+            tail_cell = self.board.pos_to_cell(self.snake_player.snake_cube_rect_list[-2].center)
+        # Cells ahead that are safe to jump to. The tail stays put for a tick each time an apple is eaten, so
+        # the margin grows with the number of apples that could be eaten before the head catches up to the tail.
+        tail_distance = self.get_distance(head_position, self.get_position(tail_cell)) - len(self.board.item_cell_dict)
+        room_ahead = tail_distance - HAMILTONIAN_SHORTCUT_MARGIN
+
+        target_distance = self.get_target_distance(head_position)
+        best_cell, best_distance = next_cell, 1
+        for offset in self.direction_dict:
+            cell = (head_cell[0] + offset[0], head_cell[1] + offset[1])
+            if cell == neck_cell or cell == self.skipped_cell or not self.board.is_in_bounds(cell) \
+                    or cell in self.board.snake_cell_dict:
+                continue
+            distance = self.get_distance(head_position, self.get_position(cell))
+            if best_distance < distance <= target_distance and distance < room_ahead:
+                best_cell, best_distance = cell, distance
+        return best_cell
+
+    def get_target_distance(self, head_position: int) -> int:
+        """Return steps along the cycle from head to the target apple.
+
+        The target is the apple nearest along the cycle, picked again only
+        once the current target is gone. An apple in the skipped cell counts
+        as being at whichever of its neighbors comes first along the cycle.
+        """
+        if self.target_cell not in self.board.item_cell_dict:
+            self.target_cell = None
+            best_distance = self.cycle_length
+            for item_cell in self.board.item_cell_dict:
+                distance = self.get_item_distance(head_position, item_cell)
+                if distance < best_distance:
+                    self.target_cell, best_distance = item_cell, distance
+        if self.target_cell is None:
+            return self.cycle_length
+        return self.get_item_distance(head_position, self.target_cell)
+
+    def get_item_distance(self, head_position: int, item_cell: tuple[int, int]) -> int:
+        """Return steps along the cycle from head to entered item cell."""
+        if item_cell == self.skipped_cell:
+            return min(self.get_distance(head_position, position)
+                       for position in self.get_skipped_cell_neighbor_positions())
+        return self.get_distance(head_position, self.get_position(item_cell))
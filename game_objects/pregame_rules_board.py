@@ -10,6 +10,7 @@ Classes:
 import os
 import pygame
 from misc.constants import *
+from misc.asset_cache import load_image
 
 
 class GameRulesBoard(object):
@@ -17,15 +18,20 @@ class GameRulesBoard(object):
 
     This class holds all of the content required to draw a pregame rules
     board, displaying a black board, the rules of the basic default snake
-    game, the game's controls, and a "press any key to continue" caption.
+    game, the game's controls (each player's move keys, for local
+    multiplayer), which autopilot mode is selected (cycled with TAB, an
+    autopilot drives player 1's snake), whether rewind practice mode is on
+    (toggled with R, holding R rewinds the game), whether a ghost of the
+    player's best run is shown (toggled with G), and a "press any key to
+    continue" caption.
     """
 
-    def __init__(self, window: pygame.Surface, width: int, height: int) -> None:
+    def __init__(self, window: pygame.Surface, width: int, height: int, player_count: int = 1) -> None:
         self.window = window
         self.width = width
         self.height = height
-        self.background = pygame.transform.scale(pygame.Surface.convert(pygame.image.load(
-            os.path.join('project_assets', 'backgrounds', 'black_background.png'))), RULES_BOARD_DIMENSIONS)
+        self.background = load_image(
+            os.path.join('project_assets', 'backgrounds', 'black_background.png'), RULES_BOARD_DIMENSIONS, alpha=False)
         self.font_size = RULES_BOARD_TEXT_FONT_SIZE
         self.text_font = pygame.font.Font(ARCADE_FONT_FILE, self.font_size)
         self.text_list = ['Objective: eat as many of the snacks', 'as you can without crashing',
@@ -33,17 +39,50 @@ class GameRulesBoard(object):
                           'UP/LEFT/DOWN/RIGHT ', '- move controls',
                           'ESC ', '- pause menu',
                           'ENTER ', '- select',
-                          'press any key to start']
+                          'TAB ', '- autopilot: OFF',
+                          'press any key to start',
+                          'R ', '- rewind: OFF',
+                          'G ', '- ghost: OFF']
         self.text_color_list = [GAME_TEXT_BLUE, GAME_TEXT_BLUE, GAME_TEXT_BLUE, GAME_TEXT_BLUE, GAME_TEXT_GREEN,
                                 GAME_TEXT_WHITE, GAME_TEXT_GREEN, GAME_TEXT_WHITE, GAME_TEXT_GREEN, GAME_TEXT_WHITE,
-                                GAME_TEXT_LIGHT_BLUE]
+                                GAME_TEXT_GREEN, GAME_TEXT_WHITE, GAME_TEXT_LIGHT_BLUE, GAME_TEXT_GREEN,
+                                GAME_TEXT_WHITE, GAME_TEXT_GREEN, GAME_TEXT_WHITE]
         self.text_pos_list = [(400, 130), (400, 150), (400, 170), (400, 190), (285, 250), (485, 250), (377, 270),
-                              (467, 270), (365, 290), (443, 290), (400, 380)]
+                              (467, 270), (365, 290), (443, 290), (377, 310), (497, 310), (400, 380), (389, 330),
+                              (479, 330), (389, 350), (479, 350)]
+        if player_count > 1:
+            # Move keys of every player go on their own line, above the move controls caption.
+            self.text_list[4] = '  '.join(SNAKE_PLAYER_CONTROLS_TEXT_LIST[:player_count])
+            self.text_pos_list[4:6] = [(400, 230), (400, 250)]
         self.text_surface_list = [(self.text_font.render(self.text_list[index], True, self.text_color_list[index]))
                                   for index in range(len(self.text_list))]
         self.text_rect_list = [surface.get_rect(center=pos)
                                for surface, pos in zip(self.text_surface_list, self.text_pos_list)]
 
+    def set_autopilot_text(self, autopilot_mode: str) -> None:
+        """Remake autopilot text surface to show selected autopilot mode."""
+        index = RULES_BOARD_AUTOPILOT_TEXT_INDEX
+        self.text_list[index] = f'- autopilot: {autopilot_mode}'
+        self.text_surface_list[index] = self.text_font.render(self.text_list[index], True,
+                                                              self.text_color_list[index])
+        self.text_rect_list[index] = self.text_surface_list[index].get_rect(midleft=self.text_rect_list[index].midleft)
+
+    def set_rewind_text(self, practice_bool: bool) -> None:
+        """Remake rewind text surface to show whether rewind practice mode is on."""
+        index = RULES_BOARD_REWIND_TEXT_INDEX
+        self.text_list[index] = f'- rewind: {"ON (hold R)" if practice_bool else "OFF"}'
+        self.text_surface_list[index] = self.text_font.render(self.text_list[index], True,
+                                                              self.text_color_list[index])
+        self.text_rect_list[index] = self.text_surface_list[index].get_rect(midleft=self.text_rect_list[index].midleft)
+
+    def set_ghost_text(self, ghost_bool: bool) -> None:
+        """Remake ghost text surface to show whether the ghost of the best run is shown."""
+        index = RULES_BOARD_GHOST_TEXT_INDEX
+        self.text_list[index] = f'- ghost: {"ON" if ghost_bool else "OFF"}'
+        self.text_surface_list[index] = self.text_font.render(self.text_list[index], True,
+                                                              self.text_color_list[index])
+        self.text_rect_list[index] = self.text_surface_list[index].get_rect(midleft=self.text_rect_list[index].midleft)
+
     def draw(self) -> None:
         """Blit background for board and all rules board text content."""
         self.window.blit(self.background, RULES_BOARD_POS)
@@ -0,0 +1,129 @@
+"""Define rewind buffer class used to play a game backwards in practice mode.
+
+This module holds a class that records what every snake did each tick of a
+game (in a fixed size ring buffer) and can undo those ticks one at a time,
+most recent first, so that holding the rewind key plays the game backwards.
+
+Classes:
+    RewindBuffer: Ring buffer of undo records for the last ticks of a game.
+"""
+
+from array import array
+import pygame
+from misc.constants import *
+from game_objects.game_board import GameBoard
+from game_objects.snack_items import AppleSnack
+from game_objects.snake_player import PlayerSnake
+
+
+class RewindBuffer(object):
+    """Fixed size ring buffer of the last ticks of a game, for rewinding.
+
+    This class keeps one small undo record per snake per tick (what the tick
+    changed, the snake's direction and tail cell before it moved, and the
+    cell of any apple spawned when it ate) in a single preallocated array,
+    plus each tick's elapsed game time, so memory never grows with how long
+    a game goes on for: once the buffer is full, each new tick overwrites the
+    oldest one. Records are deltas from the tick before, not copies of the
+    snakes, and undoing one only touches each snake's head and tail (see
+    PlayerSnake.undo_move), so rewinding a tick costs the same as playing
+    one, no matter how long the snakes are. Since ticks are only ever undone
+    from the present backwards, no full keyframes are needed either.
+
+    A tick is recorded by calling begin_tick before the snakes move and
+    end_tick once crashes and snacks have been handled.
+    """
+
+    def __init__(self, window: pygame.Surface, board: GameBoard, snake_player_list: list[PlayerSnake],
+                 capacity: int = REWIND_BUFFER_SECONDS * 1000 // GAME_LOOP_DELAY) -> None:
+        self.window = window
+        self.board = board
+        self.snake_player_list = snake_player_list
+        self.capacity = capacity  # Ticks kept (the oldest are overwritten once full).
+        self.record_size = len(self.snake_player_list) * REWIND_RECORD_FIELDS
+        self.record_array = array('h', [0]) * (self.capacity * self.record_size)
+        self.elapsed_time_array = array('i', [0]) * self.capacity
+        self.next_index = 0  # Slot the next tick is recorded in.
+        self.tick_count = 0  # Ticks that can be rewound.
+
+    def begin_tick(self, elapsed_time: int) -> None:
+        """Record each snake's state before this tick's moves, and entered elapsed game time (in ms)."""
+        offset = self.next_index * self.record_size
+        record_array = self.record_array
+        for snake_player in self.snake_player_list:
+            tail_cell = self.board.pos_to_cell(snake_player.snake_cube_rect_list[-1].center)
+            record_array[offset] = 0 if snake_player.dead else REWIND_FLAG_MOVED
+            record_array[offset + 1] = ENVIRONMENT_ACTION_LIST.index(snake_player.direction)
+            record_array[offset + 2], record_array[offset + 3] = tail_cell
+            record_array[offset + 4] = record_array[offset + 5] = -1
+            offset += REWIND_RECORD_FIELDS
+        self.elapsed_time_array[self.next_index] = elapsed_time
+
+    def end_tick(self, crashed_index_list: list[int], eaten_index_list: list[int],
+                 spawned_cell_list: list[tuple[int, int]]) -> None:
+        """Record which snakes crashed and ate this tick (and the apples spawned), then keep the tick.
+
+        Each snack eaten spawns at most one apple (none once the board is
+        full, and then none for later snakes either), so the spawned cells
+        line up with the first players in the eaten index list.
+        """
+        offset = self.next_index * self.record_size
+        for player_index in crashed_index_list:
+            self.record_array[offset + player_index * REWIND_RECORD_FIELDS] |= REWIND_FLAG_DIED
+        for player_index, spawned_cell in zip(eaten_index_list, spawned_cell_list + [None] * len(eaten_index_list)):
+            record_offset = offset + player_index * REWIND_RECORD_FIELDS
+            self.record_array[record_offset] |= REWIND_FLAG_GREW
+            if spawned_cell is not None:
+                self.record_array[record_offset + 4], self.record_array[record_offset + 5] = spawned_cell
+        self.next_index = (self.next_index + 1) % self.capacity
+        self.tick_count = min(self.tick_count + 1, self.capacity)
+
+    def can_rewind(self) -> bool:
+        """Return True if there is at least one recorded tick left to undo."""
+        return self.tick_count > 0
+
+    def rewind(self) -> tuple[int, list[int]] | None:
+        """Undo the most recent recorded tick and return its state (None if there is none left).
+
+        Undoes the tick's steps in the reverse order they were played in:
+        snacks eaten (removing the spawned apple, shrinking the snake, and
+        putting the eaten apple back in its head cell), then crashes (bringing
+        crashed snakes back to life), then moves (see PlayerSnake.undo_move).
+
+        Returns:
+            elapsed_time: Elapsed game time (in ms) when the undone tick began.
+            eaten_index_list: Indexes of players whose eaten snack was undone.
+        """
+        if self.tick_count == 0:
+            return None
+        self.next_index = (self.next_index - 1) % self.capacity
+        self.tick_count -= 1
+        offset = self.next_index * self.record_size
+        record_list = [self.record_array[record_offset:record_offset + REWIND_RECORD_FIELDS]
+                       for record_offset in range(offset, offset + self.record_size, REWIND_RECORD_FIELDS)]
+
+        eaten_index_list = []
+        for player_index in reversed(range(len(self.snake_player_list))):
+            flags, _, _, _, spawn_column, spawn_row = record_list[player_index]
+            if flags & REWIND_FLAG_GREW:
+                snake_player = self.snake_player_list[player_index]
+                apple = self.board.remove_item((spawn_column, spawn_row)) if spawn_column >= 0 else None
+                snake_player.decrease_length()
+                if apple is None:  # (Made in place, so the board's random number generator isn't used).
+                    AppleSnack(self.window, self.board, snake_player.head_cell)
+                else:
+                    apple.set_cell(snake_player.head_cell)
+                eaten_index_list.append(player_index)
+        for snake_player, (flags, *_) in zip(self.snake_player_list, record_list):
+            if flags & REWIND_FLAG_DIED:
+                snake_player.revive()
+        for snake_player, (flags, direction_index, tail_column, tail_row, *_) in zip(self.snake_player_list,
+                                                                                     record_list):
+            if flags & REWIND_FLAG_MOVED:
+                snake_player.undo_move((tail_column, tail_row), ENVIRONMENT_ACTION_LIST[direction_index])
+        return self.elapsed_time_array[self.next_index], eaten_index_list
+
+    def clear(self) -> None:
+        """Forget every recorded tick (used for a new game)."""
+        self.next_index = 0
+        self.tick_count = 0
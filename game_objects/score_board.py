@@ -10,6 +10,7 @@ Classes:
 import os
 import pygame
 from misc.constants import *
+from misc.frame_tracer import frame_tracer
 from misc.saved_data_io_functions import get_score_name_list, get_page_of_user_row
 
 
@@ -19,17 +20,13 @@ class ScoreBoard(object):
     This class holds all the code responsible for creating a score board
     page containing the user's (rank, score, name) pair row. The page contains
     10 rows of (rank, score, name) data with one of them being the row of the
-    user's entered data.
+    user's entered data. The same score board can be reused for the next
+    game's score (see set_user_row), keeping its fonts and column labels.
     """
 
     def __init__(self, window: pygame.Surface, user_score: int, user_name: str) -> None:
+        trace_start = frame_tracer.begin()
         self.window = window
-        self.user_score = user_score
-        self.user_name = user_name
-        self.score_name_list = get_score_name_list()
-        self.user_row_page, self.user_row_index = get_page_of_user_row(self.score_name_list,
-                                                                       self.user_score,
-                                                                       self.user_name)
 
         # Scoreboard column label attributes.
         self.label_color = GAME_TEXT_GREEN
@@ -45,6 +42,17 @@ class ScoreBoard(object):
         # Scoreboard data attributes.
         self.data_color = GAME_TEXT_LIGHT_BLUE
         self.data_font = pygame.font.Font(ARCADE_FONT_FILE, SCORE_DATA_FONT_SIZE)
+        self.set_user_row(user_score, user_name)
+        frame_tracer.end('ScoreBoard construction', trace_start, TRACE_CATEGORY_TRANSITION)
+
+    def set_user_row(self, user_score: int, user_name: str) -> None:
+        """Read saved scores again and make the page containing entered user's (rank, score, name) row."""
+        self.user_score = user_score
+        self.user_name = user_name
+        self.score_name_list = get_score_name_list()
+        self.user_row_page, self.user_row_index = get_page_of_user_row(self.score_name_list,
+                                                                       self.user_score,
+                                                                       self.user_name)
         self.data_pos_list, self.data_surface_list, self.data_rect_list = self.set_column_surface_rect_lists()
 
         # Highlighted user row attributes.
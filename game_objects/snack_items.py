@@ -1,7 +1,14 @@
 """Define game's snake player object.
 
 This module holds a basic powerup apple snack as well as an abstract base
-class to be used for future varieties of other game items/powerups.
+class to be used for future varieties of other game items/powerups. Items
+live in the game board's item dict (keyed by the cell they're in), so the
+board can hold hundreds of them at once.
+
+Functions:
+    get_apple_snack_count: Returns number of apples on board from user prefs.
+    spawn_apple_snacks: Places entered number of apples on free board cells.
+    draw_items: Blits every entered item to the screen in one call.
 
 Classes:
     Item: Abstract base class not meant to be instantiated!
@@ -10,8 +17,41 @@ Classes:
 
 import os
 import pygame
-import random
 from misc.constants import *
+from misc.asset_cache import load_image
+from misc.saved_data_io_functions import get_file_dict
+from game_objects.game_board import GameBoard
+
+
+def get_apple_snack_count() -> int:
+    """Return number of apples kept on the board, from user_preferences.txt.
+
+    Falls back to NUMBER_OF_APPLE_SNACKS if the setting is missing from the
+    user preferences file.
+    """
+    apples_setting = get_file_dict('user_preferences').get('APPLES')
+    if apples_setting is None:
+        return NUMBER_OF_APPLE_SNACKS
+    return int(apples_setting.split('~')[1])
+
+
+def spawn_apple_snacks(window: pygame.Surface, board: GameBoard, count: int) -> list['AppleSnack']:
+    """Place up to entered number of new apples on free board cells and return them.
+
+    Stops early if the board runs out of free cells. Each apple adds itself
+    to the board's item dict when created.
+    """
+    apple_list = []
+    for _ in range(count):
+        if not board.has_free_cell():
+            break
+        apple_list.append(AppleSnack(window, board))
+    return apple_list
+
+
+def draw_items(window: pygame.Surface, items) -> None:
+    """Blit every item in entered iterable of items to screen with one blits call (see AppleSnack.get_blit_pair)."""
+    window.blits([item.get_blit_pair() for item in items], False)
 
 
 class Item(object):
@@ -20,41 +60,52 @@ class Item(object):
     This class contains all the basic information and content common of all
     game item objects. Only meant to be used as an (abstract) parent class for
     other more specific item classes. Common attributes of all game item
-    objects: window to blit item, list of rect items already on screen (used
-    to ensure new item isn't blit behind or on top of anything already on the
-    screen), method to find a pos that isn't occupied, and a random position
-    to blit item to.
+    objects: window to blit item, the game board (used to ensure new item
+    isn't blit behind or on top of anything already on the board), method to
+    find a pos that isn't occupied, and a random position to blit item to.
+    Items should only be created while the board still has a free cell,
+    unless they're given the cell to be put in (which doesn't use the board's
+    random number generator, so a seeded game's apples aren't changed).
     """
 
-    def __init__(self, window: pygame.Surface, item_rect_list: list[pygame.Rect]) -> None:
+    def __init__(self, window: pygame.Surface, board: GameBoard, cell: tuple[int, int] | None = None) -> None:
         self.window = window
-        self.item_rect_list = item_rect_list
+        self.board = board
+        self.cell = (0, 0)
         self.x = 0
         self.y = 0
-        self.pos = self.random_pos()
+        if cell is None:
+            self.pos = self.random_pos()
+        else:
+            self.cell = cell
+            self.x, self.y = self.pos = self.board.cell_to_center(self.cell)
+        self.board.add_item(self)
 
     def random_pos(self) -> tuple[int, int]:
         """Return a random (x, y) coordinate tuple.
 
-        Uses the item_rect_list attribute to find an (x, y) coordinate not
-        currently occupied by any rect and returns it.
+        Asks the game board for a random cell not currently occupied by the
+        snake or any other item and returns the pixel center of that cell.
 
         Returns:
             self.x, self.y: A tuple representing a random x, y coordinate.
         """
-        item_rect_x_list = [rect.centerx for rect in self.item_rect_list]
-        item_rect_y_list = [rect.centery for rect in self.item_rect_list]
-
-        while True:
-            self.x = random.randrange(40, 761, SNAKE_CUBE_DISPLACEMENT)
-            if self.x not in item_rect_x_list:
-                break
-        while True:
-            self.y = random.randrange(70, 471, SNAKE_CUBE_DISPLACEMENT)
-            if self.y not in item_rect_y_list:
-                break
+        self.cell = self.board.get_random_free_cell()
+        self.x, self.y = self.board.cell_to_center(self.cell)
         return self.x, self.y
 
+    def remove(self) -> None:
+        """Remove item from the board's item dict."""
+        if self.board.item_cell_dict.get(self.cell) is self:
+            self.board.remove_item(self.cell)
+
+    def set_cell(self, cell: tuple[int, int]) -> None:
+        """Move item to entered (free) cell instead of a random one."""
+        self.remove()
+        self.cell = cell
+        self.x, self.y = self.pos = self.board.cell_to_center(self.cell)
+        self.board.add_item(self)
+
 
 class AppleSnack(Item):
     """Apple snack version of Item class that gives 100 points for each eaten.
@@ -62,17 +113,37 @@ class AppleSnack(Item):
     This class creates an apple object with a random position and blits it to
     the screen when draw method is called. Apple snack represents the basic
     "powerup", simply giving 100 points and disappearing from the screen when
-    eaten by snake.
+    eaten by snake. The scaled apple image is loaded once per size and shared
+    by every apple (the class level apple_image_dict), so spawning hundreds of
+    apples doesn't load and scale the image file hundreds of times.
     """
 
-    def __init__(self, window: pygame.Surface, item_rect_list: list[pygame.Rect]) -> None:
-        super().__init__(window, item_rect_list)
-        self.width = ITEM_APPLE_SNACK_WIDTH
-        self.height = ITEM_APPLE_SNACK_HEIGHT
-        self.apple_image = pygame.transform.scale(pygame.Surface.convert_alpha(pygame.image.load(
-            os.path.join('project_assets', 'items', 'round_apple.png'))), (self.width, self.height))
+    apple_image_dict = {}  # {(width, height): scaled apple image}
+
+    def __init__(self, window: pygame.Surface, board: GameBoard, cell: tuple[int, int] | None = None) -> None:
+        super().__init__(window, board, cell)
+        self.width = self.board.cell_size
+        self.height = self.board.cell_size
+        self.apple_image = self.get_apple_image((self.width, self.height))
         self.apple_rect = self.apple_image.get_rect(center=self.pos)
 
+    @classmethod
+    def get_apple_image(cls, size: tuple[int, int]) -> pygame.Surface:
+        """Return apple image scaled to entered size (loaded on first use)."""
+        if size not in cls.apple_image_dict:
+            cls.apple_image_dict[size] = load_image(
+                os.path.join('project_assets', 'items', 'round_apple.png'), size)
+        return cls.apple_image_dict[size]
+
+    def set_cell(self, cell: tuple[int, int]) -> None:
+        """Move apple (and its rect) to entered (free) cell."""
+        super().set_cell(cell)
+        self.apple_rect.center = self.pos
+
+    def get_blit_pair(self) -> tuple[pygame.Surface, pygame.Rect]:
+        """Return (image, rect) pair used to blit apple."""
+        return self.apple_image, self.apple_rect
+
     def draw(self) -> None:
         """Blit apple snack item to screen."""
         self.window.blit(self.apple_image, self.apple_rect)
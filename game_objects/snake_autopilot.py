@@ -0,0 +1,317 @@
+"""Define autopilot class that can drive a snake in place of the keyboard.
+
+This module holds a class responsible for steering a snake player object
+without any user input, used as an attract mode (the game playing itself) and
+as a baseline bot for comparing other strategies against.
+
+Classes:
+    SnakeAutopilot: Steers a snake to the nearest apple without trapping it.
+"""
+
+import heapq
+from collections import deque
+from misc.constants import *
+from game_objects.game_board import GameBoard
+from game_objects.snake_player import PlayerSnake
+
+
+class SnakeAutopilot(object):
+    """Autopilot that steers a snake towards the nearest apple.
+
+    This class searches the board for the shortest path from the snake's head
+    to the nearest apple (A* guided by the distance to the closest apple when
+    there are only a few apples on the board, so that large boards aren't
+    searched cell by cell, or breadth first when apples are everywhere and the
+    nearest one is only a few cells away anyway), then checks
+    that the path is safe: after following it and eating the apple, the
+    snake's head must still be able to reach its own tail (so it can always
+    escape by following its tail). If the nearest apple's path isn't safe,
+    the paths to the next nearest apples are checked too (up to
+    AUTOPILOT_SAFE_PATH_CANDIDATES apples in all). A safe path is kept and
+    followed over the following ticks instead of searching again every tick,
+    since the only board changes in between are the snake's own head and tail
+    moving (new apples only spawn on free cells, so they can never block the
+    path). The path is thrown away and searched for again once the apple is
+    gone, the snake leaves the path, or the next cell on it stops being free
+    (e.g. when another snake moves in the way). If no safe path exists, the
+    autopilot follows its tail, the long way round (to the neighboring cell
+    furthest from the tail that can still reach it, which gives the body the
+    most time to move out of the way), or if the tail can't be reached, to
+    whichever neighboring cell leaves the most room to move in, and searches
+    for an apple again every AUTOPILOT_FAILED_SEARCH_RETRY_TICKS ticks.
+
+    The autopilot only looks one apple ahead, so it doesn't always fill the
+    board (use HamiltonianAutopilot for that). With a few apples, it usually
+    gets within a few cells of filling the board, then crashes into itself in
+    the last few free cells, or finds that none of the last apples can be
+    eaten safely, follows its tail for a lap of the board and then goes for
+    the nearest apple anyway (usually crashing, instead of circling forever).
+    Once the snake and apples cover the whole board (many apples on a small
+    board), every move eats an apple, so the tail stops moving and the snake
+    crashes well before the board is full.
+    """
+
+    def __init__(self, snake_player: PlayerSnake, board: GameBoard) -> None:
+        self.snake_player = snake_player
+        self.board = board
+        self.path = deque()  # Cells the snake will move into, next cell first.
+        self.target_cell = None
+        self.ticks_until_search = 0  # Ticks to wait before searching again, after a failed search.
+        self.search_count = 0
+        self.fallback_tick_count = 0  # Ticks spent without a path (following the tail) since the last path.
+        self.direction_dict = {(0, -1): 'up', (1, 0): 'right', (0, 1): 'down', (-1, 0): 'left'}
+
+    def steer(self) -> None:
+        """Set the snake's direction for its next move."""
+        next_cell = self.get_next_cell()
+        if next_cell is not None:
+            head_cell = self.snake_player.head_cell
+            self.snake_player.set_direction(self.direction_dict[(next_cell[0] - head_cell[0],
+                                                                 next_cell[1] - head_cell[1])])
+
+    def reset(self) -> None:
+        """Forget current path (used for a new game)."""
+        self.path.clear()
+        self.target_cell = None
+        self.ticks_until_search = 0
+        self.fallback_tick_count = 0
+
+    def get_next_cell(self) -> tuple[int, int] | None:
+        """Return cell the snake should move into next (None if it's trapped).
+
+        Follows the current path if it's still valid, otherwise searches for
+        a new safe path to one of the nearest apples, otherwise falls back to
+        following the tail (see get_fallback_cell).
+        """
+        if not self.is_path_valid():
+            self.path.clear()
+            if self.ticks_until_search > 0:
+                self.ticks_until_search -= 1
+            else:
+                self.search_path()
+                if not self.path:
+                    self.ticks_until_search = AUTOPILOT_FAILED_SEARCH_RETRY_TICKS
+
+        if self.path:
+            self.fallback_tick_count = 0
+            return self.path.popleft()
+        self.fallback_tick_count += 1
+        return self.get_fallback_cell()
+
+    def is_path_valid(self) -> bool:
+        """Return True if the current path can still be followed this tick."""
+        if not self.path or self.target_cell not in self.board.item_cell_dict:
+            return False
+        next_cell = self.path[0]
+        head_cell = self.snake_player.head_cell
+        if abs(next_cell[0] - head_cell[0]) + abs(next_cell[1] - head_cell[1]) != 1:
+            return False
+        return self.is_passable(next_cell, self.get_tail_cell(), self.get_neck_cell())
+
+    def get_tail_cell(self) -> tuple[int, int]:
+        """Return cell of the snake's last body cube."""
+        return self.board.pos_to_cell(self.snake_player.snake_cube_rect_list[-1].center)
+
+    def get_neck_cell(self) -> tuple[int, int]:
+        """Return cell of the snake's first body cube (directly behind its head)."""
+        return self.board.pos_to_cell(self.snake_player.snake_cube_rect_list[1].center)
+
+    def is_passable(self, cell: tuple[int, int], tail_cell: tuple[int, int], neck_cell: tuple[int, int]) -> bool:
+        """Return True if the snake can move into entered cell next tick.
+
+        A cell is passable if it's on the board and holds no snake cube, or if
+        it holds only the snake's own tail (which moves out of the way as the
+        head moves in), unless the tail is also the neck (moving into the neck
+        means reversing, which snakes can't do).
+        """
+        if not self.board.is_in_bounds(cell) or cell == neck_cell:
+            return False
+        count = self.board.snake_cell_dict.get(cell, 0)
+        return count == 0 or (count == 1 and cell == tail_cell)
+
+    def get_neighbor_cell_list(self, cell: tuple[int, int]) -> list[tuple[int, int]]:
+        """Return the 4 cells next to entered cell (some may be off the board)."""
+        return [(cell[0] + offset[0], cell[1] + offset[1]) for offset in self.direction_dict]
+
+    def search_path(self) -> None:
+        """Search for a safe path to one of the nearest apples and store it.
+
+        The path to the nearest reachable item is checked first, then (if it
+        isn't safe, see is_path_safe) the paths to the next nearest items, in
+        order. The first safe path found becomes the current path. If none is
+        safe and the snake has already followed its tail for longer than it
+        takes to go round the whole board (so it would otherwise circle
+        forever), the path to the nearest item is taken anyway.
+        """
+        self.search_count += 1
+        nearest_path = []
+        if len(self.board.item_cell_dict) <= AUTOPILOT_A_STAR_MAX_TARGETS:
+            nearest_path = self.find_nearest_item_path_a_star()
+            if not nearest_path:
+                return
+            if self.is_path_safe(nearest_path):
+                self.set_path(nearest_path)
+                return
+        # (Items are found in order of path length, so the nearest item checked above is the first one found).
+        for path in self.find_item_path_list_breadth_first(AUTOPILOT_SAFE_PATH_CANDIDATES):
+            if not nearest_path:
+                nearest_path = path
+            elif path == nearest_path:
+                continue
+            if self.is_path_safe(path):
+                self.set_path(path)
+                return
+        if nearest_path and self.fallback_tick_count > self.board.cell_count:
+            self.set_path(nearest_path)
+
+    def set_path(self, path: list[tuple[int, int]]) -> None:
+        """Store entered path (excluding head cell) as the current path."""
+        self.path = deque(path)
+        self.target_cell = path[-1]
+
+    def find_item_path_list_breadth_first(self, path_limit: int) -> list[list[tuple[int, int]]]:
+        """Return shortest paths (excluding head cell) to the nearest items, nearest first.
+
+        Breadth first search from the snake's head that stops once entered
+        number of cells holding an item have been reached (paths don't go
+        through items, since the snake would eat them on the way).
+        """
+        head_cell = self.snake_player.head_cell
+        tail_cell = self.get_tail_cell()
+        neck_cell = self.get_neck_cell()
+        parent_dict = {head_cell: None}
+        cell_queue = deque([head_cell])
+        path_list = []
+        while cell_queue and len(path_list) < path_limit:
+            cell = cell_queue.popleft()
+            if cell in self.board.item_cell_dict:
+                path_list.append(self.make_path(parent_dict, cell))
+                continue
+            for neighbor_cell in self.get_neighbor_cell_list(cell):
+                if neighbor_cell not in parent_dict and self.is_passable(neighbor_cell, tail_cell, neck_cell):
+                    parent_dict[neighbor_cell] = cell
+                    cell_queue.append(neighbor_cell)
+        return path_list
+
+    def find_nearest_item_path_a_star(self) -> list[tuple[int, int]]:
+        """Return shortest path (excluding head cell) to nearest item, or [] if none is reachable.
+
+        A* search from the snake's head, where the estimated distance left
+        from a cell is the (Manhattan) distance to the closest item. Since
+        that estimate never overestimates, the first item reached is the one
+        nearest by path length, just like a breadth first search, but far
+        fewer cells are looked at on an open board.
+        """
+        head_cell = self.snake_player.head_cell
+        tail_cell = self.get_tail_cell()
+        neck_cell = self.get_neck_cell()
+        item_cell_list = list(self.board.item_cell_dict)
+        if not item_cell_list:
+            return []
+
+        def estimate(cell: tuple[int, int]) -> int:
+            return min(abs(cell[0] - item_cell[0]) + abs(cell[1] - item_cell[1]) for item_cell in item_cell_list)
+
+        parent_dict = {head_cell: None}
+        distance_dict = {head_cell: 0}
+        # (Ties between equal estimates go to the cell furthest along, i.e. -distance is the second sort key).
+        cell_heap = [(estimate(head_cell), 0, head_cell)]
+        while cell_heap:
+            _, negative_distance, cell = heapq.heappop(cell_heap)
+            distance = -negative_distance
+            if distance > distance_dict[cell]:
+                continue
+            if cell in self.board.item_cell_dict:
+                return self.make_path(parent_dict, cell)
+            for neighbor_cell in self.get_neighbor_cell_list(cell):
+                if (distance + 1 < distance_dict.get(neighbor_cell, self.board.cell_count)
+                        and self.is_passable(neighbor_cell, tail_cell, neck_cell)):
+                    distance_dict[neighbor_cell] = distance + 1
+                    parent_dict[neighbor_cell] = cell
+                    heapq.heappush(cell_heap, (distance + 1 + estimate(neighbor_cell), -distance - 1, neighbor_cell))
+        return []
+
+    def make_path(self, parent_dict: dict, end_cell: tuple[int, int]) -> list[tuple[int, int]]:
+        """Return path from (but excluding) search start cell to end cell, following parent_dict."""
+        path = []
+        cell = end_cell
+        while parent_dict[cell] is not None:
+            path.append(cell)
+            cell = parent_dict[cell]
+        path.reverse()
+        return path
+
+    def is_path_safe(self, path: list[tuple[int, int]]) -> bool:
+        """Return True if the snake can still reach its tail after following path.
+
+        Works out where every cube of the snake would be after following the
+        entered path and eating the apple at the end of it (one cube longer),
+        then flood fills from that head position to see if the tail can be
+        reached through cells that would be free.
+        """
+        own_cell_list = self.snake_player.get_cell_list()
+        future_cell_list = (list(reversed(path)) + own_cell_list)[:len(own_cell_list) + 1]
+        future_head_cell = future_cell_list[0]
+        future_tail_cell = future_cell_list[-1]
+        blocked_cell_set = set(future_cell_list[:-1])
+        own_cell_set = set(own_cell_list)
+        visited_cell_set = {future_head_cell}
+        cell_queue = deque([future_head_cell])
+        while cell_queue:
+            cell = cell_queue.popleft()
+            for neighbor_cell in self.get_neighbor_cell_list(cell):
+                # (Right after eating, the tail stays put for a tick, so the head can't move straight into it).
+                if neighbor_cell == future_tail_cell and cell != future_head_cell:
+                    return True
+                if (neighbor_cell in visited_cell_set or neighbor_cell in blocked_cell_set
+                        or not self.board.is_in_bounds(neighbor_cell)
+                        or (neighbor_cell in self.board.snake_cell_dict and neighbor_cell not in own_cell_set)):
+                    continue
+                visited_cell_set.add(neighbor_cell)
+                cell_queue.append(neighbor_cell)
+        return False
+
+    def get_fallback_cell(self) -> tuple[int, int] | None:
+        """Return neighboring cell furthest from the tail that can still reach it (or with the most room).
+
+        Each passable neighbor of the head is flood filled and scored by
+        whether the snake's tail can be reached from it, then by how far away
+        the tail is (following the tail the long way round keeps the snake
+        from circling in the same small loop forever), then by how many cells
+        it can reach (up to the snake's length, which is all the room it
+        needs). Returns None if no neighboring cell is passable.
+        """
+        tail_cell = self.get_tail_cell()
+        neck_cell = self.get_neck_cell()
+        room_limit = len(self.snake_player.snake_cube_rect_list) + 1
+        best_cell = None
+        best_score = None
+        for cell in self.get_neighbor_cell_list(self.snake_player.head_cell):
+            if not self.is_passable(cell, tail_cell, neck_cell):
+                continue
+            score = self.get_room_score(cell, tail_cell, room_limit)
+            if best_score is None or score > best_score:
+                best_cell, best_score = cell, score
+        return best_cell
+
+    def get_room_score(self, start_cell: tuple[int, int], tail_cell: tuple[int, int], room_limit: int,
+                       ) -> tuple[bool, int, int]:
+        """Return (tail reachable, steps to tail, number of reachable cells) from entered cell.
+
+        The flood fill is breadth first, so the tail is found at its shortest
+        distance (steps to tail is -1 if it can't be reached). It stops once
+        the tail has been found and room_limit cells have been reached.
+        """
+        tail_distance = 0 if start_cell == tail_cell else -1
+        distance_dict = {start_cell: 0}
+        cell_queue = deque([start_cell])
+        while cell_queue and (tail_distance < 0 or len(distance_dict) < room_limit):
+            cell = cell_queue.popleft()
+            for neighbor_cell in self.get_neighbor_cell_list(cell):
+                if neighbor_cell == tail_cell and tail_distance < 0:
+                    tail_distance = distance_dict[cell] + 1
+                if (neighbor_cell not in distance_dict and self.board.is_in_bounds(neighbor_cell)
+                        and neighbor_cell not in self.board.snake_cell_dict):
+                    distance_dict[neighbor_cell] = distance_dict[cell] + 1
+                    cell_queue.append(neighbor_cell)
+        return tail_distance >= 0, tail_distance, min(len(distance_dict), room_limit)
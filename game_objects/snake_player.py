@@ -1,16 +1,60 @@
 """Define game's snake player class.
 
 This module holds a class responsible for blitting the program's snake player
-object used in-game by user.
+object used in-game by user, along with functions for setting up one snake
+per local player.
+
+Functions:
+    get_player_count: Returns number of local players from user prefs.
+    make_snake_player_list: Returns a snake for each local player.
 
 Classes:
     PlayerSnake: Snake object controlled by user in-game.
 """
 
 import os
+from collections import deque
+from itertools import islice
 import pygame
 from misc.constants import *
+from misc.asset_cache import load_image
 from misc.saved_data_io_functions import get_file_dict
+from game_objects.game_board import GameBoard
+
+
+def get_player_count() -> int:
+    """Return number of local players from user_preferences.txt (1 if missing)."""
+    players_setting = get_file_dict('user_preferences').get('PLAYERS')
+    if players_setting is None:
+        return 1
+    return min(int(players_setting.split('~')[1]), MAX_LOCAL_PLAYERS)
+
+
+def make_snake_player_list(window: pygame.Surface, board: GameBoard, player_count: int) -> list['PlayerSnake']:
+    """Return list holding a snake for each local player.
+
+    Snakes start spread evenly along the board's start row. The first snake
+    uses the user's selected snake skin, and every other snake uses a skin
+    further along in the list of available skins, so that each player's snake
+    has its own color.
+
+    Args:
+        window: Surface that snakes are blit to.
+        board: Game board shared by every snake.
+        player_count: Number of snakes to make.
+
+    Returns:
+        snake_player_list: List of PlayerSnake objects, in player order.
+    """
+    skin_option_list = get_file_dict('game_options').get('SNAKE SKIN')
+    selected_skin_option = get_file_dict('user_preferences').get('SNAKE SKIN')
+    first_skin_index = skin_option_list.index(selected_skin_option) if selected_skin_option in skin_option_list else 0
+    snake_player_list = []
+    for index, start_cell in enumerate(board.get_start_cell_list(player_count)):
+        skin_option = skin_option_list[(first_skin_index + index * SNAKE_PLAYER_SKIN_STEP) % len(skin_option_list)]
+        snake_player_list.append(PlayerSnake(window, board, SNAKE_PLAYER_START_DIRECTION, start_cell,
+                                             skin_option.split('~')[1]))
+    return snake_player_list
 
 
 class PlayerSnake(object):
@@ -24,32 +68,45 @@ class PlayerSnake(object):
     snake head/body cube to the screen, changing the snake's direction,
     running a die method that stops the snake and has a death "animation",
     resetting the snake (so that the same object can be used again but from
-    the start of the game), etc.
+    the start of the game), etc. Several snakes can share one board (local
+    multiplayer), each with its own start cell and skin. The snake's cube
+    rects are kept in a deque (head first), since cubes are only ever added
+    or removed next to either end of the snake.
     """
 
-    def __init__(self, window: pygame.Surface, head_pos: tuple[int, int], direction: str) -> None:
+    def __init__(self, window: pygame.Surface, board: GameBoard, direction: str,
+                 start_cell: tuple[int, int] | None = None, snake_skin: str | None = None) -> None:
         self.window = window
-        self.head_pos = head_pos
+        self.board = board
+        self.start_cell = self.board.start_cell if start_cell is None else start_cell
+        self.head_cell = self.start_cell
+        self.head_pos = self.board.cell_to_center(self.head_cell)
         self.direction = direction
-        self.cube_width = SNAKE_CUBE_WIDTH
-        self.cube_height = SNAKE_CUBE_HEIGHT
+        self.cube_width = self.board.cell_size
+        self.cube_height = self.board.cell_size
+        self.body_cube_inset = self.board.cell_size // SNAKE_BODY_CUBE_INSET_DIVISOR
         self.user_preferences_dict = get_file_dict('user_preferences')
-        self.snake_skin = self.user_preferences_dict.get('SNAKE SKIN').split('~')[1]
-        self.head_cube = pygame.transform.scale(pygame.Surface.convert_alpha(pygame.image.load(
+        self.snake_skin = (self.user_preferences_dict.get('SNAKE SKIN').split('~')[1] if snake_skin is None
+                           else snake_skin)
+        # Head images for every direction are loaded once, so turning never loads an image file.
+        self.head_cube_dict = {head_direction: load_image(
             os.path.join('project_assets',
                          'snake_skins',
-                         f'{self.snake_skin}head_{self.direction}.png',
-                         ))), (self.cube_width, self.cube_height))
-        self.body_cube = pygame.transform.scale(pygame.Surface.convert_alpha(pygame.image.load(
+                         f'{self.snake_skin}head_{head_direction}.png',
+                         ), (self.cube_width, self.cube_height))
+            for head_direction in ['up', 'right', 'down', 'left']}
+        self.head_cube = self.head_cube_dict[self.direction]
+        self.body_cube = load_image(
             os.path.join('project_assets',
                          'snake_skins',
                          f'{self.snake_skin}body_cube.png',
-                         ))), (self.cube_width-2, self.cube_height-2))
+                         ), (self.cube_width-self.body_cube_inset, self.cube_height-self.body_cube_inset))
         self.head_cube_rect = self.head_cube.get_rect(center=self.head_pos)
-        self.snake_cube_rect_list = [self.head_cube_rect,
-                                     self.body_cube.get_rect(center=(self.head_pos[0],
-                                                                     self.head_pos[1]+SNAKE_CUBE_DISPLACEMENT))]
+        self.snake_cube_rect_list = deque([self.head_cube_rect,
+                                           self.body_cube.get_rect(center=(self.head_pos[0],
+                                                                           self.head_pos[1]+self.cube_height))])
         self.body_length = len(self.snake_cube_rect_list) - 1
+        self.occupy_board_cells()
         self.head_cube_displacement = (0, 0)
         self.displacement_dict = {'up': (0, -self.cube_height),
                                   'right': (self.cube_width, 0),
@@ -59,39 +116,78 @@ class PlayerSnake(object):
         self.dead = False
 
     def draw(self) -> None:
-        """Blit all MainMenu content to screen.
+        """Blit all PlayerSnake content to screen.
 
-        Blit each body cube in snake cube rect list instance attribute then
-        blit the head of the snake.
+        Blit each body cube in snake cube rect list instance attribute (in a
+        single blits call, since long snakes on large boards can have tens of
+        thousands of cubes) then blit the head of the snake.
         """
-        for body_cube in self.snake_cube_rect_list[1:]:
-            self.window.blit(self.body_cube, body_cube)
+        self.window.blits([(self.body_cube, body_cube) for body_cube in islice(self.snake_cube_rect_list, 1, None)],
+                          False)
         self.window.blit(self.head_cube, self.head_cube_rect)
 
     def move(self) -> None:
-        """Update the position of each snake cube in snake_cube_list.
+        """Update the position of the snake for the current frame.
 
-        A list of positions for all the snake cubes is created (from which a
-        list of displacement tuples is created for each snake cube). The snake
-        head cube is moved and every body cube takes the position of the body
-        cube before it, resulting in the snake body cubes moving with the head.
+        Moving every body cube up one place is the same as taking the last
+        (tail) body cube and putting it where the head was, so only the tail
+        cube and the head cube are moved, no matter how long the snake is (and
+        the tail cube is put back next to the head of the deque, which costs
+        the same for any length, unlike inserting near the start of a list). The
+        board's snake cell counts are updated for the vacated tail cell and
+        the head's new cell.
         """
-        snake_cube_pos_list = [cube.center for cube in self.snake_cube_rect_list]
-        snake_cube_displace_list = [(pos_final[0]-pos_initial[0], pos_final[1]-pos_initial[1])
-                                    for pos_final, pos_initial in zip(snake_cube_pos_list, snake_cube_pos_list[1:])]
+        tail_cube = self.snake_cube_rect_list.pop()
+        self.board.vacate_snake_cell(self.board.pos_to_cell(tail_cube.center))
+        tail_cube.center = self.head_cube_rect.center
+        self.snake_cube_rect_list.insert(1, tail_cube)
         self.head_cube_displacement = self.displacement_dict[self.direction]
         self.head_cube_rect.move_ip(self.head_cube_displacement)
-        for body_cube, displace in zip(self.snake_cube_rect_list[1:], snake_cube_displace_list):
-            body_cube.move_ip(displace)
+        if self.board.observation is not None:
+            self.board.mark_head_cell(self.head_cell, False)
+        self.head_cell = (self.head_cell[0] + self.head_cube_displacement[0] // self.cube_width,
+                          self.head_cell[1] + self.head_cube_displacement[1] // self.cube_height)
+        self.board.occupy_snake_cell(self.head_cell)
+        if self.board.observation is not None:
+            self.board.mark_head_cell(self.head_cell, True)
+
+    def undo_move(self, tail_cell: tuple[int, int], direction: str) -> None:
+        """Move snake back to where it was before its last move (used for rewinding).
+
+        The reverse of move: the head goes back to the first body cube's cell,
+        and that body cube is put back in entered tail cell (the cell the
+        tail left when the snake moved), so only two cubes are moved no matter
+        how long the snake is. The snake faces entered direction afterwards
+        (its direction before the move).
+        """
+        self.board.vacate_snake_cell(self.head_cell)
+        self.board.mark_head_cell(self.head_cell, False)
+        body_cube = self.snake_cube_rect_list[1]
+        del self.snake_cube_rect_list[1]
+        self.head_cell = self.board.pos_to_cell(body_cube.center)
+        self.head_cube_rect.center = body_cube.center
+        self.board.mark_head_cell(self.head_cell, True)
+        body_cube.center = self.board.cell_to_center(tail_cell)
+        self.snake_cube_rect_list.append(body_cube)
+        self.board.occupy_snake_cell(tail_cell)
+        self.direction = direction
+        self.head_cube = self.head_cube_dict[self.direction]
+
+    def has_crashed(self) -> bool:
+        """Return True if snake head is in a border or in any snake's cube.
+
+        The board's snake cell counts include every snake on the board, so a
+        count above 1 in the head's cell means this snake ran into itself,
+        into another snake's body, or head first into another snake's head.
+        """
+        return not self.board.is_in_bounds(self.head_cell) or self.board.get_snake_cell_count(self.head_cell) > 1
 
     def change_direction(self, direction_const: str, direction_dict: dict) -> None:
         """Check key input and change direction of snake accordingly.
 
         Takes in a key int that corresponds to a particular direction then
-        determines the string version of that direction via the inputted dict.
-        If the entered direction isn't in the opposite of the snake's current
-        direction, then the direction is changed and the snake head image of
-        the new direction is loaded.
+        determines the string version of that direction via the inputted dict
+        and sets the snake's direction to it (see set_direction).
 
         Args:
             direction_const: Used to determine what direction string is
@@ -100,33 +196,97 @@ class PlayerSnake(object):
                 direction_const int and to check if new direction isn't in
                 opposite direction of new one.
         """
-        new_direction = direction_dict[direction_const]
+        self.set_direction(direction_dict[direction_const])
+
+    def set_direction(self, new_direction: str) -> None:
+        """Change direction of snake to entered direction string.
+
+        If the entered direction isn't in the opposite of the snake's current
+        direction, then the direction is changed and the snake head image of
+        the new direction is used. (Used directly by the autopilot).
+        """
         if {self.direction, new_direction} not in [{'left', 'right'}, {'up', 'down'}]:
             self.direction = new_direction
-            self.head_cube = pygame.transform.scale(pygame.Surface.convert_alpha(pygame.image.load(
-                os.path.join('project_assets',
-                             'snake_skins',
-                             f'{self.snake_skin}head_{self.direction}.png',
-                             ))), (self.cube_width, self.cube_height))
+            self.head_cube = self.head_cube_dict[self.direction]
 
     def increase_length(self) -> None:
         """Increase length of snake and append new body rect to cube list."""
         new_cube_pos = self.snake_cube_rect_list[-1].center
         new_cube = self.body_cube.get_rect(center=new_cube_pos)
         self.snake_cube_rect_list.append(new_cube)
+        self.board.occupy_snake_cell(self.board.pos_to_cell(new_cube_pos))
+
+    def decrease_length(self) -> None:
+        """Remove last body rect from cube list (undoes increase_length, used for rewinding)."""
+        tail_cube = self.snake_cube_rect_list.pop()
+        self.board.vacate_snake_cell(self.board.pos_to_cell(tail_cube.center))
+
+    def get_cell_list(self) -> list[tuple[int, int]]:
+        """Return list of every cell the snake is in, from head to tail."""
+        return [self.head_cell] + [self.board.pos_to_cell(body_cube.center)
+                                   for body_cube in islice(self.snake_cube_rect_list, 1, None)]
+
+    def set_cell_list(self, cell_list: list[tuple[int, int]], direction: str) -> None:
+        """Move snake so that it's in entered cells (head to tail), facing entered direction.
+
+        Used to show a snake whose position comes from somewhere else (e.g. a
+        network game's state) rather than from moving it. The existing cube
+        rects are reused (only rects for any extra length are made), and the
+        board's snake cell counts are updated. The snake is alive afterwards.
+        """
+        self.vacate_board_cells()
+        self.head_cell = cell_list[0]
+        self.direction = direction
+        self.head_cube = self.head_cube_dict[self.direction]
+        self.head_cube_rect = self.head_cube.get_rect(center=self.board.cell_to_center(self.head_cell))
+        while len(self.snake_cube_rect_list) > len(cell_list):
+            self.snake_cube_rect_list.pop()
+        self.snake_cube_rect_list[0] = self.head_cube_rect
+        for body_cube, cell in zip(islice(self.snake_cube_rect_list, 1, None), islice(cell_list, 1, None)):
+            body_cube.center = self.board.cell_to_center(cell)
+        for cell in cell_list[len(self.snake_cube_rect_list):]:
+            self.snake_cube_rect_list.append(self.body_cube.get_rect(center=self.board.cell_to_center(cell)))
+        self.body_length = len(self.snake_cube_rect_list) - 1
+        self.occupy_board_cells()
+        self.dead = False
+
+    def occupy_board_cells(self) -> None:
+        """Add every snake cube to the board's snake cell counts."""
+        self.board.occupy_snake_cell(self.head_cell)
+        self.board.mark_head_cell(self.head_cell, True)
+        for body_cube in islice(self.snake_cube_rect_list, 1, None):
+            self.board.occupy_snake_cell(self.board.pos_to_cell(body_cube.center))
+
+    def vacate_board_cells(self) -> None:
+        """Remove every snake cube from the board's snake cell counts.
+
+        (The head cell attribute is used rather than the head rect, since the
+        head rect is moved back and inflated when the snake dies).
+        """
+        self.board.vacate_snake_cell(self.head_cell)
+        self.board.mark_head_cell(self.head_cell, False)
+        for body_cube in islice(self.snake_cube_rect_list, 1, None):
+            self.board.vacate_snake_cell(self.board.pos_to_cell(body_cube.center))
 
     def die(self) -> None:
         """Kill snake player (end game stuff)."""
         head_cube_inflate_amount = tuple((abs(coord) for coord in reversed(self.displacement_dict[self.direction])))
         self.head_cube_displacement = tuple((-coord for coord in self.displacement_dict[self.direction]))
         self.head_cube_rect.move_ip(self.head_cube_displacement)
-        self.head_cube = pygame.transform.scale(pygame.Surface.convert_alpha(pygame.image.load(
-            os.path.join('project_assets', 'snake_skins', f'{self.snake_skin}head_{self.direction}.png'))),
+        self.head_cube = load_image(
+            os.path.join('project_assets', 'snake_skins', f'{self.snake_skin}head_{self.direction}.png'),
             (self.cube_width+head_cube_inflate_amount[0], self.cube_height+head_cube_inflate_amount[1]),
         )
         self.head_cube_rect.inflate_ip(head_cube_inflate_amount)
         self.dead = True
 
+    def revive(self) -> None:
+        """Bring dead snake back to life where it crashed (undoes die, used for rewinding)."""
+        self.head_cube = self.head_cube_dict[self.direction]
+        self.head_cube_rect = self.head_cube.get_rect(center=self.board.cell_to_center(self.head_cell))
+        self.snake_cube_rect_list[0] = self.head_cube_rect
+        self.dead = False
+
     def reset(self) -> None:
         """Reset snake instance to be used in next game.
 
@@ -136,19 +296,16 @@ class PlayerSnake(object):
         body length attribute is set back to 1, and the dead attribute boolean
         is set back to False.
         """
-        self.head_pos = START_BUTTON_TEXT
+        self.vacate_board_cells()
+        self.head_cell = self.start_cell
+        self.head_pos = self.board.cell_to_center(self.head_cell)
         self.direction = SNAKE_PLAYER_START_DIRECTION
-        self.head_cube = pygame.transform.scale(pygame.Surface.convert_alpha(pygame.image.load(
-            os.path.join('project_assets', 'snake_skins', f'{self.snake_skin}head_{self.direction}.png'))),
-            (self.cube_width, self.cube_height),
-        )
-        self.body_cube = pygame.transform.scale(pygame.Surface.convert_alpha(pygame.image.load(
-            os.path.join('project_assets', 'snake_skins', f'{self.snake_skin}body_cube.png'))),
-            (self.cube_width-2, self.cube_height-2),
-        )
+        self.head_cube = self.head_cube_dict[self.direction]
+        # (The body cube image loaded in __init__ is reused, since it never changes).
         self.head_cube_rect = self.head_cube.get_rect(center=self.head_pos)
-        self.snake_cube_rect_list = [self.head_cube_rect,
-                                     self.body_cube.get_rect(center=(self.head_pos[0],
-                                                                     self.head_pos[1]+SNAKE_CUBE_DISPLACEMENT))]
+        self.snake_cube_rect_list = deque([self.head_cube_rect,
+                                           self.body_cube.get_rect(center=(self.head_pos[0],
+                                                                           self.head_pos[1]+self.cube_height))])
         self.body_length = len(self.snake_cube_rect_list) - 1
+        self.occupy_board_cells()
         self.dead = False
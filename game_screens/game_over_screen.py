@@ -1,35 +1,43 @@
 """Define game over screen class of program.
 
 This module holds the class responsible for blitting the program's game over
-screen, called after snake game end conditions are met.
+screen, called after snake game end conditions are met. The screen is shown
+after a short wait (scheduled on a timer queue, during which the final frame
+of the game stays on screen and closing the window still works).
 
 Classes:
     GameOverScreen: Contains game over screen of program.
 """
 
 import os
-import sys
 import pygame
 from misc.buttons import TextButton
 from misc.constants import *
+from misc.asset_cache import load_image
+from misc.frame_tracer import frame_tracer
 from misc.saved_data_io_functions import save_new_player_score
+from misc.scene_manager import Scene
+from misc.sound_bank import sound_bank
 from misc.text_box import TextBox
+from misc.timers import TimerQueue
 
 
-class GameOverScreen(object):
+class GameOverScreen(Scene):
     """Contains all game over screen content to be blitted to the screen.
 
     This class contains all the information and content to be blitted to the
     screen as well as a draw method that actually blits everything
-    categorized as being in the game over screen. Includes event loop that
-    checks for mouse click events. Content in the game over screen includes:
-    a game over title, the user's score, a continue button, and if the user's
-    score was over 0, both a "no thanks" button and an input name caption next
-    to a text box.
+    categorized as being in the game over screen. Includes event handling
+    that checks for mouse click events. Content in the game over screen
+    includes: a game over title, the user's score, a continue button, and if
+    the user's score was over 0, both a "no thanks" button and an input name
+    caption next to a text box. The screen is made once per game session and
+    reused after every game, with prepare called before each visit to show
+    that game's score (only the score text is rendered again).
     """
 
     def __init__(self, window: pygame.Surface, width: int, height: int, sfx_bool: str, music_bool: str,
-                 bg_dimensions: tuple[int, int], bg_pos: tuple[int, int], user_score: int) -> None:
+                 bg_dimensions: tuple[int, int], bg_pos: tuple[int, int]) -> None:
         self.window = window
         self.width = width
         self.height = height
@@ -37,13 +45,11 @@ class GameOverScreen(object):
         self.music_bool = music_bool
         self.bg_dimensions = bg_dimensions
         self.bg_pos = bg_pos
-        self.background = pygame.transform.scale(pygame.Surface.convert(pygame.image.load(
-            os.path.join('project_assets', 'backgrounds', 'black_background.png'))), self.bg_dimensions)
-        self.user_score = user_score
-        self.name_input = 'null' if self.user_score == 0 else ''
+        self.background = load_image(
+            os.path.join('project_assets', 'backgrounds', 'black_background.png'), self.bg_dimensions, alpha=False)
+        self.user_score = 0
+        self.name_input = 'null'
         self.caption = 'Snake - Game Over!'
-        self.game_over_sfx = pygame.mixer.Sound(os.path.join('project_assets', 'sfx', 'game_over.wav'))
-        self.click_sfx = pygame.mixer.Sound(os.path.join('project_assets', 'sfx', 'button_click.wav'))
         self.title = 'GAME OVER'
         self.title_font_size = GAME_OVER_TITLE_FONT_SIZE
         self.title_font = pygame.font.Font(ARCADE_FONT_FILE, self.title_font_size)
@@ -51,7 +57,7 @@ class GameOverScreen(object):
         self.title_pos = GAME_OVER_TITLE_POS
         self.title_surface = self.title_font.render(self.title, True, self.title_color)
         self.title_rect = self.title_surface.get_rect(center=self.title_pos)
-        self.text_list = ['Score:', f'{self.user_score}', 'Enter your name:']
+        self.text_list = ['Score:', '0', 'Enter your name:']
         self.text_font_size = GAME_OVER_TEXT_FONT_SIZE
         self.text_font = pygame.font.Font(ARCADE_FONT_FILE, self.text_font_size)
         self.text_color_list = [GAME_TEXT_GREEN, GAME_TEXT_LIGHT_BLUE, GAME_TEXT_GREEN]
@@ -61,100 +67,119 @@ class GameOverScreen(object):
         self.text_rect_list = [surface.get_rect(midright=pos)
                                for surface, pos in zip(self.text_surface_list, self.text_pos_list)]
         self.score_saved_bool = False
-        self.running = True
-
-    def run(self) -> None:
-        """Run game over screen event loop.
-
-        Creates no thanks button to skip option to input name and save to high
-        scores text file, continue button to go on to post game screen (or if
-        user score is over 0, to save inputted name with score to high scores
-        text file), and a name input text box to allow user to input a name if
-        they wish to save their score. Game over screen event loop is then
-        started. Event loop continuously draws game over screen content to
-        screen and checks for button hover and click events.
+        trace_start = frame_tracer.begin()
+        self.no_thanks_button = TextButton(self.window, NO_THANKS_BUTTON_POS, NO_THANKS_BUTTON_WIDTH,
+                                           GAME_OVER_BUTTON_HEIGHT, NO_THANKS_BUTTON_TEXT, GAME_OVER_BUTTON_FONT_SIZE)
+        self.continue_button = TextButton(self.window, CONTINUE_BUTTON_POS, CONTINUE_BUTTON_WIDTH,
+                                          GAME_OVER_BUTTON_HEIGHT, CONTINUE_BUTTON_TEXT, GAME_OVER_BUTTON_FONT_SIZE)
+        self.name_input_box = TextBox(self.window, INPUT_BOX_POS, INPUT_BOX_WIDTH, INPUT_BOX_HEIGHT,
+                                      GAME_COLOR_STONE_GREY, INPUT_BOX_FONT_SIZE, GAME_TEXT_LIGHT_BLUE)
+        frame_tracer.end('GameOverScreen: widget setup', trace_start, TRACE_CATEGORY_TRANSITION)
+        self.mouse_position = (0, 0)
+        self.shown = False
+        self.wait_trace_start = 0
+        self.timers = TimerQueue()
+        self.clock = pygame.time.Clock()
+
+    def prepare(self, user_score: int, user_name: str = '') -> None:
+        """Show entered score on the next visit, with the name text box starting out holding entered name."""
+        self.user_score = user_score
+        self.text_list[1] = f'{self.user_score}'
+        self.text_surface_list[1] = self.text_font.render(self.text_list[1], True, self.text_color_list[1])
+        self.text_rect_list[1] = self.text_surface_list[1].get_rect(midright=self.text_pos_list[1])
+        self.name_input_box.set_text(user_name)
+        self.name_input = 'null' if self.user_score == 0 else self.name_input_box.text
+        self.score_saved_bool = False
+
+    def enter(self) -> None:
+        """Schedule game over screen to be shown once the game over delay has passed."""
+        self.shown = False
+        self.timers.schedule(GAME_OVER_SCREEN_TIME_DELAY, self.show)
+        self.wait_trace_start = frame_tracer.begin()
+
+    def exit(self) -> None:
+        """Stop reading typed text (started when the screen was shown)."""
+        self.name_input_box.stop_typing()
+
+    def wait(self) -> None:
+        """Wait for the next frame (at a lower frame rate while the screen isn't shown yet)."""
+        self.clock.tick(GAME_OVER_FRAME_RATE if self.shown else GAME_OVER_WAIT_FRAME_RATE)
+
+    def handle_events(self, event_list: list[pygame.event.Event]) -> None:
+        """Check for button and text box click events, and typing while the text box is selected.
+
+        Events are ignored until the screen is shown (see show). The no
+        thanks button skips inputting a name and saving to the high scores
+        text file, the continue button goes on to the post game screen (or if
+        the user's score is over 0, saves inputted name with score to the high
+        scores text file first), and the name input text box lets the user
+        input a name if they wish to save their score (all of a frame's
+        typing is applied to the text box at once).
         """
-        pygame.time.delay(GAME_OVER_SCREEN_TIME_DELAY)
-        if self.sfx_bool == 'True':
-            self.game_over_sfx.play()
-        pygame.display.set_caption(self.caption)
-        no_thanks_button = TextButton(self.window, NO_THANKS_BUTTON_POS, NO_THANKS_BUTTON_WIDTH,
-                                      GAME_OVER_BUTTON_HEIGHT, NO_THANKS_BUTTON_TEXT, GAME_OVER_BUTTON_FONT_SIZE)
-        continue_button = TextButton(self.window, CONTINUE_BUTTON_POS, CONTINUE_BUTTON_WIDTH, GAME_OVER_BUTTON_HEIGHT,
-                                     CONTINUE_BUTTON_TEXT, GAME_OVER_BUTTON_FONT_SIZE)
-        name_input_box = TextBox(self.window, INPUT_BOX_POS, INPUT_BOX_WIDTH, INPUT_BOX_HEIGHT, GAME_COLOR_STONE_GREY,
-                                 INPUT_BOX_FONT_SIZE, GAME_TEXT_LIGHT_BLUE)
-
-        while self.running:
-            mouse_position = pygame.mouse.get_pos()
-            event_list = pygame.event.get()
-
-            for event in event_list:
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-
-                elif event.type == pygame.MOUSEBUTTONUP:  # Checks if mouse button was clicked.
-                    # Checks if cursor was hovering over a widget when clicked and if so, executes their code.
-
-                    if no_thanks_button.is_hovering(mouse_position) and self.user_score > 0:
-                        no_thanks_button.draw_clicked(self.sfx_bool)
-                        pygame.time.delay(BUTTON_CLICK_TIME_DELAY)
-                        self.running = False
-                        break
-                    elif continue_button.is_hovering(mouse_position):
-                        if 0 < len(self.name_input) <= TEXT_BOX_CHAR_LIMIT:
-                            continue_button.draw_clicked(self.sfx_bool)
-                            pygame.time.delay(BUTTON_CLICK_TIME_DELAY)
-                            if self.user_score > 0:
-                                save_new_player_score(self.user_score, self.name_input)
-                                self.score_saved_bool = True
-                            self.running = False
-                            break
-                        else:
-                            print('enter a name to continue')
-                    elif name_input_box.is_hovering(mouse_position):
-                        if self.sfx_bool == 'True' and not name_input_box.selected:
-                            self.click_sfx.play()
-                        name_input_box.selected = True
-                    else:
-                        name_input_box.selected = False
-                        print('nothing was clicked..')
-
-                # Checks if any letter keys were pressed while the input box was selected.
-                elif event.type == pygame.KEYDOWN and name_input_box.selected:
-                    key_pressed = pygame.key.name(event.key)
-                    if key_pressed.isalpha() and len(key_pressed) == 1:
-                        name_input_box.add_char(key_pressed)
-                        self.name_input = name_input_box.text
-                    elif event.key == pygame.K_BACKSPACE:
-                        name_input_box.remove_char()
-                        self.name_input = name_input_box.text
+        if not self.shown:
+            return
+        self.mouse_position = mouse_position = pygame.mouse.get_pos()
+
+        for event in event_list:
+            # Checks if mouse button was clicked (clicks are ignored while waiting to leave the screen).
+            if event.type == pygame.MOUSEBUTTONUP and not self.timers.is_pending():
+                # Checks if cursor was hovering over a widget when clicked and if so, executes their code.
+
+                if self.no_thanks_button.is_hovering(mouse_position) and self.user_score > 0:
+                    self.no_thanks_button.draw_clicked(self.sfx_bool)
+                    self.timers.schedule(BUTTON_CLICK_TIME_DELAY, self.stop)
+                elif self.continue_button.is_hovering(mouse_position):
+                    if 0 < len(self.name_input) <= TEXT_BOX_CHAR_LIMIT:
+                        self.continue_button.draw_clicked(self.sfx_bool)
+                        if self.user_score > 0:
+                            save_new_player_score(self.user_score, self.name_input)
+                            self.score_saved_bool = True
+                        self.timers.schedule(BUTTON_CLICK_TIME_DELAY, self.stop)
                     else:
-                        print('key pressed does nothing')
+                        print('enter a name to continue')
+                elif self.name_input_box.is_hovering(mouse_position):
+                    if self.sfx_bool == 'True' and not self.name_input_box.selected:
+                        sound_bank.play('button_click')
+                    self.name_input_box.selected = True
                 else:
-                    pass
-
-            self.draw(mouse_position, no_thanks_button, continue_button, name_input_box)
-
-    def draw(self, mouse_pos: tuple[int, int], no_thanks_button: TextButton, continue_button: TextButton,
-             name_input_box: TextBox) -> None:
-        """Blit all GameOverScreen content to screen.
-
-        Uses class attributes and entered args to blit the background, the
-        user's score and a label next to it, the continue button, and if the
-        user's score is over 0, an "enter your name" label, a text input box,
-        and a "no thanks" button.
-
-        Args:
-            mouse_pos: Used to determine which button mouse was hovering over,
-                if any.
-            no_thanks_button: Text button that goes straight to the post game
-                screen without saving score.
-            continue_button: Text button that saves user score before going to
-                the post game screen.
-            name_input_box: Text box to let user enter a name.
+                    self.name_input_box.selected = False
+                    print('nothing was clicked..')
+
+            else:
+                pass
+
+        # Checks if any letters were typed (or backspace pressed) while the input box was selected.
+        if self.user_score > 0 and not self.timers.is_pending() and self.name_input_box.handle_events(event_list):
+            self.name_input = self.name_input_box.text
+
+    def update(self) -> None:
+        """Run any scheduled callbacks that are due (showing the screen once its delay has passed)."""
+        self.timers.update()
+
+    def show(self) -> None:
+        """Show game over screen, playing its sound effect."""
+        frame_tracer.end('GameOverScreen: start delay', self.wait_trace_start, TRACE_CATEGORY_TRANSITION)
+        if self.sfx_bool == 'True':
+            sound_bank.play('game_over')
+        pygame.display.set_caption(self.caption)
+        if self.user_score > 0:
+            self.name_input_box.start_typing()
+        self.shown = True
+
+    def stop(self) -> None:
+        """Leave game over screen."""
+        self.manager.pop()
+
+    def draw(self) -> None:
+        """Blit all GameOverScreen content to screen (nothing until it is shown, keeping the game's final frame).
+
+        Uses class attributes to blit the background, the user's score and a
+        label next to it, the continue button, and if the user's score is over
+        0, an "enter your name" label, a text input box, and a "no thanks"
+        button.
         """
+        if not self.shown:
+            return
         self.window.blit(self.background, self.bg_pos)
         # Draw game over title at top.
         self.window.blit(self.title_surface, self.title_rect)
@@ -164,7 +189,7 @@ class GameOverScreen(object):
         # Draw enter your name label, its text box, and no_thanks_button if user score is more than 0.
         if self.user_score > 0:
             self.window.blit(self.text_surface_list[2], self.text_rect_list[2])
-            name_input_box.draw(mouse_pos, self.sfx_bool)
-            no_thanks_button.draw(mouse_pos, self.sfx_bool)
-        continue_button.draw(mouse_pos, self.sfx_bool)
+            self.name_input_box.draw(self.mouse_position, self.sfx_bool)
+            self.no_thanks_button.draw(self.mouse_position, self.sfx_bool)
+        self.continue_button.draw(self.mouse_position, self.sfx_bool)
         pygame.display.update()
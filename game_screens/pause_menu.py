@@ -9,21 +9,30 @@ Classes:
 """
 
 import os
-import sys
 import pygame
 from misc.constants import *
+from misc.asset_cache import load_image
+from misc.scene_manager import Scene
+from misc.sound_bank import sound_bank
+from misc.timers import TimerQueue
 
 
-class PauseMenu(object):
+class PauseMenu(Scene):
     """Allows user ability to pause game and toggle music and sfx on/off.
 
-    This class acts like a mini screen, with its own event handling and loop,
-    that gets brought up when game is paused by user. Pause menu includes
-    4 menu options: continue (which simply breaks out of pause menu event loop
-    and returns to the game), quit (which breaks user out of event loop and
-    returns to the main menu, not saving anything), sfx (setting with on and
+    This class acts like a mini screen, with its own event handling, that gets
+    pushed on top of the game when it is paused by user (the same pause menu
+    is reused every time the game is paused, see prepare). Pause menu includes
+    5 menu options: continue (which simply leaves the pause menu and returns
+    to the game), save & quit (which does the same as quit, but has the game
+    save a snapshot of itself first, so it can be resumed from the main menu
+    later), quit (which leaves the pause menu and has the game return to the
+    main menu, not saving anything), sfx (setting with on and
     off options accessed via left and right arrow keys), and music (setting
-    with on/off options accessed via left and right arrow keys).
+    with on/off options accessed via left and right arrow keys). Leaving the
+    menu, and starting music that hadn't begun yet, happen after a short
+    delay (scheduled on the menu's timer queue, so the menu keeps drawing and
+    handling events while it waits).
     """
 
     def __init__(self, window: pygame.Surface, width: int, height: int, sfx_bool: str, music_bool: str,
@@ -35,91 +44,109 @@ class PauseMenu(object):
         self.music_bool = music_bool
         self.music_not_begun_yet = music_not_begun_yet
         self.caption = 'Snake - Paused'
-        self.background = pygame.transform.scale(pygame.Surface.convert(pygame.image.load(
-            os.path.join('project_assets', 'backgrounds', 'black_background.png'))), PAUSE_MENU_DIMENSIONS)
+        self.background = load_image(
+            os.path.join('project_assets', 'backgrounds', 'black_background.png'), PAUSE_MENU_DIMENSIONS, alpha=False)
         self.font_size = PAUSE_MENU_FONT_SIZE
         self.text_font = pygame.font.Font(ARCADE_FONT_FILE, self.font_size)
-        self.text_list = ['CONTINUE',
-                          f'SFX      {"ON" if self.sfx_bool == "True" else "OFF"}',
-                          f'MUSIC    {"ON" if self.music_bool == "True" else "OFF"}',
-                          'QUIT']
-        self.text_pos_list = [(290, 175), (290, 225), (290, 275), (290, 325)]
-        self.text_surface_list = [(self.text_font.render(self.text_list[index], True, GAME_TEXT_LIGHT_BLUE))
-                                  for index in range(len(self.text_list))]
-        self.text_rect_list = [surface.get_rect(midleft=pos)
-                               for surface, pos in zip(self.text_surface_list, self.text_pos_list)]
+        self.text_list = ['CONTINUE', '', '', 'SAVE & QUIT', 'QUIT']
+        self.text_pos_list = [(290, 160), (290, 205), (290, 250), (290, 295), (290, 340)]
+        self.text_surface_list = []
+        self.white_text_surface_list = []  # Highlighted version of each option (same size as the light blue one).
+        self.text_rect_list = []
+        self.update_text()
         self.current_index = 0
-        self.button_hover_sfx = pygame.mixer.Sound(os.path.join('project_assets', 'sfx', 'button_hover.wav'))
-        self.button_click_sfx = pygame.mixer.Sound(os.path.join('project_assets', 'sfx', 'button_click.wav'))
-        self.button_game_pause_sfx = pygame.mixer.Sound(os.path.join('project_assets', 'sfx', 'game_pause.wav'))
-        self.button_game_unpause_sfx = pygame.mixer.Sound(os.path.join('project_assets', 'sfx', 'game_unpause.wav'))
         self.start_of_pause = pygame.time.get_ticks()
         self.total_time_paused = 0
         self.quit_to_main = False
-        self.running = True
+        self.save_and_quit = False
+        self.timers = TimerQueue()
 
-    def run(self) -> None:
-        """Run pause menu event loop.
+    def prepare(self, sfx_bool: str, music_bool: str, music_not_begun_yet: bool) -> None:
+        """Show the game's current sfx and music settings the next time the pause menu is entered."""
+        self.sfx_bool = sfx_bool
+        self.music_bool = music_bool
+        self.music_not_begun_yet = music_not_begun_yet
+        self.update_text()
 
-        Lowers volume before pause menu event loop is started. Event loop
-        continuously draws the four menu options and checks for arrow key down
-        events in order to highlight currently "hovered" over option.
-        """
+    def enter(self) -> None:
+        """Start a new pause, selecting continue and lowering the music's volume."""
         pygame.display.set_caption(self.caption)
         if self.sfx_bool == 'True':
-            self.button_game_pause_sfx.play()
+            sound_bank.play('game_pause')
         # Decrease volume of music.
-        pygame.mixer.music.set_volume(PAUSE_MENU_VOLUME)
-
-        while self.running:
-            event_list = pygame.event.get()
-
-            for event in event_list:
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                elif event.type == pygame.KEYDOWN:
-                    # Checks for esc button press (same function as unpause/continue).
-                    if event.key == pygame.K_ESCAPE:
+        sound_bank.set_music_volume(PAUSE_MENU_VOLUME)
+        self.current_index = 0
+        self.start_of_pause = pygame.time.get_ticks()
+        self.total_time_paused = 0
+        self.quit_to_main = False
+        self.save_and_quit = False
+
+    def exit(self) -> None:
+        """Start music straight away if it was turned on just before leaving the pause menu."""
+        self.start_music()
+
+    def handle_events(self, event_list: list[pygame.event.Event]) -> None:
+        """Check for key down events.
+
+        Arrow keys highlight the currently "hovered" over option (or toggle
+        sfx and music), and enter selects it.
+        """
+        for event in event_list:
+            # Checks for key presses (ignored while waiting to leave the pause menu).
+            if event.type == pygame.KEYDOWN and not self.timers.is_pending():
+                # Checks for esc button press (same function as unpause/continue).
+                if event.key == pygame.K_ESCAPE:
+                    if self.sfx_bool == 'True':
+                        sound_bank.play('game_unpause')
+                    self.unpause()
+                    break
+                # Checks for enter button press.
+                elif event.key == pygame.K_RETURN:
+                    # Unpause/continue.
+                    if self.text_list[self.current_index].split()[0] == 'CONTINUE':
+                        if self.sfx_bool == 'True':
+                            sound_bank.play('game_unpause')
+                        self.timers.schedule(BUTTON_CLICK_TIME_DELAY, self.unpause)
+                    # Quit (saving game first if save & quit was selected) and return to main menu.
+                    elif self.text_list[self.current_index].split()[0] in ['SAVE', 'QUIT']:
                         if self.sfx_bool == 'True':
-                            self.button_game_unpause_sfx.play()
-                        self.total_time_paused = pygame.time.get_ticks() - self.start_of_pause
-                        self.running = False
-                        break
-                    # Checks for enter button press.
-                    elif event.key == pygame.K_RETURN:
-                        # Unpause/continue.
-                        if self.text_list[self.current_index].split()[0] == 'CONTINUE':
-                            if self.sfx_bool == 'True':
-                                self.button_game_unpause_sfx.play()
-                            pygame.time.delay(BUTTON_CLICK_TIME_DELAY)
-                            self.total_time_paused = pygame.time.get_ticks() - self.start_of_pause
-                            self.running = False
-                            break
-                        # Quit and return to main menu.
-                        elif self.text_list[self.current_index].split()[0] == 'QUIT':
-                            if self.sfx_bool == 'True':
-                                self.button_click_sfx.play()
-                            pygame.time.delay(BUTTON_CLICK_TIME_DELAY)
-                            self.quit_to_main = True
-                            self.running = False
-                            break
-                        else:
-                            print('nothing happened..')
-                    # Checks for up and down key press.
-                    elif event.key in [pygame.K_UP, pygame.K_DOWN]:
-                        self.selected_option_update(event.key)
-                    # Checks for left and right key press.
-                    elif event.key in [pygame.K_LEFT, pygame.K_RIGHT]:
-                        selected_option = self.text_list[self.current_index].split()[0]
-                        if selected_option in ['SFX', 'MUSIC']:
-                            self.sfx_music_update(selected_option)
+                            sound_bank.play('button_click')
+                        self.save_and_quit = self.text_list[self.current_index].split()[0] == 'SAVE'
+                        self.timers.schedule(BUTTON_CLICK_TIME_DELAY, self.quit)
                     else:
-                        print('key pressed does nothing')
+                        print('nothing happened..')
+                # Checks for up and down key press.
+                elif event.key in [pygame.K_UP, pygame.K_DOWN]:
+                    self.selected_option_update(event.key)
+                # Checks for left and right key press.
+                elif event.key in [pygame.K_LEFT, pygame.K_RIGHT]:
+                    selected_option = self.text_list[self.current_index].split()[0]
+                    if selected_option in ['SFX', 'MUSIC']:
+                        self.sfx_music_update(selected_option)
                 else:
-                    pass
+                    print('key pressed does nothing')
+            else:
+                pass
+
+    def update(self) -> None:
+        """Run any scheduled callbacks that are due."""
+        self.timers.update()
+
+    def unpause(self) -> None:
+        """Leave pause menu, keeping how long the game was paused for."""
+        self.total_time_paused = pygame.time.get_ticks() - self.start_of_pause
+        self.manager.pop()
 
-            self.draw()
+    def quit(self) -> None:
+        """Leave pause menu and have the game return to the main menu."""
+        self.quit_to_main = True
+        self.manager.pop()
+
+    def start_music(self) -> None:
+        """Start game music from the beginning if it was turned on but hasn't begun yet."""
+        if self.music_not_begun_yet and self.music_bool == 'True':
+            pygame.mixer.music.play()
+            self.music_not_begun_yet = False
 
     def draw(self) -> None:
         """Blits all pause menu content to screen.
@@ -130,11 +157,9 @@ class PauseMenu(object):
         is being hovered over.
         """
         self.window.blit(self.background, PAUSE_MENU_POS)
-        for surface, rect in zip(self.text_surface_list, self.text_rect_list):
-            if self.text_surface_list.index(surface) == self.current_index:
-                white_surface = (self.text_font.render(self.text_list[self.current_index], True, GAME_TEXT_WHITE))
-                white_rect = white_surface.get_rect(midleft=self.text_pos_list[self.current_index])
-                self.window.blit(white_surface, white_rect)
+        for index, (surface, rect) in enumerate(zip(self.text_surface_list, self.text_rect_list)):
+            if index == self.current_index:
+                self.window.blit(self.white_text_surface_list[index], rect)
             else:
                 self.window.blit(surface, rect)
         pygame.display.update()
@@ -144,22 +169,22 @@ class PauseMenu(object):
         # Change current index.
         if direction == pygame.K_UP:
             if self.current_index == 0:
-                self.current_index = 3
+                self.current_index = len(self.text_list) - 1
             else:
                 self.current_index -= 1
         else:
-            if self.current_index == 3:
+            if self.current_index == len(self.text_list) - 1:
                 self.current_index = 0
             else:
                 self.current_index += 1
 
         # Play hover sfx.
         if self.sfx_bool == 'True':
-            self.button_hover_sfx.play()
+            sound_bank.play('button_hover')
 
     def sfx_music_update(self, selected_option: str) -> None:
         """Toggles selected option arg; that is, either music or sfx option."""
-        self.button_click_sfx.play()
+        sound_bank.play('button_click')
 
         if selected_option == 'SFX':
             if self.sfx_bool == 'True':
@@ -169,9 +194,7 @@ class PauseMenu(object):
         elif selected_option == 'MUSIC':
             # Checks if music wasn't playing before game started in order to start music from beginning.
             if self.music_not_begun_yet and self.music_bool == 'False':
-                pygame.time.delay(PAUSE_MENU_MUSIC_START_TIME_DELAY)
-                pygame.mixer.music.play()
-                self.music_not_begun_yet = False
+                self.timers.schedule(PAUSE_MENU_MUSIC_START_TIME_DELAY, self.start_music)
                 self.music_bool = 'True'
             elif self.music_bool == 'True':
                 pygame.mixer.music.pause()
@@ -182,10 +205,14 @@ class PauseMenu(object):
         else:
             print('selected option does not exist')
 
-        # Remakes the surface and rect list comprehensions in order ro reflect sfx and music option toggle on screen.
+        self.update_text()
+
+    def update_text(self) -> None:
+        """Remake option surfaces (light blue and white) and rects to reflect current sfx and music settings."""
         self.text_list[1] = f'SFX      {"ON" if self.sfx_bool == "True" else "OFF"}'
         self.text_list[2] = f'MUSIC    {"ON" if self.music_bool == "True" else "OFF"}'
         self.text_surface_list = [(self.text_font.render(self.text_list[index], True, GAME_TEXT_LIGHT_BLUE))
                                   for index in range(len(self.text_list))]
+        self.white_text_surface_list = [self.text_font.render(text, True, GAME_TEXT_WHITE) for text in self.text_list]
         self.text_rect_list = [surface.get_rect(midleft=pos)
                                for surface, pos in zip(self.text_surface_list, self.text_pos_list)]
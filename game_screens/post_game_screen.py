@@ -8,43 +8,48 @@ Classes:
 """
 
 import os
-import sys
 import pygame
 from misc.constants import *
+from misc.asset_cache import load_image
+from misc.frame_tracer import frame_tracer
 from game_objects.score_board import ScoreBoard
 from misc.buttons import TextButton
+from misc.scene_manager import Scene
+from misc.timers import TimerQueue
 
 
-class PostGameScreen(object):
+class PostGameScreen(Scene):
     """Contains all post game screen content to be blitted to the screen.
 
     This class contains all the information and content to be blitted to the
-    screen as well as a draw method that actually blits everything
-    categorized as being in the post game screen. Includes event loop that
-    checks for mouse click events. Content in the post game screen includes:
-    the background, the border ui (empty until new game is started), main menu
+    screen as well as a draw method that actually blits everything categorized
+    as being in the post game screen. Includes event handling that checks for
+    mouse click events. Content in the post game screen includes: the
+    background, the border ui (empty until new game is started), main menu
     button to return to the main menu, and a play again button to reset and
     start a new game. Depending on if a score was saved from the last game, a
     scoreboard showing the page of the user's (rank, score, name) row along
     with a "high scores" title label above it, is blit to the screen. If no
     score was saved, the post game screen is displayed as a simple black
-    background with the "snake" title in large font size.
+    background with the "snake" title in large font size. The screen is made
+    once per game session and reused after every game, with prepare called
+    before each visit (the scoreboard is made the first time a score is saved,
+    then only its page is made again for each new score).
     """
 
-    def __init__(self, window: pygame.Surface, border_ui, bg_dimensions: tuple, bg_pos: tuple, sfx_bool: str,
-                 score_saved: bool, user_score: int, user_name: str) -> None:
+    def __init__(self, window: pygame.Surface, border_ui, bg_dimensions: tuple, bg_pos: tuple, sfx_bool: str) -> None:
         self.window = window
         self.border_ui = border_ui
         self.bg_dimensions = bg_dimensions
         self.bg_pos = bg_pos
         self.sfx_bool = sfx_bool
-        self.score_saved = score_saved
-        self.user_score = user_score
-        self.user_name = user_name
-        self.background = pygame.transform.scale(pygame.Surface.convert(pygame.image.load(
-            os.path.join('project_assets', 'backgrounds', 'black_background.png'))), self.bg_dimensions)
+        self.score_saved = False
+        self.user_score = 0
+        self.user_name = ''
+        self.background = load_image(
+            os.path.join('project_assets', 'backgrounds', 'black_background.png'), self.bg_dimensions, alpha=False)
         self.play_again = False
-        self.caption = 'Snake - Scoreboard' if self.score_saved else 'Snake - Pre-Game Screen'
+        self.caption = 'Snake - Pre-Game Screen'
 
         self.title = 'SNAKE'
         self.title_font_size = POST_GAME_TITLE_FONT_SIZE
@@ -64,66 +69,69 @@ class PostGameScreen(object):
                                                                           self.highscores_title_color)
         self.highscores_title_rect = self.highscores_title_surface.get_rect(center=self.highscores_title_pos)
 
-        self.score_board = ScoreBoard(self.window, self.user_score, self.user_name) if self.score_saved else None
-        self.running = True
-
-    def run(self) -> None:
-        """Run post game screen event loop.
+        self.score_board = None
+        trace_start = frame_tracer.begin()
+        self.main_menu_button = TextButton(self.window, MAIN_MENU_BUTTON_POS, MAIN_MENU_BUTTON_WIDTH,
+                                           POST_GAME_BUTTON_HEIGHT, MAIN_MENU_BUTTON_TEXT, POST_GAME_BUTTON_FONT_SIZE)
+        self.play_again_button = TextButton(self.window, PLAY_AGAIN_BUTTON_POS, PLAY_AGAIN_BUTTON_WIDTH,
+                                            POST_GAME_BUTTON_HEIGHT, PLAY_AGAIN_BUTTON_TEXT,
+                                            POST_GAME_BUTTON_FONT_SIZE, start_sfx='_start_game')
+        frame_tracer.end('PostGameScreen: widget setup', trace_start, TRACE_CATEGORY_TRANSITION)
+        self.mouse_position = (0, 0)
+        self.timers = TimerQueue()
+
+    def prepare(self, user_score: int, user_name: str, score_saved: bool) -> None:
+        """Show scoreboard page of entered score and name on the next visit if it was saved, else the title."""
+        self.user_score = user_score
+        self.user_name = user_name
+        self.score_saved = score_saved
+        self.play_again = False
+        self.caption = 'Snake - Scoreboard' if self.score_saved else 'Snake - Pre-Game Screen'
+        if self.score_saved:
+            if self.score_board is None:
+                self.score_board = ScoreBoard(self.window, self.user_score, self.user_name)
+            else:
+                self.score_board.set_user_row(self.user_score, self.user_name)
 
-        Creates main menu button to return to the main menu, as well as a play
-        again button to start a new game. Post game screen event loop is then
-        started. Event loop continuously draws post game screen content to
-        screen and checks for button hover and click events.
-        """
+    def enter(self) -> None:
+        """Set caption."""
         pygame.display.set_caption(self.caption)
-        main_menu_button = TextButton(self.window, MAIN_MENU_BUTTON_POS, MAIN_MENU_BUTTON_WIDTH,
-                                      POST_GAME_BUTTON_HEIGHT, MAIN_MENU_BUTTON_TEXT, POST_GAME_BUTTON_FONT_SIZE)
-        play_again_button = TextButton(self.window, PLAY_AGAIN_BUTTON_POS, PLAY_AGAIN_BUTTON_WIDTH,
-                                       POST_GAME_BUTTON_HEIGHT, PLAY_AGAIN_BUTTON_TEXT, POST_GAME_BUTTON_FONT_SIZE,
-                                       start_sfx='_start_game')
-
-        while self.running:
-            mouse_position = pygame.mouse.get_pos()
-            event_list = pygame.event.get()
-
-            for event in event_list:
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-
-                elif event.type == pygame.MOUSEBUTTONUP:  # Checks if mouse button was clicked.
-                    # Checks if cursor was hovering over a button when clicked and if so, executes their code.
-
-                    if main_menu_button.is_hovering(mouse_position):
-                        main_menu_button.draw_clicked(self.sfx_bool)
-                        pygame.time.delay(BUTTON_CLICK_TIME_DELAY)
-                        self.running = False
-                        break
-                    elif play_again_button.is_hovering(mouse_position):
-                        play_again_button.draw_clicked(self.sfx_bool)
-                        pygame.time.delay(BUTTON_CLICK_TIME_DELAY)
-                        self.play_again = True
-                        self.running = False
-                        break
-                    else:
-                        print('nothing was clicked..')
-
-            self.draw(mouse_position, main_menu_button, play_again_button)
-
-    def draw(self, mouse_pos: tuple[int, int], main_menu_button: TextButton, play_again_button: TextButton) -> None:
+
+    def handle_events(self, event_list: list[pygame.event.Event]) -> None:
+        """Check for main menu and play again button click events."""
+        self.mouse_position = mouse_position = pygame.mouse.get_pos()
+
+        for event in event_list:
+            # Checks if mouse button was clicked (clicks are ignored while waiting to leave the screen).
+            if event.type == pygame.MOUSEBUTTONUP and not self.timers.is_pending():
+                # Checks if cursor was hovering over a button when clicked and if so, executes their code.
+
+                if self.main_menu_button.is_hovering(mouse_position):
+                    self.main_menu_button.draw_clicked(self.sfx_bool)
+                    self.timers.schedule(BUTTON_CLICK_TIME_DELAY, self.stop)
+                elif self.play_again_button.is_hovering(mouse_position):
+                    self.play_again_button.draw_clicked(self.sfx_bool)
+                    self.play_again = True
+                    self.timers.schedule(BUTTON_CLICK_TIME_DELAY, self.stop)
+                else:
+                    print('nothing was clicked..')
+
+    def update(self) -> None:
+        """Run any scheduled callbacks that are due."""
+        self.timers.update()
+
+    def stop(self) -> None:
+        """Leave post game screen."""
+        self.manager.pop()
+
+    def draw(self) -> None:
         """Blit all PostGameScreen content to screen.
 
-        Uses class attributes and entered args to blit the background, the
-        empty border ui, a main menu button to return to the main menu, a play
-        again button to start a new game, and depending on if the previous
-        game's score was saved, a highscores title and scoreboard. If the
-        score was not saved, a large font snake title is displayed.
-
-        Args:
-            mouse_pos: Used to determine which button mouse was hovering over,
-                if any.
-            main_menu_button: Text button that goes back to main menu.
-            play_again_button: Text button that starts new game.
+        Uses class attributes to blit the background, the empty border ui, a
+        main menu button to return to the main menu, a play again button to
+        start a new game, and depending on if the previous game's score was
+        saved, a highscores title and scoreboard. If the score was not saved,
+        a large font snake title is displayed.
         """
         self.window.blit(self.background, self.bg_pos)
         self.border_ui.draw()
@@ -132,6 +140,6 @@ class PostGameScreen(object):
             self.score_board.draw()
         else:
             self.window.blit(self.title_surface, self.title_rect)
-        main_menu_button.draw(mouse_pos, self.sfx_bool)
-        play_again_button.draw(mouse_pos, self.sfx_bool)
+        self.main_menu_button.draw(self.mouse_position, self.sfx_bool)
+        self.play_again_button.draw(self.mouse_position, self.sfx_bool)
         pygame.display.update()
@@ -11,21 +11,31 @@ Classes:
 """
 
 import os
-import sys
+import random
 import pygame
 from misc.constants import *
+from misc.frame_tracer import frame_tracer
 from misc.saved_data_io_functions import get_file_dict
+from misc.scene_manager import Scene
+from misc.sound_bank import sound_bank
+from game_objects.game_board import GameBoard, get_board_settings
 from game_objects.game_border_ui import GameBorderUI
 from game_objects.game_grid import GameGrid
+from game_objects.game_simulation import GameSimulation
+from game_objects.game_snapshot import GameSnapshot, save_game_snapshot, take_game_snapshot
+from game_objects.ghost_replay import GhostReplay, GhostSnake, load_ghost_replay, save_ghost_replay
+from game_objects.hamiltonian_autopilot import HamiltonianAutopilot
 from game_objects.pregame_rules_board import GameRulesBoard
-from game_objects.snack_items import AppleSnack
-from game_objects.snake_player import PlayerSnake
+from game_objects.rewind_buffer import RewindBuffer
+from game_objects.snake_autopilot import SnakeAutopilot
+from game_objects.snack_items import draw_items, get_apple_snack_count, spawn_apple_snacks
+from game_objects.snake_player import PlayerSnake, get_player_count, make_snake_player_list
 from game_screens.game_over_screen import GameOverScreen
 from game_screens.pause_menu import PauseMenu
 from game_screens.post_game_screen import PostGameScreen
 
 
-class SnakeGameScreen(object):
+class SnakeGameScreen(Scene):
     """Manages all screens/content in game_screens package.
 
     This class acts like a container for managing all screens used after
@@ -33,14 +43,29 @@ class SnakeGameScreen(object):
     objects to be used in the snake game itself like: the game clock, the
     background, the game grid, the border ui and all of its data, the snake
     object itself as well as 3 snacks to the screen, and the game rules board
-    if this is the user's first game. Also includes an event loop that starts
-    the game as soon as any key is pressed, setups up and creates all other
-    game screens used after game ends, including the game over screen and the
-    post game screen.
+    if this is the user's first game. Also includes event handling that starts
+    the game as soon as any key is pressed, and opens all other game screens
+    used after game ends (pushing each onto the scene manager when the screen
+    before it is left, see resume), including the game over screen and the
+    post game screen. The pause menu is made once and reused by every game,
+    as are the game over and post game screens (made the first time they are
+    opened and prepared with each game's score after that). Practice games
+    (with rewinding turned on before the first game) skip the game over
+    screen, so their scores are never put on the leaderboard. If a snapshot
+    of a saved game is entered, the board, snakes, apples, and scores are put
+    back how they were saved instead, and the first game carries on from
+    there (and from the saved time).
+
+    Every new game's board is seeded with a new seed, and single player games
+    (without autopilot or rewinding) are recorded, so that the best run on
+    each board size and apple count is kept as a ghost replay. With the ghost
+    turned on (toggled with G before the first game), games are played on the
+    best run's seed, with a ghost snake replaying that run alongside the
+    player's snake.
     """
 
     def __init__(self, window: pygame.Surface, width: int, height: int, sfx_bool: str, music_bool: str,
-                 background: pygame.Surface) -> None:
+                 background: pygame.Surface, snapshot: GameSnapshot | None = None) -> None:
         self.window = window
         self.width = width
         self.height = height
@@ -48,115 +73,274 @@ class SnakeGameScreen(object):
         self.music_bool = music_bool
         self.grid_bool = get_file_dict('user_preferences').get('GRID').split('~')[1]
         self.first_game = True
-        self.play_again = False
+        self.autopilot_mode = AUTOPILOT_MODE_LIST[0]
+        self.practice_bool = False
+        self.modes_locked = False
+        self.ghost_bool = False
         self.score_saved_bool = False
         self.caption = 'Snake'
         self.clock = pygame.time.Clock()
-        self.border_ui = GameBorderUI(self.window, self.width, self.height, game_ready_ui=True)
-        self.bg_width = (self.width - (self.border_ui.border_left.get_width() * 2))
-        self.bg_height = (self.height
-                          - (self.border_ui.border_upper.get_height()
-                             + self.border_ui.border_lower.get_height()))
+        self.play_area_rect = pygame.Rect(GAME_BORDER_LEFT, GAME_BORDER_UPPER,
+                                          self.width - GAME_BORDER_LEFT - GAME_BORDER_RIGHT,
+                                          self.height - GAME_BORDER_UPPER - GAME_BORDER_LOWER)
+        if snapshot is None:
+            self.board = GameBoard(*get_board_settings(), self.play_area_rect)
+            self.player_count = get_player_count()
+        else:
+            self.board = GameBoard(snapshot.columns, snapshot.rows, snapshot.cell_size, self.play_area_rect)
+            self.player_count = snapshot.player_count
+        self.border_ui = GameBorderUI(self.window, self.width, self.height, self.board, game_ready_ui=True,
+                                      player_count=self.player_count)
+        self.bg_width = self.board.width
+        self.bg_height = self.board.height
         self.bg_dimensions = (self.bg_width, self.bg_height)
         self.background = pygame.transform.scale(background, self.bg_dimensions)
-        self.bg_x = self.border_ui.border_left.get_width()
-        self.bg_y = self.border_ui.border_upper.get_height()
+        self.bg_x = self.board.left
+        self.bg_y = self.board.top
         self.bg_pos = (self.bg_x, self.bg_y)
-        self.grid = GameGrid(self.window, self.border_ui) if self.grid_bool == 'True' else None
-        self.instructions_board = GameRulesBoard(self.window, self.width, self.height)
-        self.snake_player = PlayerSnake(self.window, SNAKE_PLAYER_START_POS, SNAKE_PLAYER_START_DIRECTION)
-        self.apple_list = [AppleSnack(self.window, self.snake_player.snake_cube_rect_list)
-                           for _ in range(NUMBER_OF_APPLE_SNACKS)]
-        self.running = 1
+        self.grid = GameGrid(self.window, self.board) if self.grid_bool == 'True' else None
+        self.instructions_board = GameRulesBoard(self.window, self.width, self.height, self.player_count)
+        self.snake_player_list = make_snake_player_list(self.window, self.board, self.player_count)
+        self.apple_count = get_apple_snack_count()
+        # Best run on this board (only single player games that start from scratch can race it).
+        self.best_replay = (load_ghost_replay(self.board.columns, self.board.rows, self.apple_count)
+                            if self.player_count == 1 and snapshot is None else None)
+        self.game_seed = None  # Seed of the current game's board (None for a resumed game).
+        self.reset_board()
+        self.resume_elapsed_time = 0  # Milliseconds already played in a resumed game (for its timer).
+        if snapshot is not None:
+            try:
+                snapshot.restore(self.window, self.board, self.snake_player_list)
+            except ValueError as error:  # Starts a new game on the saved board instead.
+                print(f'could not load game snapshot: {error}')
+                self.reset_board()
+                snapshot = None
+        if snapshot is not None:
+            self.game_seed = None
+            self.modes_locked = True  # A resumed game keeps the autopilot and practice modes it was saved with.
+            self.border_ui.snacks_eaten_list = list(snapshot.snacks_eaten_list)
+            self.border_ui.update_timer(snapshot.elapsed_time, 0, 0)
+            self.resume_elapsed_time = snapshot.elapsed_time
+            self.autopilot_mode, self.practice_bool = snapshot.autopilot_mode, snapshot.practice_bool
+            self.instructions_board.set_autopilot_text(self.autopilot_mode)
+            self.instructions_board.set_rewind_text(self.practice_bool)
+        self.pause_menu = PauseMenu(self.window, self.width, self.height, self.sfx_bool, self.music_bool, True)
+        self.snake_game = None
+        self.game_over_screen = None
+        self.post_game_screen = None
+
+    def enter(self) -> None:
+        """Set caption."""
+        pygame.display.set_caption(self.caption)
 
-    def run(self) -> None:
-        """Run snake game screen event loop.
+    def handle_events(self, event_list: list[pygame.event.Event]) -> None:
+        """Check if the user wants to change a setting of the first game or start it.
 
-        This method contains an event loop that manages all of the screens in
-        the game_screens package. It checks if the user wants to start a new
-        game or quit and uses information from choices made in previous
-        screens to determine what shows up on the subsequent screens.
+        Before the first game, TAB, R, and G change the autopilot mode,
+        practice mode, and ghost settings shown on the instructions board
+        (except a resumed game's autopilot and practice modes), and any other
+        key starts the game.
         """
-        pygame.display.set_caption(self.caption)
-
-        while self.running:
-            event_list = pygame.event.get()
-
-            for event in event_list:
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-
-                # Checks if first game and a key was pressed or if subsequent game and play again button was pressed.
-                elif (event.type == pygame.KEYUP and self.first_game) or self.play_again:
-                    self.first_game = False
-                    # Creates snake game itself and runs.
-                    snake = SnakeGame(self.window, self.width, self.height, self.sfx_bool, self.music_bool,
-                                      self.grid_bool, self.clock, self.border_ui, self.background, self.bg_pos,
-                                      self.grid, self.snake_player, self.apple_list)
-                    snake.run()
-                    if snake.quit_to_main:  # Used if player quit game from pause menu in SnakeGame class.
-                        self.running = 0
-                        break
-                    self.sfx_bool, self.music_bool = snake.sfx_bool, snake.music_bool
-                    # Creates game over screen and runs.
-                    game_over = GameOverScreen(self.window, self.width, self.height, self.sfx_bool, self.music_bool,
-                                               self.bg_dimensions, self.bg_pos, self.border_ui.user_score)
-                    game_over.run()
-                    self.score_saved_bool = game_over.score_saved_bool  # If true, post game screen shows scoreboard.
-                    # Creates post/pre game screen and runs.
-                    self.border_ui.game_ready_ui = False
-                    post_game_screen = PostGameScreen(self.window, self.border_ui, self.bg_dimensions, self.bg_pos,
-                                                      self.sfx_bool, self.score_saved_bool, game_over.user_score,
-                                                      game_over.name_input.lower())
-                    post_game_screen.run()
-                    self.play_again = post_game_screen.play_again
-                    # Returns to main menu if user didn't want to play again, otherwise, resets all game objects.
-                    if self.play_again is False:
-                        self.running = 0
-                        break
-                    else:
-                        pygame.display.set_caption(self.caption)
-                        self.border_ui.reset()
-                        self.snake_player.reset()
-                        self.apple_list = [AppleSnack(self.window, self.snake_player.snake_cube_rect_list)
-                                           for _ in range(NUMBER_OF_APPLE_SNACKS)]
+        for event in event_list:
+            # Checks if first game and TAB was pressed (selects next autopilot mode before game starts).
+            if event.type == pygame.KEYUP and self.first_game and event.key == pygame.K_TAB and not self.modes_locked:
+                mode_index = AUTOPILOT_MODE_LIST.index(self.autopilot_mode)
+                self.autopilot_mode = AUTOPILOT_MODE_LIST[(mode_index + 1) % len(AUTOPILOT_MODE_LIST)]
+                self.instructions_board.set_autopilot_text(self.autopilot_mode)
+            # Checks if first game and R was pressed (turns rewind practice mode on/off before game starts).
+            elif event.type == pygame.KEYUP and self.first_game and event.key == pygame.K_r and not self.modes_locked:
+                self.practice_bool = not self.practice_bool
+                self.instructions_board.set_rewind_text(self.practice_bool)
+            # Checks if first game and G was pressed (turns ghost of best run on/off before game starts).
+            elif event.type == pygame.KEYUP and self.first_game and event.key == pygame.K_g:
+                if self.best_replay is None:
+                    print('no best run to show a ghost of yet')
                 else:
-                    pass
-
-            self.draw()
+                    self.ghost_bool = not self.ghost_bool
+                    self.reset_board()
+                    self.instructions_board.set_ghost_text(self.ghost_bool)
+            # Checks if first game and a key was pressed.
+            elif event.type == pygame.KEYUP and self.first_game:
+                self.first_game = False
+                self.start_game()
+                break
+            else:
+                pass
+
+    def resume(self, previous_scene: Scene) -> None:
+        """Open the next screen once entered screen is left.
+
+        After a game, the game over screen is opened (practice games, which
+        can be rewound, and autopilot games skip it, so their scores never go
+        on the leaderboard), then the post game screen. Choosing to play again from the post game
+        screen resets all game objects and starts a new game, otherwise (or if
+        the player quit the game from the pause menu) the user is returned to
+        the main menu.
+        """
+        if previous_scene is self.snake_game:
+            if self.snake_game.quit_to_main:  # Used if player quit game from pause menu in SnakeGame class.
+                self.manager.pop()
+                return
+            # Keeps game's replay as the new best run if it ate more snacks than the best run.
+            replay = self.snake_game.replay
+            if replay is not None:
+                replay.snacks_eaten = self.border_ui.snacks_eaten_list[0]
+                if replay.is_better_than(self.best_replay):
+                    save_ghost_replay(replay)
+                    self.best_replay = replay
+            self.sfx_bool, self.music_bool = self.snake_game.sfx_bool, self.snake_game.music_bool
+            # Practice games (which can be rewound) and autopilot games never go on the leaderboard.
+            if self.practice_bool or self.autopilot_mode != 'OFF':
+                self.score_saved_bool = False
+                self.open_post_game_screen(self.border_ui.user_score, '')
+            else:
+                self.open_game_over_screen(self.border_ui.user_score)
+        elif previous_scene is self.game_over_screen:
+            self.score_saved_bool = self.game_over_screen.score_saved_bool  # If true, post game shows scoreboard.
+            self.open_post_game_screen(self.game_over_screen.user_score, self.game_over_screen.name_input.lower())
+        elif previous_scene is self.post_game_screen:
+            # Returns to main menu if user didn't want to play again, otherwise, resets all game objects.
+            if self.post_game_screen.play_again is False:
+                self.manager.pop()
+            else:
+                pygame.display.set_caption(self.caption)
+                self.border_ui.reset()
+                self.reset_board()
+                self.start_game()
+
+    def start_game(self) -> None:
+        """Create snake game itself (with player 1 driven by autopilot if turned on) and open it."""
+        autopilot = self.make_autopilot()
+        ghost_snake, replay = self.make_ghost_snake(), self.make_replay()
+        self.snake_game = SnakeGame(self.window, self.width, self.height, self.sfx_bool, self.music_bool,
+                                    self.grid_bool, self.clock, self.board, self.border_ui, self.background,
+                                    self.bg_pos, self.grid, self.snake_player_list, autopilot,
+                                    self.resume_elapsed_time, self.practice_bool, ghost_snake, replay, self.pause_menu)
+        self.resume_elapsed_time = 0
+        self.manager.push(self.snake_game)
+
+    def open_game_over_screen(self, user_score: int) -> None:
+        """Open game over screen showing entered score (made on its first visit)."""
+        if self.game_over_screen is None:
+            transition_start = frame_tracer.begin()
+            self.game_over_screen = GameOverScreen(self.window, self.width, self.height, self.sfx_bool,
+                                                   self.music_bool, self.play_area_rect.size,
+                                                   self.play_area_rect.topleft)
+            frame_tracer.end('GameOverScreen construction', transition_start, TRACE_CATEGORY_TRANSITION)
+        self.game_over_screen.sfx_bool, self.game_over_screen.music_bool = self.sfx_bool, self.music_bool
+        transition_start = frame_tracer.begin()
+        self.game_over_screen.prepare(user_score)
+        frame_tracer.end('GameOverScreen prepare', transition_start, TRACE_CATEGORY_TRANSITION)
+        self.manager.push(self.game_over_screen)
+
+    def open_post_game_screen(self, user_score: int, user_name: str) -> None:
+        """Open post/pre game screen showing entered score and name if it was saved (made on its first visit)."""
+        self.border_ui.game_ready_ui = False
+        if self.post_game_screen is None:
+            transition_start = frame_tracer.begin()
+            self.post_game_screen = PostGameScreen(self.window, self.border_ui, self.play_area_rect.size,
+                                                   self.play_area_rect.topleft, self.sfx_bool)
+            frame_tracer.end('PostGameScreen construction', transition_start, TRACE_CATEGORY_TRANSITION)
+        self.post_game_screen.sfx_bool = self.sfx_bool
+        transition_start = frame_tracer.begin()
+        self.post_game_screen.prepare(user_score, user_name, self.score_saved_bool)
+        frame_tracer.end('PostGameScreen prepare', transition_start, TRACE_CATEGORY_TRANSITION)
+        self.manager.push(self.post_game_screen)
+
+    def reset_board(self) -> None:
+        """Clear board, reset every snake, and place apples for a new game, on a new seed.
+
+        The seed is the best run's seed if the ghost is turned on, so apples
+        start out (and, for as long as the player follows the best run, keep
+        spawning) in the same cells as they did in the best run.
+        """
+        self.game_seed = self.best_replay.seed if self.ghost_bool else random.getrandbits(32)
+        self.board.seed(self.game_seed)
+        self.board.clear()
+        for snake_player in self.snake_player_list:
+            snake_player.reset()
+        spawn_apple_snacks(self.window, self.board, self.apple_count)
+
+    def make_ghost_snake(self) -> GhostSnake | None:
+        """Return ghost snake replaying the best run (None if the ghost is off, or in practice mode)."""
+        if not self.ghost_bool or self.practice_bool:
+            return None
+        return GhostSnake(self.window, self.board, self.best_replay, self.snake_player_list[0].snake_skin)
+
+    def make_replay(self) -> GhostReplay | None:
+        """Return empty replay to record the next game in (None if it can't be raced as a ghost).
+
+        Only single player games played from their first tick, by the player
+        (not an autopilot), without rewinding, are recorded.
+        """
+        if (self.player_count != 1 or self.game_seed is None or self.autopilot_mode != 'OFF'
+                or self.practice_bool):
+            return None
+        return GhostReplay(self.board.columns, self.board.rows, self.apple_count, self.game_seed)
+
+    def make_autopilot(self) -> SnakeAutopilot | HamiltonianAutopilot | None:
+        """Return autopilot for player 1's snake of selected mode (None if off)."""
+        if self.autopilot_mode == 'APPLE':
+            return SnakeAutopilot(self.snake_player_list[0], self.board)
+        elif self.autopilot_mode == 'CYCLE':
+            return HamiltonianAutopilot(self.snake_player_list[0], self.board)
+        return None
 
     def draw(self) -> None:
         """Blit all setup snake game content before game starts.
 
         This method blits content to be used in-game, before the game starts,
-        including: the background, the game grid, the snake player, all
+        including: the background, the game grid, the snake players, all
         randomly positioned snack items, the border ui, and an instructions
         board if it is the user's first game.
         """
         self.window.blit(self.background, self.bg_pos)
         if self.grid_bool == 'True':
             self.grid.draw()
-        self.snake_player.draw()
-        for apple in self.apple_list:
-            apple.draw()
+        for snake_player in self.snake_player_list:
+            snake_player.draw()
+        draw_items(self.window, self.board.item_cell_dict.values())
         self.border_ui.draw()
         if self.first_game:
             self.instructions_board.draw()
         pygame.display.update()
 
 
-class SnakeGame(object):
+class SnakeGame(Scene):
     """Contains content used in the actual snake game itself.
 
-    This class represents the game itself, with its main feature being an
-    event loop that checks for user input and changes the screen accordingly.
+    This class represents the game itself, a scene that checks for user input
+    each frame and changes the screen accordingly, and leaves itself (popping
+    back to the snake game screen) once the game has ended.
+    The game holds one snake per local player, all sharing the same board, and
+    the game ends once every snake has crashed. The rules themselves are
+    played by a GameSimulation (shared with the training environments and
+    network game rooms), while this class handles sound effects, music, and
+    the border ui's scores. If an autopilot is entered, it steers its snake
+    every frame (that player's keys still work, but the autopilot takes back
+    control on the next frame). A resumed game's timer starts from the
+    entered elapsed time, and choosing save & quit in the pause menu saves a
+    snapshot of the game (see game_snapshot) before returning to the main
+    menu. If a pause menu is entered, it is reused every time the game is
+    paused (otherwise one is made the first time it is).
+
+    In practice mode, every tick is recorded in a rewind buffer, and holding
+    R plays the game backwards one tick per frame (scores and the timer go
+    back too). Crashing doesn't end a practice game straight away: the game
+    waits, frozen, for the player to either rewind or press ENTER to end it.
+
+    If a ghost snake is entered, it plays one tick of the best run each
+    frame the game does (and is drawn under the players' snakes), and if a
+    replay is entered, the direction player 1's snake moved in is recorded
+    in it each frame.
     """
 
     def __init__(self, window: pygame.Surface, width: int, height: int, sfx_bool: str, music_bool: str, grid_bool: str,
-                 clock: pygame.time.Clock, border_ui: GameBorderUI, background: pygame.Surface,
-                 bg_pos: tuple[int, int], grid: GameGrid, snake_player: PlayerSnake, apple_list: list[AppleSnack],
-                 ) -> None:
+                 clock: pygame.time.Clock, board: GameBoard, border_ui: GameBorderUI, background: pygame.Surface,
+                 bg_pos: tuple[int, int], grid: GameGrid, snake_player_list: list[PlayerSnake],
+                 autopilot: SnakeAutopilot | HamiltonianAutopilot | None = None, elapsed_time: int = 0,
+                 practice_bool: bool = False, ghost_snake: GhostSnake | None = None,
+                 replay: GhostReplay | None = None, pause_menu: PauseMenu | None = None) -> None:
         self.window = window
         self.width = width
         self.height = height
@@ -165,141 +349,245 @@ class SnakeGame(object):
         self.grid_bool = grid_bool
         self.music_not_begun_yet = True
         self.clock = clock
+        self.board = board
         self.border_ui = border_ui
         self.background = background
         self.bg_pos = bg_pos
         self.grid = grid
-        self.snake_player = snake_player
-        self.apple_list = apple_list
-        self.caption = 'Snake - In Game'
+        self.snake_player_list = snake_player_list
+        self.autopilot = autopilot
+        self.simulation = GameSimulation(self.window, self.board, self.snake_player_list, self.autopilot)
+        self.rewind_buffer = RewindBuffer(self.window, self.board, self.snake_player_list) if practice_bool else None
+        self.ghost_snake = ghost_snake
+        self.replay = replay
+        self.pause_menu = pause_menu
+        self.direction_key_dict = {}
+        self.practice_over = False  # True once every snake crashed in practice mode (until rewound or ended).
+        self.caption = 'Snake - Practice' if practice_bool else 'Snake - In Game'
         self.game_music_intro = self.menu_music = os.path.join('project_assets', 'music', 'game_music_intro.ogg')
         self.game_music = self.menu_music = os.path.join('project_assets', 'music', 'game_music.ogg')
-        self.snack_points_up_sfx = pygame.mixer.Sound(os.path.join('project_assets', 'sfx', 'snack_points_up.wav'))
-        self.snake_crashes_sfx = pygame.mixer.Sound(os.path.join('project_assets', 'sfx', 'snake_crashes.wav'))
-        self.start_time = pygame.time.get_ticks()
+        self.start_time = pygame.time.get_ticks() - elapsed_time
         self.total_pause_time = 0
         self.quit_to_main = False
         self.running = 1
 
-    def run(self) -> None:
-        """Run snake game event loop.
-
-        This method starts the game's music and a timer on the top right of
-        the screen, before starting the main game while loop. The game loop
-        first checks if any key events have occurred (pause or change snake's
-        direction), then calls a move method from snake player instance that
-        moves snake for current frame, then checks for collisions between the
-        snake player and any borders or snack items (and executes relevant
-        code), and then finally draws all current game information to screen.
-        """
+    def enter(self) -> None:
+        """Start the game's music and its players' move keys (the timer started when the game was made)."""
         pygame.display.set_caption(self.caption)
         pygame.mixer.music.load(self.game_music_intro)
         pygame.mixer.music.queue(self.game_music, loops=-1)
         if self.music_bool == 'True':
             pygame.mixer.music.play()
-        arrow_keys_dict = {pygame.K_UP: 'up', pygame.K_RIGHT: 'right', pygame.K_DOWN: 'down', pygame.K_LEFT: 'left'}
-
-        while self.running:
-            pygame.time.delay(GAME_LOOP_DELAY)
-            self.clock.tick(GAME_LOOP_TICK)
-            event_list = pygame.event.get()
-
-            for event in event_list:
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                elif event.type == pygame.KEYDOWN:
-                    # Checks if game was paused.
-                    if event.key == pygame.K_ESCAPE:
-                        # Creates pause menu and runs.
-                        pause_menu = PauseMenu(self.window, self.width, self.height, self.sfx_bool, self.music_bool,
-                                               self.music_not_begun_yet)
-                        pause_menu.run()
-                        pygame.mixer.music.set_volume(GAME_VOLUME)  # Increase volume of music back to normal.
-                        self.total_pause_time += pause_menu.total_time_paused
-                        self.sfx_bool, self.music_bool = pause_menu.sfx_bool, pause_menu.music_bool
-                        self.music_not_begun_yet = pause_menu.music_not_begun_yet
-                        self.quit_to_main = pause_menu.quit_to_main
-                        # Returns to main menu immediately if player pressed quit in pause menu.
-                        if pause_menu.quit_to_main:
-                            pygame.mixer.music.stop()
-                            pygame.mixer.music.unload()
-                            self.running = 0
-                            break
-                        pygame.display.set_caption(self.caption)
-                    # Checks if any of the arrow keys were pressed.
-                    elif event.key in arrow_keys_dict.keys():
-                        self.snake_player.change_direction(event.key, arrow_keys_dict)
-                    else:
-                        print('key pressed does nothing')
+        self.direction_key_dict = self.make_direction_key_dict()
+
+    def wait(self) -> None:
+        """Wait for the next game tick."""
+        pygame.time.delay(GAME_LOOP_DELAY)
+        self.clock.tick(GAME_LOOP_TICK)
+
+    def handle_events(self, event_list: list[pygame.event.Event]) -> None:
+        """Check if any key events have occurred (pause, change a snake's direction, or end a practice game)."""
+        for event in event_list:
+            if event.type == pygame.KEYDOWN:
+                # Checks if game was paused.
+                if event.key == pygame.K_ESCAPE:
+                    self.open_pause_menu()
+                    break
+                # Checks if any player's move keys were pressed.
+                elif event.key in self.direction_key_dict:
+                    snake_player, player_keys_dict = self.direction_key_dict[event.key]
+                    snake_player.change_direction(event.key, player_keys_dict)
+                # Checks if practice game was ended after every snake crashed.
+                elif event.key == pygame.K_RETURN and self.practice_over:
+                    self.end_game()
+                    break
+                elif event.key == pygame.K_r and self.rewind_buffer is not None:
+                    pass  # (Rewinding is checked every frame, for as long as R is held).
                 else:
-                    pass
-
-            # Move snake for this particular "frame".
-            self.snake_player.move()
+                    print('key pressed does nothing')
+            else:
+                pass
 
-            # Collision event handling.
-            self.end_game_event_handling()
-            self.snack_collision_handling()
+    def update(self) -> None:
+        """Update the simulation for this frame, then leave the game if it has ended.
 
-            self.draw()
+        Moves every snake still alive for the current frame and checks for
+        collisions between the snakes, borders, and snack items, executing
+        relevant code (or rewinds a frame if R is held in practice mode).
+        """
+        if self.running:
+            if self.rewind_buffer is not None and pygame.key.get_pressed()[pygame.K_r]:
+                self.rewind_simulation()
+            elif not self.practice_over:
+                self.update_simulation()
+        if not self.running:
+            self.manager.pop()
+
+    def open_pause_menu(self) -> None:
+        """Open pause menu (made the first time the game is paused, if none was entered)."""
+        if self.pause_menu is None:
+            self.pause_menu = PauseMenu(self.window, self.width, self.height, self.sfx_bool, self.music_bool,
+                                        self.music_not_begun_yet)
+        else:
+            self.pause_menu.prepare(self.sfx_bool, self.music_bool, self.music_not_begun_yet)
+        self.manager.push(self.pause_menu)
+
+    def resume(self, previous_scene: Scene) -> None:
+        """Pick the game back up after the pause menu (or leave it, if the player quit from the pause menu)."""
+        pause_menu = previous_scene
+        sound_bank.set_music_volume(GAME_VOLUME)  # Increase volume of music back to normal.
+        self.total_pause_time += pause_menu.total_time_paused
+        self.sfx_bool, self.music_bool = pause_menu.sfx_bool, pause_menu.music_bool
+        self.music_not_begun_yet = pause_menu.music_not_begun_yet
+        self.quit_to_main = pause_menu.quit_to_main
+        # Returns to main menu immediately if player pressed quit in pause menu.
+        if pause_menu.quit_to_main:
+            if pause_menu.save_and_quit:
+                save_game_snapshot(take_game_snapshot(
+                    self.board, self.snake_player_list, self.border_ui.snacks_eaten_list,
+                    pause_menu.start_of_pause - self.start_time - self.total_pause_time,
+                    self.rewind_buffer is not None, self.get_autopilot_mode()))
+            self.end_game()
+            self.manager.pop()
+        else:
+            pygame.display.set_caption(self.caption)
+
+    def get_autopilot_mode(self) -> str:
+        """Return autopilot mode driving player 1's snake (see AUTOPILOT_MODE_LIST)."""
+        if isinstance(self.autopilot, SnakeAutopilot):
+            return 'APPLE'
+        elif isinstance(self.autopilot, HamiltonianAutopilot):
+            return 'CYCLE'
+        return AUTOPILOT_MODE_LIST[0]
+
+    def make_direction_key_dict(self) -> dict:
+        """Return dict mapping every player's move keys to their snake.
+
+        Each player's keys come from SNAKE_PLAYER_KEY_NAME_LIST (player 1 uses
+        the arrow keys). The dict values are (snake player, player keys dict)
+        tuples, where the player keys dict maps that player's keys to the
+        direction strings used by PlayerSnake.change_direction.
+
+        Returns:
+            direction_key_dict: Dict of {key: (snake, player keys dict)}.
+        """
+        direction_key_dict = {}
+        for snake_player, key_name_tuple in zip(self.snake_player_list, SNAKE_PLAYER_KEY_NAME_LIST):
+            player_keys_dict = {getattr(pygame, key_name): direction
+                                for key_name, direction in zip(key_name_tuple, ['up', 'right', 'down', 'left'])}
+            for key in player_keys_dict:
+                direction_key_dict[key] = (snake_player, player_keys_dict)
+        return direction_key_dict
+
+    def update_simulation(self) -> None:
+        """Move every snake still alive then handle collisions for this frame.
+
+        The autopilot (if any) steers its snake first. Every snake is moved
+        before any collisions are checked (see GameSimulation.move_snakes).
+        In practice mode, the frame is recorded in the rewind buffer. The
+        ghost snake (if any) plays its next tick too, and player 1's move is
+        recorded in the replay (if any).
+        """
+        if self.rewind_buffer is not None:
+            self.rewind_buffer.begin_tick(pygame.time.get_ticks() - self.start_time - self.total_pause_time)
+        if self.ghost_snake is not None:
+            self.ghost_snake.update()
+        self.simulation.move_snakes()
+        if self.replay is not None:
+            self.replay.record(self.snake_player_list[0].direction)
+        crashed_index_list = self.end_game_event_handling()
+        eaten_index_list = self.snack_collision_handling()
+        if self.rewind_buffer is not None:
+            self.rewind_buffer.end_tick(crashed_index_list, eaten_index_list, self.simulation.spawned_cell_list)
+
+    def rewind_simulation(self) -> None:
+        """Undo the last recorded frame (practice mode), taking scores and timer back with it.
+
+        The timer is set back to the undone frame's time by counting the time
+        since then as paused. Does nothing once the rewind buffer runs out.
+        """
+        rewound = self.rewind_buffer.rewind()
+        if rewound is None:
+            return
+        elapsed_time, eaten_index_list = rewound
+        for player_index in eaten_index_list:
+            self.border_ui.snacks_eaten_list[player_index] -= 1
+        self.total_pause_time = pygame.time.get_ticks() - self.start_time - elapsed_time
+        self.practice_over = False
+        if self.autopilot is not None:
+            self.autopilot.reset()
+
+    def end_game(self) -> None:
+        """Stop game music and end the game (it is left at the end of the frame, see update)."""
+        pygame.mixer.music.stop()
+        pygame.mixer.music.unload()
+        self.running = 0
 
     def draw(self) -> None:
         """Blit current frame of snake game content.
 
         This method blits all content in the game's current frame, to the
         screen. Content includes: the background, a grid (if turned on), the
-        current position of the snake, all apple objects in apple_list, and
-        the game border ui (border ui timer information is updated before
-        doing so).
+        current position of the ghost snake (if any) and the snakes, all apple
+        objects on the board, and the game border ui (border ui timer
+        information is updated before doing so).
         """
         self.window.blit(self.background, self.bg_pos)
         if self.grid_bool == 'True':
             self.grid.draw()
-        self.snake_player.draw()
-        for apple in self.apple_list:
-            apple.draw()
+        if self.ghost_snake is not None:
+            self.ghost_snake.draw()
+        for snake_player in self.snake_player_list:
+            snake_player.draw()
+        draw_items(self.window, self.board.item_cell_dict.values())
         self.border_ui.update_timer(pygame.time.get_ticks(), self.start_time, self.total_pause_time)
         self.border_ui.draw()
         pygame.display.update()
 
-    def end_game_event_handling(self) -> None:
+    def end_game_event_handling(self) -> list[int]:
         """Event handling for end game conditions.
 
-        This method checks if the snake object's head rect has collided with
-        any of the game border rects or any of the snake object's body cube
-        rects. If it has, game end code is executed.
+        This method checks, in one pass over the snakes still alive, if each
+        snake's head has left the board (and so collided with the game border)
+        or has moved into a cell holding any other snake cube (its own body,
+        another snake's body, or another snake's head), using the board's
+        shared cell occupancy counts. Crashed snakes are killed only after
+        every snake is checked (so two snakes crashing head to head both die)
+        and stay on the board as obstacles (see GameSimulation.handle_crashes).
+        Once every snake has crashed, game end code is executed (or, in
+        practice mode, the game waits to be rewound or ended).
+
+        Returns:
+            crashed_index_list: Indexes of players that crashed this frame.
         """
-        if list(filter(self.snake_player.head_cube_rect.colliderect,
-                       (self.snake_player.snake_cube_rect_list[1:] + self.border_ui.border_image_rect_list))):
-            self.snake_player.die()
-            pygame.mixer.music.stop()
-            pygame.mixer.music.unload()
+        crashed_index_list = self.simulation.handle_crashes()
+        if crashed_index_list:
             if self.sfx_bool == 'True':
-                self.snake_crashes_sfx.play()
-            self.running = 0
+                sound_bank.play('snake_crashes')
+            if self.simulation.is_over():
+                if self.rewind_buffer is None:
+                    self.end_game()
+                else:
+                    self.practice_over = True
+        return crashed_index_list
 
-    def snack_collision_handling(self) -> None:
+    def snack_collision_handling(self) -> list[int]:
         """Event handling for snack item collisions.
 
-        This method checks if the snake object's head rect has collided with
-        any of the snack items' rects currently blitted to the screen. If it
-        has, "snack eaten" code is executed (eaten apple object is removed
-        from apple list, a sfx is played, snake increases in length, snacks
-        eaten attribute in border ui goes up, and a new apple object is
-        created and added to apple list).
-        """
-        if list(filter((lambda apple_ob: self.snake_player.head_cube_rect.colliderect(apple_ob.apple_rect)),
-                       self.apple_list)):
+        This method removes whatever snack item is in each living snake
+        object's head cell from the board's item dict (a single dict lookup,
+        no matter how many items are on the board). If there was one, "snack
+        eaten" code is executed (a sfx is played, snake increases in length,
+        that player's snacks eaten count in border ui goes up, and a new apple
+        object is placed on a free cell if the board still has one, see
+        GameSimulation.handle_snacks).
 
-            for apple in self.apple_list:
-                if self.snake_player.head_cube_rect.colliderect(apple.apple_rect):
-                    self.apple_list.remove(apple)
-                    break
+        Returns:
+            eaten_index_list: Indexes of players that ate a snack this frame.
+        """
+        eaten_index_list = self.simulation.handle_snacks()
+        for player_index in eaten_index_list:
             if self.sfx_bool == 'True':
-                self.snack_points_up_sfx.play()
-            self.snake_player.increase_length()
-            self.border_ui.snacks_eaten += 1
-            current_item_rect_list = self.snake_player.snake_cube_rect_list + [apple.apple_rect
-                                                                               for apple in self.apple_list]
-            self.apple_list.append(AppleSnack(self.window, current_item_rect_list))
+                sound_bank.play('snack_points_up')
+            self.border_ui.snacks_eaten_list[player_index] += 1
+        return eaten_index_list
@@ -1,7 +1,7 @@
 """Define game options screen, content, and row classes.
 
 This module holds a class responsible for blitting the program's game
-options screen and running an event loop to listen for mouse click events,
+options screen and handling mouse click events,
 another class responsible for holding and blitting each game option row, and
 another class responsible for blitting and holding all of the content in each
 game option row (game option label, all the corresponding options, and left
@@ -13,11 +13,13 @@ Classes:
     GameOptionsScreen: Contains game options screen of program.
 """
 
-import sys
 import pygame
 from misc.constants import *
 from misc.buttons import ApplyButton, CutoutArrowButton, TextButton
 from misc.saved_data_io_functions import get_file_dict, set_new_user_preferences, update_settings_real_time
+from misc.scene_manager import Scene
+from misc.thumbnail_cache import thumbnail_cache
+from misc.timers import TimerQueue
 
 
 class GameOptionRow(object):
@@ -27,7 +29,15 @@ class GameOptionRow(object):
     includes any game option label entered as an argument, a corresponding
     list of possible options, the currently selected option, and left and
     right buttons to click through the available options. A draw method that
-    blits all the content in the row object is also included.
+    blits all the content in the row object is also included. The label and
+    every available option are rendered once, when the row is made, and the
+    selected option is kept as an index into the option list, so selecting
+    another option only swaps which surface is blit (and moves the arrows
+    next to it). Rows of options in THUMBNAIL_OPTION_LABEL_LIST (backgrounds
+    and snake skins) also show a preview of the selected option in a column
+    after the arrows, from the thumbnail cache, which starts making the
+    previews of the options on either side as soon as an option is
+    selected.
     """
 
     def __init__(self, window: pygame.Surface, option_label: str, x_pos: int, y_pos: int) -> None:
@@ -38,14 +48,62 @@ class GameOptionRow(object):
         self.left_button_pos = (x_pos, y_pos)
         self.right_button_pos = (x_pos, y_pos)
         self.option_list = get_file_dict('game_options').get(self.option_label)
-        self.set_option = get_file_dict('user_preferences').get(self.option_label)
-        self.currently_selected_option = self.set_option
+        label_font = pygame.font.Font(BUBBLE_FONT_FILE, GAME_OPTIONS_LABEL_FONT_SIZE)
+        self.label_surface = label_font.render(self.option_label, True, GAME_TEXT_BLUE)
+        self.label_rect = self.label_surface.get_rect(midleft=(70, self.y_pos))
+        option_font = pygame.font.Font(ARCADE_FONT_FILE, GAME_OPTIONS_OPTION_FONT_SIZE)
+        self.option_surface_list = [option_font.render(option.split('~')[0], True, GAME_TEXT_LIGHT_BLUE)
+                                    for option in self.option_list]
+        self.option_rect = self.option_surface_list[0].get_rect()
+        self.option_value_list = [option.split('~')[1] for option in self.option_list]
         self.left_button = CutoutArrowButton(self.window, self.left_button_pos, CUTOUT_ARROW_BUTTON_WIDTH,
                                              CUTOUT_ARROW_BUTTON_HEIGHT, 'left')
         self.right_button = CutoutArrowButton(self.window, self.right_button_pos, CUTOUT_ARROW_BUTTON_WIDTH,
                                               CUTOUT_ARROW_BUTTON_HEIGHT, 'right')
         self.left_button_exists = False
         self.right_button_exists = False
+        self.thumbnail_bool = self.option_label in THUMBNAIL_OPTION_LABEL_LIST
+        self.thumbnail_pos = (THUMBNAIL_X_POS, self.y_pos)
+        # (Options added after the user's preferences were last saved default to their first choice).
+        self.set_option = get_file_dict('user_preferences').get(self.option_label, self.option_list[0])
+        self.selected_index = 0
+        self.currently_selected_option = self.option_list[0]
+        self.select_option(self.get_option_index(self.set_option))
+
+    def get_option_index(self, option: str) -> int:
+        """Return index of entered option in option list (0, the first option, if it isn't available anymore)."""
+        return self.option_list.index(option) if option in self.option_list else 0
+
+    def select_option(self, index: int) -> None:
+        """Select option at entered index and move the option and arrow buttons to fit it.
+
+        The left arrow is only shown if the selected option isn't the first
+        option, and the right arrow only if it isn't the last option.
+        """
+        self.selected_index = index
+        self.currently_selected_option = self.option_list[index]
+        self.x_pos = self.label_rect.left + 300
+
+        # Left arrow goes after the label.
+        self.left_button_pos = (self.x_pos, self.y_pos)
+        self.left_button.update_button_pos(self.left_button_pos)
+        self.left_button_exists = self.selected_index > 0
+        self.x_pos += (GAME_OPTIONS_OPTION_SPACER + self.left_button.width)
+
+        # Selected option goes after the left arrow.
+        self.option_rect = self.option_surface_list[index].get_rect(midleft=(self.x_pos, self.y_pos))
+        self.x_pos += (self.option_rect.width + GAME_OPTIONS_OPTION_SPACER)
+
+        # Right arrow goes after the selected option.
+        self.right_button_pos = (self.x_pos, self.y_pos)
+        self.right_button.update_button_pos(self.right_button_pos)
+        self.right_button_exists = self.selected_index < len(self.option_list) - 1
+
+        # Asking for the neighboring options' previews makes them ahead of time.
+        if self.thumbnail_bool:
+            for neighbor_index in [index - 1, index + 1]:
+                if 0 <= neighbor_index < len(self.option_list):
+                    thumbnail_cache.get(self.option_label, self.option_value_list[neighbor_index])
 
     def draw(self, mouse_pos: tuple[int, int], sfx_bool: str) -> None:
         """Blit all GameOptionRow content to screen.
@@ -61,43 +119,16 @@ class GameOptionRow(object):
                 if arrow buttons should activate their hover and click sfx
                 when activated.
         """
-
-        # Blit game option label.
-        self.x_pos = 70
-        label_font = pygame.font.Font(BUBBLE_FONT_FILE, GAME_OPTIONS_LABEL_FONT_SIZE)
-        label_pos = (self.x_pos, self.y_pos)
-        label_surface = label_font.render(self.option_label, True, GAME_TEXT_BLUE)
-        label_rect = label_surface.get_rect(midleft=label_pos)
-        self.window.blit(label_surface, label_rect)
-        self.x_pos += 300
-
-        # Blit left arrow if currently selected option is > index 0.
-        self.left_button_pos = (self.x_pos, self.y_pos)
-        if self.currently_selected_option != self.option_list[0]:
-            self.left_button.update_button_pos(self.left_button_pos)
+        self.window.blit(self.label_surface, self.label_rect)
+        if self.left_button_exists:
             self.left_button.draw(mouse_pos, sfx_bool)
-            self.left_button_exists = True
-        else:
-            self.left_button_exists = False
-        self.x_pos += (GAME_OPTIONS_OPTION_SPACER + self.left_button.width)
-
-        # Blit currently selected option.
-        option_font = pygame.font.Font(ARCADE_FONT_FILE, GAME_OPTIONS_OPTION_FONT_SIZE)
-        option_pos = (self.x_pos, self.y_pos)
-        currently_selected_option_clean = (self.currently_selected_option.split('~')[0])
-        option_surface = option_font.render(currently_selected_option_clean, True, GAME_TEXT_LIGHT_BLUE)
-        option_rect = option_surface.get_rect(midleft=option_pos)
-        self.window.blit(option_surface, option_rect)
-        self.x_pos += (option_rect.width + GAME_OPTIONS_OPTION_SPACER)
-
-        # Blit right arrow if currently selected option is < index -1.
-        self.right_button_pos = (self.x_pos, self.y_pos)
-        if self.currently_selected_option != self.option_list[-1]:
-            self.right_button.update_button_pos(self.right_button_pos)
+        self.window.blit(self.option_surface_list[self.selected_index], self.option_rect)
+        if self.right_button_exists:
             self.right_button.draw(mouse_pos, sfx_bool)
-            self.right_button_exists = True
-        else:
-            self.right_button_exists = False
+        if self.thumbnail_bool:
+            thumbnail = thumbnail_cache.get(self.option_label, self.option_value_list[self.selected_index])
+            if thumbnail is not None:
+                self.window.blit(thumbnail, thumbnail.get_rect(midleft=self.thumbnail_pos))
 
 
 class GameOptionsContent(object):
@@ -113,14 +144,14 @@ class GameOptionsContent(object):
     def __init__(self, window: pygame.Surface) -> None:
         self.window = window
         self.x_pos = 100
-        self.y_pos = 70
+        self.y_pos = GAME_OPTIONS_ROWS_START_Y
         # Makes a list of row objects that each accept a game option dictionary key.
         self.list_of_rows = [GameOptionRow(window, option_key, self.x_pos, self.y_increment())
                              for option_key in get_file_dict('game_options')]
 
     def y_increment(self) -> int:
         """Increment y_pos attribute (for spacing each GameOptionRow)."""
-        self.y_pos += 45
+        self.y_pos += GAME_OPTIONS_ROW_SPACING
         return self.y_pos
 
     def make_new_user_preferences_list(self) -> list[str]:
@@ -141,6 +172,13 @@ class GameOptionsContent(object):
 
         return new_pref_list
 
+    def reset_selected_options(self) -> None:
+        """Set every row's selected option back to the option saved in the user's preferences."""
+        user_preferences_dict = get_file_dict('user_preferences')
+        for row_object in self.list_of_rows:
+            row_object.set_option = user_preferences_dict.get(row_object.option_label, row_object.option_list[0])
+            row_object.select_option(row_object.get_option_index(row_object.set_option))
+
     def arrows_is_hovering(self, mouse_pos: tuple[int, int]) -> bool:
         """Return bool indicating whether any arrows are being hovered over.
 
@@ -160,9 +198,8 @@ class GameOptionsContent(object):
         """Check if any arrow buttons were clicked and draws them.
 
         Iterates through option row object list and draws the clicked version
-        of any arrow button that was clicked and then changes the object's
-        currently_selected_option attribute to the next or previous option
-        depending on arrow direction clicked.
+        of any arrow button that was clicked and then selects the row's next
+        or previous option depending on arrow direction clicked.
 
         Args:
             mouse_pos: Used to determine which button mouse was hovering over,
@@ -173,14 +210,10 @@ class GameOptionsContent(object):
         for row_object in self.list_of_rows:
             if row_object.left_button_exists and row_object.left_button.is_hovering(mouse_pos):
                 row_object.left_button.draw_clicked(sfx_bool)
-                # (Maybe put this in game_option_row object as a method and then call it here).
-                row_object.currently_selected_option = \
-                    row_object.option_list[(row_object.option_list.index(row_object.currently_selected_option)) - 1]
+                row_object.select_option(row_object.selected_index - 1)
             elif row_object.right_button_exists and row_object.right_button.is_hovering(mouse_pos):
                 row_object.right_button.draw_clicked(sfx_bool)
-                # (Maybe put this in game_option_row object as a method and then call it here).
-                row_object.currently_selected_option = \
-                    row_object.option_list[(row_object.option_list.index(row_object.currently_selected_option)) + 1]
+                row_object.select_option(row_object.selected_index + 1)
             else:
                 pass
 
@@ -190,13 +223,13 @@ class GameOptionsContent(object):
             row_object.draw(mouse_pos, sfx_bool)
 
 
-class GameOptionsScreen(object):
+class GameOptionsScreen(Scene):
     """Contains all game options screen content to be blitted to the screen.
 
     This class contains all the information and content to be blitted to the
     screen as well as a draw method that actually blits everything
-    categorized as being in the game options screen. Includes event loop that
-    checks for mouse click events. Content in the game options screen
+    categorized as being in the game options screen. Includes event handling
+    that checks for mouse click events. Content in the game options screen
     includes: a column of game option labels (sound, music, grid, border
     theme, background, and snake skin), a column of currently selected options
     corresponding to each game option label, left and right arrow buttons that
@@ -204,7 +237,10 @@ class GameOptionsScreen(object):
     option label, an apply button that takes all of the currently selected
     options and saves them in the game_options.txt file in order to be used in
     other parts of the program, and a back button to leave the game options
-    screen event loop and return to the main menu.
+    screen and return to the main menu. The screen is reused between visits,
+    with every row set back to the saved options (dropping changes that
+    weren't applied) on each visit. It runs at GAME_OPTIONS_FRAME_RATE
+    frames per second.
     """
 
     def __init__(self, window: pygame.Surface, width: int, height: int, sfx_bool: str, music_bool: str,
@@ -222,78 +258,70 @@ class GameOptionsScreen(object):
         self.title_pos = GAME_OPTIONS_TITLE_POS
         self.title_surface = self.title_font.render(self.title, True, self.title_color)
         self.title_rect = self.title_surface.get_rect(center=self.title_pos)
-        self.running = True
-
-    def run(self) -> None:
-        """Run game options screen event loop.
-
-        This method creates back button, apply button, and a 
-        GameOptionsContent instance, then starts an event loop to check if 
-        either button or any arrow buttons in game_options have been pressed.
-        """
+        self.back_button = TextButton(self.window, BACK_BUTTON_POS, TEXT_BUTTON_WIDTH, TEXT_BUTTON_HEIGHT,
+                                      BACK_BUTTON_TEXT, TEXT_BUTTON_FONT_SIZE)
+        self.apply_button = ApplyButton(self.window, APPLY_BUTTON_POS, TEXT_BUTTON_WIDTH, TEXT_BUTTON_HEIGHT,
+                                        APPLY_BUTTON_TEXT, TEXT_BUTTON_FONT_SIZE)
+        self.game_options = GameOptionsContent(self.window)
+        self.mouse_position = (0, 0)
+        self.timers = TimerQueue()
+        self.clock = pygame.time.Clock()
+
+    def enter(self) -> None:
+        """Set caption and show the saved options (a new GameOptionsContent is only made the first visit)."""
         pygame.display.set_caption(self.caption)
-        back_button = TextButton(self.window, BACK_BUTTON_POS, TEXT_BUTTON_WIDTH, TEXT_BUTTON_HEIGHT,
-                                 BACK_BUTTON_TEXT, TEXT_BUTTON_FONT_SIZE)
-        apply_button = ApplyButton(self.window, APPLY_BUTTON_POS, TEXT_BUTTON_WIDTH, TEXT_BUTTON_HEIGHT,
-                                   APPLY_BUTTON_TEXT, TEXT_BUTTON_FONT_SIZE)
-        game_options = GameOptionsContent(self.window)
-
-        while self.running:
-            mouse_position = pygame.mouse.get_pos()
-            event_list = pygame.event.get()
-
-            for event in event_list:
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-
-                # Checks if mouse button was clicked.
-                elif event.type == pygame.MOUSEBUTTONUP:
-                    # Checks if cursor was hovering over any buttons when clicked and if so, executes its code.
-
-                    if back_button.is_hovering(mouse_position):
-                        back_button.draw_clicked(self.sfx_bool)
-                        pygame.time.delay(BUTTON_CLICK_TIME_DELAY)
-                        self.running = False
-                        break
-                    elif apply_button.is_hovering(mouse_position):
-                        apply_button.draw_clicked()
-                        pygame.time.delay(BUTTON_CLICK_TIME_DELAY)
-                        old_user_preferences_dict = get_file_dict('user_preferences')
-                        new_user_preferences_list = game_options.make_new_user_preferences_list()
-                        set_new_user_preferences(new_user_preferences_list)
-                        self.sfx_bool, self.music_bool, self.background = \
-                            update_settings_real_time(self.width, self.height, old_user_preferences_dict)
-                    elif game_options.arrows_is_hovering(mouse_position):
-                        game_options.arrows_draw_clicked(mouse_position, self.sfx_bool)
-                        pygame.time.delay(BUTTON_CLICK_TIME_DELAY)
-                    else:
-                        print('nothing was clicked')
-
+        self.game_options.reset_selected_options()
+
+    def wait(self) -> None:
+        """Wait for the next frame (so the screen doesn't keep the cpu busy)."""
+        self.clock.tick(GAME_OPTIONS_FRAME_RATE)
+
+    def handle_events(self, event_list: list[pygame.event.Event]) -> None:
+        """Check if either button or any arrow buttons in game_options have been pressed."""
+        self.mouse_position = mouse_position = pygame.mouse.get_pos()
+
+        for event in event_list:
+            # Checks if mouse button was clicked (clicks are ignored while waiting to leave the screen).
+            if event.type == pygame.MOUSEBUTTONUP and not self.timers.is_pending():
+                # Checks if cursor was hovering over any buttons when clicked and if so, executes its code.
+
+                if self.back_button.is_hovering(mouse_position):
+                    self.back_button.draw_clicked(self.sfx_bool)
+                    self.timers.schedule(BUTTON_CLICK_TIME_DELAY, self.stop)
+                elif self.apply_button.is_hovering(mouse_position):
+                    self.apply_button.draw_clicked()
+                    old_user_preferences_dict = get_file_dict('user_preferences')
+                    new_user_preferences_list = self.game_options.make_new_user_preferences_list()
+                    set_new_user_preferences(new_user_preferences_list)
+                    self.sfx_bool, self.music_bool, self.background = \
+                        update_settings_real_time(self.width, self.height, old_user_preferences_dict)
+                elif self.game_options.arrows_is_hovering(mouse_position):
+                    self.game_options.arrows_draw_clicked(mouse_position, self.sfx_bool)
                 else:
-                    pass
+                    print('nothing was clicked')
 
-            self.draw(mouse_position, back_button, apply_button, game_options)
+            else:
+                pass
 
-    def draw(self, mouse_pos: tuple[int, int], button_1: TextButton, button_2: ApplyButton, options: GameOptionsContent,
-             ) -> None:
-        """Blit all GameOptionsScreen content to screen.
+    def update(self) -> None:
+        """Run any scheduled callbacks that are due and pick up option previews made since the last frame."""
+        self.timers.update()
+        thumbnail_cache.update()
 
-        Uses class attributes and entered args to blit a background, all game
-        option rows (which include a game option label, the currently selected
-        option, and arrows to click through the available options), a back
-        button, an apply button, and a game options title to the screen.
+    def stop(self) -> None:
+        """Leave game options screen (returns to main menu)."""
+        self.manager.pop()
 
-        Args:
-            mouse_pos: Used to determine which button mouse was hovering over,
-                if any.
-            button_1: Text button that goes back to main menu.
-            button_2: Apply button that dynamically applies changes to user
-                preferences.
-            options: Holds all game option rows.
+    def draw(self) -> None:
+        """Blit all GameOptionsScreen content to screen.
+
+        Uses class attributes to blit a background, all game option rows
+        (which include a game option label, the currently selected option, and
+        arrows to click through the available options), a back button, an
+        apply button, and a game options title to the screen.
         """
         self.window.blit(self.background, BACKGROUND_BLIT_POS)
         self.window.blit(self.title_surface, self.title_rect)
-        for screen_item in [button_1, button_2, options]:
-            screen_item.draw(mouse_pos, self.sfx_bool)
+        for screen_item in [self.back_button, self.apply_button, self.game_options]:
+            screen_item.draw(self.mouse_position, self.sfx_bool)
         pygame.display.update()
@@ -2,30 +2,42 @@
 
 This module holds the class responsible for blitting the program's high scores
 screen, blitting a scoreboard with pages, blitting buttons to click through
-each page, and running an event loop to listen for mouse click events.
+each page, and handling mouse click events.
 
 Classes:
     HighScoresScreen: Contains high scores screen of program.
 """
 
 import os
-import sys
 import pygame
 from misc.constants import *
+from misc.asset_cache import load_image
 from misc.buttons import ArrowButton, TextButton
 from misc.saved_data_io_functions import get_score_name_list
+from misc.scene_manager import Scene
+from misc.timers import TimerQueue
 
 
-class HighScoresScreen(object):
+class HighScoresScreen(Scene):
     """Contains all high scores screen content to be blitted to the screen.
 
     This class contains all the information and content to be blitted to the
     screen as well as a draw method that actually blits everything
-    categorized as being in the high score screen. Includes event loop that
-    checks for mouse click events. Content in the high scores screen includes:
-    the scoreboard (with rank, score, and username columns), a left and right
-    arrow to switch between scoreboard screens, and a back button to leave the
-    high scores screen event loop and return to the main menu.
+    categorized as being in the high score screen. Includes event handling
+    that checks for mouse click events. Content in the high scores screen
+    includes: the scoreboard (with rank, score, and username columns), a left
+    and right arrow to switch between scoreboard screens, and a back button to
+    leave the high scores screen and return to the main menu. The screen is
+    reused between visits, with the saved scores read again (and the first
+    page shown) on each visit.
+
+    Each page (scoreboard background, column labels, and rows) is rendered
+    once into a surface and kept, so drawing a page is a single blit. When
+    the saved scores are read again, only pages from the first row that
+    changed onwards are rendered again (a new score only moves the rows
+    ranked below it), and the pages next to the current one are rendered
+    ahead of time, one per frame, so paging with the arrow buttons never has
+    to wait for a page to render.
     """
 
     def __init__(self, window: pygame.Surface, width: float, height: float,
@@ -35,148 +47,166 @@ class HighScoresScreen(object):
         self.height = height
         self.sfx_bool = sfx_bool
         self.background = background
-        self.scoreboard = pygame.transform.scale(pygame.Surface.convert(pygame.image.load(
-            os.path.join('project_assets', 'backgrounds', 'black_background.png'))), SCORE_BOARD_SIZE)
-        self.score_name_list = get_score_name_list()
+        self.scoreboard = load_image(
+            os.path.join('project_assets', 'backgrounds', 'black_background.png'), SCORE_BOARD_SIZE, alpha=False)
+        self.score_name_list = []
         self.current_page = 1
-        self.page_limit = -(-len(self.score_name_list) // SCORES_PER_PAGE)
+        self.page_limit = 1
         self.caption = 'Snake - Leaderboard'
-        self.text = ''
-        self.text_color = GAME_TEXT_LIGHT_BLUE
+        self.label_font = pygame.font.Font(ARCADE_FONT_FILE, SCORE_DATA_LABEL_FONT_SIZE)
         self.font = pygame.font.Font(ARCADE_FONT_FILE, SCORE_DATA_FONT_SIZE)
-        self.text_pos = (0, 0)
-        self.text_surface = self.font.render(self.text, True, self.text_color)
-        self.text_rect = self.text_surface.get_rect(center=self.text_pos)
-        self.running = True
-
-    def run(self) -> None:
-        """Run high scores screen event loop.
-
-        Creates arrow buttons to move through each page of the scoreboard, as
-        well as a back button to return to the main menu. High scores screen
-        event loop is then started. Event loop continuously draws high scores
-        screen content to screen and checks for button hover and click events.
-        """
+        self.page_surface_dict = {}  # {page number: rendered page surface}
+        self.back_button = TextButton(self.window, BACK_BUTTON_POS, TEXT_BUTTON_WIDTH, TEXT_BUTTON_HEIGHT, 'BACK',
+                                      TEXT_BUTTON_FONT_SIZE)
+        self.prev_button = ArrowButton(self.window, PREV_ARROW_BUTTON_POS, ARROW_BUTTON_WIDTH, ARROW_BUTTON_HEIGHT,
+                                       'left')
+        self.next_button = ArrowButton(self.window, NEXT_ARROW_BUTTON_POS, ARROW_BUTTON_WIDTH, ARROW_BUTTON_HEIGHT,
+                                       'right')
+        self.mouse_position = (0, 0)
+        self.timers = TimerQueue()
+
+    def enter(self) -> None:
+        """Set caption and read saved scores again, starting from the first page."""
         pygame.display.set_caption(self.caption)
-        back_button = TextButton(self.window, BACK_BUTTON_POS, TEXT_BUTTON_WIDTH, TEXT_BUTTON_HEIGHT, 'BACK',
-                                 TEXT_BUTTON_FONT_SIZE)
-        prev_button = ArrowButton(self.window, PREV_ARROW_BUTTON_POS, ARROW_BUTTON_WIDTH, ARROW_BUTTON_HEIGHT, 'left')
-        next_button = ArrowButton(self.window, NEXT_ARROW_BUTTON_POS, ARROW_BUTTON_WIDTH, ARROW_BUTTON_HEIGHT, 'right')
-
-        while self.running:
-            mouse_position = pygame.mouse.get_pos()
-            event_list = pygame.event.get()
-
-            for event in event_list:
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-
-                elif event.type == pygame.MOUSEBUTTONUP:  # Checks if mouse button was clicked.
-                    # Checks if cursor was hovering over any buttons when clicked and if so, executes their code.
-
-                    if back_button.is_hovering(mouse_position):
-                        back_button.draw_clicked(self.sfx_bool)
-                        pygame.time.delay(BUTTON_CLICK_TIME_DELAY)
-                        self.running = False
-                        break
-                    elif prev_button.is_hovering(mouse_position) and 1 < self.current_page <= self.page_limit:
-                        prev_button.draw_clicked(self.sfx_bool)
-                        self.page_changed(direction='prev')
-                        pygame.time.delay(BUTTON_CLICK_TIME_DELAY)
-                    elif next_button.is_hovering(mouse_position) and 1 <= self.current_page < self.page_limit:
-                        next_button.draw_clicked(self.sfx_bool)
-                        self.page_changed(direction='next')
-                        pygame.time.delay(BUTTON_CLICK_TIME_DELAY)
-                    else:
-                        print('nothing was clicked')
+        self.set_score_name_list(get_score_name_list())
+        self.current_page = 1
+        self.page_limit = -(-len(self.score_name_list) // SCORES_PER_PAGE)
 
+    def handle_events(self, event_list: list[pygame.event.Event]) -> None:
+        """Check for back button and page arrow button click events."""
+        self.mouse_position = mouse_position = pygame.mouse.get_pos()
+
+        for event in event_list:
+            # Checks if mouse button was clicked (clicks are ignored while waiting to leave the screen).
+            if event.type == pygame.MOUSEBUTTONUP and not self.timers.is_pending():
+                # Checks if cursor was hovering over any buttons when clicked and if so, executes their code.
+
+                if self.back_button.is_hovering(mouse_position):
+                    self.back_button.draw_clicked(self.sfx_bool)
+                    self.timers.schedule(BUTTON_CLICK_TIME_DELAY, self.stop)
+                elif self.prev_button.is_hovering(mouse_position) and 1 < self.current_page <= self.page_limit:
+                    self.prev_button.draw_clicked(self.sfx_bool)
+                    self.page_changed(direction='prev')
+                elif self.next_button.is_hovering(mouse_position) and 1 <= self.current_page < self.page_limit:
+                    self.next_button.draw_clicked(self.sfx_bool)
+                    self.page_changed(direction='next')
                 else:
-                    pass
+                    print('nothing was clicked')
+
+            else:
+                pass
 
-            self.draw(mouse_position, back_button, prev_button, next_button)
+    def update(self) -> None:
+        """Run any scheduled callbacks that are due and render a page next to the current one if it isn't yet."""
+        self.timers.update()
+        for page in [self.current_page + 1, self.current_page - 1]:
+            if 1 <= page <= self.page_limit and page not in self.page_surface_dict:
+                self.get_page_surface(page)
+                break
 
-    def draw(self, mouse_pos: tuple[int, int], button_1: TextButton, button_2: ArrowButton, button_3: ArrowButton,
-             ) -> None:
+    def stop(self) -> None:
+        """Leave high scores screen (returns to main menu)."""
+        self.manager.pop()
+
+    def draw(self) -> None:
         """Blit all HighScoresScreen content to screen.
 
-        Uses class attributes, internal methods, and entered args to blit the 
-        background, a scoreboard background, all of the current page content,
-        a back button to return to the main menu, and two arrow buttons used 
-        to go through all scoreboard pages available.
-
-        Args:
-            mouse_pos: Used to determine which button mouse was hovering over,
-                if any.
-            button_1: Text button that goes back to main menu.
-            button_2: Arrow button that goes to previous page of scoreboard.
-            button_3: Arrow button that goes to next page of scoreboard.
+        Uses class attributes and internal methods to blit the background, a
+        scoreboard background, all of the current page content, a back button
+        to return to the main menu, and two arrow buttons used to go through
+        all scoreboard pages available.
         """
         self.window.blit(self.background, BACKGROUND_BLIT_POS)
-        self.window.blit(self.scoreboard, SCORE_BOARD_BLIT_POS)
         self.draw_current_page()
-        button_1.draw(mouse_pos, self.sfx_bool)
+        self.back_button.draw(self.mouse_position, self.sfx_bool)
         if self.current_page != 1:
-            button_2.draw(mouse_pos, self.sfx_bool)
+            self.prev_button.draw(self.mouse_position, self.sfx_bool)
         if self.current_page != self.page_limit:
-            button_3.draw(mouse_pos, self.sfx_bool)
+            self.next_button.draw(self.mouse_position, self.sfx_bool)
         pygame.display.update()
 
     def draw_current_page(self) -> None:
-        """Organize and blit all data in current scoreboard page.
+        """Blit current scoreboard page (rendered the first time it is shown, see get_page_surface)."""
+        self.window.blit(self.get_page_surface(self.current_page), SCORE_BOARD_BLIT_POS)
+
+    def get_page_surface(self, page: int) -> pygame.Surface:
+        """Return rendered surface of entered page, rendering and keeping it if it isn't yet.
 
-        This method takes information from attributes that were created in the
-        init method and structures them (mostly the score_name_list) into three
+        Once more than SCORE_PAGE_CACHE_LIMIT pages are kept, the pages
+        furthest from the current page are forgotten.
+        """
+        page_surface = self.page_surface_dict.get(page)
+        if page_surface is None:
+            page_surface = self.page_surface_dict[page] = self.render_page(page)
+            while len(self.page_surface_dict) > SCORE_PAGE_CACHE_LIMIT:
+                del self.page_surface_dict[max(self.page_surface_dict,
+                                               key=lambda kept_page: abs(kept_page - self.current_page))]
+        return page_surface
+
+    def render_page(self, page: int) -> pygame.Surface:
+        """Organize and render all data in entered scoreboard page onto a copy of the scoreboard background.
+
+        This method takes the score_name_list and structures it into three
         categorical columns (rank, score, name) and eleven rows. The first row
         always being the column labels (RANK, SCORE, NAME), and the other ten
         being the ten rows of (rank, score, name) data allowed on each page.
+        Positions are worked out in window coordinates, then moved to the
+        page surface's (which is blit at SCORE_BOARD_BLIT_POS).
         """
+        page_surface = self.scoreboard.copy()
+        offset_x, offset_y = SCORE_BOARD_BLIT_POS
 
-        # Blits scoreboard column labels on screen.
-        self.font = pygame.font.Font(ARCADE_FONT_FILE, SCORE_DATA_LABEL_FONT_SIZE)
-        self.text_color = GAME_TEXT_GREEN
+        # Renders scoreboard column labels.
         x_pos = 110
-
-        for item in ['RANK', 'SCORE', 'NAME']:
-            self.text = item
-            self.text_pos = (x_pos, 50)
-            self.text_surface = self.font.render(self.text, True, self.text_color)
-            if item == 'SCORE':
-                self.text_rect = self.text_surface.get_rect(midright=self.text_pos)
+        for column, item in enumerate(['RANK', 'SCORE', 'NAME']):
+            text_pos = (x_pos - offset_x, 50 - offset_y)
+            text_surface = self.label_font.render(item, True, GAME_TEXT_GREEN)
+            if column == 1:
+                text_rect = text_surface.get_rect(midright=text_pos)
                 x_pos += 100
             else:
-                self.text_rect = self.text_surface.get_rect(midleft=self.text_pos)
+                text_rect = text_surface.get_rect(midleft=text_pos)
                 x_pos += 300
-            self.window.blit(self.text_surface, self.text_rect)
+            page_surface.blit(text_surface, text_rect)
 
-        # Blits current scoreboard page's data (10 rank, score, name pairs) on screen.
-        self.font = pygame.font.Font(ARCADE_FONT_FILE, SCORE_DATA_FONT_SIZE)
-        self.text_color = GAME_TEXT_LIGHT_BLUE
-        start = (self.current_page - 1) * SCORES_PER_PAGE
-        stop = self.current_page * SCORES_PER_PAGE
+        # Renders page's data (10 rank, score, name pairs).
+        start = (page - 1) * SCORES_PER_PAGE
+        stop = page * SCORES_PER_PAGE
         rank = start
         y_pos = 90
 
         for pair in self.score_name_list[start:stop]:
             rank += 1
-            score = pair[0]
-            name = pair[1].upper()  # (Maybe get rid of .upper() and do type change in init method).
             x_pos = 110
 
-            for item in [rank, score, name]:
-                self.text = str(item)
-                self.text_pos = (x_pos, y_pos)
-                self.text_surface = self.font.render(self.text, True, self.text_color)
-                if item == score:
-                    self.text_rect = self.text_surface.get_rect(midright=self.text_pos)
+            for column, item in enumerate([rank, pair[0], pair[1].upper()]):
+                text_pos = (x_pos - offset_x, y_pos - offset_y)
+                text_surface = self.font.render(str(item), True, GAME_TEXT_LIGHT_BLUE)
+                if column == 1:
+                    text_rect = text_surface.get_rect(midright=text_pos)
                     x_pos += 100
                 else:
-                    self.text_rect = self.text_surface.get_rect(midleft=self.text_pos)
+                    text_rect = text_surface.get_rect(midleft=text_pos)
                     x_pos += 300
-                self.window.blit(self.text_surface, self.text_rect)
+                page_surface.blit(text_surface, text_rect)
 
             y_pos += 30
 
+        return page_surface
+
+    def set_score_name_list(self, score_name_list: list[list[int, str]]) -> None:
+        """Show entered score, name pairs, forgetting rendered pages from the first changed row onwards."""
+        changed_index = 0
+        for old_pair, new_pair in zip(self.score_name_list, score_name_list):
+            if old_pair != new_pair:
+                break
+            changed_index += 1
+        if changed_index < max(len(self.score_name_list), len(score_name_list)):
+            first_changed_page = changed_index // SCORES_PER_PAGE + 1
+            for page in [page for page in self.page_surface_dict if page >= first_changed_page]:
+                del self.page_surface_dict[page]
+        self.score_name_list = score_name_list
+
     def page_changed(self, direction: str) -> None:
         """Change current page in direction specified."""
         if direction == 'prev':
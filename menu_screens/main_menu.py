@@ -1,31 +1,44 @@
 """Draw main menu and check for mouse click events.
 
 This module holds the class responsible for blitting the program's main menu,
-all of its button options, and runs an event loop to listen for mouse click
-events.
+all of its button options, and handling mouse click events to open the
+other screens.
 
 Classes:
     MainMenu: Contains main menu of program.
 """
 
 import os
+from functools import partial
 import pygame
 from misc.constants import *
+from misc.frame_tracer import frame_tracer
 from misc.buttons import TextButton
+from misc.scene_manager import Scene
+from misc.timers import TimerQueue
+from game_objects.game_snapshot import GameSnapshot, delete_game_snapshot, has_game_snapshot, load_game_snapshot
 from game_screens.snake_game_screen import SnakeGameScreen
 from menu_screens.high_scores_screen import HighScoresScreen
 from menu_screens.game_options_screen import GameOptionsScreen
 from misc.saved_data_io_functions import get_file_dict, update_settings_real_time
 
 
-class MainMenu(object):
+class MainMenu(Scene):
     """Contains all main menu content to be blitted to the screen.
 
     This class contains all the information and content to be blitted to the
     screen as well as a draw method that actually blits everything
     categorized as being in the main menu. Main menu content includes 4 button
     options (start game, high scores, game options, and quit). Each button
-    calls each option's corresponding screen class when selected.
+    opens each option's corresponding screen when selected. A smaller resume
+    button is also shown while there is a saved game (see the pause menu's
+    save & quit option), which carries on the saved game. Selected screens
+    are opened once the clicked button has been shown pressed for a moment
+    (scheduled on the menu's timer queue, so the menu keeps drawing and
+    handling events in the meantime). The high scores and game options
+    screens are made the first time they are opened and reused on every
+    visit after that, while a new snake game screen is made for each game
+    (its board depends on the settings chosen, or the game being resumed).
     """
 
     def __init__(self, window: pygame.Surface, width: int, height: int, sfx_bool: str, music_bool: str,
@@ -44,101 +57,130 @@ class MainMenu(object):
         self.title_surface = self.font.render(self.title, True, self.title_color)
         self.title_rect = self.title_surface.get_rect(center=self.title_pos)
         self.menu_music = os.path.join('project_assets', 'music', 'menu_music.ogg')
-        self.running = True
-
-    def run(self) -> None:
-        """Run main menu event loop.
+        self.start_game_button = TextButton(self.window, START_BUTTON_POS, MENU_BUTTON_WIDTH, MENU_BUTTON_HEIGHT,
+                                            START_BUTTON_TEXT, MENU_BUTTONS_FONT_SIZE, start_sfx='_start_game')
+        self.high_scores_button = TextButton(self.window, HIGH_SCORES_BUTTON_POS, MENU_BUTTON_WIDTH,
+                                             MENU_BUTTON_HEIGHT, HIGH_SCORES_BUTTON_TEXT, MENU_BUTTONS_FONT_SIZE)
+        self.game_options_button = TextButton(self.window, GAME_OPTIONS_BUTTON_POS, MENU_BUTTON_WIDTH,
+                                              MENU_BUTTON_HEIGHT, GAME_OPTIONS_BUTTON_TEXT, MENU_BUTTONS_FONT_SIZE)
+        self.quit_button = TextButton(self.window, QUIT_BUTTON_POS, MENU_BUTTON_WIDTH, MENU_BUTTON_HEIGHT,
+                                      QUIT_BUTTON_TEXT, MENU_BUTTONS_FONT_SIZE)
+        self.resume_button = TextButton(self.window, RESUME_BUTTON_POS, RESUME_BUTTON_WIDTH, TEXT_BUTTON_HEIGHT,
+                                        RESUME_BUTTON_TEXT, TEXT_BUTTON_FONT_SIZE, start_sfx='_start_game')
+        self.resume_bool = False
+        self.game_screen = None
+        self.high_scores_screen = None
+        self.game_options_screen = None
+        self.mouse_position = (0, 0)
+        self.timers = TimerQueue()
+
+    def enter(self) -> None:
+        """Set caption and check if there is a saved game to show the resume button for."""
+        pygame.display.set_caption(self.caption)
+        self.resume_bool = has_game_snapshot()
 
-        Creates menu buttons (start game, high scores, game options, and
-        quit), then starts main menu event loop from which other screens and
-        their event loops will be called. Event loop continuously draws main
-        menu contents to screen and checks for button hovering, until a button
-        is selected, then runs each button's corresponding screen code (i.e.
+    def resume(self, previous_scene: Scene) -> None:
+        """Pick up where entered screen left off (menu music after a game, changed settings after game options)."""
+        pygame.display.set_caption(self.caption)
+        if previous_scene is self.game_screen:
+            self.game_screen = None
+            self.resume_bool = has_game_snapshot()
+            pygame.mixer.music.load(self.menu_music)
+            if self.music_bool == 'True':
+                pygame.mixer.music.play(-1)
+        elif previous_scene is self.game_options_screen:
+            self.sfx_bool, self.music_bool, self.background = \
+                update_settings_real_time(self.width, self.height, get_file_dict('user_preferences'))
+
+    def handle_events(self, event_list: list[pygame.event.Event]) -> None:
+        """Check for button click events.
+
+        When a menu button is clicked, its click is shown and its
+        corresponding screen is opened once the click delay has passed (i.e.
         if high_scores_button is pressed, the button clicked method is called,
-        an instance of the HighScoresScreen class is created, and its run
-        method is called).
+        and the high scores screen is pushed onto the scene manager shortly
+        after).
         """
-        pygame.display.set_caption(self.caption)
-        start_game_button = TextButton(self.window, START_BUTTON_POS, MENU_BUTTON_WIDTH, MENU_BUTTON_HEIGHT,
-                                       START_BUTTON_TEXT, MENU_BUTTONS_FONT_SIZE, start_sfx='_start_game')
-        high_scores_button = TextButton(self.window, HIGH_SCORES_BUTTON_POS, MENU_BUTTON_WIDTH, MENU_BUTTON_HEIGHT,
-                                        HIGH_SCORES_BUTTON_TEXT, MENU_BUTTONS_FONT_SIZE)
-        game_options_button = TextButton(self.window, GAME_OPTIONS_BUTTON_POS, MENU_BUTTON_WIDTH, MENU_BUTTON_HEIGHT,
-                                         GAME_OPTIONS_BUTTON_TEXT, MENU_BUTTONS_FONT_SIZE)
-        quit_button = TextButton(self.window, QUIT_BUTTON_POS, MENU_BUTTON_WIDTH, MENU_BUTTON_HEIGHT,
-                                 QUIT_BUTTON_TEXT, MENU_BUTTONS_FONT_SIZE)
-
-        while self.running:
-            mouse_position = pygame.mouse.get_pos()
-            event_list = pygame.event.get()
-
-            for event in event_list:
-                if event.type == pygame.QUIT:
-                    self.running = False
-                    break
-
-                elif event.type == pygame.MOUSEBUTTONUP:  # Checks if mouse button was clicked.
-                    # Checks if cursor was hovering over any menu buttons when clicked and if so, executes their code.
-
-                    if start_game_button.is_hovering(mouse_position):
-                        start_game_button.draw_clicked(self.sfx_bool)
-                        pygame.mixer.music.stop()
-                        pygame.mixer.music.unload()
-                        pygame.time.delay(BUTTON_CLICK_TIME_DELAY)
-                        game = SnakeGameScreen(self.window, self.width, self.height, self.sfx_bool, self.music_bool,
-                                               self.background)
-                        game.run()
-                        pygame.display.set_caption(self.caption)
-                        pygame.mixer.music.load(self.menu_music)
-                        if self.music_bool == 'True':
-                            pygame.mixer.music.play(-1)
-                    elif high_scores_button.is_hovering(mouse_position):
-                        high_scores_button.draw_clicked(self.sfx_bool)
-                        pygame.time.delay(BUTTON_CLICK_TIME_DELAY)
-                        high_scores = HighScoresScreen(self.window, self.width, self.height, self.sfx_bool,
-                                                       self.background)
-                        high_scores.run()
-                        pygame.display.set_caption(self.caption)
-                    elif game_options_button.is_hovering(mouse_position):
-                        game_options_button.draw_clicked(self.sfx_bool)
-                        pygame.time.delay(BUTTON_CLICK_TIME_DELAY)
-                        game_options = GameOptionsScreen(self.window, self.width, self.height, self.sfx_bool,
-                                                         self.music_bool, self.background)
-                        game_options.run()
-                        pygame.display.set_caption(self.caption)
-                        self.sfx_bool, self.music_bool, self.background = \
-                            update_settings_real_time(self.width, self.height, get_file_dict('user_preferences'))
-                    elif quit_button.is_hovering(mouse_position):
-                        pygame.mixer.music.stop()
-                        quit_button.draw_clicked(self.sfx_bool)
-                        pygame.time.delay(QUIT_BUTTON_CLICK_TIME_DELAY)
-                        self.running = False
-                        break
+        self.mouse_position = mouse_position = pygame.mouse.get_pos()
+
+        for event in event_list:
+            # Checks if mouse button was clicked (clicks are ignored while waiting to open a screen).
+            if event.type == pygame.MOUSEBUTTONUP and not self.timers.is_pending():
+                # Checks if cursor was hovering over any menu buttons when clicked and if so, executes their code.
+
+                if self.start_game_button.is_hovering(mouse_position) or \
+                        (self.resume_bool and self.resume_button.is_hovering(mouse_position)):
+                    # Loads saved game (only once, so it can't be replayed) if resume button was pressed.
+                    snapshot = None
+                    if self.start_game_button.is_hovering(mouse_position):
+                        self.start_game_button.draw_clicked(self.sfx_bool)
                     else:
-                        print('nothing was clicked..')
-
+                        self.resume_button.draw_clicked(self.sfx_bool)
+                        snapshot = load_game_snapshot()
+                        delete_game_snapshot()
+                    pygame.mixer.music.stop()
+                    pygame.mixer.music.unload()
+                    self.timers.schedule(BUTTON_CLICK_TIME_DELAY, partial(self.start_game, snapshot))
+                elif self.high_scores_button.is_hovering(mouse_position):
+                    self.high_scores_button.draw_clicked(self.sfx_bool)
+                    self.timers.schedule(BUTTON_CLICK_TIME_DELAY, self.open_high_scores)
+                elif self.game_options_button.is_hovering(mouse_position):
+                    self.game_options_button.draw_clicked(self.sfx_bool)
+                    self.timers.schedule(BUTTON_CLICK_TIME_DELAY, self.open_game_options)
+                elif self.quit_button.is_hovering(mouse_position):
+                    pygame.mixer.music.stop()
+                    self.quit_button.draw_clicked(self.sfx_bool)
+                    self.timers.schedule(QUIT_BUTTON_CLICK_TIME_DELAY, self.stop)
                 else:
-                    pass
+                    print('nothing was clicked..')
+
+            else:
+                pass
+
+    def update(self) -> None:
+        """Run any scheduled callbacks that are due."""
+        self.timers.update()
+
+    def start_game(self, snapshot: GameSnapshot | None = None) -> None:
+        """Open new snake game screen (resuming entered snapshot's game, if any)."""
+        transition_start = frame_tracer.begin()
+        self.game_screen = SnakeGameScreen(self.window, self.width, self.height, self.sfx_bool, self.music_bool,
+                                           self.background, snapshot)
+        frame_tracer.end('SnakeGameScreen construction', transition_start, TRACE_CATEGORY_TRANSITION)
+        self.manager.push(self.game_screen)
+
+    def open_high_scores(self) -> None:
+        """Open high scores screen (made on its first visit)."""
+        if self.high_scores_screen is None:
+            self.high_scores_screen = HighScoresScreen(self.window, self.width, self.height, self.sfx_bool,
+                                                       self.background)
+        self.high_scores_screen.sfx_bool, self.high_scores_screen.background = self.sfx_bool, self.background
+        self.manager.push(self.high_scores_screen)
 
-            self.draw(mouse_position, start_game_button, high_scores_button, game_options_button, quit_button)
+    def open_game_options(self) -> None:
+        """Open game options screen (made on its first visit)."""
+        if self.game_options_screen is None:
+            self.game_options_screen = GameOptionsScreen(self.window, self.width, self.height, self.sfx_bool,
+                                                         self.music_bool, self.background)
+        self.game_options_screen.sfx_bool, self.game_options_screen.music_bool = self.sfx_bool, self.music_bool
+        self.game_options_screen.background = self.background
+        self.manager.push(self.game_options_screen)
 
-    def draw(self, mouse_pos: tuple[int, int], button_1: TextButton, button_2: TextButton, button_3: TextButton,
-             button_4: TextButton) -> None:
-        """Blit all MainMenu content to screen.
+    def stop(self) -> None:
+        """Leave main menu (quits program)."""
+        self.manager.pop()
 
-        Uses class attributes and entered args to blit a background, the snake
-        title, and all of the menu buttons to the screen.
+    def draw(self) -> None:
+        """Blit all MainMenu content to screen.
 
-        Args:
-            mouse_pos: Used to determine which button the mouse cursor was
-                hovering over, if any.
-            button_1: One of four menu buttons.
-            button_2: One of four menu buttons.
-            button_3: One of four menu buttons.
-            button_4: One of four menu buttons.
+        Uses class attributes to blit a background, the snake title, and all
+        of the menu buttons (and the resume button, if there is a saved game)
+        to the screen.
         """
         self.window.blit(self.background, BACKGROUND_BLIT_POS)
         self.window.blit(self.title_surface, self.title_rect)
-        for button in [button_1, button_2, button_3, button_4]:
-            button.draw(mouse_pos, self.sfx_bool)
+        for button in [self.start_game_button, self.high_scores_button, self.game_options_button, self.quit_button]:
+            button.draw(self.mouse_position, self.sfx_bool)
+        if self.resume_bool:
+            self.resume_button.draw(self.mouse_position, self.sfx_bool)
         pygame.display.update()
@@ -2,9 +2,9 @@
 
 This module holds the classes responsible for setting up the snake game
 program, running it, and blitting the first screen (SplashScreen) of the
-program gui. RootWindow is the game window itself. It has a greeting screen
-but then calls MainMenu (MainMenu internally has code that executes when
-called).
+program gui. RootWindow is the game window itself. It runs the program's
+scene manager, starting on the greeting screen, which is swapped for the
+MainMenu once a key is pressed (every other screen is opened from there).
 
 Classes:
     SplashScreen: Contains splash screen content.
@@ -15,27 +15,34 @@ import os
 import sys
 import pygame
 from misc.constants import *
+from misc.asset_cache import load_image
+from misc.frame_tracer import frame_tracer
 from menu_screens.main_menu import MainMenu
 from misc.saved_data_io_functions import update_settings_real_time
+from misc.scene_manager import Scene, SceneManager
+from misc.sound_bank import sound_bank
 
 
-class SplashScreen(object):
+class SplashScreen(Scene):
     """Contains all content to be blitted to the splash screen.
 
     This class contains all the information and content to be blitted to the
     screen as well as a draw method that actually blits everything
-    categorized as being in the splash screen.
+    categorized as being in the splash screen. Once any key or mouse button
+    is pressed, the splash screen is swapped for the entered main menu.
     """
 
-    def __init__(self, window: pygame.Surface, width: int, height: int) -> None:
+    def __init__(self, window: pygame.Surface, width: int, height: int, sfx_bool: str, main_menu: Scene) -> None:
         self.window = window
         self.width = width
         self.height = height
-        self.background = pygame.transform.scale(pygame.Surface.convert(pygame.image.load(
+        self.sfx_bool = sfx_bool
+        self.main_menu = main_menu
+        self.background = load_image(
             os.path.join('project_assets',
                          'backgrounds',
                          'black_background.png',
-                         ))), (self.width, self.height))
+                         ), (self.width, self.height), alpha=False)
         self.text_color = GAME_TEXT_BLUE
         self.title = 'SNAKE'
         self.title_font = pygame.font.Font(BUBBLE_FONT_FILE, SPLASH_TITLE_FONT_SIZE)
@@ -48,6 +55,15 @@ class SplashScreen(object):
         self.caption1_surface = self.caption1_font.render(self.caption1, True, self.text_color)
         self.caption1_rect = self.caption1_surface.get_rect(center=self.caption1_pos)
 
+    def handle_events(self, event_list: list[pygame.event.Event]) -> None:
+        """Swap splash screen for main menu once a key or mouse button is pressed."""
+        for event in event_list:
+            if event.type == pygame.KEYUP or event.type == pygame.MOUSEBUTTONUP:
+                if self.sfx_bool == 'True':
+                    sound_bank.play('button_click')
+                self.manager.switch(self.main_menu)
+                break
+
     def draw(self) -> None:
         """Blit SplashScreen content to screen.
 
@@ -64,52 +80,60 @@ class RootWindow(object):
     """Contains all initialization and program setup code.
 
     This class initializes pygame and retrieves a bunch of information to be
-    used later in the other screens of the program. Includes main program loop
-    in its run method.
+    used later in the other screens of the program. Includes the scene
+    manager running the program's main loop, started in its run method.
+
+    Every screen draws to the same 800x500 window surface, which is shown
+    scaled to fit the window (see open_window), so the window can be resized
+    or made fullscreen at any resolution.
     """
 
     def __init__(self) -> None:
+        frame_tracer.enable_from_environment()
         pygame.init()
         self.width = GAME_WINDOW_WIDTH
         self.height = GAME_WINDOW_HEIGHT
-        self.window = pygame.display.set_mode((self.width, self.height))
+        self.scene_manager = SceneManager()
+        self.window = self.open_window()
+        sound_bank.load()  # Every sound effect is decoded once, here, and shared by every screen.
         self.caption = 'Snake'
         self.menu_music = os.path.join('project_assets', 'music', 'menu_music.ogg')
-        self.button_click_sfx = pygame.mixer.Sound(os.path.join('project_assets', 'sfx', 'button_click.wav'))
         self.sfx_bool = ''
         self.music_bool = ''
         self.background = ''
-        self.running = True
+
+    def open_window(self) -> pygame.Surface:
+        """Open resizable window showing the game's frame scaled to fit, and return the surface to draw to.
+
+        The returned surface is always 800x500. With pygame.SCALED, SDL's
+        renderer stretches each presented frame to the window's size (and
+        maps mouse positions back to the 800x500 frame), so nothing is scaled
+        by the program itself, and resizing the window or going fullscreen
+        only changes how the frame is stretched. The window starts out
+        fullscreen if the SNAKE_FULLSCREEN environment variable is 'True'.
+        """
+        try:
+            window = pygame.display.set_mode((self.width, self.height), pygame.SCALED | pygame.RESIZABLE)
+        except pygame.error:
+            print('scaled window not supported, using fixed size window')
+            return pygame.display.set_mode((self.width, self.height))
+        if os.environ.get(FULLSCREEN_ENV_VAR, '') == 'True':
+            self.scene_manager.toggle_fullscreen()
+        return window
 
     def run(self) -> None:
-        """Run snake program's main event loop.
+        """Run snake program's main loop.
 
-        Retrieves multiple saved user preferences then starts up the main
-        "outer" event loop of program. Event loop draws SplashScreen instance
-        to screen and when a key is pressed, instance of MainMenu is created
-        and its run method is called.
+        Retrieves multiple saved user preferences, creates the main menu, then
+        pushes a SplashScreen instance onto the scene manager and runs its
+        main loop until the window is closed or the main menu is quit.
         """
         pygame.display.set_caption(self.caption)
         pygame.mixer.music.load(self.menu_music)
         self.sfx_bool, self.music_bool, self.background = update_settings_real_time(self.width, self.height)
-        greeting_screen = SplashScreen(self.window, self.width, self.height)
-
-        while self.running:
-            greeting_screen.draw()
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                    break
-                elif event.type == pygame.KEYUP or event.type == pygame.MOUSEBUTTONUP:
-                    if self.sfx_bool == 'True':
-                        self.button_click_sfx.play()
-                    main_menu = MainMenu(self.window, self.width, self.height,
-                                         self.sfx_bool, self.music_bool, self.background)
-                    main_menu.run()
-                    self.running = False
-                else:
-                    pass
+        main_menu = MainMenu(self.window, self.width, self.height, self.sfx_bool, self.music_bool, self.background)
+        self.scene_manager.push(SplashScreen(self.window, self.width, self.height, self.sfx_bool, main_menu))
+        self.scene_manager.run()
 
         pygame.quit()
         sys.exit()
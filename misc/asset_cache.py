@@ -0,0 +1,124 @@
+"""Define functions that load images through a cache of ready to blit copies.
+
+This module holds the function every image asset of the program is loaded
+with. The first time an image is loaded at a given size, it is decoded,
+converted, and scaled as before, and the result's pixels are saved to
+ASSET_CACHE_DIRECTORY exactly as they are laid out in memory. Later loads
+(including on later runs of the program) copy those pixels straight into a
+new surface, skipping decoding, converting, and scaling. Saved copies are
+named after a hash of their source file's contents, their size, and their
+pixel format (which depends on the window), so changing an asset, asking for
+it at a new size, or running on a display with another pixel format makes a
+new copy. Images with no transparent pixels are kept without per pixel alpha,
+so they are blitted on the faster path of surfaces made with convert.
+
+Usage:
+    background = load_image(os.path.join('project_assets', 'backgrounds', 'grass_background.png'),
+                            (800, 500), alpha=False)
+
+Functions:
+    get_source_hash: Gets hash of entered asset file's contents.
+    get_pixel_format: Gets surface with the window's pixel format, and its name.
+    get_cache_path: Gets file path of entered image's cached copy.
+    load_image: Loads entered image scaled to entered size, through the cache.
+"""
+
+import hashlib
+import os
+import pygame
+from misc.constants import *
+
+source_hash_dict = {}  # {source path: (modification time, file size, hash of file contents)}
+pixel_format_dict = {}  # {alpha bool: (1x1 surface converted for the window, name of its pixel format)}
+
+
+def get_source_hash(source_path: str) -> str:
+    """Return hash of entered asset file's contents (hashed again only when the file changes)."""
+    source_stat = os.stat(source_path)
+    cached_hash = source_hash_dict.get(source_path)
+    if cached_hash is None or cached_hash[:2] != (source_stat.st_mtime_ns, source_stat.st_size):
+        with open(source_path, 'rb') as source_file:
+            cached_hash = (source_stat.st_mtime_ns, source_stat.st_size,
+                           hashlib.sha1(source_file.read()).hexdigest()[:16])
+        source_hash_dict[source_path] = cached_hash
+    return cached_hash[2]
+
+
+def get_pixel_format(alpha: bool) -> tuple[pygame.Surface, str]:
+    """Return surface with the pixel format images are converted to for the window, and that format's name.
+
+    Args:
+        alpha: Whether the pixel format has per pixel alpha (convert_alpha)
+            or not (convert).
+
+    Returns:
+        template: 1x1 surface with the pixel format.
+        name: A string naming the pixel format (e.g. "alpha32_ff0000_ff00_ff_ff000000").
+    """
+    if alpha not in pixel_format_dict:
+        template = pygame.Surface((1, 1), pygame.SRCALPHA if alpha else 0)
+        template = template.convert_alpha() if alpha else template.convert()
+        mask_names = '_'.join(f'{mask:x}' for mask in template.get_masks())
+        pixel_format_dict[alpha] = (template, f'{"alpha" if alpha else "opaque"}{template.get_bitsize()}_{mask_names}')
+    return pixel_format_dict[alpha]
+
+
+def get_cache_path(source_hash: str, size: tuple[int, int], pixel_format_name: str) -> str:
+    """Return file path of the cached copy of an image with entered hash, size, and pixel format."""
+    return os.path.join(ASSET_CACHE_DIRECTORY, f'{source_hash}_{size[0]}x{size[1]}_{pixel_format_name}.bin')
+
+
+def load_image(source_path: str, size: tuple[float, float], alpha: bool = True) -> pygame.Surface:
+    """Return entered image converted for the window and scaled to entered size.
+
+    The image is read from its cached copy if there is one, or else loaded
+    from its asset file and cached. Images loaded with alpha keep their per
+    pixel alpha unless every pixel of the scaled image is opaque (images
+    loaded without alpha never have it, same as pygame.Surface.convert).
+
+    Args:
+        source_path: A string containing file path of the image's asset file.
+        size: Width and height to scale the image to (floats are rounded down,
+            same as pygame.transform.scale).
+        alpha: Whether the image's transparent pixels should be kept.
+
+    Returns:
+        image: Scaled image, converted for the window.
+    """
+    size = (int(size[0]), int(size[1]))
+    if size[0] <= 0 or size[1] <= 0:  # Nothing to cache for an empty image.
+        return pygame.Surface(size, pygame.SRCALPHA if alpha else 0)
+    source_hash = get_source_hash(source_path)
+    for alpha_format in ([True, False] if alpha else [False]):
+        template, pixel_format_name = get_pixel_format(alpha_format)
+        cache_path = get_cache_path(source_hash, size, pixel_format_name)
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'rb') as cache_file:
+                    pixel_bytes = cache_file.read()
+                image = pygame.Surface(size, template.get_flags(), template)
+                if len(pixel_bytes) != image.get_pitch() * size[1]:
+                    raise ValueError('cached copy is the wrong size')
+                image.get_buffer().write(pixel_bytes)
+                return image
+            except (OSError, ValueError, pygame.error):
+                print(f'could not read cached copy of {source_path}')
+
+    image = pygame.image.load(source_path)
+    image = pygame.transform.scale(image.convert_alpha() if alpha else image.convert(), size)
+    if alpha:
+        alpha_bytes = pygame.image.tobytes(image, 'RGBA')[3::4]
+        if alpha_bytes.count(255) == len(alpha_bytes):
+            image = image.convert()
+    pixel_format_name = get_pixel_format(bool(image.get_flags() & pygame.SRCALPHA))[1]
+
+    cache_path = get_cache_path(source_hash, size, pixel_format_name)
+    try:
+        os.makedirs(ASSET_CACHE_DIRECTORY, exist_ok=True)
+        # Written under a temporary name first, so a half written copy is never read.
+        with open(f'{cache_path}.tmp', 'wb') as cache_file:
+            cache_file.write(image.get_buffer().raw)
+        os.replace(f'{cache_path}.tmp', cache_path)
+    except OSError:
+        print(f'could not cache copy of {source_path}')
+    return image
@@ -16,6 +16,8 @@ Classes:
 import os
 import pygame
 from misc.constants import *
+from misc.asset_cache import load_image
+from misc.sound_bank import sound_bank
 
 
 class Button:
@@ -26,7 +28,9 @@ class Button:
     other more specific button classes. Common attributes of all button
     objects: window to blit button, position to blit button to, button
     dimensions, bool to keep track of whether a button is being hovered over,
-    and a button hover sfx.
+    the name of its hover sfx (played through the sound bank), and how long
+    the button is still shown pressed for after being clicked (so screens can
+    carry on drawing while they wait to move on, instead of pausing).
     """
 
     def __init__(self, window: pygame.Surface, pos: tuple[int, int], width: int, height: int) -> None:
@@ -35,7 +39,12 @@ class Button:
         self.width = width
         self.height = height
         self.hovered = False
-        self.button_hover_sfx = pygame.mixer.Sound(os.path.join('project_assets', 'sfx', 'button_hover.wav'))
+        self.pressed_until = 0  # Time (in ms) button is drawn pressed until, after being clicked.
+        self.button_hover_sfx = 'button_hover'
+
+    def is_pressed(self) -> bool:
+        """Return True if button was clicked recently enough to still be drawn pressed."""
+        return pygame.time.get_ticks() < self.pressed_until
 
 
 class TextButton(Button):
@@ -46,7 +55,8 @@ class TextButton(Button):
     features such as: the ability to add text to button and choose whether the
     mouse click sfx is set to the normal version or a "start game sfx" version.
     Meant to be used as is and/or used as a base class for even more specified
-    button classes.
+    button classes. The text is blit onto a copy of each button image once,
+    when the button is made, so drawing the button is a single blit.
     """
 
     def __init__(self, window: pygame.Surface, pos: tuple[int, int], width: int, height: int, text: str,
@@ -55,20 +65,28 @@ class TextButton(Button):
         self.text = text
         self.font_size = font_size
         self.start_sfx = start_sfx
-        self.button_click_sfx = pygame.mixer.Sound(os.path.join('project_assets',
-                                                                'sfx',
-                                                                f'button_click{self.start_sfx}.wav'))
+        self.button_click_sfx = f'button_click{self.start_sfx}'
         self.text_color = GAME_TEXT_BLUE
         self.text_font = pygame.font.Font(BUBBLE_FONT_FILE, self.font_size)
         self.text_surface = self.text_font.render(self.text, True, self.text_color)
         self.text_rect = self.text_surface.get_rect(center=self.pos)
-        self.button_image = pygame.transform.scale(pygame.Surface.convert_alpha(pygame.image.load(
-            os.path.join('project_assets', 'buttons', 'stoneButtonReady.png'))), (self.width, self.height))
-        self.button_image_hover = pygame.transform.scale(pygame.Surface.convert_alpha(pygame.image.load(
-            os.path.join('project_assets', 'buttons', 'stoneButtonHovered.png'))), (self.width, self.height))
-        self.button_image_clicked = pygame.transform.scale(pygame.Surface.convert_alpha(pygame.image.load(
-            os.path.join('project_assets', 'buttons', 'stoneButtonPressed.png'))), (self.width, self.height))
+        self.button_image = load_image(
+            os.path.join('project_assets', 'buttons', 'stoneButtonReady.png'), (self.width, self.height))
+        self.button_image_hover = load_image(
+            os.path.join('project_assets', 'buttons', 'stoneButtonHovered.png'), (self.width, self.height))
+        self.button_image_clicked = load_image(
+            os.path.join('project_assets', 'buttons', 'stoneButtonPressed.png'), (self.width, self.height))
         self.button_rect = self.button_image.get_rect(center=self.pos)
+        self.button_surface = self.add_text(self.button_image)
+        self.button_surface_hover = self.add_text(self.button_image_hover)
+        self.button_surface_clicked = self.add_text(self.button_image_clicked)
+
+    def add_text(self, button_image: pygame.Surface) -> pygame.Surface:
+        """Return copy of entered button image with the button's text blit on."""
+        button_surface = button_image.copy()
+        button_surface.blit(self.text_surface, (self.text_rect.x - self.button_rect.x,
+                                                self.text_rect.y - self.button_rect.y))
+        return button_surface
 
     def is_hovering(self, mouse_pos: tuple[int, int]) -> bool:
         """Return True if mouse is hovering over button."""
@@ -87,11 +105,11 @@ class TextButton(Button):
             sfx_bool: Used to determine if button should make a click sfx when
                 selected.
         """
-        self.window.blit(self.button_image_clicked, self.button_rect)
-        self.window.blit(self.text_surface, self.text_rect)
+        self.window.blit(self.button_surface_clicked, self.button_rect)
         pygame.display.update()
+        self.pressed_until = pygame.time.get_ticks() + BUTTON_CLICK_TIME_DELAY
         if sfx_bool == 'True':
-            self.button_click_sfx.play()
+            sound_bank.play(self.button_click_sfx)
 
     def draw(self, mouse_pos: tuple[int, int], sfx_bool: str) -> None:
         """Blit normal or hovered button image to screen accordingly.
@@ -105,16 +123,16 @@ class TextButton(Button):
             sfx_bool: Used to determine if button should make a hover sfx when
                 mouse is hovering over it.
         """
-        if self.is_hovering(mouse_pos):
-            self.window.blit(self.button_image_hover, self.button_rect)
-            self.window.blit(self.text_surface, self.text_rect)
+        if self.is_pressed():
+            self.window.blit(self.button_surface_clicked, self.button_rect)
+        elif self.is_hovering(mouse_pos):
+            self.window.blit(self.button_surface_hover, self.button_rect)
             if self.hovered is False:
                 if sfx_bool == 'True':
-                    self.button_hover_sfx.play()
+                    sound_bank.play(self.button_hover_sfx)
                 self.hovered = True
         else:
-            self.window.blit(self.button_image, self.button_rect)
-            self.window.blit(self.text_surface, self.text_rect)
+            self.window.blit(self.button_surface, self.button_rect)
             if self.hovered is True:
                 self.hovered = False
 
@@ -132,14 +150,14 @@ class ApplyButton(TextButton):
     def __init__(self, window: pygame.Surface, pos: tuple[int, int], width: int, height: int, text: str, font_size: int,
                  ) -> None:
         super().__init__(window, pos, width, height, text, font_size)
-        self.button_click_sfx = pygame.mixer.Sound(os.path.join('project_assets', 'sfx', 'button_apply_changes.wav'))
+        self.button_click_sfx = 'button_apply_changes'
 
     def draw_clicked(self) -> None:
         """Blit clicked button instance to screen and make apply changes sfx."""
-        self.window.blit(self.button_image_clicked, self.button_rect)
-        self.window.blit(self.text_surface, self.text_rect)
+        self.window.blit(self.button_surface_clicked, self.button_rect)
         pygame.display.update()
-        self.button_click_sfx.play()
+        self.pressed_until = pygame.time.get_ticks() + BUTTON_CLICK_TIME_DELAY
+        sound_bank.play(self.button_click_sfx)
 
 
 class ArrowButton(Button):
@@ -156,23 +174,22 @@ class ArrowButton(Button):
     def __init__(self, window: pygame.Surface, pos: tuple[int, int], width: int, height: int, direction: str) -> None:
         Button.__init__(self, window, pos, width, height)
         self.direction = direction
-        self.button_click_direction_sfx = pygame.mixer.Sound(
-            os.path.join('project_assets', 'sfx', f'button_click_{self.direction}.wav'))
-        self.arrow_image = pygame.transform.scale(pygame.Surface.convert_alpha(pygame.image.load(
+        self.button_click_direction_sfx = f'button_click_{self.direction}'
+        self.arrow_image = load_image(
             os.path.join('project_assets',
                          'buttons',
                          f'ArrowButtonReady{self.direction.capitalize()}.png',
-                         ))), (self.width, self.height))
-        self.arrow_image_hover = pygame.transform.scale(pygame.Surface.convert_alpha(pygame.image.load(
+                         ), (self.width, self.height))
+        self.arrow_image_hover = load_image(
             os.path.join('project_assets',
                          'buttons',
                          f'ArrowButtonHovered{self.direction.capitalize()}.png',
-                         ))), (self.width, self.height))
-        self.arrow_image_clicked = pygame.transform.scale(pygame.Surface.convert_alpha(pygame.image.load(
+                         ), (self.width, self.height))
+        self.arrow_image_clicked = load_image(
             os.path.join('project_assets',
                          'buttons',
                          f'ArrowButtonPressed{self.direction.capitalize()}.png',
-                         ))), (self.width, self.height))
+                         ), (self.width, self.height))
         self.arrow_rect = self.arrow_image.get_rect(center=self.pos)
 
     def is_hovering(self, mouse_pos: tuple[int, int]) -> bool:
@@ -185,8 +202,9 @@ class ArrowButton(Button):
         """Blit clicked button image to screen and play click sfx."""
         self.window.blit(self.arrow_image_clicked, self.arrow_rect)
         pygame.display.update()
+        self.pressed_until = pygame.time.get_ticks() + BUTTON_CLICK_TIME_DELAY
         if sfx_bool == 'True':
-            self.button_click_direction_sfx.play()
+            sound_bank.play(self.button_click_direction_sfx)
 
     def draw(self, mouse_pos: tuple[int, int], sfx_bool: str) -> None:
         """Blit normal or hovered button image to screen accordingly.
@@ -200,11 +218,13 @@ class ArrowButton(Button):
             sfx_bool: Used to determine if button should make a hover sfx when
                 mouse is hovering over it.
         """
-        if self.is_hovering(mouse_pos):
+        if self.is_pressed():
+            self.window.blit(self.arrow_image_clicked, self.arrow_rect)
+        elif self.is_hovering(mouse_pos):
             self.window.blit(self.arrow_image_hover, self.arrow_rect)
             if self.hovered is False:
                 if sfx_bool == 'True':
-                    self.button_hover_sfx.play()
+                    sound_bank.play(self.button_hover_sfx)
                 self.hovered = True
         else:
             self.window.blit(self.arrow_image, self.arrow_rect)
@@ -224,21 +244,21 @@ class CutoutArrowButton(ArrowButton):
 
     def __init__(self, window: pygame.Surface, pos: tuple[int, int], width: int, height: int, direction: str) -> None:
         super().__init__(window, pos, width, height, direction)
-        self.arrow_image = pygame.transform.scale(pygame.Surface.convert_alpha(pygame.image.load(
+        self.arrow_image = load_image(
             os.path.join('project_assets',
                          'buttons',
                          f'ArrowButtonCutoutReady{self.direction.capitalize()}.png',
-                         ))), (self.width, self.height))
-        self.arrow_image_hover = pygame.transform.scale(pygame.Surface.convert_alpha(pygame.image.load(
+                         ), (self.width, self.height))
+        self.arrow_image_hover = load_image(
             os.path.join('project_assets',
                          'buttons',
                          f'ArrowButtonCutoutHovered{self.direction.capitalize()}.png',
-                         ))), (self.width, self.height))
-        self.arrow_image_clicked = pygame.transform.scale(pygame.Surface.convert_alpha(pygame.image.load(
+                         ), (self.width, self.height))
+        self.arrow_image_clicked = load_image(
             os.path.join('project_assets',
                          'buttons',
                          f'ArrowButtonCutoutPressed{self.direction.capitalize()}.png',
-                         ))), (self.width, self.height))
+                         ), (self.width, self.height))
 
     def update_button_pos(self, pos: tuple[int, int]) -> None:
         """Update position of button."""
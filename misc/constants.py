@@ -12,6 +12,7 @@ import os
 # Used throughout program.
 GAME_WINDOW_WIDTH = 800
 GAME_WINDOW_HEIGHT = 500
+FULLSCREEN_ENV_VAR = 'SNAKE_FULLSCREEN'  # Set to 'True' to start program fullscreen (F11 toggles fullscreen).
 BACKGROUND_BLIT_POS = (0, 0)
 
 GAME_TEXT_BLUE = (10, 115, 205)
@@ -50,6 +51,9 @@ GAME_OPTIONS_BUTTON_POS = (400, 370)
 GAME_OPTIONS_BUTTON_TEXT = 'SETTINGS'
 QUIT_BUTTON_POS = (400, 445)
 QUIT_BUTTON_TEXT = 'QUIT'
+RESUME_BUTTON_WIDTH = 160
+RESUME_BUTTON_POS = (700, 465)
+RESUME_BUTTON_TEXT = 'RESUME'
 
 # High scores screen class.
 SCORE_DATA_LABEL_FONT_SIZE = 22
@@ -57,6 +61,7 @@ SCORE_DATA_FONT_SIZE = 15
 SCORE_BOARD_SIZE = (750, 400)
 SCORE_BOARD_BLIT_POS = (25, 25)
 SCORES_PER_PAGE = 10
+SCORE_PAGE_CACHE_LIMIT = 5  # Most rendered pages kept at once (the ones furthest from the current page go first).
 
 ARROW_BUTTON_WIDTH = 35
 ARROW_BUTTON_HEIGHT = 35
@@ -80,6 +85,20 @@ GAME_OPTIONS_TITLE_POS = (250, 38)
 GAME_OPTIONS_LABEL_FONT_SIZE = 25
 GAME_OPTIONS_OPTION_FONT_SIZE = 14
 GAME_OPTIONS_OPTION_SPACER = 20
+GAME_OPTIONS_ROWS_START_Y = 70
+GAME_OPTIONS_ROW_SPACING = 36
+GAME_OPTIONS_FRAME_RATE = 60  # Settings screen only blits cached surfaces, so it doesn't need to run any faster.
+
+# Thumbnail cache class.
+THUMBNAIL_DIRECTORY = os.path.join('saved_data_snake', 'thumbnails')
+THUMBNAIL_OPTION_LABEL_LIST = ['BACKGROUND', 'SNAKE SKIN']  # Game options shown with a preview of each option.
+THUMBNAIL_BACKGROUND_SIZE = (48, 30)
+THUMBNAIL_SKIN_CUBE_SIZE = 12
+THUMBNAIL_SKIN_BODY_LENGTH = 3  # Body cubes drawn in front of the head of a snake skin's preview.
+THUMBNAIL_X_POS = 695  # Left edge of the previews' column (right of the widest option's right arrow).
+
+# Asset cache functions.
+ASSET_CACHE_DIRECTORY = os.path.join('saved_data_snake', 'asset_cache')
 
 # Pause menu class.
 PAUSE_MENU_DIMENSIONS = (400, 300)
@@ -89,9 +108,10 @@ PAUSE_MENU_VOLUME = 0.5
 PAUSE_MENU_MUSIC_START_TIME_DELAY = 600
 
 # Snake game screen classes.
-SNAKE_PLAYER_START_POS = (400, 430)
+SNAKE_PLAYER_START_ROWS_FROM_BOTTOM = 3
 SNAKE_PLAYER_START_DIRECTION = 'up'
 NUMBER_OF_APPLE_SNACKS = 3
+MAX_LOCAL_PLAYERS = 4
 GAME_LOOP_DELAY = 100
 GAME_LOOP_TICK = 20
 GAME_VOLUME = 1.0
@@ -102,6 +122,8 @@ GAME_OVER_TITLE_POS = (400, 120)
 GAME_OVER_TEXT_FONT_SIZE = 18
 
 GAME_OVER_SCREEN_TIME_DELAY = 1500
+GAME_OVER_WAIT_FRAME_RATE = 30  # Event checks per second while waiting to show the game over screen.
+GAME_OVER_FRAME_RATE = 60
 
 GAME_OVER_BUTTON_FONT_SIZE = 18
 GAME_OVER_BUTTON_HEIGHT = 40
@@ -133,7 +155,7 @@ PLAY_AGAIN_BUTTON_WIDTH = 200
 PLAY_AGAIN_BUTTON_POS = (655, 445)
 PLAY_AGAIN_BUTTON_TEXT = 'PLAY AGAIN'
 
-# Game border ui class.
+# Game border ui class. (Minimum border sizes; borders grow to surround boards smaller than the play area).
 GAME_BORDER_LEFT = 30
 GAME_BORDER_RIGHT = 30
 GAME_BORDER_UPPER = 60
@@ -143,19 +165,124 @@ GAME_UI_FONT_SIZE = 14
 GAME_UI_SCORE_MULTIPLIER = 100
 GAME_UI_TEXT_BG_HEIGHT = 20
 
+# Game grid class.
+GAME_GRID_COLORKEY = (255, 0, 255)
+
 # Rules board class.
 RULES_BOARD_POS = (125, 100)
 RULES_BOARD_DIMENSIONS = (550, 300)
 RULES_BOARD_TEXT_FONT_SIZE = 12
+RULES_BOARD_AUTOPILOT_TEXT_INDEX = 11  # Index of the "- autopilot: on/off" text in rules board text list.
+RULES_BOARD_REWIND_TEXT_INDEX = 14  # Index of the "- rewind: on/off" text in rules board text list.
+RULES_BOARD_GHOST_TEXT_INDEX = 16  # Index of the "- ghost: on/off" text in rules board text list.
+
+# Game board class.
+BOARD_DEFAULT_SIZE = (37, 21)  # (columns, rows) of the classic 800x500 board.
+BOARD_DEFAULT_CELL_SIZE = 20
 
 # Snake player class.
-SNAKE_CUBE_WIDTH = 20
-SNAKE_CUBE_HEIGHT = SNAKE_CUBE_WIDTH
-SNAKE_CUBE_DISPLACEMENT = SNAKE_CUBE_WIDTH
+SNAKE_BODY_CUBE_INSET_DIVISOR = 10  # Body cubes are drawn (cell size // 10) px smaller than their cell.
+SNAKE_PLAYER_SKIN_STEP = 2  # Player n uses the skin 2n places after the selected one (so colors don't look alike).
+# Names of the pygame key constants for up, right, down, and left, for each local player.
+SNAKE_PLAYER_KEY_NAME_LIST = [('K_UP', 'K_RIGHT', 'K_DOWN', 'K_LEFT'), ('K_w', 'K_d', 'K_s', 'K_a'),
+                              ('K_i', 'K_l', 'K_k', 'K_j'), ('K_KP8', 'K_KP6', 'K_KP5', 'K_KP4')]
+SNAKE_PLAYER_CONTROLS_TEXT_LIST = ['P1 ARROWS', 'P2 WASD', 'P3 IJKL', 'P4 NUMPAD']
+
+# Snake autopilot class.
+AUTOPILOT_FAILED_SEARCH_RETRY_TICKS = 5  # Searches for an apple again this many ticks after finding no safe path.
+AUTOPILOT_A_STAR_MAX_TARGETS = 16  # With more apples than this on the board, breadth first search is used.
+AUTOPILOT_SAFE_PATH_CANDIDATES = 8  # Nearest apples whose paths are checked for safety in each search.
+AUTOPILOT_MODE_LIST = ['OFF', 'APPLE', 'CYCLE']  # Autopilot modes cycled through with TAB before a game.
+
+# Game snapshot class.
+GAME_SNAPSHOT_FILE = os.path.join('saved_data_snake', 'game_snapshot.bin')
+GAME_SNAPSHOT_MAGIC = b'SNKS'
+GAME_SNAPSHOT_VERSION = 2
+GAME_SNAPSHOT_RNG_WORDS = 625  # Mersenne Twister state words (624, plus the position in them).
+
+# Rewind buffer class.
+REWIND_BUFFER_SECONDS = 60  # How much of a practice game can be rewound (older ticks are forgotten).
+REWIND_RECORD_FIELDS = 6  # (flags, direction index, tail column, tail row, spawned apple column, row) per snake.
+REWIND_FLAG_MOVED = 1  # Bit flags of each snake's record.
+REWIND_FLAG_GREW = 2
+REWIND_FLAG_DIED = 4
 
-# Apple item class.
-ITEM_APPLE_SNACK_WIDTH = 20
-ITEM_APPLE_SNACK_HEIGHT = ITEM_APPLE_SNACK_WIDTH
+# Ghost replay and ghost snake classes.
+GHOST_REPLAY_DIRECTORY = os.path.join('saved_data_snake', 'ghost_replays')
+GHOST_REPLAY_MAGIC = b'SNKG'
+GHOST_REPLAY_VERSION = 1
+GHOST_SNAKE_ALPHA = 110  # Opacity (out of 255) of the ghost snake's images.
+
+# Hamiltonian autopilot class.
+HAMILTONIAN_CYCLE_DIRECTORY = os.path.join('saved_data_snake', 'hamiltonian_cycles')
+HAMILTONIAN_CYCLE_MAGIC = b'SNKC'
+HAMILTONIAN_CYCLE_VERSION = 1
+HAMILTONIAN_SHORTCUT_MAX_FILL = 0.5  # Shortcuts are only taken while snake (and apples) fill less than half the board.
+HAMILTONIAN_SHORTCUT_APPLE_WEIGHT = 2  # Each apple counts as this many snake cubes towards the fill above.
+HAMILTONIAN_SHORTCUT_MARGIN = 4  # Extra cells kept between a shortcut and the tail (on top of 1 per apple).
+
+# Board observation class.
+OBSERVATION_CHANNEL_BODY = 0  # Index of each channel of the observation tensor.
+OBSERVATION_CHANNEL_HEAD = 1
+OBSERVATION_CHANNEL_APPLE = 2
+OBSERVATION_CHANNEL_WALL = 3
+OBSERVATION_CHANNEL_COUNT = 4
+
+# Snake environment class.
+ENVIRONMENT_ACTION_LIST = ['up', 'right', 'down', 'left']  # Direction of each action number.
+
+# Network game server and client classes.
+NETWORK_DEFAULT_HOST = '127.0.0.1'
+NETWORK_DEFAULT_PORT = 5405
+NETWORK_TICK_SECONDS = GAME_LOOP_DELAY / 1000  # Same speed as the local game loop.
+NETWORK_ROOM_PLAYER_COUNT = 2  # Snakes per room (a game starts once every seat is taken).
+NETWORK_ROOM_NAME_LIMIT = 32  # Max bytes in a room name.
+NETWORK_MESSAGE_JOIN = 1  # Message type ids.
+NETWORK_MESSAGE_DIRECTION = 2
+NETWORK_MESSAGE_WELCOME = 3
+NETWORK_MESSAGE_STATE = 4
+NETWORK_MESSAGE_GAME_OVER = 5
+NETWORK_MESSAGE_SPECTATE = 6
+NETWORK_MESSAGE_KEYFRAME = 7
+NETWORK_MESSAGE_DELTA = 8
+NETWORK_SPECTATOR_INDEX = 255  # Player index sent to spectators in their welcome message.
+NETWORK_DELTA_MOVED = 1  # Bit flags of each snake in a spectator delta.
+NETWORK_DELTA_GREW = 2
+NETWORK_DELTA_DIED = 4
+NETWORK_WRITE_BUFFER_LIMIT = 1024 * 1024  # Unsent bytes a client may fall behind by before it's disconnected.
+NETWORK_KEYFRAME_TICKS = 50  # Spectators are sent a full keyframe every 50 ticks (5 seconds), deltas otherwise.
+NETWORK_CLIENT_FRAME_SECONDS = 1 / 60  # How often the pygame client polls input and redraws.
 
 # Text box class.
 TEXT_BOX_CHAR_LIMIT = 12
+TEXT_BOX_CARET_WIDTH = 2
+TEXT_BOX_CARET_BLINK_TIME = 500  # Milliseconds the caret is shown (and then hidden) for while blinking.
+TEXT_BOX_KEY_REPEAT_DELAY = 400  # Milliseconds backspace is held down for before it repeats.
+TEXT_BOX_KEY_REPEAT_INTERVAL = 50
+
+# Frame tracer class.
+TRACE_FILE_ENV_VAR = 'SNAKE_TRACE_FILE'
+TRACE_BUFFER_CAPACITY = 65536
+TRACE_CATEGORY_FRAME = 0
+TRACE_CATEGORY_TRANSITION = 1
+TRACE_CATEGORY_NAMES = ('frame phases', 'screen transitions')
+
+# Sound bank class.
+SOUND_CATEGORY_VOICES = {'ui': 2, 'gameplay': 4, 'jingle': 1}  # Mixer channels reserved for each category.
+SOUND_DUCKING_CATEGORY_LIST = ['jingle']  # Categories whose sounds lower the music's volume while playing.
+SOUND_MUSIC_DUCK_FACTOR = 0.35
+SOUND_EFFECT_DICT = {'button_hover': ('ui', 0),  # {sound effect file name: (category, priority)}
+                     'button_click': ('ui', 1),
+                     'button_click_start_game': ('ui', 1),
+                     'button_click_left': ('ui', 1),
+                     'button_click_right': ('ui', 1),
+                     'button_apply_changes': ('ui', 1),
+                     'game_pause': ('ui', 2),
+                     'game_unpause': ('ui', 2),
+                     'snack_points_up': ('gameplay', 1),
+                     'snake_crashes': ('jingle', 1),
+                     'game_over': ('jingle', 2),
+                     }
+
+# Timer queue and tween classes.
+TWEEN_EASE_OUT_POWER = 3
@@ -0,0 +1,139 @@
+"""Define opt-in frame timeline tracer used to find stalls between screens.
+
+This module holds a tracer that records begin and end timestamps of every
+frame phase (event polling, simulation tick, and draw) and every screen
+transition (screen construction, score board building, etc.) and writes them
+out as a Chrome trace-event JSON file when the program exits. The file can be
+opened in Perfetto (ui.perfetto.dev) or chrome://tracing.
+
+Tracing is turned on by setting the SNAKE_TRACE_FILE environment variable to
+the path of the JSON file to write. Events are stored in a preallocated ring
+buffer (oldest events are overwritten once it is full) so that recording an
+event doesn't allocate and doesn't perturb the timings being measured. When
+tracing is off, begin() and end() return immediately.
+
+Usage:
+    trace_start = frame_tracer.begin()
+    ...  # Code being traced.
+    frame_tracer.end('SnakeGame: draw', trace_start)
+
+Classes:
+    FrameTracer: Ring buffer of trace events and Chrome trace JSON writer.
+"""
+
+import atexit
+import json
+import os
+import time
+from array import array
+from misc.constants import *
+
+
+class FrameTracer(object):
+    """Records timestamped frame phases and screen transitions in a ring buffer.
+
+    This class preallocates fixed size arrays for event start and end times,
+    event names, and event categories. Each recorded event overwrites the
+    oldest slot once the buffer is full. Categories are shown as separate
+    "threads" in the trace viewer so that frame phases and screen transitions
+    each get their own track.
+    """
+
+    def __init__(self, capacity: int = TRACE_BUFFER_CAPACITY) -> None:
+        self.capacity = capacity
+        self.enabled = False
+        self.output_file = ''
+        self.start_array = array('q', bytes(8 * self.capacity))
+        self.end_array = array('q', bytes(8 * self.capacity))
+        self.category_array = array('b', bytes(self.capacity))
+        self.name_list = [''] * self.capacity
+        self.next_index = 0
+        self.event_count = 0
+        self.clock_origin = time.perf_counter_ns()
+
+    def enable(self, output_file: str) -> None:
+        """Turn tracing on and write trace to output_file when program exits."""
+        if not self.enabled:
+            atexit.register(self.write)
+        self.enabled = True
+        self.output_file = output_file
+
+    def enable_from_environment(self) -> None:
+        """Turn tracing on if SNAKE_TRACE_FILE environment variable is set."""
+        output_file = os.environ.get(TRACE_FILE_ENV_VAR, '')
+        if output_file:
+            self.enable(output_file)
+
+    def begin(self) -> int:
+        """Return start timestamp (in ns) to be passed to end() later."""
+        if not self.enabled:
+            return 0
+        return time.perf_counter_ns()
+
+    def end(self, name: str, start: int, category: int = TRACE_CATEGORY_FRAME) -> None:
+        """Record event that started at start timestamp and ends now.
+
+        Args:
+            name: Name shown for event in trace viewer (pass a str literal so
+                no new str is created per frame).
+            start: Timestamp returned by begin().
+            category: TRACE_CATEGORY_FRAME or TRACE_CATEGORY_TRANSITION.
+        """
+        if not self.enabled:
+            return
+        self.record(name, start, time.perf_counter_ns(), category)
+
+    def instant(self, name: str, category: int = TRACE_CATEGORY_TRANSITION) -> None:
+        """Record zero length marker event (i.e. "SnakeGame.run returned")."""
+        if not self.enabled:
+            return
+        now = time.perf_counter_ns()
+        self.record(name, now, now, category)
+
+    def record(self, name: str, start: int, end: int, category: int) -> None:
+        """Store event in next ring buffer slot, overwriting oldest if full."""
+        index = self.next_index
+        self.start_array[index] = start
+        self.end_array[index] = end
+        self.category_array[index] = category
+        self.name_list[index] = name
+        self.next_index = (index + 1) % self.capacity
+        self.event_count += 1
+
+    def get_trace_event_list(self) -> list[dict]:
+        """Return list of recorded events in Chrome trace-event format, oldest first."""
+        stored_count = min(self.event_count, self.capacity)
+        first_index = (self.next_index - stored_count) % self.capacity
+        trace_event_list = [{'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': category + 1,
+                             'args': {'name': category_name}}
+                            for category, category_name in enumerate(TRACE_CATEGORY_NAMES)]
+
+        for offset in range(stored_count):
+            index = (first_index + offset) % self.capacity
+            start_us = (self.start_array[index] - self.clock_origin) / 1000
+            duration_us = (self.end_array[index] - self.start_array[index]) / 1000
+            category = self.category_array[index]
+            trace_event = {'name': self.name_list[index], 'cat': TRACE_CATEGORY_NAMES[category],
+                           'pid': 1, 'tid': category + 1, 'ts': start_us}
+            if duration_us > 0:
+                trace_event.update({'ph': 'X', 'dur': duration_us})
+            else:
+                trace_event.update({'ph': 'i', 's': 't'})
+            trace_event_list.append(trace_event)
+
+        return trace_event_list
+
+    def write(self) -> None:
+        """Write all recorded events to output_file as Chrome trace JSON."""
+        if not self.enabled:
+            return
+        with open(self.output_file, 'w') as trace_file:
+            json.dump({'traceEvents': self.get_trace_event_list(),
+                       'displayTimeUnit': 'ms',
+                       'otherData': {'dropped_events': max(0, self.event_count - self.capacity)}},
+                      trace_file)
+        print(f'frame trace written to {self.output_file}')
+
+
+# Single program wide tracer shared by every screen.
+frame_tracer = FrameTracer()
@@ -18,6 +18,7 @@ Functions:
 
 import os
 import pygame
+from misc.asset_cache import load_image
 
 
 def get_file_dict(file_name: str) -> dict:
@@ -155,8 +156,8 @@ def update_settings_real_time(bg_width: int, bg_height: int, old_user_prefs: dic
     user_prefs = get_file_dict('user_preferences')
     sfx_bool = user_prefs.get('SOUND').split('~')[1]
     background_choice = user_prefs.get('BACKGROUND').split('~')[1]
-    background = pygame.transform.scale(pygame.Surface.convert(pygame.image.load(
-        os.path.join('project_assets', 'backgrounds', f'{background_choice}'))), (bg_width, bg_height))
+    background = load_image(
+        os.path.join('project_assets', 'backgrounds', f'{background_choice}'), (bg_width, bg_height), alpha=False)
 
     old_music_setting = None if old_user_prefs is None else old_user_prefs.get('MUSIC').split('~')[1]
     music_setting = user_prefs.get('MUSIC').split('~')[1]
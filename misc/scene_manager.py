@@ -0,0 +1,176 @@
+"""Define scene base class and the scene manager that runs every screen of the program.
+
+This module holds a base class for the program's screens ("scenes") and a
+manager that keeps them in a stack and runs the program's only main loop:
+each frame, the scene on top of the stack handles that frame's events,
+updates, and draws itself. Scenes open other scenes by pushing them onto the
+stack and go back to the scene below by popping themselves off, instead of
+calling each other's run methods, so the call stack stays flat no matter how
+many screens are visited. Scenes are kept by whichever scene opens them and
+pushed again on their next visit, so their assets are only loaded once.
+
+Usage:
+    self.manager.push(self.high_scores_screen)  # Opens high scores screen.
+    ...
+    self.manager.pop()  # Goes back to the scene below.
+
+Classes:
+    Scene: Base class of a screen run by the scene manager.
+    SceneManager: Stack of scenes and the program's main loop.
+"""
+
+import pygame
+from misc.constants import *
+from misc.frame_tracer import frame_tracer
+from misc.sound_bank import sound_bank
+
+
+class Scene(object):
+    """Base class of a screen run by the scene manager.
+
+    Every hook does nothing by default, so scenes only override the hooks
+    they need. enter and exit are called each time the scene is pushed onto
+    and popped off the stack, and pause and resume each time another scene is
+    pushed on top of it and popped off again. While the scene is on top of
+    the stack, wait, handle_events, update, and draw are called once per
+    frame, in that order (if the scene pushes or pops a scene while handling
+    its events, the frame ends there, and the scene now on top of the stack
+    runs from the next frame).
+    """
+
+    manager = None  # Scene manager the scene was last pushed onto.
+    visit_trace_start = 0  # Trace timestamp of when the scene was last pushed.
+
+    def enter(self) -> None:
+        """Set scene up for a new visit (called when pushed onto the stack)."""
+
+    def exit(self) -> None:
+        """Tidy up after a visit (called when popped off the stack)."""
+
+    def pause(self) -> None:
+        """Called when another scene is pushed on top of this one."""
+
+    def resume(self, previous_scene: 'Scene') -> None:
+        """Called when entered scene (on top of this one) is popped, so its results can be read."""
+
+    def wait(self) -> None:
+        """Wait for the next frame to start (scenes don't wait by default)."""
+
+    def handle_events(self, event_list: list[pygame.event.Event]) -> None:
+        """Handle this frame's events (the window being closed is handled by the scene manager)."""
+
+    def update(self) -> None:
+        """Update scene for this frame."""
+
+    def draw(self) -> None:
+        """Blit scene content to screen."""
+
+
+class SceneManager(object):
+    """Stack of scenes and the program's main loop.
+
+    This class runs frames of whichever scene is on top of its stack until
+    the window is closed or the last scene is popped off. Pushing, popping,
+    and switching scenes call the scenes' enter, exit, pause, and resume
+    hooks straight away (so a scene's resume hook may push or pop scenes
+    itself), and each visit is recorded in the frame tracer's screen
+    transitions track. Pressing F11 toggles fullscreen on any screen (F11
+    key events are never passed on to scenes), and music ducked by a jingle
+    is brought back to its volume on any screen (see SoundBank.update).
+    """
+
+    def __init__(self) -> None:
+        self.scene_stack = []
+        self.trace_name_dict = {}  # {scene class: (frame wait, event polling, update, draw, visit) trace names}
+        self.running = True
+
+    def get_trace_names(self, scene: Scene) -> tuple[str, str, str, str, str]:
+        """Return names entered scene's frame phases and visits are traced under (made once per class)."""
+        scene_class = type(scene)
+        if scene_class not in self.trace_name_dict:
+            name = scene_class.__name__
+            self.trace_name_dict[scene_class] = (f'{name}: frame wait', f'{name}: event polling', f'{name}: update',
+                                                 f'{name}: draw', f'{name} visit')
+        return self.trace_name_dict[scene_class]
+
+    def push(self, scene: Scene) -> None:
+        """Pause scene on top of the stack (if any) and enter entered scene on top of it."""
+        if self.scene_stack:
+            self.scene_stack[-1].pause()
+        self.enter(scene)
+
+    def pop(self) -> Scene:
+        """Exit scene on top of the stack and resume the scene below it (if any).
+
+        Returns:
+            scene: Scene that was popped off.
+        """
+        scene = self.scene_stack.pop()
+        self.exit(scene)
+        if self.scene_stack:
+            self.scene_stack[-1].resume(scene)
+        return scene
+
+    def switch(self, scene: Scene) -> None:
+        """Exit scene on top of the stack and enter entered scene in its place (nothing is paused or resumed)."""
+        self.exit(self.scene_stack.pop())
+        self.enter(scene)
+
+    def enter(self, scene: Scene) -> None:
+        """Put entered scene on top of the stack and call its enter hook."""
+        scene.manager = self
+        scene.visit_trace_start = frame_tracer.begin()
+        self.scene_stack.append(scene)
+        scene.enter()
+
+    def exit(self, scene: Scene) -> None:
+        """Call entered scene's exit hook (once it is off the stack) and trace its visit."""
+        scene.exit()
+        frame_tracer.end(self.get_trace_names(scene)[4], scene.visit_trace_start, TRACE_CATEGORY_TRANSITION)
+
+    def toggle_fullscreen(self) -> None:
+        """Switch window between fullscreen and windowed (the game's frame is scaled to fit either way)."""
+        try:
+            pygame.display.toggle_fullscreen()
+        except pygame.error:
+            print('fullscreen not supported')
+
+    def quit(self) -> None:
+        """Stop main loop (scenes left on the stack aren't exited, since the program is closing)."""
+        self.running = False
+
+    def run(self) -> None:
+        """Run main loop, one frame of the scene on top of the stack at a time, until there are none left."""
+        while self.running and self.scene_stack:
+            scene = self.scene_stack[-1]
+            wait_name, event_name, update_name, draw_name, _ = self.get_trace_names(scene)
+
+            trace_start = frame_tracer.begin()
+            scene.wait()
+            frame_tracer.end(wait_name, trace_start)
+            sound_bank.update()
+
+            trace_start = frame_tracer.begin()
+            event_list = []
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.quit()
+                elif event.type in (pygame.KEYDOWN, pygame.KEYUP) and event.key == pygame.K_F11:
+                    if event.type == pygame.KEYUP:
+                        self.toggle_fullscreen()
+                    continue
+                event_list.append(event)
+            if not self.running:
+                break
+            scene.handle_events(event_list)
+            frame_tracer.end(event_name, trace_start)
+            if not self.scene_stack or self.scene_stack[-1] is not scene:
+                continue  # (Scene is no longer on top, so the rest of its frame would play or draw it once too often).
+
+            trace_start = frame_tracer.begin()
+            scene.update()
+            frame_tracer.end(update_name, trace_start)
+
+            trace_start = frame_tracer.begin()
+            scene.draw()
+            frame_tracer.end(draw_name, trace_start)
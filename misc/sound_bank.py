@@ -0,0 +1,110 @@
+"""Define sound bank that plays every sound effect of the program.
+
+This module holds a bank that decodes every sound effect once (instead of
+each button, screen, and game loading its own copies) and plays them through
+a pool of reserved mixer channels. Each sound effect belongs to a category
+(ui, gameplay, or jingle, see SOUND_EFFECT_DICT) that has its own channels, so
+a burst of sounds in one category (like apples eaten in quick succession) can
+never cut off sounds of another, and a burst can't pile up more voices than
+its category has channels. Jingles also duck the music while they play.
+
+Usage:
+    sound_bank.play('button_click')
+
+Classes:
+    SoundBank: Decoded sound effects and the mixer channels they play on.
+"""
+
+import os
+import pygame
+from misc.constants import *
+
+
+class SoundBank(object):
+    """Decoded sound effects and the reserved mixer channels they play on.
+
+    This class loads every sound effect in SOUND_EFFECT_DICT the first time
+    it is needed (at startup, see RootWindow) and reserves a fixed number of
+    mixer channels per category (SOUND_CATEGORY_VOICES), so pygame never
+    hands them out to other sounds. A sound is played on a free channel of
+    its category. If every channel of the category is busy, the sound takes
+    over the channel playing the lowest priority sound (the oldest one, if
+    several share that priority), unless every channel is playing a sound of
+    a higher priority than it, in which case it isn't played. While a jingle
+    plays, the music plays at SOUND_MUSIC_DUCK_FACTOR of its volume (the
+    scene manager calls update once per frame to bring it back). If there is no audio device, nothing is
+    loaded and every method does nothing.
+    """
+
+    def __init__(self) -> None:
+        self.loaded = False
+        self.sound_dict = {}  # {sound effect name: decoded sound}
+        self.voice_list_dict = {}  # {category: [[channel, priority of sound, ms sound started at]]}
+        self.music_volume = GAME_VOLUME
+        self.duck_end_time = 0  # Time (in ms) the music is ducked until (0 if it isn't).
+
+    def load(self) -> None:
+        """Decode every sound effect and reserve every category's channels (only done once)."""
+        if self.loaded:
+            return
+        self.loaded = True
+        if pygame.mixer.get_init() is None:
+            print('no audio device, sound effects are turned off')
+            return
+        reserved_count = sum(SOUND_CATEGORY_VOICES.values())
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), reserved_count))
+        pygame.mixer.set_reserved(reserved_count)
+        channel_index = 0
+        for category, voice_count in SOUND_CATEGORY_VOICES.items():
+            self.voice_list_dict[category] = [[pygame.mixer.Channel(index), 0, 0]
+                                              for index in range(channel_index, channel_index + voice_count)]
+            channel_index += voice_count
+        for name in SOUND_EFFECT_DICT:
+            self.sound_dict[name] = pygame.mixer.Sound(os.path.join('project_assets', 'sfx', f'{name}.wav'))
+
+    def play(self, name: str) -> None:
+        """Play entered sound effect on a channel of its category (see class docstring)."""
+        if not self.loaded:
+            self.load()
+        sound = self.sound_dict.get(name)
+        if sound is None:
+            return
+        category, priority = SOUND_EFFECT_DICT[name]
+        now = pygame.time.get_ticks()
+        voice = self.get_voice(category, priority)
+        if voice is None:
+            return
+        voice[0].play(sound)
+        voice[1], voice[2] = priority, now
+        if category in SOUND_DUCKING_CATEGORY_LIST:
+            self.duck_end_time = max(self.duck_end_time, now + int(sound.get_length() * 1000))
+            self.set_music_volume(self.music_volume)
+
+    def get_voice(self, category: str, priority: int) -> list | None:
+        """Return free voice of entered category, else the voice a sound of entered priority may take over.
+
+        Returns:
+            voice: [channel, priority, start time] list of the voice, or None
+                if every voice is busy playing a higher priority sound.
+        """
+        voice_list = self.voice_list_dict[category]
+        for voice in voice_list:
+            if not voice[0].get_busy():
+                return voice
+        lowest_voice = min(voice_list, key=lambda voice: (voice[1], voice[2]))
+        return lowest_voice if lowest_voice[1] <= priority else None
+
+    def set_music_volume(self, volume: float) -> None:
+        """Set volume of music (lowered while a jingle is playing)."""
+        self.music_volume = volume
+        if pygame.mixer.get_init() is not None:
+            pygame.mixer.music.set_volume(volume * (SOUND_MUSIC_DUCK_FACTOR if self.duck_end_time else 1.0))
+
+    def update(self) -> None:
+        """Bring music back to its volume once every jingle ducking it has finished (called every frame)."""
+        if self.duck_end_time and pygame.time.get_ticks() >= self.duck_end_time:
+            self.duck_end_time = 0
+            self.set_music_volume(self.music_volume)
+
+
+sound_bank = SoundBank()
@@ -2,15 +2,17 @@
 
 This module holds a reusable text box class that serves all the functions of a
 basic text box widget: accept user input, save it, return error messages, draw
-on screen, etc.
+on screen, etc. The text box is drawn with a single blit of a ready made
+image of itself (see get_frame), which is only made again when its text or
+highlight changes, so a text box nobody is typing in costs nothing to draw.
 
 Classes:
     TextBox: Object that serves all the functions of a basic text box object.
 """
 
-import os
 import pygame
 from misc.constants import *
+from misc.sound_bank import sound_bank
 
 
 class TextBox(object):
@@ -19,7 +21,10 @@ class TextBox(object):
     This class is a reusable text box object constructor for pygame (due to
     the absence of any builtin text box objects in pygame). User has full
     control of the text box's dimensions, position, color, text_color, and
-    font size. Note: Character limit is 12.
+    font size. Note: Character limit is 12. While selected, a caret blinks
+    after the text. Typing is read from a whole frame's events at once (see
+    handle_events), letters from TEXTINPUT events and backspaces from KEYDOWN
+    events (repeated while held down, between start_typing and stop_typing).
     """
 
     def __init__(self, window: pygame.Surface, textbox_pos: tuple[int, int], textbox_width: int, textbox_height: int,
@@ -46,9 +51,14 @@ class TextBox(object):
         self.text_surface = self.text_font.render(self.text, True, self.text_color)
         self.text_rect = self.text_surface.get_rect(midleft=((self.textbox_pos[0]+self.textbox_outline_offset),
                                                              self.textbox_pos[1]))
-        self.button_hover_sfx = pygame.mixer.Sound(os.path.join('project_assets', 'sfx', 'button_hover.wav'))
+        self.caret_rect = pygame.Rect(0, 0, TEXT_BOX_CARET_WIDTH, self.text_font.get_height())
+        self.caret_rect.centery = self.textbox_pos[1]
+        self.caret_start_time = 0  # Ticks the caret's blinking last started from (shown) at.
+        self.frame_dict = {}  # {(highlight color or None, caret shown bool): text box image (cleared on text change)}
+        self.button_hover_sfx = 'button_hover'
         self.hovered = False
         self.selected = True
+        self.previous_key_repeat = None  # (delay, interval) key repeat to restore once typing stops.
 
     def draw(self, mouse_pos: tuple[int, int], sfx_bool: str) -> None:
         """Blit text box and text to screen.
@@ -64,7 +74,6 @@ class TextBox(object):
                 sfx when selected.
         """
         self.draw_textbox(mouse_pos, sfx_bool)
-        self.window.blit(self.text_surface, self.text_rect)
 
     def is_hovering(self, mouse_pos: tuple[int, int]) -> bool:
         """Check if mouse is hovering over text box."""
@@ -72,42 +81,137 @@ class TextBox(object):
             return True
 
     def draw_textbox(self, mouse_pos: tuple[int, int], sfx_bool: str) -> None:
-        """Determine if highlighted and blit text box and highlight to screen.
+        """Determine if highlighted and blit text box (with its text and highlight) to screen.
 
         This method uses class attributes and entered args to determine if
         text box is being hovered over or is selected: method blits a blue
-        "highlight" rect around the text box if it is selected, a white one if
-        it is being hovered over, plays a hover sfx, and blits the actual text
-        box as well, regardless.
+        "highlight" rect around the text box (and a blinking caret after its
+        text) if it is selected, a white one if it is being hovered over,
+        plays a hover sfx, and blits the actual text box as well, regardless.
 
         Args:
             mouse_pos: Used to determine if cursor was hovering over text box.
             sfx_bool: Used to determine whether text box should make a hover
                 sfx when hovered over.
         """
+        highlight_color = None
+        caret_bool = False
         if self.selected:
-            pygame.draw.rect(self.window, GAME_TEXT_LIGHT_BLUE, self.textbox_rect_outline)
+            highlight_color = GAME_TEXT_LIGHT_BLUE
+            caret_bool = (pygame.time.get_ticks() - self.caret_start_time) // TEXT_BOX_CARET_BLINK_TIME % 2 == 0
         elif self.is_hovering(mouse_pos):
-            pygame.draw.rect(self.window, GAME_TEXT_WHITE, self.textbox_rect_outline)
+            highlight_color = GAME_TEXT_WHITE
             if self.hovered is False:
                 self.hovered = True
                 if sfx_bool == 'True':
-                    self.button_hover_sfx.play()
+                    sound_bank.play(self.button_hover_sfx)
         else:
             if self.hovered is True:
                 self.hovered = False
 
-        pygame.draw.rect(self.window, self.textbox_color, self.textbox_rect)
+        frame_rect = self.textbox_rect if highlight_color is None else self.textbox_rect_outline
+        self.window.blit(self.get_frame(highlight_color, caret_bool), frame_rect)
+
+    def get_frame(self, highlight_color: tuple[int, int, int] | None, caret_bool: bool) -> pygame.Surface:
+        """Return image of text box with its text, entered highlight around it, and caret (made once per text).
+
+        Args:
+            highlight_color: Color of the highlight rect around the text box,
+                or None for no highlight (image only covers the text box).
+            caret_bool: Whether the caret is shown after the text.
+
+        Returns:
+            frame: Image of the text box, the size of its highlight rect (or
+                of the text box itself, if there is no highlight).
+        """
+        key = (highlight_color, caret_bool)
+        frame = self.frame_dict.get(key)
+        if frame is None:
+            frame_rect = self.textbox_rect if highlight_color is None else self.textbox_rect_outline
+            offset = (-frame_rect.x, -frame_rect.y)
+            frame = pygame.Surface(frame_rect.size)
+            frame.fill(self.textbox_color if highlight_color is None else highlight_color)
+            frame.fill(self.textbox_color, self.textbox_rect.move(offset))
+            frame.blit(self.text_surface, self.text_rect.move(offset))
+            if caret_bool:
+                self.caret_rect.left = min(self.text_rect.left + self.text_surface.get_width() + 1,
+                                           self.textbox_rect.right - TEXT_BOX_CARET_WIDTH)
+                frame.fill(self.text_color, self.caret_rect.move(offset))
+            self.frame_dict[key] = frame
+        return frame
+
+    def render_text(self) -> None:
+        """Update self.text_surface after self.text changes (and show caret straight away, while typing)."""
+        self.text_surface = self.text_font.render(self.text, True, self.text_color)
+        self.frame_dict.clear()
+        self.caret_start_time = pygame.time.get_ticks()
+
+    def set_text(self, text: str) -> None:
+        """Replace self.text with text (used to clear a reused text box) and update self.text_surface."""
+        self.text = text.upper()[:TEXT_BOX_CHAR_LIMIT]
+        self.render_text()
 
     def add_char(self, input_char: str) -> None:
         """Adds input_char to self.text unless self.text is > 12 chars."""
         if len(self.text) < TEXT_BOX_CHAR_LIMIT:
             self.text += input_char.upper()
-            self.text_surface = self.text_font.render(self.text, True, self.text_color)
+            self.render_text()
         else:
             print('char limit 12')
 
     def remove_char(self) -> None:
         """Removes last char from self.text and updates self.text_surface."""
         self.text = self.text[:-1]
-        self.text_surface = self.text_font.render(self.text, True, self.text_color)
+        self.render_text()
+
+    def handle_events(self, event_list: list[pygame.event.Event]) -> bool:
+        """Apply every letter typed and backspace pressed in entered events to self.text, if selected.
+
+        All of a frame's typing is applied before self.text_surface is
+        rendered again, so it is rendered at most once per frame, however
+        many keys were pressed (or repeated) that frame. Only letters are
+        kept from TEXTINPUT events, and letters past the character limit are
+        dropped.
+
+        Args:
+            event_list: This frame's events.
+
+        Returns:
+            changed: Whether self.text changed.
+        """
+        if not self.selected:
+            return False
+        text = self.text
+        char_limit_bool = False
+        for event in event_list:
+            if event.type == pygame.TEXTINPUT:
+                for input_char in event.text:
+                    if not (input_char.isascii() and input_char.isalpha()):
+                        continue
+                    if len(text) < TEXT_BOX_CHAR_LIMIT:
+                        text += input_char.upper()
+                    else:
+                        char_limit_bool = True
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_BACKSPACE:
+                text = text[:-1]
+        if char_limit_bool:
+            print('char limit 12')
+        if text == self.text:
+            return False
+        self.text = text
+        self.render_text()
+        return True
+
+    def start_typing(self) -> None:
+        """Start reading typed text, with held keys repeating (call when the text box is shown)."""
+        if self.previous_key_repeat is None:
+            self.previous_key_repeat = pygame.key.get_repeat()
+            pygame.key.set_repeat(TEXT_BOX_KEY_REPEAT_DELAY, TEXT_BOX_KEY_REPEAT_INTERVAL)
+            pygame.key.start_text_input()
+
+    def stop_typing(self) -> None:
+        """Stop reading typed text, putting key repeat back to what it was before start_typing was called."""
+        if self.previous_key_repeat is not None:
+            pygame.key.set_repeat(*self.previous_key_repeat)
+            pygame.key.stop_text_input()
+            self.previous_key_repeat = None
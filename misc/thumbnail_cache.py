@@ -0,0 +1,122 @@
+"""Define thumbnail cache that makes the game options screen's previews.
+
+This module holds a cache of small preview images ("thumbnails") of the
+backgrounds and snake skins that can be picked in the game options screen.
+Each thumbnail is made from its asset files the first time it is asked for,
+on a background thread (so the screen keeps drawing and handling events while
+large backgrounds are decoded), saved to THUMBNAIL_DIRECTORY, and loaded from
+there afterwards. Saved thumbnails are named after the modification time of
+the asset files they were made from, so a changed asset gets a new thumbnail.
+
+Usage:
+    thumbnail = thumbnail_cache.get('BACKGROUND', 'grass_background.png')  # None until it is ready.
+    ...
+    thumbnail_cache.update()  # Once per frame, picks up thumbnails made since the last frame.
+
+Classes:
+    ThumbnailCache: Preview images of background and snake skin options.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+from misc.constants import *
+
+
+class ThumbnailCache(object):
+    """Preview images of background and snake skin options, made once and kept.
+
+    This class hands out thumbnails of game option values (a background file
+    name, or a snake skin file name prefix) by option label (see
+    THUMBNAIL_OPTION_LABEL_LIST). Asking for a thumbnail that isn't ready yet
+    returns None and starts making it on the cache's only worker thread, which
+    only loads, scales, and saves images (surfaces are converted for the
+    window on the main thread, in update).
+
+    Pygame surfaces aren't safe to use from 2 threads at once, but the worker
+    only ever touches surfaces it made itself, and each finished thumbnail is
+    only handed to the main thread (through its future) once the worker is
+    done with it. Loading, scaling, blitting between its own surfaces, and
+    saving don't need the display or a font, unlike converting (done in
+    update) or rendering text (why high score pages are rendered on their
+    screen's own loop instead, see HighScoresScreen). A thumbnail that can't be made is
+    kept as an empty surface, so it isn't tried again. Thumbnails are kept in
+    memory once made, so scrolling back to an option never loads it again.
+    """
+
+    def __init__(self) -> None:
+        self.thumbnail_dict = {}  # {(option label, option value): thumbnail converted for the window}
+        self.future_dict = {}  # {(option label, option value): future of thumbnail being made}
+        self.executor = None  # Worker thread pool (made the first time a thumbnail is asked for).
+
+    def get(self, option_label: str, option_value: str) -> pygame.Surface | None:
+        """Return thumbnail of entered option value, or None (making it in the background) if it isn't ready yet."""
+        key = (option_label, option_value)
+        thumbnail = self.thumbnail_dict.get(key)
+        if thumbnail is None and key not in self.future_dict:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='thumbnail')
+            self.future_dict[key] = self.executor.submit(self.load_thumbnail, option_label, option_value)
+        return thumbnail
+
+    def update(self) -> None:
+        """Keep every thumbnail finished since the last call (call every frame while thumbnails are shown)."""
+        for key in [key for key, future in self.future_dict.items() if future.done()]:
+            try:
+                thumbnail = self.future_dict.pop(key).result()
+            except (OSError, ValueError, pygame.error) as error:
+                print(f'could not make thumbnail of {key[1]}: {error}')
+                thumbnail = pygame.Surface((1, 1), pygame.SRCALPHA)  # Stops it being asked for again.
+            self.thumbnail_dict[key] = thumbnail.convert_alpha()
+
+    def get_source_path_list(self, option_label: str, option_value: str) -> list[str]:
+        """Return file paths of the asset files entered option value's thumbnail is made from."""
+        if option_label == 'BACKGROUND':
+            return [os.path.join('project_assets', 'backgrounds', option_value)]
+        return [os.path.join('project_assets', 'snake_skins', f'{option_value}{part}.png')
+                for part in ['body_cube', 'head_right']]
+
+    def load_image(self, image_path: str) -> pygame.Surface:
+        """Load entered image as a 24 or 32 bit surface (palette images are copied to one, so they can be scaled)."""
+        image = pygame.image.load(image_path)
+        if image.get_bitsize() not in (24, 32):
+            true_color_image = pygame.Surface(image.get_size(), pygame.SRCALPHA)
+            true_color_image.blit(image, (0, 0))
+            image = true_color_image
+        return image
+
+    def load_thumbnail(self, option_label: str, option_value: str) -> pygame.Surface:
+        """Load thumbnail of entered option value from disk, making and saving it first if needed (worker thread)."""
+        source_path_list = self.get_source_path_list(option_label, option_value)
+        modified_time = max(os.stat(source_path).st_mtime_ns for source_path in source_path_list)
+        file_prefix = f'{option_label.lower().replace(" ", "_")}_{os.path.splitext(option_value)[0]}'
+        thumbnail_path = os.path.join(THUMBNAIL_DIRECTORY, f'{file_prefix}_{modified_time}.png')
+        if os.path.exists(thumbnail_path):
+            return pygame.image.load(thumbnail_path)
+
+        if option_label == 'BACKGROUND':
+            thumbnail = pygame.transform.smoothscale(self.load_image(source_path_list[0]), THUMBNAIL_BACKGROUND_SIZE)
+        else:
+            # A short snake: body cubes in a row, followed by its head facing right.
+            body_cube, head = [pygame.transform.smoothscale(self.load_image(source_path),
+                                                            (THUMBNAIL_SKIN_CUBE_SIZE, THUMBNAIL_SKIN_CUBE_SIZE))
+                               for source_path in source_path_list]
+            thumbnail = pygame.Surface((THUMBNAIL_SKIN_CUBE_SIZE * (THUMBNAIL_SKIN_BODY_LENGTH + 1),
+                                        THUMBNAIL_SKIN_CUBE_SIZE), pygame.SRCALPHA)
+            for index in range(THUMBNAIL_SKIN_BODY_LENGTH):
+                thumbnail.blit(body_cube, (index * THUMBNAIL_SKIN_CUBE_SIZE, 0))
+            thumbnail.blit(head, (THUMBNAIL_SKIN_BODY_LENGTH * THUMBNAIL_SKIN_CUBE_SIZE, 0))
+
+        try:
+            os.makedirs(THUMBNAIL_DIRECTORY, exist_ok=True)
+            # Forget thumbnails made from older versions of the asset files.
+            for file_name in os.listdir(THUMBNAIL_DIRECTORY):
+                if file_name.startswith(f'{file_prefix}_') and file_name[len(file_prefix) + 1:-4].isdigit():
+                    os.remove(os.path.join(THUMBNAIL_DIRECTORY, file_name))
+            pygame.image.save(thumbnail, thumbnail_path)
+        except (OSError, pygame.error):
+            print('could not save thumbnail to disk')
+        return thumbnail
+
+
+thumbnail_cache = ThumbnailCache()
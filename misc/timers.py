@@ -0,0 +1,81 @@
+"""Define timer queue and tween classes used for non-blocking screen transitions.
+
+This module holds a queue of callbacks scheduled to run a number of
+milliseconds from now, and a tween that moves a value from one number to
+another over a number of milliseconds. Screens use them instead of
+pygame.time.delay, so a screen keeps drawing itself and handling events
+(including closing the window) while it waits to move on.
+
+Usage:
+    self.timers.schedule(BUTTON_CLICK_TIME_DELAY, self.stop)
+    ...
+    self.timers.update()  # Once per frame, runs every callback that is due.
+
+Classes:
+    TimerQueue: Callbacks scheduled to run after a delay.
+    Tween: Value eased from a start number to an end number over time.
+"""
+
+import heapq
+from itertools import count
+import pygame
+from misc.constants import *
+
+
+class TimerQueue(object):
+    """Callbacks scheduled to run after a delay, checked once per frame.
+
+    This class keeps scheduled callbacks in a heap ordered by the time they
+    are due (callbacks due at the same time run in the order they were
+    scheduled), so checking for due callbacks every frame only looks at the
+    front of the heap. Callbacks run from update, in the screen's own loop,
+    never from another thread.
+    """
+
+    def __init__(self) -> None:
+        self.timer_heap = []  # [(time due in ms, order scheduled, callback)]
+        self.order_counter = count()
+
+    def schedule(self, delay: int, callback) -> None:
+        """Run entered callback (with no args) once entered delay (in ms) has passed."""
+        heapq.heappush(self.timer_heap, (pygame.time.get_ticks() + delay, next(self.order_counter), callback))
+
+    def update(self) -> None:
+        """Run (and remove) every callback that is due."""
+        now = pygame.time.get_ticks()
+        while self.timer_heap and self.timer_heap[0][0] <= now:
+            heapq.heappop(self.timer_heap)[2]()
+
+    def is_pending(self) -> bool:
+        """Return True while any callback is waiting to run (used to ignore input during transitions)."""
+        return len(self.timer_heap) > 0
+
+    def clear(self) -> None:
+        """Forget every scheduled callback without running it."""
+        self.timer_heap.clear()
+
+
+class Tween(object):
+    """Value eased from a start number to an end number over a duration.
+
+    This class works its value out from the time since it started whenever
+    value is called, so it never needs updating every frame. The value eases
+    out (moves quickly at first, then slows down as it settles on the end
+    number).
+    """
+
+    def __init__(self, start_value: float, end_value: float, duration: int) -> None:
+        self.start_value = start_value
+        self.end_value = end_value
+        self.duration = max(1, duration)
+        self.start_time = pygame.time.get_ticks()
+
+    def value(self) -> float:
+        """Return value at the current time (end value once the duration has passed)."""
+        progress = min(1.0, (pygame.time.get_ticks() - self.start_time) / self.duration)
+        eased_progress = 1 - (1 - progress) ** TWEEN_EASE_OUT_POWER
+        return self.start_value + (self.end_value - self.start_value) * eased_progress
+
+    def is_done(self) -> bool:
+        """Return True once the duration has passed."""
+        return pygame.time.get_ticks() - self.start_time >= self.duration
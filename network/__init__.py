@@ -0,0 +1,17 @@
+"""Networked multiplayer: an asyncio game server and its clients.
+
+This package runs authoritative snake games on a server (the same rules as
+the local game) in rooms of NETWORK_ROOM_PLAYER_COUNT players, with every
+room ticked by one timer on one asyncio event loop. Clients send direction
+changes and are sent each room's state after every tick over TCP.
+
+Usage (from the project root, so that asset paths resolve):
+    python -m network server                    # host rooms on the default port
+    python -m network client --room friends     # play in room "friends"
+    python -m network simulate --rooms 50       # loopback test with simulated clients
+
+Modules:
+    protocol: Binary message format.
+    game_server: GameRoom and GameServer classes.
+    game_client: GameClient, SimulatedClient, and PygameClient classes.
+"""
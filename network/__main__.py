@@ -0,0 +1,94 @@
+"""Run game server, pygame client, or a loopback test via "python -m network".
+
+Functions:
+    simulate: Runs a server and simulated clients over loopback and reports.
+    main: Command line entry point.
+"""
+
+import os
+import sys
+
+if len(sys.argv) > 1 and sys.argv[1] != 'client':
+    # Servers and simulated clients never show anything (must be set before pygame is imported).
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import argparse
+import asyncio
+from misc.constants import *
+from network.game_client import GameClient, PygameClient, SimulatedClient
+from network.game_server import GameServer
+
+
+async def simulate(room_count: int, tick_count: int, tick_seconds: float, spectator_count: int = 0) -> None:
+    """Run a server on loopback with every room filled by simulated clients and report results.
+
+    Each room gets NETWORK_ROOM_PLAYER_COUNT simulated clients and entered
+    number of spectators. Once every client has received tick_count states,
+    the states and games received, the average bytes received per state by
+    players and by spectators, and the average time the server spent ticking
+    all rooms, are printed.
+    """
+    server = GameServer('127.0.0.1', 0, tick_seconds)
+    await server.start()
+    player_client_list = [SimulatedClient('127.0.0.1', server.port, f'room {room_index}', seed=client_index)
+                          for room_index in range(room_count)
+                          for client_index in range(NETWORK_ROOM_PLAYER_COUNT)]
+    spectator_client_list = [GameClient('127.0.0.1', server.port, f'room {room_index}', spectate=True)
+                             for room_index in range(room_count)
+                             for _ in range(spectator_count)]
+    client_list = spectator_client_list + player_client_list  # (Spectators first, so they see every game start).
+    for client in client_list:
+        await client.connect()
+    receive_task_list = [asyncio.create_task(client.receive_messages()) for client in client_list]
+    start_tick_count = server.tick_count
+    while min(client.state_count for client in client_list) < tick_count:
+        await asyncio.sleep(tick_seconds)
+    ticks_run = server.tick_count - start_tick_count
+    for client in client_list:
+        await client.close()
+    for task in receive_task_list:
+        task.cancel()
+    await server.stop()
+    print(f'rooms: {room_count}, clients: {len(client_list)}, server ticks: {ticks_run}')
+    print(f'states received: {sum(client.state_count for client in client_list)}, games finished: '
+          f'{sum(client.game_over_count for client in player_client_list) // NETWORK_ROOM_PLAYER_COUNT}')
+    for name, group_list in (('player', player_client_list), ('spectator', spectator_client_list)):
+        state_total = sum(client.state_count for client in group_list)
+        if state_total:
+            print(f'average bytes per {name} state: '
+                  f'{sum(client.bytes_received for client in group_list) / state_total:.1f}')
+    print(f'average time ticking every room: {server.tick_time_total / max(server.tick_count, 1) * 1000:.3f} ms')
+
+
+def main() -> None:
+    """Parse command line args and run server, client, or loopback simulation."""
+    parser = argparse.ArgumentParser(prog='python -m network', description='Networked snake games.')
+    subparsers = parser.add_subparsers(dest='mode', required=True)
+    server_parser = subparsers.add_parser('server', help='host game rooms')
+    server_parser.add_argument('--host', default=NETWORK_DEFAULT_HOST)
+    server_parser.add_argument('--port', type=int, default=NETWORK_DEFAULT_PORT)
+    client_parser = subparsers.add_parser('client', help='play in a game room')
+    client_parser.add_argument('--host', default=NETWORK_DEFAULT_HOST)
+    client_parser.add_argument('--port', type=int, default=NETWORK_DEFAULT_PORT)
+    client_parser.add_argument('--room', default='lobby')
+    client_parser.add_argument('--spectate', action='store_true', help='watch the room instead of playing')
+    simulate_parser = subparsers.add_parser('simulate', help='test server over loopback with simulated clients')
+    simulate_parser.add_argument('--rooms', type=int, default=10)
+    simulate_parser.add_argument('--ticks', type=int, default=100)
+    simulate_parser.add_argument('--tick-seconds', type=float, default=NETWORK_TICK_SECONDS)
+    simulate_parser.add_argument('--spectators', type=int, default=0, help='spectators per room')
+    args = parser.parse_args()
+
+    if args.mode == 'server':
+        server = GameServer(args.host, args.port)
+        print(f'serving snake on {args.host}:{args.port}')
+        asyncio.run(server.serve_forever())
+    elif args.mode == 'client':
+        asyncio.run(PygameClient(args.host, args.port, args.room, args.spectate).run())
+    else:
+        asyncio.run(simulate(args.rooms, args.ticks, args.tick_seconds, args.spectators))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,295 @@
+"""Define network game clients: a pygame client and a simulated one.
+
+This module holds the clients that connect to a GameServer room: a base class
+handling the connection and messages, a pygame client that shows the room's
+game in a window (drawing with the in-game PlayerSnake.draw and
+AppleSnack.draw methods) and sends the arrow keys as direction changes, and a
+simulated client that picks its own directions, used to test the server over
+loopback (many of them can run on one event loop). Any client can spectate
+instead of play, rebuilding each tick's state from the server's keyframes and
+deltas.
+
+Classes:
+    GameClient: Connects to a room and keeps its latest state.
+    SimulatedClient: Client that steers its snake away from walls and snakes.
+    PygameClient: Client that shows the game in a window and reads the keyboard.
+"""
+
+import asyncio
+import os
+import random
+from collections import deque
+import pygame
+from misc.constants import *
+from misc.asset_cache import load_image
+from misc.saved_data_io_functions import get_file_dict
+from game_objects.game_board import GameBoard, get_board_settings
+from game_objects.game_border_ui import GameBorderUI
+from game_objects.snack_items import AppleSnack
+from game_objects.snake_player import make_snake_player_list
+from network.protocol import WELCOME_PAYLOAD, decode_delta, decode_state, encode_message, read_message
+
+
+class GameClient(object):
+    """Connection to a game server room.
+
+    This class joins the entered room, reads the server's welcome message
+    (player index, player count, and board size), then keeps reading state
+    messages in the background (see receive_messages), calling on_state with
+    every decoded state and on_game_over with the final scores of each game.
+    Subclasses override those methods to react to the game.
+
+    A spectating client is sent a keyframe (a full state) now and then and a
+    delta every other tick. It keeps its own copy of each snake's cells (in
+    deques, so applying a delta only touches both ends) and of the apple
+    cells, rebuilds the state from each delta, and calls on_state with it
+    just like a player's client would. Deltas are ignored until the first
+    keyframe arrives.
+    """
+
+    def __init__(self, host: str = NETWORK_DEFAULT_HOST, port: int = NETWORK_DEFAULT_PORT,
+                 room_name: str = 'lobby', spectate: bool = False) -> None:
+        self.host = host
+        self.port = port
+        self.room_name = room_name
+        self.spectate = spectate
+        self.reader = None
+        self.writer = None
+        self.player_index = None
+        self.player_count = 0
+        self.columns = 0
+        self.rows = 0
+        self.state_count = 0
+        self.game_over_count = 0
+        self.bytes_received = 0
+        self.connected = False
+        self.spectator_snake_list = None  # [dead, direction, snacks eaten, cell deque] of each snake when spectating.
+        self.spectator_apple_cell_set = set()
+
+    async def connect(self) -> None:
+        """Connect to server, join (or spectate) room, and wait for the welcome message."""
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(encode_message(NETWORK_MESSAGE_SPECTATE if self.spectate else NETWORK_MESSAGE_JOIN,
+                                         self.room_name.encode('utf-8')))
+        message_type, payload = await read_message(self.reader)
+        if message_type != NETWORK_MESSAGE_WELCOME:
+            raise ConnectionError(f'expected welcome message, got message type {message_type}')
+        self.player_index, self.player_count, self.columns, self.rows = WELCOME_PAYLOAD.unpack(payload)
+        self.connected = True
+
+    async def receive_messages(self) -> None:
+        """Read messages from server until the connection closes."""
+        try:
+            while True:
+                message_type, payload = await read_message(self.reader)
+                self.bytes_received += len(payload)
+                if message_type == NETWORK_MESSAGE_STATE:
+                    self.state_count += 1
+                    self.on_state(*decode_state(payload))
+                elif message_type == NETWORK_MESSAGE_KEYFRAME:
+                    self.state_count += 1
+                    self.on_state(*self.load_keyframe(payload))
+                elif message_type == NETWORK_MESSAGE_DELTA:
+                    if self.spectator_snake_list is not None:
+                        self.state_count += 1
+                        self.on_state(*self.apply_delta(payload))
+                elif message_type == NETWORK_MESSAGE_GAME_OVER:
+                    self.game_over_count += 1
+                    self.on_game_over([int.from_bytes(payload[index:index + 4], 'little')
+                                       for index in range(0, len(payload), 4)])
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.connected = False
+
+    def load_keyframe(self, payload: bytes) -> tuple[int, list, list]:
+        """Replace spectated state with entered KEYFRAME payload's and return it (as decode_state does)."""
+        tick, snake_state_list, apple_cell_list = decode_state(payload)
+        self.spectator_snake_list = [[dead, direction, snacks_eaten, deque(cell_list)]
+                                     for dead, direction, snacks_eaten, cell_list in snake_state_list]
+        self.spectator_apple_cell_set = set(apple_cell_list)
+        return tick, snake_state_list, apple_cell_list
+
+    def apply_delta(self, payload: bytes) -> tuple[int, list, list]:
+        """Update spectated state with entered DELTA payload and return the new state (as decode_state does).
+
+        Mirrors PlayerSnake.move (new head in, tail out) and
+        PlayerSnake.increase_length (tail cell doubled up) for each snake,
+        then swaps eaten apples for spawned ones (see encode_delta).
+        """
+        tick, snake_delta_list, spawned_cell_list = decode_delta(payload)
+        for snake, (flags, direction, head_cell, snacks_eaten) in zip(self.spectator_snake_list, snake_delta_list):
+            cell_deque = snake[3]
+            if flags & NETWORK_DELTA_MOVED:
+                cell_deque.appendleft(head_cell)
+                cell_deque.pop()
+            if flags & NETWORK_DELTA_GREW:
+                cell_deque.append(cell_deque[-1])
+                self.spectator_apple_cell_set.discard(head_cell)
+            if flags & NETWORK_DELTA_DIED:
+                snake[0] = True
+            snake[1] = direction
+            snake[2] = snacks_eaten
+        self.spectator_apple_cell_set.update(spawned_cell_list)
+        return (tick, [(dead, direction, snacks_eaten, list(cell_deque))
+                       for dead, direction, snacks_eaten, cell_deque in self.spectator_snake_list],
+                list(self.spectator_apple_cell_set))
+
+    def send_direction(self, direction: str) -> None:
+        """Ask server to turn this client's snake towards entered direction."""
+        self.writer.write(encode_message(NETWORK_MESSAGE_DIRECTION,
+                                         bytes([ENVIRONMENT_ACTION_LIST.index(direction)])))
+
+    def on_state(self, tick: int, snake_state_list: list, apple_cell_list: list) -> None:
+        """Handle a tick's state (overridden by subclasses)."""
+        pass
+
+    def on_game_over(self, snacks_eaten_list: list[int]) -> None:
+        """Handle end of a game (overridden by subclasses)."""
+        pass
+
+    async def close(self) -> None:
+        """Close connection to server."""
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+class SimulatedClient(GameClient):
+    """Client that steers its own snake, used to test servers over loopback.
+
+    After every state, this client keeps going straight unless the next cell
+    is off the board or holds a snake, in which case it turns to a random
+    safe direction (if there is one).
+    """
+
+    def __init__(self, host: str = NETWORK_DEFAULT_HOST, port: int = NETWORK_DEFAULT_PORT,
+                 room_name: str = 'lobby', seed: int | None = None) -> None:
+        super().__init__(host, port, room_name)
+        self.rng = random.Random(seed)
+        self.displacement_dict = {'up': (0, -1), 'right': (1, 0), 'down': (0, 1), 'left': (-1, 0)}
+        self.opposite_direction_dict = {'up': 'down', 'right': 'left', 'down': 'up', 'left': 'right'}
+
+    def on_state(self, tick: int, snake_state_list: list, apple_cell_list: list) -> None:
+        """Send direction keeping this client's snake out of walls and snakes."""
+        dead, direction, _, cell_list = snake_state_list[self.player_index]
+        if dead:
+            return
+        blocked_cell_set = set()
+        for _, _, _, snake_cell_list in snake_state_list:
+            blocked_cell_set.update(snake_cell_list[:-1])  # (Tails move out of the way).
+        head_cell = cell_list[0]
+
+        def is_safe(new_direction: str) -> bool:
+            offset = self.displacement_dict[new_direction]
+            cell = (head_cell[0] + offset[0], head_cell[1] + offset[1])
+            return 0 <= cell[0] < self.columns and 0 <= cell[1] < self.rows and cell not in blocked_cell_set
+
+        if is_safe(direction):
+            return
+        safe_direction_list = [new_direction for new_direction in ENVIRONMENT_ACTION_LIST
+                               if new_direction != self.opposite_direction_dict[direction] and is_safe(new_direction)]
+        if safe_direction_list:
+            self.send_direction(self.rng.choice(safe_direction_list))
+
+
+class PygameClient(GameClient):
+    """Client that shows its room's game in a pygame window.
+
+    This class keeps a local board with a PlayerSnake for every player (with
+    the same skins as local multiplayer) and a pool of AppleSnack objects,
+    moves them to where the server's latest state says they are, and draws
+    them with their own draw methods on top of the user's background, with a
+    border ui showing every player's score. The arrow keys are sent to the
+    server as direction changes (unless spectating).
+    """
+
+    def __init__(self, host: str = NETWORK_DEFAULT_HOST, port: int = NETWORK_DEFAULT_PORT,
+                 room_name: str = 'lobby', spectate: bool = False) -> None:
+        super().__init__(host, port, room_name, spectate)
+        self.window = None
+        self.board = None
+        self.border_ui = None
+        self.background = None
+        self.snake_player_list = []
+        self.apple_pool_list = []
+        self.key_direction_dict = {getattr(pygame, key_name): direction
+                                   for key_name, direction in zip(SNAKE_PLAYER_KEY_NAME_LIST[0],
+                                                                  ENVIRONMENT_ACTION_LIST)}
+        self.caption = 'Snake - Spectating' if spectate else 'Snake - Online'
+        self.running = False
+
+    def setup_window(self) -> None:
+        """Open game window and make local board, snakes, border ui, and background."""
+        pygame.init()
+        self.window = pygame.display.set_mode((GAME_WINDOW_WIDTH, GAME_WINDOW_HEIGHT))
+        pygame.display.set_caption(self.caption)
+        play_area_rect = pygame.Rect(GAME_BORDER_LEFT, GAME_BORDER_UPPER,
+                                     GAME_WINDOW_WIDTH - GAME_BORDER_LEFT - GAME_BORDER_RIGHT,
+                                     GAME_WINDOW_HEIGHT - GAME_BORDER_UPPER - GAME_BORDER_LOWER)
+        self.board = GameBoard(self.columns, self.rows, get_board_settings()[2], play_area_rect)
+        self.snake_player_list = make_snake_player_list(self.window, self.board, self.player_count)
+        self.border_ui = GameBorderUI(self.window, GAME_WINDOW_WIDTH, GAME_WINDOW_HEIGHT, self.board, True,
+                                      self.player_count)
+        background_choice = get_file_dict('user_preferences').get('BACKGROUND').split('~')[1]
+        self.background = load_image(
+            os.path.join('project_assets', 'backgrounds', background_choice), self.board.rect.size, alpha=False)
+
+    def on_state(self, tick: int, snake_state_list: list, apple_cell_list: list) -> None:
+        """Move local snakes and apples to entered state and redraw window."""
+        for snake_player, (dead, direction, snacks_eaten, cell_list) in zip(self.snake_player_list,
+                                                                           snake_state_list):
+            if dead and snake_player.dead:
+                continue
+            snake_player.set_cell_list(cell_list, direction)
+            if dead:
+                snake_player.die()
+        self.place_apples(apple_cell_list)
+        self.border_ui.snacks_eaten_list = [snacks_eaten for _, _, snacks_eaten, _ in snake_state_list]
+        self.border_ui.update_timer(int(tick * NETWORK_TICK_SECONDS * 1000), 0, 0)
+        self.draw()
+
+    def place_apples(self, apple_cell_list: list[tuple[int, int]]) -> None:
+        """Put an apple from the pool in each entered cell (making more apples if the pool runs out)."""
+        for apple in self.apple_pool_list:
+            apple.remove()
+        while len(self.apple_pool_list) < len(apple_cell_list) and self.board.has_free_cell():
+            apple = AppleSnack(self.window, self.board)
+            apple.remove()
+            self.apple_pool_list.append(apple)
+        for apple, cell in zip(self.apple_pool_list, apple_cell_list):
+            apple.set_cell(cell)
+
+    def draw(self) -> None:
+        """Blit background, every snake, every apple, and border ui, then update window."""
+        self.window.blit(self.background, self.board.rect.topleft)
+        for snake_player in self.snake_player_list:
+            snake_player.draw()
+        for apple in self.board.item_cell_dict.values():
+            apple.draw()
+        self.border_ui.draw()
+        pygame.display.update()
+
+    async def run(self) -> None:
+        """Connect, open window, and show the game until the window is closed or the server goes away.
+
+        Keyboard events are polled every NETWORK_CLIENT_FRAME_SECONDS on the
+        same event loop that receives states from the server.
+        """
+        await self.connect()
+        self.setup_window()
+        receive_task = asyncio.create_task(self.receive_messages())
+        self.running = True
+        while self.running and self.connected:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.running = False
+                elif event.type == pygame.KEYDOWN and event.key in self.key_direction_dict and not self.spectate:
+                    self.send_direction(self.key_direction_dict[event.key])
+            await asyncio.sleep(NETWORK_CLIENT_FRAME_SECONDS)
+        receive_task.cancel()
+        await self.close()
+        pygame.quit()
@@ -0,0 +1,278 @@
+"""Define asyncio game server hosting many networked game rooms at once.
+
+This module holds the classes for an authoritative snake game server: every
+game is played on the server (with the same rules as the local game, see
+GameSimulation), clients only send direction changes and are sent the state
+of their room after every tick. One process hosts any number of rooms, all
+run on a single asyncio event loop: one timer task ticks every room, so there
+is no thread (or task) per game. Spectators can watch any room, and are sent
+small per-tick deltas (with a full keyframe now and then) instead of states.
+Writes are never awaited (so one slow client can't hold up every room), and
+a client whose unsent bytes pile up past NETWORK_WRITE_BUFFER_LIMIT is
+disconnected instead of being buffered for without limit.
+
+Functions:
+    write_or_disconnect: Writes message to client, or drops client if behind.
+
+Classes:
+    GameRoom: One networked game and the clients playing it.
+    GameServer: TCP server that hosts rooms and ticks them all.
+"""
+
+import asyncio
+import time
+import pygame
+from misc.constants import *
+from game_objects.game_board import GameBoard
+from game_objects.game_simulation import GameSimulation, get_headless_window
+from game_objects.snack_items import spawn_apple_snacks
+from game_objects.snake_player import PlayerSnake
+from network.protocol import WELCOME_PAYLOAD, encode_delta, encode_message, encode_state, read_message
+
+
+def write_or_disconnect(writer: asyncio.StreamWriter, message: bytes) -> None:
+    """Write entered message to client, or disconnect client if it has fallen too far behind reading.
+
+    The connection is aborted (dropping its unsent bytes) rather than closed,
+    and the client's handler then removes it from its room (see
+    GameServer.handle_client). Writes to a client already being disconnected
+    are skipped.
+    """
+    transport = writer.transport
+    if transport.is_closing():
+        return
+    if transport.get_write_buffer_size() > NETWORK_WRITE_BUFFER_LIMIT:
+        print('client fell too far behind, disconnecting it')
+        transport.abort()
+        return
+    writer.write(message)
+
+
+class GameRoom(object):
+    """One networked game with a seat (and snake) for each player.
+
+    This class holds a board, one snake per seat, and the stream writer of
+    the client in each seat. Once every seat is taken a game starts, and
+    each tick plays one tick of the game, then encodes the room's state once
+    and writes the same bytes to every client. When every snake has crashed,
+    each client is sent the final scores, and the next game starts on the
+    following tick if every seat is still taken. A client leaving mid-game
+    kills its snake.
+
+    Spectators (any number of them) don't take a seat. Each tick they are
+    sent one DELTA message (encoded once, whatever the number of spectators)
+    holding only what changed that tick, so its size stays the same no
+    matter how long the snakes grow. A full KEYFRAME is sent instead every
+    NETWORK_KEYFRAME_TICKS ticks, at the start of every game, and on the
+    tick after a spectator joins, so that new spectators (and any that fell
+    out of step) catch up.
+    """
+
+    def __init__(self, name: str, window: pygame.Surface, player_count: int = NETWORK_ROOM_PLAYER_COUNT,
+                 columns: int = BOARD_DEFAULT_SIZE[0], rows: int = BOARD_DEFAULT_SIZE[1],
+                 apple_count: int = NUMBER_OF_APPLE_SNACKS) -> None:
+        self.name = name
+        self.window = window
+        self.player_count = player_count
+        self.apple_count = apple_count
+        play_area_rect = pygame.Rect(GAME_BORDER_LEFT, GAME_BORDER_UPPER,
+                                     GAME_WINDOW_WIDTH - GAME_BORDER_LEFT - GAME_BORDER_RIGHT,
+                                     GAME_WINDOW_HEIGHT - GAME_BORDER_UPPER - GAME_BORDER_LOWER)
+        self.board = GameBoard(columns, rows, BOARD_DEFAULT_CELL_SIZE, play_area_rect)
+        self.snake_player_list = [PlayerSnake(self.window, self.board, SNAKE_PLAYER_START_DIRECTION, start_cell)
+                                  for start_cell in self.board.get_start_cell_list(self.player_count)]
+        self.simulation = GameSimulation(self.window, self.board, self.snake_player_list)
+        spawn_apple_snacks(self.window, self.board, self.apple_count)
+        self.writer_list = [None] * self.player_count  # Stream writer of client in each seat (None if empty).
+        self.snacks_eaten_list = [0] * self.player_count
+        self.spectator_writer_list = []
+        self.keyframe_pending = False  # Whether next tick must be sent to spectators as a keyframe.
+        self.tick_count = 0
+        self.playing = False
+
+    def add_client(self, writer: asyncio.StreamWriter) -> int | None:
+        """Seat client with entered stream writer and return its player index (None if room is full)."""
+        if None not in self.writer_list:
+            return None
+        player_index = self.writer_list.index(None)
+        self.writer_list[player_index] = writer
+        return player_index
+
+    def remove_client(self, player_index: int) -> None:
+        """Empty entered seat, killing its snake if a game is being played."""
+        self.writer_list[player_index] = None
+        snake_player = self.snake_player_list[player_index]
+        if self.playing and not snake_player.dead:
+            snake_player.die()
+
+    def add_spectator(self, writer: asyncio.StreamWriter) -> None:
+        """Add spectator with entered stream writer (sent a keyframe on the next tick)."""
+        self.spectator_writer_list.append(writer)
+        self.keyframe_pending = True
+
+    def remove_spectator(self, writer: asyncio.StreamWriter) -> None:
+        """Remove spectator with entered stream writer."""
+        self.spectator_writer_list.remove(writer)
+
+    def is_empty(self) -> bool:
+        """Return True if no client is seated and no one is spectating."""
+        return all(writer is None for writer in self.writer_list) and not self.spectator_writer_list
+
+    def set_direction(self, player_index: int, direction_index: int) -> None:
+        """Turn entered player's snake (ignored unless a game is being played)."""
+        if self.playing and 0 <= direction_index < len(ENVIRONMENT_ACTION_LIST):
+            self.snake_player_list[player_index].set_direction(ENVIRONMENT_ACTION_LIST[direction_index])
+
+    def tick(self) -> None:
+        """Play one tick (starting a new game first if every seat is taken) and send state to every client."""
+        if not self.playing:
+            if None in self.writer_list:
+                return
+            self.simulation.reset(self.apple_count)
+            self.snacks_eaten_list = [0] * self.player_count
+            self.tick_count = 0
+            self.keyframe_pending = True
+            self.playing = True
+
+        moved_bool_list = [not snake_player.dead for snake_player in self.snake_player_list]
+        crashed_index_list, eaten_index_list = self.simulation.update()
+        for player_index in eaten_index_list:
+            self.snacks_eaten_list[player_index] += 1
+        self.tick_count += 1
+        self.broadcast(encode_state(self.tick_count, self.snake_player_list, self.snacks_eaten_list,
+                                    self.board.item_cell_dict))
+        if self.spectator_writer_list:
+            if self.keyframe_pending or self.tick_count % NETWORK_KEYFRAME_TICKS == 0:
+                self.keyframe_pending = False
+                spectator_message = encode_state(self.tick_count, self.snake_player_list, self.snacks_eaten_list,
+                                                 self.board.item_cell_dict, NETWORK_MESSAGE_KEYFRAME)
+            else:
+                spectator_message = encode_delta(self.tick_count, self.snake_player_list, moved_bool_list,
+                                                 eaten_index_list, crashed_index_list, self.snacks_eaten_list,
+                                                 self.simulation.spawned_cell_list)
+            self.broadcast_spectators(spectator_message)
+        if self.simulation.is_over():
+            self.playing = False
+            game_over_message = encode_message(NETWORK_MESSAGE_GAME_OVER, b''.join(
+                snacks_eaten.to_bytes(4, 'little') for snacks_eaten in self.snacks_eaten_list))
+            self.broadcast(game_over_message)
+            self.broadcast_spectators(game_over_message)
+
+    def broadcast(self, message: bytes) -> None:
+        """Write entered (already encoded) message to every seated client."""
+        for writer in self.writer_list:
+            if writer is not None:
+                write_or_disconnect(writer, message)
+
+    def broadcast_spectators(self, message: bytes) -> None:
+        """Write entered (already encoded) message to every spectator."""
+        for writer in self.spectator_writer_list:
+            write_or_disconnect(writer, message)
+
+
+class GameServer(object):
+    """TCP server hosting any number of game rooms on one event loop.
+
+    This class accepts client connections, seats each client in the room it
+    asks to join or watch (making the room if it doesn't exist yet, and
+    removing it once its last client leaves), passes on direction changes, and runs a
+    single timer task that ticks every room once per tick_seconds. The timer
+    aims for fixed tick times (each tick is scheduled from when the previous
+    one was due, not from when it finished), and if it falls more than a
+    tick behind it skips ahead instead of running ticks back to back. Room
+    keyword args (player count, board size, apple count) are used for every
+    room. Port 0 picks any free port (see port once started).
+    """
+
+    def __init__(self, host: str = NETWORK_DEFAULT_HOST, port: int = NETWORK_DEFAULT_PORT,
+                 tick_seconds: float = NETWORK_TICK_SECONDS, **room_kwargs) -> None:
+        self.host = host
+        self.port = port
+        self.tick_seconds = tick_seconds
+        self.room_kwargs = room_kwargs
+        self.window = get_headless_window()
+        self.room_dict = {}  # {room name: GameRoom}
+        self.server = None
+        self.tick_task = None
+        self.tick_count = 0
+        self.tick_time_total = 0.0  # Seconds spent ticking rooms (for reporting server load).
+
+    async def start(self) -> None:
+        """Start listening for clients and start ticking rooms."""
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.tick_task = asyncio.create_task(self.tick_rooms())
+
+    async def serve_forever(self) -> None:
+        """Start server (if not started) and run until cancelled."""
+        if self.server is None:
+            await self.start()
+        await self.server.serve_forever()
+
+    async def stop(self) -> None:
+        """Stop ticking rooms and close server."""
+        self.tick_task.cancel()
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def tick_rooms(self) -> None:
+        """Tick every room once per tick_seconds, forever."""
+        loop = asyncio.get_running_loop()
+        next_tick_time = loop.time()
+        while True:
+            start = time.perf_counter()
+            for room in list(self.room_dict.values()):
+                room.tick()
+            self.tick_time_total += time.perf_counter() - start
+            self.tick_count += 1
+            next_tick_time += self.tick_seconds
+            if next_tick_time < loop.time() - self.tick_seconds:
+                next_tick_time = loop.time()
+            await asyncio.sleep(max(0.0, next_tick_time - loop.time()))
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Seat a newly connected client, then pass its direction changes on until it leaves.
+
+        The first message from a client must be a JOIN message naming the
+        room to play in (or a SPECTATE message naming the room to watch). A
+        client asking to join a full room is disconnected. Spectators are
+        welcomed with NETWORK_SPECTATOR_INDEX as their player index.
+        """
+        room = None
+        player_index = None
+        spectating = False
+        try:
+            message_type, payload = await read_message(reader)
+            if message_type not in (NETWORK_MESSAGE_JOIN, NETWORK_MESSAGE_SPECTATE):
+                print('client did not join a room first')
+                return
+            room_name = payload[:NETWORK_ROOM_NAME_LIMIT].decode('utf-8', 'replace')
+            if room_name not in self.room_dict:
+                self.room_dict[room_name] = GameRoom(room_name, self.window, **self.room_kwargs)
+            room = self.room_dict[room_name]
+            if message_type == NETWORK_MESSAGE_SPECTATE:
+                room.add_spectator(writer)
+                spectating = True
+            else:
+                player_index = room.add_client(writer)
+                if player_index is None:
+                    print(f'room {room_name} is full')
+                    return
+            writer.write(encode_message(NETWORK_MESSAGE_WELCOME, WELCOME_PAYLOAD.pack(
+                NETWORK_SPECTATOR_INDEX if spectating else player_index, room.player_count,
+                room.board.columns, room.board.rows)))
+            while True:
+                message_type, payload = await read_message(reader)
+                if message_type == NETWORK_MESSAGE_DIRECTION and payload and not spectating:
+                    room.set_direction(player_index, payload[0])
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if room is not None:
+                if player_index is not None:
+                    room.remove_client(player_index)
+                if spectating:
+                    room.remove_spectator(writer)
+                if room.is_empty() and self.room_dict.get(room.name) is room:
+                    del self.room_dict[room.name]
+            writer.close()
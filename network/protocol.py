@@ -0,0 +1,176 @@
+"""Define binary message format used between game server and clients.
+
+This module holds functions for encoding and decoding every message sent over
+a network game connection. Each message is a header (payload length and
+message type, see the NETWORK_MESSAGE_ constants) followed by its payload.
+Payloads are packed with struct, and cell lists are packed as arrays of
+(column, row) int16 pairs (so a head that crashed into the border, one cell
+off the board, still fits), all little endian.
+
+Message payloads:
+    JOIN (client): Room name (UTF-8).
+    SPECTATE (client): Room name (UTF-8), to watch instead of play.
+    DIRECTION (client): Direction index (in ENVIRONMENT_ACTION_LIST order).
+    WELCOME (server): Player index, player count, board columns and rows.
+    STATE (server): Tick number, then each snake's dead flag, direction
+        index, snacks eaten, length and cells (head first), then every
+        apple's cell.
+    GAME_OVER (server): Snacks eaten by each player.
+    KEYFRAME (server, to spectators): Same payload as STATE.
+    DELTA (server, to spectators): Tick number, then each snake's flags
+        (moved, grew, died), direction index, new head cell, and snacks
+        eaten, then the cells of apples spawned this tick. Its size doesn't
+        depend on how long the snakes are.
+
+Functions:
+    encode_message: Returns header and payload bytes of a message.
+    read_message: Reads one message from a stream reader.
+    encode_state: Returns STATE (or KEYFRAME) message of a game room's current tick.
+    decode_state: Returns tick, snake states, and apple cells of a STATE payload.
+    encode_delta: Returns DELTA message of a game room's current tick.
+    decode_delta: Returns tick, snake deltas, and spawned apple cells of a DELTA payload.
+    pack_cells: Returns bytes of entered cell list.
+    unpack_cells: Returns cell list read from bytes.
+"""
+
+import asyncio
+import struct
+import sys
+from array import array
+from itertools import chain
+from misc.constants import *
+
+MESSAGE_HEADER = struct.Struct('<IB')  # (payload length, message type)
+WELCOME_PAYLOAD = struct.Struct('<BBHH')  # (player index, player count, columns, rows)
+STATE_HEADER = struct.Struct('<IB')  # (tick, snake count)
+SNAKE_HEADER = struct.Struct('<BBII')  # (dead, direction index, snacks eaten, length)
+SNAKE_DELTA = struct.Struct('<BBhhI')  # (flags, direction index, head column, head row, snacks eaten)
+COUNT = struct.Struct('<I')
+CELL_SIZE = 4  # Bytes per packed (column, row) cell.
+
+
+def encode_message(message_type: int, payload: bytes = b'') -> bytes:
+    """Return entered message's header followed by its payload."""
+    return MESSAGE_HEADER.pack(len(payload), message_type) + payload
+
+
+async def read_message(reader: asyncio.StreamReader) -> tuple[int, bytes]:
+    """Read one message from entered stream and return its (message type, payload).
+
+    Raises asyncio.IncompleteReadError if the connection closes part way.
+    """
+    payload_length, message_type = MESSAGE_HEADER.unpack(await reader.readexactly(MESSAGE_HEADER.size))
+    return message_type, await reader.readexactly(payload_length)
+
+
+def pack_cells(cell_list) -> bytes:
+    """Return bytes of entered iterable of (column, row) cells."""
+    cell_array = array('h', chain.from_iterable(cell_list))
+    if sys.byteorder == 'big':
+        cell_array.byteswap()
+    return cell_array.tobytes()
+
+
+def unpack_cells(payload: bytes, offset: int, count: int) -> list[tuple[int, int]]:
+    """Return list of entered number of cells packed in payload from offset on."""
+    cell_array = array('h')
+    cell_array.frombytes(payload[offset:offset + count * CELL_SIZE])
+    if sys.byteorder == 'big':
+        cell_array.byteswap()
+    return list(zip(cell_array[::2], cell_array[1::2]))
+
+
+def encode_state(tick: int, snake_player_list: list, snacks_eaten_list: list[int], apple_cells,
+                 message_type: int = NETWORK_MESSAGE_STATE) -> bytes:
+    """Return STATE message of entered game tick (see module docstring).
+
+    Args:
+        tick: Number of the tick.
+        snake_player_list: Every PlayerSnake in the game, in player order.
+        snacks_eaten_list: Snacks eaten by each player.
+        apple_cells: Iterable of cells holding an apple.
+        message_type: Type of message (NETWORK_MESSAGE_KEYFRAME for spectator keyframes).
+
+    Returns:
+        message: Encoded STATE message, ready to be written to every client.
+    """
+    part_list = [STATE_HEADER.pack(tick, len(snake_player_list))]
+    for snake_player, snacks_eaten in zip(snake_player_list, snacks_eaten_list):
+        cell_list = snake_player.get_cell_list()
+        part_list.append(SNAKE_HEADER.pack(snake_player.dead, ENVIRONMENT_ACTION_LIST.index(snake_player.direction),
+                                           snacks_eaten, len(cell_list)))
+        part_list.append(pack_cells(cell_list))
+    apple_cell_bytes = pack_cells(apple_cells)
+    part_list.append(COUNT.pack(len(apple_cell_bytes) // CELL_SIZE))
+    part_list.append(apple_cell_bytes)
+    return encode_message(message_type, b''.join(part_list))
+
+
+def encode_delta(tick: int, snake_player_list: list, moved_bool_list: list[bool], eaten_index_list: list[int],
+                 crashed_index_list: list[int], snacks_eaten_list: list[int], spawned_cell_list: list) -> bytes:
+    """Return DELTA message of entered game tick (see module docstring).
+
+    A spectator that knows the previous tick's state rebuilds this tick's by
+    adding each moved snake's new head cell and dropping its tail cell (or,
+    for a snake that grew, doubling up its tail cell instead, just like
+    PlayerSnake.increase_length), removing the apple in the head cell of
+    every snake that grew, and adding the spawned apples.
+
+    Args:
+        tick: Number of the tick.
+        snake_player_list: Every PlayerSnake in the game, in player order.
+        moved_bool_list: Whether each snake was alive (and so moved) this tick.
+        eaten_index_list: Indexes of players that ate an apple this tick.
+        crashed_index_list: Indexes of players that crashed this tick.
+        snacks_eaten_list: Snacks eaten by each player.
+        spawned_cell_list: Cells of apples spawned this tick.
+
+    Returns:
+        message: Encoded DELTA message, ready to be written to every spectator.
+    """
+    part_list = [STATE_HEADER.pack(tick, len(snake_player_list))]
+    for index, snake_player in enumerate(snake_player_list):
+        flags = ((NETWORK_DELTA_MOVED if moved_bool_list[index] else 0)
+                 | (NETWORK_DELTA_GREW if index in eaten_index_list else 0)
+                 | (NETWORK_DELTA_DIED if index in crashed_index_list else 0))
+        part_list.append(SNAKE_DELTA.pack(flags, ENVIRONMENT_ACTION_LIST.index(snake_player.direction),
+                                          *snake_player.head_cell, snacks_eaten_list[index]))
+    part_list.append(COUNT.pack(len(spawned_cell_list)))
+    part_list.append(pack_cells(spawned_cell_list))
+    return encode_message(NETWORK_MESSAGE_DELTA, b''.join(part_list))
+
+
+def decode_delta(payload: bytes) -> tuple[int, list[tuple[int, str, tuple[int, int], int]], list[tuple[int, int]]]:
+    """Return (tick, snake delta list, spawned apple cell list) of a DELTA payload.
+
+    Each snake delta is a (flags, direction, head cell, snacks eaten) tuple.
+    """
+    tick, snake_count = STATE_HEADER.unpack_from(payload)
+    offset = STATE_HEADER.size
+    snake_delta_list = []
+    for _ in range(snake_count):
+        flags, direction_index, head_column, head_row, snacks_eaten = SNAKE_DELTA.unpack_from(payload, offset)
+        offset += SNAKE_DELTA.size
+        snake_delta_list.append((flags, ENVIRONMENT_ACTION_LIST[direction_index], (head_column, head_row),
+                                 snacks_eaten))
+    spawned_count, = COUNT.unpack_from(payload, offset)
+    return tick, snake_delta_list, unpack_cells(payload, offset + COUNT.size, spawned_count)
+
+
+def decode_state(payload: bytes) -> tuple[int, list[tuple[bool, str, int, list]], list[tuple[int, int]]]:
+    """Return (tick, snake state list, apple cell list) of a STATE payload.
+
+    Each snake state is a (dead, direction, snacks eaten, cell list) tuple,
+    with cells from head to tail.
+    """
+    tick, snake_count = STATE_HEADER.unpack_from(payload)
+    offset = STATE_HEADER.size
+    snake_state_list = []
+    for _ in range(snake_count):
+        dead, direction_index, snacks_eaten, length = SNAKE_HEADER.unpack_from(payload, offset)
+        offset += SNAKE_HEADER.size
+        snake_state_list.append((bool(dead), ENVIRONMENT_ACTION_LIST[direction_index], snacks_eaten,
+                                 unpack_cells(payload, offset, length)))
+        offset += length * CELL_SIZE
+    apple_count, = COUNT.unpack_from(payload, offset)
+    return tick, snake_state_list, unpack_cells(payload, offset + COUNT.size, apple_count)
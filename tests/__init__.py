@@ -0,0 +1,97 @@
+"""Define helpers shared by the program's headless tests.
+
+This package holds round trip tests of the program's binary formats (game
+snapshots, ghost replays, and network messages) and checks of the
+Hamiltonian cycle builder and the autopilot that follows it. Everything runs headless (see
+get_headless_window), so the tests need no real window or sound device. Run
+them from the project's root folder, since game objects load their images and
+settings by relative path:
+
+Usage:
+    python -m unittest discover tests
+
+Functions:
+    make_board: Returns empty, seeded game board of entered size.
+    make_simulation: Returns seeded game simulation of entered board size.
+    play_random_ticks: Plays ticks with randomly steered snakes.
+"""
+
+import os
+import random
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+import pygame
+from misc.constants import *
+from game_objects.game_board import GameBoard
+from game_objects.game_simulation import GameSimulation, get_headless_window
+from game_objects.snake_autopilot import SnakeAutopilot
+from game_objects.snake_player import make_snake_player_list
+
+DIRECTION_OFFSET_DICT = {'up': (0, -1), 'right': (1, 0), 'down': (0, 1), 'left': (-1, 0)}
+
+
+def make_board(columns: int, rows: int, seed: int = 0) -> GameBoard:
+    """Return empty game board of entered size in the default play area, seeded with entered seed."""
+    play_area_rect = pygame.Rect(GAME_BORDER_LEFT, GAME_BORDER_UPPER,
+                                 GAME_WINDOW_WIDTH - GAME_BORDER_LEFT - GAME_BORDER_RIGHT,
+                                 GAME_WINDOW_HEIGHT - GAME_BORDER_UPPER - GAME_BORDER_LOWER)
+    board = GameBoard(columns, rows, BOARD_DEFAULT_CELL_SIZE, play_area_rect)
+    board.seed(seed)
+    return board
+
+
+def make_simulation(columns: int, rows: int, player_count: int = 1, apple_count: int = NUMBER_OF_APPLE_SNACKS,
+                    seed: int = 0, autopilot_bool: bool = False) -> GameSimulation:
+    """Return game simulation of a new game on a seeded board of entered size.
+
+    Args:
+        columns: Number of columns on the board.
+        rows: Number of rows on the board.
+        player_count: Number of snakes on the board.
+        apple_count: Number of apples on the board.
+        seed: Seed of the board's random number generator.
+        autopilot_bool: Whether player 1's snake is steered by the apple
+            autopilot.
+
+    Returns:
+        simulation: Simulation with its apples placed, ready to play.
+    """
+    window = get_headless_window()
+    board = make_board(columns, rows, seed)
+    snake_player_list = make_snake_player_list(window, board, player_count)
+    autopilot = SnakeAutopilot(snake_player_list[0], board) if autopilot_bool else None
+    simulation = GameSimulation(window, board, snake_player_list, autopilot)
+    simulation.reset(apple_count)
+    return simulation
+
+
+def play_random_ticks(simulation: GameSimulation, tick_count: int, seed: int = 0) -> list[tuple[list[int], list[int]]]:
+    """Play up to entered number of ticks, with each snake turning a random (safe, if it can) way now and then.
+
+    Snakes turn whenever the cell ahead is a wall or holds a snake, so games
+    last long enough to eat apples and grow (snakes still crash once boxed
+    in, or into each other's heads).
+
+    Returns:
+        result_list: (crashed player indexes, player indexes that ate) of each
+            tick played (stops early once every snake has crashed).
+    """
+    rng = random.Random(seed)
+    board = simulation.board
+    result_list = []
+    for _ in range(tick_count):
+        if simulation.is_over():
+            break
+        for snake_player in simulation.snake_player_list:
+            if snake_player.dead:
+                continue
+            safe_direction_list = []
+            for direction in ENVIRONMENT_ACTION_LIST:
+                offset = DIRECTION_OFFSET_DICT[direction]
+                cell = (snake_player.head_cell[0] + offset[0], snake_player.head_cell[1] + offset[1])
+                if board.is_in_bounds(cell) and cell not in board.snake_cell_dict:
+                    safe_direction_list.append(direction)
+            if safe_direction_list and (snake_player.direction not in safe_direction_list or rng.random() < 0.2):
+                snake_player.set_direction(rng.choice(safe_direction_list))
+        result_list.append(simulation.update())
+    return result_list
@@ -0,0 +1,112 @@
+"""Round trip game snapshots through their file format, and resume games from them."""
+
+import os
+import tempfile
+import unittest
+from array import array
+from game_objects.game_snapshot import GameSnapshot, load_game_snapshot, save_game_snapshot, take_game_snapshot
+from tests import make_simulation, play_random_ticks
+
+BOARD_SIZE = (37, 21)
+PLAYER_COUNT = 2
+APPLE_COUNT = 10
+
+
+class GameSnapshotTest(unittest.TestCase):
+
+    def play_game(self, tick_count: int, seed: int = 3):
+        """Return (simulation, snacks eaten by each player) of a game played for entered number of ticks."""
+        simulation = make_simulation(*BOARD_SIZE, player_count=PLAYER_COUNT, apple_count=APPLE_COUNT, seed=seed)
+        snacks_eaten_list = [0] * PLAYER_COUNT
+        for _, eaten_index_list in play_random_ticks(simulation, tick_count, seed):
+            for index in eaten_index_list:
+                snacks_eaten_list[index] += 1
+        return simulation, snacks_eaten_list
+
+    def test_round_trip(self):
+        simulation, snacks_eaten_list = self.play_game(200)
+        snapshot = take_game_snapshot(simulation.board, simulation.snake_player_list, snacks_eaten_list, 12345)
+        loaded_snapshot = GameSnapshot.from_bytes(snapshot.to_bytes())
+        for attribute in ['columns', 'rows', 'cell_size', 'elapsed_time', 'rng_state', 'snake_state_list',
+                          'apple_cell_array', 'free_cell_array', 'snacks_eaten_list']:
+            self.assertEqual(getattr(loaded_snapshot, attribute), getattr(snapshot, attribute))
+
+    def test_modes_round_trip(self):
+        simulation, snacks_eaten_list = self.play_game(50)
+        for practice_bool, autopilot_mode in [(False, 'OFF'), (True, 'OFF'), (False, 'APPLE'), (True, 'CYCLE')]:
+            with self.subTest(practice_bool=practice_bool, autopilot_mode=autopilot_mode):
+                snapshot = take_game_snapshot(simulation.board, simulation.snake_player_list, snacks_eaten_list, 0,
+                                              practice_bool, autopilot_mode)
+                loaded_snapshot = GameSnapshot.from_bytes(snapshot.to_bytes())
+                self.assertEqual(loaded_snapshot.practice_bool, practice_bool)
+                self.assertEqual(loaded_snapshot.autopilot_mode, autopilot_mode)
+
+    def test_resumed_game_plays_the_same(self):
+        simulation, snacks_eaten_list = self.play_game(150)
+        self.assertFalse(simulation.is_over())
+        data = take_game_snapshot(simulation.board, simulation.snake_player_list, snacks_eaten_list, 0).to_bytes()
+        resumed_simulation = make_simulation(*BOARD_SIZE, player_count=PLAYER_COUNT, apple_count=APPLE_COUNT, seed=99)
+        GameSnapshot.from_bytes(data).restore(resumed_simulation.window, resumed_simulation.board,
+                                              resumed_simulation.snake_player_list)
+        # Both games are steered the same way from here on, so they must stay identical (apples included).
+        for tick in range(300):
+            result = play_random_ticks(simulation, 1, seed=tick)
+            self.assertEqual(play_random_ticks(resumed_simulation, 1, seed=tick), result)
+            for snake_player, resumed_snake_player in zip(simulation.snake_player_list,
+                                                          resumed_simulation.snake_player_list):
+                self.assertEqual(resumed_snake_player.get_cell_list(), snake_player.get_cell_list())
+                self.assertEqual(resumed_snake_player.dead, snake_player.dead)
+            self.assertEqual(list(resumed_simulation.board.item_cell_dict), list(simulation.board.item_cell_dict))
+            if simulation.is_over():
+                break
+
+    def test_save_and_load_file(self):
+        simulation, snacks_eaten_list = self.play_game(50)
+        snapshot = take_game_snapshot(simulation.board, simulation.snake_player_list, snacks_eaten_list, 500)
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'snapshot.bin')
+            save_game_snapshot(snapshot, file_path)
+            self.assertEqual(load_game_snapshot(file_path).to_bytes(), snapshot.to_bytes())
+            self.assertIsNone(load_game_snapshot(os.path.join(directory, 'missing.bin')))
+
+    def test_bad_bytes(self):
+        simulation, snacks_eaten_list = self.play_game(50)
+        data = take_game_snapshot(simulation.board, simulation.snake_player_list, snacks_eaten_list, 0).to_bytes()
+        for bad_data in [b'', data[:20], data[:-2], b'XXXX' + data[4:]]:
+            with self.assertRaises(ValueError):
+                GameSnapshot.from_bytes(bad_data)
+
+    def test_cells_not_fitting_board(self):
+        simulation, snacks_eaten_list = self.play_game(50)
+        for change in ['empty snake', 'snake off board', 'apple in snake', 'free cell missing', 'free cell in apple',
+                       'too many players']:
+            with self.subTest(change=change):
+                snapshot = take_game_snapshot(simulation.board, simulation.snake_player_list, snacks_eaten_list, 0)
+                dead, direction, snacks_eaten, cell_array = snapshot.snake_state_list[0]
+                if change == 'empty snake':
+                    snapshot.snake_state_list[0] = (dead, direction, snacks_eaten, array('h'))
+                elif change == 'snake off board':
+                    cell_array[-2:] = array('h', [BOARD_SIZE[0], 0])
+                elif change == 'apple in snake':
+                    snapshot.apple_cell_array[:2] = cell_array[2:4]
+                elif change == 'free cell missing':
+                    del snapshot.free_cell_array[-2:]
+                elif change == 'free cell in apple':
+                    snapshot.free_cell_array[:2] = snapshot.apple_cell_array[:2]
+                else:
+                    snapshot.snake_state_list *= 3
+                    snapshot.player_count = len(snapshot.snake_state_list)
+                with self.assertRaises(ValueError):
+                    GameSnapshot.from_bytes(snapshot.to_bytes())
+
+    def test_restore_with_wrong_free_cells(self):
+        simulation, snacks_eaten_list = self.play_game(50)
+        snapshot = take_game_snapshot(simulation.board, simulation.snake_player_list, snacks_eaten_list, 0)
+        del snapshot.free_cell_array[-2:]
+        resumed_simulation = make_simulation(*BOARD_SIZE, player_count=PLAYER_COUNT, apple_count=APPLE_COUNT, seed=99)
+        with self.assertRaises(ValueError):
+            snapshot.restore(resumed_simulation.window, resumed_simulation.board, resumed_simulation.snake_player_list)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+"""Round trip ghost replays through their file format, and race them against the game they recorded."""
+
+import unittest
+from misc.constants import *
+from game_objects.game_simulation import get_headless_window
+from game_objects.ghost_replay import GhostReplay, GhostSnake
+from tests import make_board, make_simulation
+
+
+class GhostReplayTest(unittest.TestCase):
+
+    def record_replay(self, tick_count: int) -> tuple[GhostReplay, list[list[tuple[int, int]]]]:
+        """Return replay of an autopilot game, along with the snake's cells after every tick."""
+        simulation = make_simulation(*BOARD_DEFAULT_SIZE, seed=7, autopilot_bool=True)
+        replay = GhostReplay(simulation.board.columns, simulation.board.rows, NUMBER_OF_APPLE_SNACKS, 7)
+        snake_player = simulation.snake_player_list[0]
+        cell_list_list = []
+        while len(replay.direction_array) < tick_count and not simulation.is_over():
+            _, eaten_index_list = simulation.update()
+            replay.record(snake_player.direction)
+            replay.snacks_eaten += len(eaten_index_list)
+            cell_list_list.append(snake_player.get_cell_list())
+        return replay, cell_list_list
+
+    def test_round_trip(self):
+        replay, _ = self.record_replay(500)
+        loaded_replay = GhostReplay.from_bytes(replay.to_bytes())
+        for attribute in ['columns', 'rows', 'apple_count', 'seed', 'snacks_eaten', 'direction_array']:
+            self.assertEqual(getattr(loaded_replay, attribute), getattr(replay, attribute))
+
+    def test_empty_round_trip(self):
+        replay = GhostReplay(10, 10, 3, 123)
+        self.assertEqual(len(GhostReplay.from_bytes(replay.to_bytes()).direction_array), 0)
+
+    def test_bad_bytes(self):
+        data = self.record_replay(50)[0].to_bytes()
+        for bad_data in [b'', data[:10], data[:-1], b'XXXX' + data[4:]]:
+            with self.assertRaises(ValueError):
+                GhostReplay.from_bytes(bad_data)
+
+    def test_ghost_follows_recorded_game(self):
+        replay, cell_list_list = self.record_replay(500)
+        replay = GhostReplay.from_bytes(replay.to_bytes())
+        ghost_snake = GhostSnake(get_headless_window(), make_board(replay.columns, replay.rows), replay)
+        for cell_list in cell_list_list:
+            ghost_snake.update()
+            self.assertEqual(ghost_snake.snake_player.get_cell_list(), cell_list)
+        self.assertTrue(ghost_snake.finished)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+"""Check that the Hamiltonian cycle autopilot fills the board with every apple count option."""
+
+import tempfile
+import unittest
+from unittest import mock
+from misc.saved_data_io_functions import get_file_dict
+from game_objects import hamiltonian_autopilot
+from game_objects.hamiltonian_autopilot import HamiltonianAutopilot
+from tests import make_simulation
+
+APPLE_COUNT_LIST = [int(option.split('~')[1]) for option in get_file_dict('game_options')['APPLES']]
+SEED_LIST = [0, 1, 2]
+
+
+class HamiltonianAutopilotTest(unittest.TestCase):
+
+    def setUp(self):
+        # Builds cycles from scratch, and saves them in a temporary directory instead of the saved data one.
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        for patcher in [mock.patch.object(hamiltonian_autopilot, 'HAMILTONIAN_CYCLE_DIRECTORY', directory.name),
+                        mock.patch.dict(hamiltonian_autopilot._hamiltonian_cycle_dict, clear=True)]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def play_game(self, columns: int, rows: int, apple_count: int, seed: int) -> HamiltonianAutopilot:
+        """Play game driven by the cycle autopilot until it's over, and return the autopilot."""
+        simulation = make_simulation(columns, rows, apple_count=apple_count, seed=seed)
+        autopilot = HamiltonianAutopilot(simulation.snake_player_list[0], simulation.board)
+        simulation.autopilot = autopilot
+        tick_limit = columns * rows * columns * rows
+        while not simulation.is_over() and tick_limit > 0:
+            simulation.update()
+            tick_limit -= 1
+        self.assertTrue(simulation.is_over())
+        return autopilot
+
+    def test_fills_even_board(self):
+        for apple_count in APPLE_COUNT_LIST:
+            for seed in SEED_LIST:
+                with self.subTest(apple_count=apple_count, seed=seed):
+                    board = self.play_game(20, 20, apple_count, seed).board
+                    self.assertEqual(len(board.snake_cell_dict), board.cell_count)
+                    self.assertEqual(board.item_cell_dict, {})
+
+    def test_fills_odd_board_but_skipped_cell(self):
+        for apple_count in APPLE_COUNT_LIST:
+            for seed in SEED_LIST:
+                with self.subTest(apple_count=apple_count, seed=seed):
+                    autopilot = self.play_game(37, 21, apple_count, seed)
+                    board = autopilot.board
+                    self.assertEqual(board.free_cell_list, [])
+                    self.assertLessEqual(set(board.item_cell_dict), {autopilot.skipped_cell})
+                    self.assertEqual(len(board.snake_cell_dict) + len(board.item_cell_dict), board.cell_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""Check that Hamiltonian cycles visit every board cell once, one step at a time."""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+from game_objects import hamiltonian_autopilot
+from game_objects.hamiltonian_autopilot import CYCLE_HEADER, build_hamiltonian_cycle, get_hamiltonian_cycle, \
+    is_hamiltonian_cycle, load_hamiltonian_cycle
+
+BOARD_SIZE_LIST = [(2, 2), (4, 4), (10, 10), (37, 21), (74, 42), (8, 5), (5, 8), (3, 3), (7, 5), (21, 37)]
+
+
+class BuildHamiltonianCycleTest(unittest.TestCase):
+
+    def test_every_cell_once(self):
+        for columns, rows in BOARD_SIZE_LIST:
+            with self.subTest(size=(columns, rows)):
+                cycle_cell_list = build_hamiltonian_cycle(columns, rows)
+                expected_cell_set = {(column, row) for column in range(columns) for row in range(rows)}
+                if columns % 2 == 1 and rows % 2 == 1:
+                    expected_cell_set.discard((columns - 1, rows - 1))  # (No cycle exists through every cell).
+                self.assertEqual(len(cycle_cell_list), len(expected_cell_set))
+                self.assertEqual(set(cycle_cell_list), expected_cell_set)
+
+    def test_consecutive_cells_adjacent(self):
+        for columns, rows in BOARD_SIZE_LIST:
+            with self.subTest(size=(columns, rows)):
+                cycle_cell_list = build_hamiltonian_cycle(columns, rows)
+                for index, (column, row) in enumerate(cycle_cell_list):
+                    next_column, next_row = cycle_cell_list[(index + 1) % len(cycle_cell_list)]
+                    self.assertEqual(abs(next_column - column) + abs(next_row - row), 1)
+
+
+class HamiltonianCycleFileTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        for patcher in [mock.patch.object(hamiltonian_autopilot, 'HAMILTONIAN_CYCLE_DIRECTORY', directory.name),
+                        mock.patch.dict(hamiltonian_autopilot._hamiltonian_cycle_dict, clear=True)]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def get_cycle_bytes(self, columns: int, rows: int) -> bytes:
+        """Return cycle file saved for entered board size (building it first)."""
+        get_hamiltonian_cycle(columns, rows)
+        hamiltonian_autopilot._hamiltonian_cycle_dict.clear()
+        with open(os.path.join(self.directory, f'{columns}x{rows}.bin'), 'rb') as cycle_file:
+            return cycle_file.read()
+
+    def test_saved_cycle_loads(self):
+        for columns, rows in BOARD_SIZE_LIST:
+            with self.subTest(size=(columns, rows)):
+                self.get_cycle_bytes(columns, rows)
+                cycle_order = load_hamiltonian_cycle(columns, rows)
+                self.assertIsNotNone(cycle_order)
+                self.assertTrue(is_hamiltonian_cycle(cycle_order, columns, rows))
+
+    def test_bad_cycle_file_is_rebuilt(self):
+        columns, rows = 7, 5
+        data = self.get_cycle_bytes(columns, rows)
+        order_data = data[CYCLE_HEADER.size:]
+        swapped_data = data[:CYCLE_HEADER.size] + order_data[4:8] + order_data[:4] + order_data[8:]
+        for bad_data in [b'', data[:10], data[:-2], data[:-4], order_data, b'XXXX' + data[4:], swapped_data]:
+            with self.subTest(bad_data=bad_data[:12]):
+                with open(os.path.join(self.directory, f'{columns}x{rows}.bin'), 'wb') as cycle_file:
+                    cycle_file.write(bad_data)
+                self.assertIsNone(load_hamiltonian_cycle(columns, rows))
+                cycle_order, cycle_index = get_hamiltonian_cycle(columns, rows)
+                self.assertTrue(is_hamiltonian_cycle(cycle_order, columns, rows))
+                self.assertEqual(self.get_cycle_bytes(columns, rows), data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""Round trip network game states and spectator deltas through the message format."""
+
+import unittest
+from misc.constants import *
+from network.game_client import GameClient
+from network.protocol import MESSAGE_HEADER, decode_delta, decode_state, encode_delta, encode_state
+from tests import make_simulation, play_random_ticks
+
+
+def split_message(message: bytes) -> tuple[int, bytes]:
+    """Return (message type, payload) of entered encoded message, checking its header's length."""
+    payload_length, message_type = MESSAGE_HEADER.unpack_from(message)
+    payload = message[MESSAGE_HEADER.size:]
+    assert payload_length == len(payload)
+    return message_type, payload
+
+
+def get_expected_state(simulation, snacks_eaten_list: list[int]) -> list[tuple[bool, str, int, list]]:
+    """Return state of every snake in entered simulation, as decode_state returns it."""
+    return [(snake_player.dead, snake_player.direction, snacks_eaten, snake_player.get_cell_list())
+            for snake_player, snacks_eaten in zip(simulation.snake_player_list, snacks_eaten_list)]
+
+
+class StateMessageTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        simulation = make_simulation(37, 21, player_count=3, apple_count=10, seed=3)
+        snacks_eaten_list = [0, 0, 0]
+        for tick, (_, eaten_index_list) in enumerate(play_random_ticks(simulation, 300, seed=3), 1):
+            for index in eaten_index_list:
+                snacks_eaten_list[index] += 1
+            message_type, payload = split_message(encode_state(tick, simulation.snake_player_list,
+                                                               snacks_eaten_list, simulation.board.item_cell_dict))
+            self.assertEqual(message_type, NETWORK_MESSAGE_STATE)
+            decoded_tick, snake_state_list, apple_cell_list = decode_state(payload)
+            self.assertEqual(decoded_tick, tick)
+            self.assertEqual(snake_state_list, get_expected_state(simulation, snacks_eaten_list))
+            self.assertEqual(apple_cell_list, list(simulation.board.item_cell_dict))
+
+    def test_keyframe_type(self):
+        simulation = make_simulation(10, 10)
+        message_type, _ = split_message(encode_state(0, simulation.snake_player_list, [0],
+                                                     simulation.board.item_cell_dict, NETWORK_MESSAGE_KEYFRAME))
+        self.assertEqual(message_type, NETWORK_MESSAGE_KEYFRAME)
+
+
+class DeltaMessageTest(unittest.TestCase):
+
+    def test_spectator_rebuilds_every_tick(self):
+        simulation = make_simulation(37, 21, player_count=2, apple_count=25, seed=5)
+        snacks_eaten_list = [0, 0]
+        client = GameClient(spectate=True)
+        client.load_keyframe(split_message(encode_state(0, simulation.snake_player_list, snacks_eaten_list,
+                                                        simulation.board.item_cell_dict))[1])
+        tick = 0
+        while not simulation.is_over() and tick < 400:
+            moved_bool_list = [not snake_player.dead for snake_player in simulation.snake_player_list]
+            (crashed_index_list, eaten_index_list), = play_random_ticks(simulation, 1, seed=tick)
+            tick += 1
+            for index in eaten_index_list:
+                snacks_eaten_list[index] += 1
+            message_type, payload = split_message(encode_delta(
+                tick, simulation.snake_player_list, moved_bool_list, eaten_index_list, crashed_index_list,
+                snacks_eaten_list, simulation.spawned_cell_list))
+            self.assertEqual(message_type, NETWORK_MESSAGE_DELTA)
+            self.assertEqual(decode_delta(payload)[0], tick)
+            decoded_tick, snake_state_list, apple_cell_list = client.apply_delta(payload)
+            self.assertEqual(decoded_tick, tick)
+            self.assertEqual(snake_state_list, get_expected_state(simulation, snacks_eaten_list))
+            self.assertEqual(set(apple_cell_list), set(simulation.board.item_cell_dict))
+        self.assertGreater(sum(snacks_eaten_list), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
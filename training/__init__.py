@@ -0,0 +1,24 @@
+"""Headless environments for training agents (bots) to play the game.
+
+This package wraps the game's rules in Gym-style environments that can be
+stepped millions of times without opening the game's menus (RootWindow), a
+visible window, or an audio device, and without drawing anything unless a
+frame is asked for. Unless SDL drivers are already set, SDL is pointed at
+its dummy video and audio drivers before pygame is imported.
+
+Usage (from the project root, so that asset paths resolve):
+    from training.snake_environment import SnakeEnvironment
+    environment = SnakeEnvironment()
+    observation = environment.reset(seed=0)
+    observation, reward, done, info = environment.step(0)  # 0 = up.
+    frame = environment.render()  # Only when a frame is wanted.
+
+Modules:
+    snake_environment: Single board and vectorized (many board) environments.
+"""
+
+import os
+
+# Must be set before pygame is imported anywhere.
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
@@ -0,0 +1,231 @@
+"""Define Gym-style environments that run the snake game headlessly.
+
+This module holds an environment class that plays a single board of snake
+one tick at a time from an agent's actions (instead of the keyboard), along
+with a vectorized version that steps many boards per call. The game objects
+used in-game (GameBoard, PlayerSnake, AppleSnack, GameBorderUI, GameGrid) and
+the game's rules (GameSimulation) are reused as is, so the environment plays
+exactly the same game, and draw methods are only called when a frame is
+rendered.
+Observations are BoardObservation tensors that the board keeps up to date in
+place, so stepping allocates no observation at all.
+
+Classes:
+    SnakeEnvironment: Single board environment with reset/step/render.
+    VectorSnakeEnvironment: Steps many SnakeEnvironment boards per call.
+"""
+
+import os
+import pygame
+from misc.constants import *
+from misc.asset_cache import load_image
+from misc.saved_data_io_functions import get_file_dict
+from game_objects.board_observation import BoardObservation, get_tensor
+from game_objects.game_board import GameBoard
+from game_objects.game_border_ui import GameBorderUI
+from game_objects.game_grid import GameGrid
+from game_objects.game_simulation import GameSimulation, get_headless_window
+from game_objects.snack_items import draw_items, spawn_apple_snacks
+from game_objects.snake_player import PlayerSnake
+
+
+class SnakeEnvironment(object):
+    """Headless single player snake game stepped by an agent's actions.
+
+    This class holds one board, one snake, and the board's apples. Each step
+    turns the snake towards the direction of the entered action (actions are
+    indexes into ENVIRONMENT_ACTION_LIST, and turning back on itself is
+    ignored, just like in-game), then plays one tick of GameSimulation (the
+    same rules SnakeGame.update_simulation uses). The
+    reward for a step is the points scored in it (GAME_UI_SCORE_MULTIPLIER
+    for each apple eaten, the same as the in-game score), and an episode is
+    done once the snake crashes (or after max_steps steps, if entered).
+    Apples are placed with the board's own random number generator, so
+    resetting with the same seed and taking the same actions replays the
+    same game.
+
+    The observation is the board's BoardObservation tensor (body, head,
+    apples, and walls channels), returned as a NumPy array if NumPy is
+    installed and as a multidimensional memoryview otherwise. The same
+    object is returned every step and changes in place as the board does (use
+    observation.copy to keep one). Its buffer can be entered, so that a
+    vectorized environment's boards all write into one block of memory.
+
+    Nothing is drawn while stepping. The border ui, background, and grid
+    used by render are only made the first time a frame is rendered. The
+    cell size only affects rendering, and a render mode of 'human' also shows
+    rendered frames in a window.
+    """
+
+    def __init__(self, columns: int = BOARD_DEFAULT_SIZE[0], rows: int = BOARD_DEFAULT_SIZE[1],
+                 apple_count: int = NUMBER_OF_APPLE_SNACKS, max_steps: int | None = None,
+                 cell_size: int = BOARD_DEFAULT_CELL_SIZE, render_mode: str | None = None,
+                 observation_buffer: memoryview | None = None) -> None:
+        self.window = get_headless_window()
+        self.width = GAME_WINDOW_WIDTH
+        self.height = GAME_WINDOW_HEIGHT
+        self.play_area_rect = pygame.Rect(GAME_BORDER_LEFT, GAME_BORDER_UPPER,
+                                          self.width - GAME_BORDER_LEFT - GAME_BORDER_RIGHT,
+                                          self.height - GAME_BORDER_UPPER - GAME_BORDER_LOWER)
+        self.board = GameBoard(columns, rows, cell_size, self.play_area_rect)
+        # (Attached before the snake is made, so that the snake marks its head cell in it).
+        self.observation = BoardObservation(columns, rows, observation_buffer)
+        self.observation.attach(self.board)
+        self.snake_player = PlayerSnake(self.window, self.board, SNAKE_PLAYER_START_DIRECTION)
+        self.simulation = GameSimulation(self.window, self.board, [self.snake_player])
+        self.apple_count = apple_count
+        self.max_steps = max_steps
+        self.render_mode = render_mode
+        self.action_count = len(ENVIRONMENT_ACTION_LIST)
+        self.snacks_eaten = 0
+        self.step_count = 0
+        self.done = False
+        self.border_ui = None
+        self.background = None
+        self.grid = None
+        spawn_apple_snacks(self.window, self.board, self.apple_count)
+
+    def reset(self, seed: int | None = None) -> 'numpy.ndarray | memoryview':
+        """Start a new episode and return its first observation.
+
+        Args:
+            seed: Seed for the board's random number generator (None keeps
+                the generator's current state, so episodes keep varying).
+
+        Returns:
+            observation: Observation of the new episode's first tick.
+        """
+        if seed is not None:
+            self.board.seed(seed)
+        self.simulation.reset(self.apple_count)
+        self.snacks_eaten = 0
+        self.step_count = 0
+        self.done = False
+        return self.observation.tensor
+
+    def step(self, action: int) -> tuple['numpy.ndarray | memoryview', int, bool, dict]:
+        """Play one tick with entered action.
+
+        Args:
+            action: Index into ENVIRONMENT_ACTION_LIST of the direction to
+                turn the snake towards before it moves.
+
+        Returns:
+            observation: Observation after the tick.
+            reward: Points scored this tick.
+            done: True if the episode is over (reset before stepping again).
+            info: Dict of score, snacks eaten, snake length, steps taken,
+                and whether the episode was cut short by max_steps.
+        """
+        if self.done:
+            print('episode is over, reset environment before stepping again')
+            return self.observation.tensor, 0, True, self.get_info(False)
+
+        self.snake_player.set_direction(ENVIRONMENT_ACTION_LIST[action])
+        crashed_index_list, eaten_index_list = self.simulation.update()
+        self.step_count += 1
+        self.done = len(crashed_index_list) > 0
+        self.snacks_eaten += len(eaten_index_list)
+        reward = len(eaten_index_list) * GAME_UI_SCORE_MULTIPLIER
+
+        truncated = not self.done and self.max_steps is not None and self.step_count >= self.max_steps
+        self.done = self.done or truncated
+        return self.observation.tensor, reward, self.done, self.get_info(truncated)
+
+    def get_info(self, truncated: bool) -> dict:
+        """Return dict of current score, snacks eaten, length, steps, and truncated flag."""
+        return {'score': self.snacks_eaten * GAME_UI_SCORE_MULTIPLIER,
+                'snacks_eaten': self.snacks_eaten,
+                'length': len(self.snake_player.snake_cube_rect_list),
+                'steps': self.step_count,
+                'truncated': truncated}
+
+    def render(self) -> pygame.Surface:
+        """Draw current tick with the in-game draw methods and return the frame.
+
+        The background (the user's selected one), grid (if turned on), snake,
+        apples, and border ui are drawn to the off screen window surface, in
+        the same order as SnakeGame.draw. With render_mode 'human', the frame
+        is also shown in a game sized window.
+
+        Returns:
+            window: Off screen surface holding the rendered frame.
+        """
+        if self.border_ui is None:
+            pygame.font.init()
+            user_prefs = get_file_dict('user_preferences')
+            self.border_ui = GameBorderUI(self.window, self.width, self.height, self.board, game_ready_ui=True)
+            self.background = load_image(
+                os.path.join('project_assets', 'backgrounds', user_prefs.get('BACKGROUND').split('~')[1]),
+                self.board.rect.size, alpha=False)
+            self.grid = GameGrid(self.window, self.board) if user_prefs.get('GRID').split('~')[1] == 'True' else None
+
+        self.window.blit(self.background, self.board.rect.topleft)
+        if self.grid is not None:
+            self.grid.draw()
+        self.snake_player.draw()
+        draw_items(self.window, self.board.item_cell_dict.values())
+        self.border_ui.snacks_eaten_list[0] = self.snacks_eaten
+        self.border_ui.draw()
+        if self.render_mode == 'human':
+            if pygame.display.get_surface().get_size() != (self.width, self.height):
+                pygame.display.set_mode((self.width, self.height))
+            pygame.display.get_surface().blit(self.window, BACKGROUND_BLIT_POS)
+            pygame.display.update()
+        return self.window
+
+
+class VectorSnakeEnvironment(object):
+    """Many SnakeEnvironment boards stepped together with one call.
+
+    This class holds a list of environments that all share the same settings
+    and steps every one of them per call, taking a list of actions (one per
+    board) and returning the observations of every board, along with lists
+    of rewards, done flags, and info dicts. Every board's observation tensor
+    lives in one shared buffer, so the observations of all boards are a
+    single (boards, channels, rows, columns) tensor (NumPy array if NumPy is
+    installed, memoryview otherwise) that is updated in place, with nothing
+    gathered or copied per step. A board whose episode ends is reset straight
+    away, so every board is always ready for the next step: its part of the
+    tensor shows the first tick of the new episode, and a copy of the last
+    observation of the finished episode is put in its info dict under
+    'final_observation'. Keyword args are passed on to every SnakeEnvironment.
+    """
+
+    def __init__(self, environment_count: int, **environment_kwargs) -> None:
+        columns = environment_kwargs.get('columns', BOARD_DEFAULT_SIZE[0])
+        rows = environment_kwargs.get('rows', BOARD_DEFAULT_SIZE[1])
+        observation_size = OBSERVATION_CHANNEL_COUNT * (columns + 2) * (rows + 2)
+        self.observation_buffer = memoryview(bytearray(environment_count * observation_size))
+        self.environment_list = [SnakeEnvironment(**environment_kwargs, observation_buffer=self.observation_buffer[
+            index * observation_size:(index + 1) * observation_size]) for index in range(environment_count)]
+        self.environment_count = environment_count
+        self.observation_tensor = get_tensor(self.observation_buffer,
+                                             (environment_count,) + self.environment_list[0].observation.shape)
+
+    def reset(self, seed: int | None = None) -> 'numpy.ndarray | memoryview':
+        """Reset every board and return the observation tensor of every board.
+
+        Board n is seeded with seed + n (if a seed is entered), so that each
+        board plays a different (but repeatable) game.
+        """
+        for index, environment in enumerate(self.environment_list):
+            environment.reset(None if seed is None else seed + index)
+        return self.observation_tensor
+
+    def step(self, action_list: list[int]) -> tuple['numpy.ndarray | memoryview', list[int], list[bool], list[dict]]:
+        """Step every board with its action and return step results (see class docstring)."""
+        reward_list, done_list, info_list = [], [], []
+        for environment, action in zip(self.environment_list, action_list):
+            _, reward, done, info = environment.step(action)
+            if done:
+                info['final_observation'] = environment.observation.copy()
+                environment.reset()
+            reward_list.append(reward)
+            done_list.append(done)
+            info_list.append(info)
+        return self.observation_tensor, reward_list, done_list, info_list
+
+    def render(self, index: int = 0) -> pygame.Surface:
+        """Render entered board (the first one by default) and return the frame."""
+        return self.environment_list[index].render()